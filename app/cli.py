@@ -0,0 +1,599 @@
+"""
+Línea de comandos de FURIPS (sin interfaz gráfica).
+
+Solo importa las capas de datos y dominio (nunca PySide6), y cada comando
+importa lo que necesita al ejecutarse, así que arranca rápido y sirve para
+tareas desatendidas en un servidor.
+
+Uso:
+    python -m app.cli auditar --desde 2026-01-01 --hasta 2026-06-30 [--prestador CODIGO]
+                              [--regla REGLA ...] [--salida violaciones.csv]
+    python -m app.cli historial vehiculos|propietarios [--accidente ID] [--placa PLACA]
+                                [--vehiculo ID] [--documento DOC] [--desde ...] [--hasta ...]
+                                [--limite N [--despues CURSOR]] [--salida historial.csv]
+    python -m app.cli exportar (--id ID ... | --desde ... --hasta ... [--prestador CODIGO])
+                               [--formato furips1|furips2|ambos] [--cola]
+    python -m app.cli imprimir (--id ID ... | --desde ... --hasta ... [--prestador CODIGO])
+                               [--tipo furips1|furips2|furips_cte] [--cola]
+    python -m app.cli trabajos listar [--estado ESTADO ...]
+    python -m app.cli trabajos reanudar [--id ID]
+    python -m app.cli trabajos cancelar --id ID
+    python -m app.cli archivo archivar [--antes-de AAAA-MM-DD] [--lote N]
+    python -m app.cli archivo restaurar --id ID [--id ID ...] [--reactivar]
+    python -m app.cli importar [--furips1 ARCHIVO] [--furips2 ARCHIVO] [--prestador CODIGO]
+                               [--errores errores.csv]
+    python -m app.cli validar [--furips1 ARCHIVO] [--furips2 ARCHIVO] [--errores errores.csv]
+    python -m app.cli bench [--registros N]
+
+    (alias en inglés: export, print, import, validate)
+
+exportar e imprimir escriben en la salida estándar la ruta de cada archivo
+generado; el progreso y los errores van a la salida de errores. Con --cola el
+lote corre en la cola de trabajos persistente: si se interrumpe (Ctrl+C, caída
+de la BD) se retoma con `trabajos reanudar` desde el último bloque confirmado.
+
+Códigos de salida:
+    0  sin hallazgos
+    1  se encontraron violaciones / registros con error
+    2  argumentos inválidos
+    3  error de base de datos o de ejecución
+"""
+import argparse
+import csv
+import logging
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+SALIDA_OK = 0
+SALIDA_HALLAZGOS = 1
+SALIDA_ARGUMENTOS = 2
+SALIDA_ERROR = 3
+
+
+def _fecha(valor: str) -> date:
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida '{valor}' (use AAAA-MM-DD)")
+
+
+class _Progreso:
+    """
+    Progreso en la salida de errores: una línea que se sobrescribe si es una
+    terminal, o una línea cada 10 % si se redirige a un archivo (cron, logs).
+    """
+
+    def __init__(self, total: int, etiqueta: str):
+        self.total = total
+        self.etiqueta = etiqueta
+        self.actual = 0
+        self._terminal = sys.stderr.isatty()
+        self._siguiente = 0
+        self._inicio = time.perf_counter()
+
+    def avanzar(self, cantidad: int = 1):
+        self.actual += cantidad
+        porcentaje = self.actual * 100 // self.total if self.total else 100
+        if self._terminal:
+            print(f"\r{self.etiqueta}: {self.actual}/{self.total} ({porcentaje}%)",
+                  end="", file=sys.stderr, flush=True)
+        elif porcentaje >= self._siguiente:
+            print(f"{self.etiqueta}: {self.actual}/{self.total} ({porcentaje}%)", file=sys.stderr, flush=True)
+            self._siguiente = porcentaje - porcentaje % 10 + 10
+
+    def mensaje(self, texto: str):
+        """Escribe un mensaje sin mezclarlo con la línea de progreso."""
+        if self._terminal and self.actual:
+            print(file=sys.stderr)
+        print(texto, file=sys.stderr)
+
+    def terminar(self) -> float:
+        """Cierra la línea de progreso y retorna los segundos transcurridos."""
+        if self._terminal and self.actual:
+            print(file=sys.stderr)
+        return time.perf_counter() - self._inicio
+
+
+def _seleccionar_accidentes(session, args: argparse.Namespace) -> Optional[List[int]]:
+    """IDs indicados con --id, o los del periodo/prestador. None si los argumentos no sirven."""
+    from app.data.repositories.accidente_repo import AccidenteRepository
+    from app.data.repositories.prestador_repo import PrestadorRepository
+
+    if args.id:
+        return list(dict.fromkeys(args.id))
+    if not (args.desde and args.hasta):
+        print("Indique --id o el periodo con --desde y --hasta", file=sys.stderr)
+        return None
+
+    prestador_id = None
+    if args.prestador:
+        prestador = PrestadorRepository(session).get_by_codigo(args.prestador)
+        if prestador is None:
+            print(f"Prestador '{args.prestador}' no existe", file=sys.stderr)
+            return None
+        prestador_id = prestador.id
+    return AccidenteRepository(session).get_ids_por_periodo(args.desde, args.hasta, prestador_id)
+
+
+# ============================================================================
+# AUDITAR
+# ============================================================================
+
+def _cmd_auditar(args: argparse.Namespace) -> int:
+    """Audita la integridad de los accidentes del periodo y escribe las violaciones en CSV."""
+    from app.config.db import get_db_session
+    from app.data.repositories.integridad_repo import CHEQUEOS, IntegridadRepository
+    from app.data.repositories.prestador_repo import PrestadorRepository
+
+    if args.regla:
+        desconocidas = [r for r in args.regla if r not in CHEQUEOS]
+        if desconocidas:
+            print(f"Reglas desconocidas: {', '.join(desconocidas)}. "
+                  f"Disponibles: {', '.join(CHEQUEOS)}", file=sys.stderr)
+            return SALIDA_ARGUMENTOS
+
+    inicio = time.perf_counter()
+    conteo: Counter = Counter()
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    try:
+        with get_db_session() as session:
+            prestador_id = None
+            if args.prestador:
+                prestador = PrestadorRepository(session).get_by_codigo(args.prestador)
+                if prestador is None:
+                    print(f"Prestador '{args.prestador}' no existe", file=sys.stderr)
+                    return SALIDA_ARGUMENTOS
+                prestador_id = prestador.id
+
+            writer = csv.writer(salida)
+            writer.writerow(["regla", "accidente_id", "consecutivo", "detalle"])
+            repo = IntegridadRepository(session)
+            for regla, accidente_id, consecutivo, detalle in repo.violaciones(
+                args.desde, args.hasta, prestador_id, args.regla
+            ):
+                writer.writerow([regla, accidente_id, consecutivo, detalle])
+                conteo[regla] += 1
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    segundos = time.perf_counter() - inicio
+    for regla, (descripcion, _) in CHEQUEOS.items():
+        if conteo[regla]:
+            print(f"  {regla}: {conteo[regla]} ({descripcion})", file=sys.stderr)
+    print(f"{sum(conteo.values())} violación(es) en {segundos:.1f} s", file=sys.stderr)
+    return SALIDA_HALLAZGOS if conteo else SALIDA_OK
+
+
+# ============================================================================
+# HISTORIAL
+# ============================================================================
+
+def _cmd_historial(args: argparse.Namespace) -> int:
+    """Historial de auditoría de vehículos o propietarios en CSV (todo o una página)."""
+    from app.config.db import get_db_session
+    from app.domain.services.auditoria_service import VEHICULOS, AuditoriaService
+
+    filtros = {"accidente_id": args.accidente, "desde": args.desde}
+    if args.hasta:
+        filtros["hasta"] = args.hasta + timedelta(days=1)  # --hasta es inclusivo
+    if args.tabla == VEHICULOS:
+        if args.documento:
+            print("--documento solo aplica a propietarios", file=sys.stderr)
+            return SALIDA_ARGUMENTOS
+        filtros.update(placa=args.placa, vehiculo_id=args.vehiculo)
+    else:
+        if args.placa or args.vehiculo:
+            print("--placa y --vehiculo solo aplican a vehiculos", file=sys.stderr)
+            return SALIDA_ARGUMENTOS
+        filtros["documento"] = args.documento
+
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    try:
+        with get_db_session() as session:
+            servicio = AuditoriaService(session)
+            if args.limite:
+                try:
+                    filas, siguiente = servicio.pagina(args.tabla, args.limite, args.despues, **filtros)
+                except ValueError:
+                    print(f"Cursor inválido: {args.despues}", file=sys.stderr)
+                    return SALIDA_ARGUMENTOS
+                writer = csv.writer(salida)
+                if filas:
+                    writer.writerow(list(filas[0]))
+                    writer.writerows(list(f.values()) for f in filas)
+                total = len(filas)
+                if siguiente:
+                    print(f"Página siguiente: --despues {siguiente}", file=sys.stderr)
+            else:
+                total = servicio.exportar_csv(salida, args.tabla, **filtros)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"{total} fila(s) de historial", file=sys.stderr)
+    return SALIDA_OK
+
+
+# ============================================================================
+# EXPORTAR / IMPRIMIR
+# ============================================================================
+
+def _cmd_exportar(args: argparse.Namespace) -> int:
+    """Exporta los archivos planos FURIPS1/FURIPS2 de los accidentes seleccionados."""
+    from app.config.db import get_db_session
+    from app.domain.services.export_service import ExportService
+
+    if args.cola:
+        from app.domain.services.trabajos_service import TrabajosService
+        return _encolar_y_esperar(args, lambda ids: TrabajosService.encolar_exportacion(ids, args.formato))
+
+    formatos = ("furips1", "furips2") if args.formato == "ambos" else (args.formato,)
+    generados = fallidos = 0
+    with get_db_session() as session:
+        ids = _seleccionar_accidentes(session, args)
+        if ids is None:
+            return SALIDA_ARGUMENTOS
+
+        servicio = ExportService(session)
+        progreso = _Progreso(len(ids), "Exportando")
+        for accidente_id in ids:
+            for formato in formatos:
+                exito, ruta, error = getattr(servicio, f"exportar_{formato}")(accidente_id)
+                if exito:
+                    print(ruta, flush=True)
+                    generados += 1
+                else:
+                    progreso.mensaje(f"Accidente {accidente_id} ({formato.upper()}): {error}")
+                    fallidos += 1
+            progreso.avanzar()
+        segundos = progreso.terminar()
+
+    print(f"{generados} archivo(s) generado(s), {fallidos} con error en {segundos:.1f} s", file=sys.stderr)
+    return SALIDA_HALLAZGOS if fallidos else SALIDA_OK
+
+
+def _cmd_imprimir(args: argparse.Namespace) -> int:
+    """Genera los PDF FURIPS de los accidentes seleccionados."""
+    from app.config.db import get_db_session
+    from app.domain.services.print_service import PrintService
+
+    if args.cola:
+        from app.domain.services.trabajos_service import TrabajosService
+        return _encolar_y_esperar(args, lambda ids: TrabajosService.encolar_impresion(ids, args.tipo))
+
+    with get_db_session() as session:
+        ids = _seleccionar_accidentes(session, args)
+    if ids is None:
+        return SALIDA_ARGUMENTOS
+
+    servicio = PrintService()
+    generados = fallidos = 0
+    progreso = _Progreso(len(ids), "Generando PDF")
+    for accidente_id in ids:
+        try:
+            print(servicio.generar_pdf_accidente(accidente_id, tipo=args.tipo), flush=True)
+            generados += 1
+        except Exception as e:
+            logger.debug("Error generando PDF del accidente %s", accidente_id, exc_info=True)
+            progreso.mensaje(f"Accidente {accidente_id}: {e}")
+            fallidos += 1
+        progreso.avanzar()
+    segundos = progreso.terminar()
+
+    print(f"{generados} PDF generado(s), {fallidos} con error en {segundos:.1f} s", file=sys.stderr)
+    return SALIDA_HALLAZGOS if fallidos else SALIDA_OK
+
+
+# ============================================================================
+# COLA DE TRABAJOS
+# ============================================================================
+
+def _encolar_y_esperar(args: argparse.Namespace, encolar) -> int:
+    """Encola los accidentes seleccionados como un trabajo y lo procesa en primer plano."""
+    from app.config.db import get_db_session
+    from app.domain.services.trabajos_service import TrabajosService
+
+    with get_db_session() as session:
+        ids = _seleccionar_accidentes(session, args)
+    if ids is None:
+        return SALIDA_ARGUMENTOS
+
+    cola = TrabajosService.cola()
+    trabajo_id = encolar(ids)
+    print(f"Trabajo {trabajo_id} encolado ({len(ids)} accidente(s))", file=sys.stderr)
+    # Solo este trabajo: los pendientes de la aplicación de escritorio no se tocan
+    cola.iniciar(recuperar=False)
+    cola.reanudar(trabajo_id)
+    return _esperar_trabajos(cola, [trabajo_id])
+
+
+def _esperar_trabajos(cola, trabajo_ids: List[int]) -> int:
+    """Muestra el progreso hasta que terminen los trabajos e imprime sus resultados."""
+    from app.infra.cola_trabajos import COMPLETADO
+
+    total = sum(cola.trabajo(i)["total"] for i in trabajo_ids)
+    progreso = _Progreso(total, "Procesando")
+
+    def al_progresar(estados):
+        hechos = sum(e["procesados"] for e in estados if e)
+        if hechos > progreso.actual:
+            progreso.avanzar(hechos - progreso.actual)
+
+    try:
+        estados = cola.esperar(trabajo_ids, al_progresar=al_progresar)
+    except KeyboardInterrupt:
+        progreso.mensaje("Deteniendo al terminar el bloque en curso...")
+        cola.detener()
+        print(f"Trabajo(s) {', '.join(map(str, trabajo_ids))} pendiente(s); "
+              f"continúe con: python -m app.cli trabajos reanudar", file=sys.stderr)
+        return SALIDA_ERROR
+    finally:
+        segundos = progreso.terminar()
+    cola.detener()
+
+    codigo = SALIDA_OK
+    for estado in estados:
+        for item, resultado_item, resultado in cola.resultados(estado["id"]):
+            if resultado_item == "ok":
+                for ruta in resultado.split(";"):
+                    print(ruta)
+            else:
+                print(f"Accidente {item}: {resultado}", file=sys.stderr)
+        print(f"Trabajo {estado['id']}: {estado['estado']}, {estado['procesados']}/{estado['total']} "
+              f"procesados, {estado['fallidos']} con error", file=sys.stderr)
+        if estado["estado"] != COMPLETADO:
+            if estado["error"]:
+                print(f"  {estado['error']}", file=sys.stderr)
+            codigo = SALIDA_ERROR
+        elif estado["fallidos"] and codigo == SALIDA_OK:
+            codigo = SALIDA_HALLAZGOS
+    print(f"Tiempo: {segundos:.1f} s", file=sys.stderr)
+    return codigo
+
+
+def _cmd_trabajos(args: argparse.Namespace) -> int:
+    """Consulta, reanuda o cancela trabajos de la cola persistente."""
+    from app.domain.services.trabajos_service import TrabajosService
+
+    cola = TrabajosService.cola()
+    if args.accion == "listar":
+        for t in cola.trabajos(args.estado):
+            print(f"{t['id']:>6}  {t['tipo']:<9} {t['estado']:<12} {t['procesados']:>7}/{t['total']:<7} "
+                  f"{t['fallidos']:>5} err  {t['actualizado_en']}  {t['error'] or ''}")
+        return SALIDA_OK
+
+    if args.accion == "cancelar":
+        if not cola.cancelar(args.id):
+            print(f"El trabajo {args.id} no existe o ya terminó", file=sys.stderr)
+            return SALIDA_ARGUMENTOS
+        return SALIDA_OK
+
+    # reanudar: sin ID también retoma los que quedaron en curso por un cierre inesperado
+    # (los que otro proceso sigue renovando no se tocan)
+    cola.iniciar(recuperar=args.id is None)
+    ids = cola.reanudar(args.id)
+    if not ids:
+        cola.detener()
+        print("No hay trabajos para reanudar", file=sys.stderr)
+        return SALIDA_OK if args.id is None else SALIDA_ARGUMENTOS
+    return _esperar_trabajos(cola, ids)
+
+
+# ============================================================================
+# ARCHIVO
+# ============================================================================
+
+def _cmd_archivo(args: argparse.Namespace) -> int:
+    """Archiva los accidentes anulados o restaura accidentes archivados."""
+    from app.domain.services.archivo_service import ArchivoService
+
+    servicio = ArchivoService(args.lote if args.accion == "archivar" else None)
+    if args.accion == "restaurar":
+        ids = list(dict.fromkeys(args.id))
+        restaurados = servicio.restaurar(ids, reactivar=args.reactivar)
+        print(f"{restaurados} de {len(ids)} accidente(s) restaurados", file=sys.stderr)
+        return SALIDA_OK if restaurados == len(ids) else SALIDA_HALLAZGOS
+
+    inicio = time.perf_counter()
+    archivados = 0
+
+    def al_archivar(cantidad: int):
+        nonlocal archivados
+        archivados += cantidad
+        print(f"Archivados: {archivados}", file=sys.stderr, flush=True)
+
+    total = servicio.archivar_anulados(args.antes_de, al_archivar)
+    print(f"{total} accidente(s) anulados archivados en {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+    return SALIDA_OK
+
+
+# ============================================================================
+# IMPORTAR / VALIDAR / BENCH
+# ============================================================================
+
+def _cmd_importar(args: argparse.Namespace) -> int:
+    """Importa archivos planos FURIPS1/FURIPS2 (p. ej. los enviados por otra IPS)."""
+    if not (args.furips1 or args.furips2):
+        print("Indique --furips1 y/o --furips2", file=sys.stderr)
+        return SALIDA_ARGUMENTOS
+
+    from app.config.db import get_db_session
+    from app.domain.services.import_service import ImportService
+
+    with get_db_session() as session:
+        try:
+            resultado = ImportService(session).importar(
+                args.furips1, args.furips2, args.prestador, args.errores
+            )
+        except ValueError as e:
+            # Prestador inexistente o no indicado para el FURIPS2
+            print(str(e), file=sys.stderr)
+            return SALIDA_ARGUMENTOS
+    print(f"{resultado.lineas_leidas} línea(s) leída(s): {resultado.accidentes_creados} accidente(s) y "
+          f"{resultado.detalles_creados} detalle(s) creados, {resultado.filas_con_error} con error "
+          f"en {resultado.segundos:.1f} s", file=sys.stderr)
+    if resultado.archivo_errores:
+        print(f"Errores en: {resultado.archivo_errores}", file=sys.stderr)
+    return SALIDA_HALLAZGOS if resultado.filas_con_error else SALIDA_OK
+
+
+def _cmd_validar(args: argparse.Namespace) -> int:
+    """Valida archivos planos FURIPS1/FURIPS2 (formato y reglas de la circular) sin BD."""
+    if not (args.furips1 or args.furips2):
+        print("Indique --furips1 y/o --furips2", file=sys.stderr)
+        return SALIDA_ARGUMENTOS
+
+    from app.domain.services.import_service import ImportService
+
+    resultado = ImportService(None).validar(args.furips1, args.furips2, args.errores)
+    print(f"{resultado.lineas_leidas} línea(s) validada(s), {resultado.filas_con_error} con error "
+          f"en {resultado.segundos:.1f} s", file=sys.stderr)
+    if resultado.archivo_errores:
+        print(f"Errores en: {resultado.archivo_errores}", file=sys.stderr)
+    return SALIDA_HALLAZGOS if resultado.filas_con_error else SALIDA_OK
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    """Mide la validación por lotes y la conversión ORM/DTO frente a sus versiones campo a campo."""
+    from app.domain.validators.batch_validator import medir
+    from app.domain import mapeadores
+
+    r = medir(args.registros)
+    print(f"Validación de {r['registros']} registros sintéticos ({r['invalidos']} inválidos)")
+    print(f"  registro a registro: {r['segundos_registro']:.3f} s")
+    print(f"  por lotes:           {r['segundos_lote']:.3f} s (+{r['segundos_transponer']:.3f} s transponiendo)")
+    print(f"  aceleración:         {r['aceleracion']:.1f}x")
+
+    print(f"Conversión de {args.registros} objetos (campo a campo -> mapeadores)")
+    for caso, t in mapeadores.medir(args.registros).items():
+        aceleracion = t["antes"] / t["despues"] if t["despues"] else 0.0
+        print(f"  {caso + ':':31}{t['antes']:.3f} s -> {t['despues']:.3f} s ({aceleracion:.1f}x)")
+    return SALIDA_OK
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+def construir_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="FURIPS por línea de comandos")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostrar logs de depuración")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    auditar = sub.add_parser("auditar", help="Auditoría de integridad previa a la radicación")
+    auditar.add_argument("--desde", type=_fecha, required=True, help="Fecha inicial del evento (AAAA-MM-DD)")
+    auditar.add_argument("--hasta", type=_fecha, required=True, help="Fecha final del evento (AAAA-MM-DD)")
+    auditar.add_argument("--prestador", help="Código de habilitación del prestador")
+    auditar.add_argument("--regla", action="append", help="Regla a ejecutar (repetible; por defecto todas)")
+    auditar.add_argument("--salida", help="Archivo CSV de salida (por defecto la salida estándar)")
+    auditar.set_defaults(func=_cmd_auditar)
+
+    historial = sub.add_parser("historial", help="Historial de auditoría de vehículos o propietarios (CSV)")
+    historial.add_argument("tabla", choices=["vehiculos", "propietarios"])
+    historial.add_argument("--accidente", type=int, help="ID del accidente")
+    historial.add_argument("--placa", help="Placa (anterior o nueva)")
+    historial.add_argument("--vehiculo", type=int, help="ID del vehículo (anterior o nuevo)")
+    historial.add_argument("--documento", help="Documento del propietario (anterior o nuevo)")
+    historial.add_argument("--desde", type=_fecha, help="Fecha inicial del cambio (AAAA-MM-DD)")
+    historial.add_argument("--hasta", type=_fecha, help="Fecha final del cambio (AAAA-MM-DD, inclusiva)")
+    historial.add_argument("--limite", type=int, help="Solo una página de N filas (por defecto todo)")
+    historial.add_argument("--despues", help="Cursor de la página siguiente (lo indica la página anterior)")
+    historial.add_argument("--salida", help="Archivo CSV de salida (por defecto la salida estándar)")
+    historial.set_defaults(func=_cmd_historial)
+
+    # Selección de accidentes común a exportar e imprimir
+    seleccion = argparse.ArgumentParser(add_help=False)
+    seleccion.add_argument("--id", type=int, action="append", help="ID de accidente (repetible)")
+    seleccion.add_argument("--desde", type=_fecha, help="Fecha inicial del evento (AAAA-MM-DD)")
+    seleccion.add_argument("--hasta", type=_fecha, help="Fecha final del evento (AAAA-MM-DD)")
+    seleccion.add_argument("--prestador", help="Código de habilitación del prestador")
+
+    exportar = sub.add_parser("exportar", aliases=["export"], parents=[seleccion],
+                              help="Exportar archivos planos FURIPS1/FURIPS2")
+    exportar.add_argument("--formato", choices=["furips1", "furips2", "ambos"], default="ambos")
+    exportar.add_argument("--cola", action="store_true", help="Ejecutar como trabajo reanudable")
+    exportar.set_defaults(func=_cmd_exportar)
+
+    imprimir = sub.add_parser("imprimir", aliases=["print"], parents=[seleccion],
+                              help="Generar los PDF FURIPS")
+    imprimir.add_argument("--tipo", choices=["furips1", "furips2", "furips_cte"], default="furips_cte",
+                          help="Plantilla/origen de datos (por defecto furips_cte, como la interfaz)")
+    imprimir.add_argument("--cola", action="store_true", help="Ejecutar como trabajo reanudable")
+    imprimir.set_defaults(func=_cmd_imprimir)
+
+    importar = sub.add_parser("importar", aliases=["import"],
+                              help="Importar archivos planos FURIPS1/FURIPS2")
+    importar.add_argument("--furips1", help="Archivo FURIPS1 (accidentes)")
+    importar.add_argument("--furips2", help="Archivo FURIPS2 (detalles)")
+    importar.add_argument("--prestador",
+                          help="Código de habilitación contra el que se resuelven los consecutivos del FURIPS2 "
+                               "(por defecto el único prestador del FURIPS1 importado)")
+    importar.add_argument("--errores", help="CSV de filas rechazadas (por defecto en el directorio de salida)")
+    importar.set_defaults(func=_cmd_importar)
+
+    validar = sub.add_parser("validar", aliases=["validate"],
+                             help="Validar archivos planos FURIPS1/FURIPS2 sin importarlos")
+    validar.add_argument("--furips1", help="Archivo FURIPS1")
+    validar.add_argument("--furips2", help="Archivo FURIPS2")
+    validar.add_argument("--errores", help="CSV de errores (por defecto en el directorio de salida)")
+    validar.set_defaults(func=_cmd_validar)
+
+    trabajos = sub.add_parser("trabajos", help="Cola de trabajos de exportación/impresión")
+    acciones = trabajos.add_subparsers(dest="accion", required=True)
+    listar = acciones.add_parser("listar", help="Trabajos recientes")
+    listar.add_argument("--estado", action="append",
+                        choices=["pendiente", "en_curso", "completado", "interrumpido", "cancelado"])
+    reanudar = acciones.add_parser("reanudar", help="Continuar trabajos pendientes o interrumpidos")
+    reanudar.add_argument("--id", type=int, help="Solo este trabajo")
+    cancelar = acciones.add_parser("cancelar", help="Cancelar un trabajo")
+    cancelar.add_argument("--id", type=int, required=True)
+    trabajos.set_defaults(func=_cmd_trabajos)
+
+    archivo = sub.add_parser("archivo", help="Archivo de accidentes anulados")
+    acciones_archivo = archivo.add_subparsers(dest="accion", required=True)
+    archivar = acciones_archivo.add_parser("archivar", help="Mover los accidentes anulados al archivo")
+    archivar.add_argument("--antes-de", type=_fecha, help="Solo eventos anteriores a esta fecha (AAAA-MM-DD)")
+    archivar.add_argument("--lote", type=int, help="Accidentes por transacción (por defecto 200)")
+    restaurar = acciones_archivo.add_parser("restaurar", help="Devolver accidentes archivados")
+    restaurar.add_argument("--id", type=int, action="append", required=True, help="ID de accidente (repetible)")
+    restaurar.add_argument("--reactivar", action="store_true", help="Dejarlos activos (estado = 1)")
+    archivo.set_defaults(func=_cmd_archivo)
+
+    bench = sub.add_parser("bench", help="Medir la validación por lotes y la conversión de DTOs")
+    bench.add_argument("--registros", type=int, default=10_000, help="Registros sintéticos (por defecto 10000)")
+    bench.set_defaults(func=_cmd_bench)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = construir_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return SALIDA_ARGUMENTOS if e.code else SALIDA_OK
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        print("Interrumpido", file=sys.stderr)
+        return SALIDA_ERROR
+    except Exception as e:
+        logger.exception("Error ejecutando '%s'", args.comando)
+        print(f"Error: {e}", file=sys.stderr)
+        return SALIDA_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
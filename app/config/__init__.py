@@ -10,6 +10,8 @@ from app.config.db import (
     init_db,
     check_db_connection,
     check_ext_connection,
+    get_pool_stats,
+    warmup_pools,
 )
 
 __all__ = [
@@ -24,4 +26,6 @@ __all__ = [
     "init_db",
     "check_db_connection",
     "check_ext_connection",
+    "get_pool_stats",
+    "warmup_pools",
 ]
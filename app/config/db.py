@@ -4,39 +4,200 @@ Crea engines y session factories para:
 - BD principal furips (RW)
 - BD externa (RO)
 """
+import logging
+import threading
+import time
 from contextlib import contextmanager
-from typing import Generator, Optional
+from typing import Any, Dict, Generator, Optional
 
-from sqlalchemy import create_engine, event, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 
 from app.config.settings import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Variables globales para lazy initialization
 _engine_app: Optional[Engine] = None
 _engine_ext: Optional[Engine] = None
 _SessionApp = None
 _SessionExt = None
+_init_lock = threading.Lock()
+
+
+# ============================================================================
+# POOL DE CONEXIONES
+# ============================================================================
+class _EstadisticasPool:
+    """Acumula métricas de checkout de un pool (thread-safe)."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.pings = 0
+        self.desconexiones = 0
+    
+    def registrar_espera(self, segundos: float, timeout: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += segundos
+            if segundos > self.espera_max:
+                self.espera_max = segundos
+            if timeout:
+                self.timeouts += 1
+    
+    def registrar_ping(self, ok: bool):
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.desconexiones += 1
+    
+    def como_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            promedio = self.espera_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "espera_total_ms": round(self.espera_total * 1000, 3),
+                "espera_promedio_ms": round(promedio * 1000, 3),
+                "espera_max_ms": round(self.espera_max * 1000, 3),
+                "pings": self.pings,
+                "desconexiones": self.desconexiones,
+            }
+
+
+class QueuePoolMedido(QueuePool):
+    """
+    QueuePool que mide el tiempo de espera de cada checkout.
+    
+    El tiempo incluye la espera por una conexión libre y, si el pool no tiene
+    conexiones disponibles, la apertura de una nueva.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estadisticas = _EstadisticasPool()
+    
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except exc.TimeoutError:
+            self.estadisticas.registrar_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.estadisticas.registrar_espera(time.perf_counter() - inicio)
+        return conexion
+    
+    def recreate(self):
+        # Conservar las métricas cuando el pool se recrea tras una desconexión
+        nuevo = super().recreate()
+        nuevo.estadisticas = self.estadisticas
+        return nuevo
+
+
+def _construir_connect_args(opciones: Dict[str, Any]) -> Dict[str, Any]:
+    """Traduce timeouts/compresión a los argumentos que entiende cada driver."""
+    driver = make_url(opciones["url"]).get_driver_name()
+    args: Dict[str, Any] = {}
+    
+    if driver in ("pymysql", "mysqldb"):
+        args["connect_timeout"] = opciones["connect_timeout"]
+        if opciones["read_timeout"]:
+            args["read_timeout"] = opciones["read_timeout"]
+        if opciones["write_timeout"]:
+            args["write_timeout"] = opciones["write_timeout"]
+    elif driver == "mysqlconnector":
+        args["connection_timeout"] = opciones["connect_timeout"]
+    
+    if opciones["compress"]:
+        if driver in ("mysqldb", "mysqlconnector"):
+            args["compress"] = True
+        else:
+            logger.warning("Compresión no soportada por el driver '%s', se ignora", driver)
+    
+    # Los argumentos explícitos de .env tienen prioridad
+    args.update(opciones["connect_args"])
+    return args
+
+
+def _instalar_pre_ping_idle(engine: Engine, segundos_inactiva: int):
+    """
+    Hace ping solo a conexiones que estuvieron inactivas más de N segundos.
+    
+    Evita el round trip de `pool_pre_ping` en cada checkout; si el ping falla
+    se lanza DisconnectionError y el pool reemplaza la conexión.
+    """
+    
+    @event.listens_for(engine, "connect")
+    def _al_conectar(dbapi_connection, connection_record):
+        connection_record.info["ultimo_uso"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkin")
+    def _al_devolver(dbapi_connection, connection_record):
+        connection_record.info["ultimo_uso"] = time.monotonic()
+    
+    @event.listens_for(engine, "checkout")
+    def _al_tomar(dbapi_connection, connection_record, connection_proxy):
+        ultimo_uso = connection_record.info.get("ultimo_uso")
+        if ultimo_uso is not None and time.monotonic() - ultimo_uso < segundos_inactiva:
+            return
+        
+        estadisticas = getattr(engine.pool, "estadisticas", None)
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+        except Exception as e:
+            if estadisticas:
+                estadisticas.registrar_ping(ok=False)
+            raise exc.DisconnectionError(f"Conexión inactiva descartada: {e}") from e
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        if estadisticas:
+            estadisticas.registrar_ping(ok=True)
+
+
+def _crear_engine(opciones: Dict[str, Any]) -> Engine:
+    """Crea un engine a partir de `Settings.get_pool_options`."""
+    engine = create_engine(
+        opciones["url"],
+        poolclass=QueuePoolMedido,
+        pool_size=opciones["pool_size"],
+        max_overflow=opciones["max_overflow"],
+        pool_timeout=opciones["pool_timeout"],
+        pool_recycle=opciones["pool_recycle"],
+        pool_use_lifo=opciones["pool_use_lifo"],
+        pool_pre_ping=opciones["pre_ping"] == "always",
+        connect_args=_construir_connect_args(opciones),
+        echo=opciones["echo"],
+    )
+    if opciones["pre_ping"] == "idle":
+        _instalar_pre_ping_idle(engine, opciones["pre_ping_idle"])
+    return engine
 
 
 def _init_engines():
-    """Inicializa los engines (lazy)."""
+    """Inicializa los engines (lazy, thread-safe)."""
     global _engine_app, _engine_ext, _SessionApp, _SessionExt
     
-    if _engine_app is None:
+    with _init_lock:
+        if _engine_app is not None:
+            return
+        
         settings = get_settings()
         
         # Engine principal
-        _engine_app = create_engine(
-            settings.DB_URL,
-            pool_size=settings.DB_POOL_SIZE,
-            pool_recycle=settings.DB_POOL_RECYCLE,
-            pool_pre_ping=True,
-            echo=settings.DB_ECHO,
-        )
+        engine_app = _crear_engine(settings.get_pool_options())
         _SessionApp = sessionmaker(
-            bind=_engine_app,
+            bind=engine_app,
             autocommit=False,
             autoflush=False,
             expire_on_commit=False,
@@ -44,13 +205,7 @@ def _init_engines():
         
         # Engine externo (opcional)
         if settings.DB_EXT_URL:
-            _engine_ext = create_engine(
-                settings.DB_EXT_URL,
-                pool_size=settings.DB_EXT_POOL_SIZE,
-                pool_recycle=settings.DB_EXT_POOL_RECYCLE,
-                pool_pre_ping=True,
-                echo=settings.DB_EXT_ECHO,
-            )
+            _engine_ext = _crear_engine(settings.get_pool_options(externa=True))
             _SessionExt = sessionmaker(
                 bind=_engine_ext,
                 autocommit=False,
@@ -67,6 +222,9 @@ def _init_engines():
                         "La sesión externa es READ-ONLY. "
                         "No se permiten operaciones de escritura."
                     )
+        
+        # Publicar el engine principal al final: marca la inicialización completa
+        _engine_app = engine_app
 
 
 def get_engine_app() -> Engine:
@@ -163,7 +321,7 @@ def check_db_connection() -> bool:
             conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"Error al conectar con la BD: {e}")
+        logger.error("Error al conectar con la BD: %s", e)
         return False
 
 
@@ -177,10 +335,91 @@ def check_ext_connection() -> bool:
             conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"Error al conectar con la BD externa: {e}")
+        logger.error("Error al conectar con la BD externa: %s", e)
         return False
 
 
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Retorna el estado de los pools para diagnóstico.
+    
+    Incluye conexiones en uso/libres, overflow y tiempos de espera en checkout.
+    """
+    def _stats(engine: Optional[Engine]) -> Optional[Dict[str, Any]]:
+        if engine is None:
+            return None
+        pool = engine.pool
+        datos: Dict[str, Any] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+        estadisticas = getattr(pool, "estadisticas", None)
+        if estadisticas:
+            datos.update(estadisticas.como_dict())
+        return datos
+    
+    return {
+        "app": _stats(get_engine_app()),
+        "ext": _stats(get_engine_ext()),
+    }
+
+
+def _precalentar_engine(engine: Engine, cantidad: int) -> int:
+    """Abre `cantidad` conexiones y las devuelve al pool. Retorna las abiertas."""
+    cantidad = min(cantidad, engine.pool.size())
+    if cantidad <= 0:
+        return 0
+    
+    conexiones = []
+    try:
+        for _ in range(cantidad):
+            conexiones.append(engine.connect())
+    except Exception as e:
+        logger.warning("Precalentamiento del pool incompleto: %s", e)
+    finally:
+        for conexion in conexiones:
+            conexion.close()
+    return len(conexiones)
+
+
+def warmup_pools(en_segundo_plano: Optional[bool] = None) -> Optional[threading.Thread]:
+    """
+    Precalienta los pools según DB_POOL_WARMUP / DB_EXT_POOL_WARMUP.
+    
+    Args:
+        en_segundo_plano: None usa DB_POOL_WARMUP_ASYNC; True lanza un hilo daemon.
+    
+    Returns:
+        El hilo lanzado, o None si se ejecutó de forma síncrona o no hay nada que hacer.
+    """
+    settings = get_settings()
+    if settings.DB_POOL_WARMUP <= 0 and settings.DB_EXT_POOL_WARMUP <= 0:
+        return None
+    
+    if en_segundo_plano is None:
+        en_segundo_plano = settings.DB_POOL_WARMUP_ASYNC
+    
+    def _ejecutar():
+        inicio = time.perf_counter()
+        abiertas = _precalentar_engine(get_engine_app(), settings.DB_POOL_WARMUP)
+        engine_ext = get_engine_ext()
+        if engine_ext is not None:
+            abiertas += _precalentar_engine(engine_ext, settings.DB_EXT_POOL_WARMUP)
+        logger.info(
+            "Pool precalentado: %d conexión(es) en %.0f ms", abiertas, (time.perf_counter() - inicio) * 1000
+        )
+    
+    if not en_segundo_plano:
+        _ejecutar()
+        return None
+    
+    hilo = threading.Thread(target=_ejecutar, name="warmup-pool", daemon=True)
+    hilo.start()
+    return hilo
+
+
 # ============================================================================
 # EXPORTS PARA COMPATIBILIDAD
 # ============================================================================
@@ -4,7 +4,7 @@ Carga variables de entorno desde .env usando pydantic.
 """
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 import os
 
 from dotenv import load_dotenv
@@ -23,21 +23,64 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 5
     DB_POOL_RECYCLE: int = 3600
     DB_ECHO: bool = False
+    DB_MAX_OVERFLOW: int = 5               # Conexiones extra sobre pool_size en picos
+    DB_POOL_TIMEOUT: int = 30              # Segundos de espera por una conexión libre
+    DB_POOL_USE_LIFO: bool = True          # Reusar la conexión más reciente (las viejas expiran)
+    DB_POOL_PRE_PING: str = "idle"         # always | idle | never
+    DB_POOL_PRE_PING_IDLE: int = 300       # Segundos de inactividad antes de hacer ping (modo idle)
+    DB_CONNECT_TIMEOUT: int = 10
+    DB_READ_TIMEOUT: Optional[int] = None
+    DB_WRITE_TIMEOUT: Optional[int] = None
+    DB_COMPRESS: bool = False              # Solo drivers que lo soportan (mysqlclient, mysql-connector)
+    DB_CONNECT_ARGS: Dict[str, Any] = {}   # Argumentos extra para el driver (JSON en .env)
+    DB_POOL_WARMUP: int = 0                # Conexiones a abrir al iniciar (0 = sin precalentamiento)
+    DB_POOL_WARMUP_ASYNC: bool = True      # Precalentar en un hilo en segundo plano
     
     # Base de datos externa - RO
     DB_EXT_URL: Optional[str] = None
     DB_EXT_POOL_SIZE: int = 3
     DB_EXT_POOL_RECYCLE: int = 3600
     DB_EXT_ECHO: bool = False
+    DB_EXT_MAX_OVERFLOW: int = 2
+    DB_EXT_POOL_TIMEOUT: int = 30
+    DB_EXT_POOL_USE_LIFO: bool = True
+    DB_EXT_POOL_PRE_PING: str = "idle"
+    DB_EXT_POOL_PRE_PING_IDLE: int = 300
+    DB_EXT_CONNECT_TIMEOUT: int = 10
+    DB_EXT_READ_TIMEOUT: Optional[int] = None
+    DB_EXT_WRITE_TIMEOUT: Optional[int] = None
+    DB_EXT_COMPRESS: bool = False
+    DB_EXT_CONNECT_ARGS: Dict[str, Any] = {}
+    DB_EXT_POOL_WARMUP: int = 0
+    
+    # Caché de proyecciones (estadísticas de la BD externa)
+    PROYECCION_CACHE_TTL: int = 300        # Segundos antes de refrescar una proyección en caché (0 = sin caché)
+    PROYECCION_RECALCULO_COMPLETO: int = 3600  # Segundos antes de releer también los meses cerrados
     
     # Rutas de plantillas PDF
     PDF_TEMPLATE_FURIPS1: str = "app/infra/pdf/templates/furips1_base.pdf"
     PDF_TEMPLATE_FURIPS2: str = "app/infra/pdf/templates/furips2_base.pdf"
     PDF_OUTPUT_DIR: str = "output"
     
+    # Cola de trabajos por lotes (exportación / impresión)
+    COLA_TRABAJOS_DB: str = "data/trabajos.db"   # Archivo SQLite local con el progreso de los trabajos
+    COLA_TRABAJOS_HILOS: int = 2
+    COLA_TRABAJOS_LOTE: int = 100          # Ítems por punto de control
+    COLA_TRABAJOS_VENCIMIENTO: int = 600   # Segundos sin punto de control para dar un trabajo por abandonado
+    
+    # Réplica local de catálogos y procedimientos
+    REPLICA_DB: str = "data/replica.db"    # Archivo SQLite local; el arranque lee de aquí sin esperar la red
+    REPLICA_INTERVALO: int = 600           # Segundos entre sincronizaciones en segundo plano (0 = solo al iniciar)
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/furips.log"
+    LOG_FORMAT: str = "json"               # Formato del archivo: json | texto
+    LOG_CONSOLE_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {         # Nivel por módulo (prefijo de logger -> nivel)
+        "sqlalchemy.engine": "WARNING",
+    }
+    LOG_SAMPLING: Dict[str, int] = {}      # Muestreo de DEBUG por módulo: prefijo -> 1 de cada N
     
     # Aplicación
     APP_NAME: str = "FURIPS Desktop"
@@ -60,6 +103,44 @@ class Settings(BaseSettings):
         else:
             raise ValueError(f"Tipo de plantilla desconocido: {template_type}")
     
+    def get_pool_options(self, externa: bool = False) -> Dict[str, Any]:
+        """
+        Retorna la configuración del pool/conexión de un engine.
+        
+        Args:
+            externa: True para la BD externa (prefijo DB_EXT_), False para la principal.
+        
+        Returns:
+            dict con url, echo, pool_size, max_overflow, pool_timeout, pool_recycle,
+            pool_use_lifo, pre_ping, pre_ping_idle, connect/read/write_timeout,
+            compress y connect_args. El precalentamiento (POOL_WARMUP) lo lee
+            directamente warmup_pools.
+        """
+        prefijo = "DB_EXT_" if externa else "DB_"
+        def valor(nombre: str) -> Any:
+            return getattr(self, f"{prefijo}{nombre}")
+        
+        pre_ping = (valor("POOL_PRE_PING") or "always").strip().lower()
+        if pre_ping not in ("always", "idle", "never"):
+            raise ValueError(f"{prefijo}POOL_PRE_PING inválido: {pre_ping} (use always, idle o never)")
+        
+        return {
+            "url": valor("URL"),
+            "echo": valor("ECHO"),
+            "pool_size": valor("POOL_SIZE"),
+            "max_overflow": valor("MAX_OVERFLOW"),
+            "pool_timeout": valor("POOL_TIMEOUT"),
+            "pool_recycle": valor("POOL_RECYCLE"),
+            "pool_use_lifo": valor("POOL_USE_LIFO"),
+            "pre_ping": pre_ping,
+            "pre_ping_idle": valor("POOL_PRE_PING_IDLE"),
+            "connect_timeout": valor("CONNECT_TIMEOUT"),
+            "read_timeout": valor("READ_TIMEOUT"),
+            "write_timeout": valor("WRITE_TIMEOUT"),
+            "compress": valor("COMPRESS"),
+            "connect_args": dict(valor("CONNECT_ARGS") or {}),
+        }
+    
     def get_output_dir(self) -> Path:
         """Retorna el path del directorio de salida."""
         output_path = Path(self.PDF_OUTPUT_DIR)
@@ -29,6 +29,9 @@ from app.data.models.accidente_procesos import (
     AccidenteMedicoTratante,
     AccidenteRemision,
 )
+from app.data.models.accidente_resumen import AccidenteResumen
+from app.data.models.auditoria import VehiculoHistorial, PropietarioHistorial
+from app.data.models.activos import INCLUIR_INACTIVOS, incluyendo_inactivos
 
 __all__ = [
     "Base",
@@ -57,4 +60,12 @@ __all__ = [
     "PersonaConfig",
     "AccidenteMedicoTratante",
     "AccidenteRemision",
+    # Auditoría
+    "VehiculoHistorial",
+    "PropietarioHistorial",
+    # Modelos de lectura
+    "AccidenteResumen",
+    # Filtro de filas activas
+    "INCLUIR_INACTIVOS",
+    "incluyendo_inactivos",
 ]
@@ -3,7 +3,7 @@ Modelo de Accidente (encabezado FURIPS1).
 """
 from datetime import date, time
 
-from sqlalchemy import Column, BigInteger, Integer, String, Date, Time, ForeignKey, Enum
+from sqlalchemy import Column, BigInteger, Integer, String, Date, Time, ForeignKey, Enum, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -28,6 +28,14 @@ class Accidente(Base):
     vehiculo_id = Column(BigInteger, ForeignKey("vehiculo.id"), nullable=True, comment="FK vehículo involucrado")
     estado_aseguramiento_id = Column(Integer, ForeignKey("estado_aseguramiento.id"), nullable=False, comment="FK estado del aseguramiento")
     estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo")
+    version = Column(Integer, nullable=False, server_default=text("1"), comment="Versión de la fila (concurrencia optimista)")
+    
+    __table_args__ = (
+        UniqueConstraint("prestador_id", "numero_consecutivo", name="uq_accidente_prestador_consecutivo"),
+        Index("idx_accidente_prestador_fecha", "prestador_id", "fecha_evento"),
+        Index("idx_accidente_estado_fecha", "estado", "fecha_evento"),
+    )
+    __mapper_args__ = {"version_id_col": version}
     
     # Relaciones
     prestador = relationship("PrestadorSalud", back_populates="accidentes")
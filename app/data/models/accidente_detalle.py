@@ -1,7 +1,12 @@
 """
 Modelo de AccidenteDetalle (FURIPS2).
+
+La tabla está particionada por año del evento (anio_evento, ver
+migrations/run_particionar_accidente_detalle.py). MySQL no admite llaves
+foráneas en tablas particionadas: las ForeignKey de abajo solo describen las
+relaciones para el ORM.
 """
-from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, SmallInteger, String, ForeignKey, text
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -21,6 +26,15 @@ class AccidenteDetalle(Base):
     valor_facturado = Column(BigInteger, nullable=False, default=0, comment="Valor total facturado")
     valor_reclamado = Column(BigInteger, nullable=False, default=0, comment="Valor total reclamado")
     estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo")
+    anio_evento = Column(
+        SmallInteger,
+        nullable=False,
+        server_default=text("0"),
+        comment="Año de accidente.fecha_evento (llave de partición; lo asigna un trigger)",
+    )
+    version = Column(Integer, nullable=False, server_default=text("1"), comment="Versión de la fila (concurrencia optimista)")
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relaciones
     accidente = relationship("Accidente", back_populates="detalles")
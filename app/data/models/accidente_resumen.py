@@ -0,0 +1,57 @@
+"""
+Modelo de AccidenteResumen (modelo de lectura desnormalizado).
+
+Tabla angosta que replica, por accidente, los datos que muestran las grillas
+de búsqueda/impresión (consecutivo, factura, fecha, placa y víctima). Se
+mantiene al escribir desde los servicios/presenters, de modo que las búsquedas
+no necesitan el JOIN de cuatro tablas ni las consultas de vehículo por fila.
+"""
+from sqlalchemy import Column, BigInteger, Integer, String, Date, Time, ForeignKey, Index
+
+from app.data.models.base import Base
+
+
+class AccidenteResumen(Base):
+    __tablename__ = "accidente_resumen"
+
+    accidente_id = Column(BigInteger, ForeignKey("accidente.id"), primary_key=True, autoincrement=False, comment="PK/FK accidente")
+    prestador_id = Column(BigInteger, nullable=False, comment="Prestador que radica")
+    numero_consecutivo = Column(String(12), nullable=False, comment="Consecutivo del accidente")
+    numero_factura = Column(String(20), nullable=False, comment="Número de factura")
+    fecha_evento = Column(Date, nullable=False, comment="Fecha del evento")
+    hora_evento = Column(Time, nullable=True, comment="Hora del evento")
+    placa = Column(String(10), nullable=True, comment="Placa del vehículo activo")
+    victima_persona_id = Column(BigInteger, nullable=True, comment="Persona de la víctima activa")
+    tipo_identificacion = Column(String(50), nullable=True, comment="Descripción del tipo de documento de la víctima")
+    numero_identificacion = Column(String(20), nullable=True, comment="Documento de la víctima")
+    primer_nombre = Column(String(30), nullable=True, comment="Primer nombre de la víctima")
+    segundo_nombre = Column(String(30), nullable=True, comment="Segundo nombre de la víctima")
+    primer_apellido = Column(String(30), nullable=True, comment="Primer apellido de la víctima")
+    segundo_apellido = Column(String(30), nullable=True, comment="Segundo apellido de la víctima")
+    vehiculo_id = Column(BigInteger, nullable=True, comment="Vehículo del accidente")
+    estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo (copia de accidente.estado)")
+
+    # Índices alineados con los filtros de búsqueda soportados
+    __table_args__ = (
+        Index("idx_resumen_estado_fecha", "estado", "fecha_evento"),
+        Index("idx_resumen_consecutivo", "numero_consecutivo"),
+        Index("idx_resumen_factura", "numero_factura"),
+        Index("idx_resumen_documento", "numero_identificacion"),
+        Index("idx_resumen_prestador_fecha", "prestador_id", "fecha_evento"),
+        Index("idx_resumen_persona", "victima_persona_id"),
+        Index("idx_resumen_vehiculo", "vehiculo_id"),
+    )
+
+    @property
+    def nombre_victima(self) -> str:
+        """Retorna el nombre completo de la víctima."""
+        partes = [
+            self.primer_nombre,
+            self.segundo_nombre,
+            self.primer_apellido,
+            self.segundo_apellido,
+        ]
+        return " ".join([p for p in partes if p])
+
+    def __repr__(self) -> str:
+        return f"<AccidenteResumen(accidente_id={self.accidente_id}, consecutivo='{self.numero_consecutivo}')>"
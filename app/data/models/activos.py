@@ -0,0 +1,95 @@
+"""
+Filtro global de filas activas.
+
+Toda consulta ORM de un modelo con columna `estado` trae solo sus filas
+activas, también en joinedload/selectinload y en los lazy loads de los
+objetos que cargó: una víctima o un detalle anulado no llega a la memoria.
+El valor activo se deduce del tipo de la columna:
+
+    Integer   1           (la mayoría de tablas)
+    Boolean   True        (pais, departamento, municipio)
+    Enum      'ACTIVO'    (procedimiento)
+    Enum      'activo'    (accidente_medico_tratante, accidente_remision)
+
+No se filtran la recarga de atributos de un objeto ya cargado (refresh,
+atributos expirados), los UPDATE/DELETE masivos ni el SQL textual.
+
+Para incluir las inactivas (reactivar, búsquedas por llave natural única):
+
+    query.execution_options(incluir_inactivos=True)
+
+    with incluyendo_inactivos(session):
+        ...
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import Boolean, Enum, event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+
+from app.data.models.base import Base
+
+# Opción de ejecución (por consulta) o clave de session.info (por sesión)
+INCLUIR_INACTIVOS = "incluir_inactivos"
+
+_criterios: Optional[list] = None
+_lock = threading.Lock()
+
+
+def valor_activo(columna) -> Any:
+    """Valor de `estado` que representa una fila activa según el tipo de la columna."""
+    tipo = columna.type
+    if isinstance(tipo, Boolean):
+        return True
+    if isinstance(tipo, Enum):
+        for valor in tipo.enums:
+            if valor.lower() == "activo":
+                return valor
+        raise ValueError(f"El Enum de {columna} no tiene valor 'activo'")
+    return 1
+
+
+def criterios_activos() -> List:
+    """Un with_loader_criteria por modelo con `estado` (se arma al primer uso, con los mappers ya registrados)."""
+    global _criterios
+    if _criterios is None:
+        with _lock:
+            if _criterios is None:
+                criterios = []
+                for mapper in Base.registry.mappers:
+                    columna = mapper.columns.get("estado")
+                    if columna is not None:
+                        criterios.append(with_loader_criteria(
+                            mapper.class_,
+                            getattr(mapper.class_, "estado") == valor_activo(columna),
+                            include_aliases=True,
+                        ))
+                _criterios = criterios
+    return _criterios
+
+
+@contextmanager
+def incluyendo_inactivos(session: Session) -> Iterator[Session]:
+    """Desactiva el filtro de filas activas para las consultas de la sesión dentro del bloque."""
+    anterior = session.info.get(INCLUIR_INACTIVOS)
+    session.info[INCLUIR_INACTIVOS] = True
+    try:
+        yield session
+    finally:
+        if anterior is None:
+            session.info.pop(INCLUIR_INACTIVOS, None)
+        else:
+            session.info[INCLUIR_INACTIVOS] = anterior
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _solo_activos(ejecucion: ORMExecuteState):
+    # Los lazy loads ya heredan el criterio de la consulta que cargó al padre
+    if not ejecucion.is_select or ejecucion.is_column_load or ejecucion.is_relationship_load:
+        return
+    incluir = ejecucion.execution_options.get(
+        INCLUIR_INACTIVOS, ejecucion.session.info.get(INCLUIR_INACTIVOS, False)
+    )
+    if not incluir:
+        ejecucion.statement = ejecucion.statement.options(*criterios_activos())
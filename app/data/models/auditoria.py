@@ -0,0 +1,48 @@
+"""
+Modelos de las tablas de auditoría de vehículos y propietarios.
+
+Las tablas las crea migrations/run_create_auditoria.py. Solo se insertan
+filas (ver AuditoriaWriter); no tienen relaciones ORM para no cargar nada al
+escribir.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, func
+
+from app.data.models.base import Base
+
+
+class VehiculoHistorial(Base):
+    __tablename__ = "vehiculo_historial"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    accidente_id = Column(Integer, nullable=False, comment="ID del accidente relacionado")
+    vehiculo_id_anterior = Column(Integer, nullable=True, comment="ID del vehículo anulado (si aplica)")
+    vehiculo_id_nuevo = Column(Integer, nullable=True, comment="ID del nuevo vehículo creado (si aplica)")
+    accion = Column(String(50), nullable=False, comment="ANULAR, CREAR, ACTUALIZAR")
+    placa_anterior = Column(String(10), nullable=True, comment="Placa del vehículo anulado")
+    placa_nueva = Column(String(10), nullable=True, comment="Placa del nuevo vehículo")
+    motivo = Column(String(500), nullable=True, comment="Motivo del cambio")
+    usuario = Column(String(100), nullable=True, comment="Usuario que realizó el cambio")
+    fecha_cambio = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<VehiculoHistorial(id={self.id}, accidente_id={self.accidente_id}, accion='{self.accion}')>"
+
+
+class PropietarioHistorial(Base):
+    __tablename__ = "propietario_historial"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    accidente_id = Column(Integer, nullable=False, comment="ID del accidente relacionado")
+    propietario_id_anterior = Column(Integer, nullable=True, comment="ID del propietario anulado (si aplica)")
+    propietario_id_nuevo = Column(Integer, nullable=True, comment="ID del nuevo propietario creado (si aplica)")
+    persona_id_anterior = Column(Integer, nullable=True, comment="ID de la persona del propietario anulado")
+    persona_id_nueva = Column(Integer, nullable=True, comment="ID de la persona del nuevo propietario")
+    accion = Column(String(50), nullable=False, comment="ANULAR, CREAR, ACTUALIZAR")
+    documento_anterior = Column(String(20), nullable=True, comment="Documento del propietario anulado")
+    documento_nuevo = Column(String(20), nullable=True, comment="Documento del nuevo propietario")
+    motivo = Column(String(500), nullable=True, comment="Motivo del cambio")
+    usuario = Column(String(100), nullable=True, comment="Usuario que realizó el cambio")
+    fecha_cambio = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<PropietarioHistorial(id={self.id}, accidente_id={self.accidente_id}, accion='{self.accion}')>"
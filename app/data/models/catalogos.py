@@ -1,7 +1,8 @@
 """
 Modelos de tablas de catálogo/maestros.
 """
-from sqlalchemy import Column, Integer, String, SmallInteger, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, SmallInteger, Boolean, ForeignKey, Enum, FetchedValue, Index, text
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -45,6 +46,12 @@ class Municipio(Base):
     codigo_postal = Column(String(6), nullable=True, comment="Código postal")
     nombre = Column(String(80), nullable=False, comment="Nombre del municipio")
     estado = Column(Boolean, nullable=False, default=True, comment="1 activo, 0 inactivo")
+    # DEFAULT/ON UPDATE CURRENT_TIMESTAMP(6) los pone MySQL (migrations/run_add_actualizado_en_referencia.py)
+    actualizado_en = Column(mysql.TIMESTAMP(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)"), server_onupdate=FetchedValue(), comment="Última modificación (sincronización incremental)")
+    
+    __table_args__ = (
+        Index("idx_municipio_actualizado_en", "actualizado_en"),
+    )
     
     # Relaciones
     departamento = relationship("Departamento", back_populates="municipios")
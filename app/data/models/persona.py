@@ -3,7 +3,7 @@ Modelo de Persona.
 """
 from datetime import date, datetime
 
-from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, ForeignKey, CheckConstraint, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -27,6 +27,7 @@ class Persona(Base):
     municipio_residencia_id = Column(Integer, ForeignKey("municipio.id"), nullable=False, comment="FK municipio de residencia")
     fecha_registro = Column(DateTime, nullable=False, default=datetime.now, comment="Fecha de creación del registro")
     estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo")
+    version = Column(Integer, nullable=False, server_default=text("1"), comment="Versión de la fila (concurrencia optimista)")
     
     # Constraints
     __table_args__ = (
@@ -34,7 +35,11 @@ class Persona(Base):
             "(fecha_fallecimiento IS NULL) OR (fecha_fallecimiento >= fecha_nacimiento)",
             name="chk_persona_fallecimiento"
         ),
+        UniqueConstraint("tipo_identificacion_id", "numero_identificacion", name="uq_persona_documento"),
+        # Búsqueda por prefijo del documento sin conocer el tipo (accidente_resumen)
+        Index("idx_persona_numero_identificacion", "numero_identificacion"),
     )
+    __mapper_args__ = {"version_id_col": version}
     
     # Relaciones
     tipo_identificacion = relationship("TipoIdentificacion", back_populates="personas")
@@ -1,7 +1,8 @@
 """
 Modelo de PersonaConfig.
 """
-from sqlalchemy import Column, BigInteger, Integer, String, Boolean, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, BigInteger, Integer, String, Boolean, ForeignKey, TIMESTAMP, FetchedValue, Index, text
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -18,7 +19,12 @@ class PersonaConfig(Base):
     especialidad = Column(String(80), nullable=True, comment="Especialidad médica")
     estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo")
     creado_en = Column(TIMESTAMP, server_default=func.current_timestamp())
-    actualizado_en = Column(TIMESTAMP, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    # DEFAULT/ON UPDATE CURRENT_TIMESTAMP(6) los pone MySQL (migrations/run_add_actualizado_en_referencia.py)
+    actualizado_en = Column(mysql.TIMESTAMP(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)"), server_onupdate=FetchedValue(), comment="Última modificación (sincronización incremental)")
+    
+    __table_args__ = (
+        Index("idx_persona_config_actualizado_en", "actualizado_en"),
+    )
     
     # Relaciones
     persona = relationship("Persona", back_populates="config")
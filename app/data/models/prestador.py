@@ -1,7 +1,8 @@
 """
 Modelo de Prestador de Salud (IPS).
 """
-from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, FetchedValue, Index, text
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -17,6 +18,12 @@ class PrestadorSalud(Base):
     telefono = Column(String(15), nullable=True, comment="Contacto telefónico")
     municipio_id = Column(Integer, ForeignKey("municipio.id"), nullable=True, comment="FK municipio de la IPS")
     direccion = Column(String(200), nullable=True, comment="Dirección de la IPS")
+    # DEFAULT/ON UPDATE CURRENT_TIMESTAMP(6) los pone MySQL (migrations/run_add_actualizado_en_referencia.py)
+    actualizado_en = Column(mysql.TIMESTAMP(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)"), server_onupdate=FetchedValue(), comment="Última modificación (sincronización incremental)")
+    
+    __table_args__ = (
+        Index("idx_prestador_salud_actualizado_en", "actualizado_en"),
+    )
     
     # Relaciones
     municipio = relationship("Municipio", back_populates="prestadores")
@@ -1,7 +1,8 @@
 """
 Modelos de Vehículo y Procedimiento.
 """
-from sqlalchemy import Column, BigInteger, Integer, String, Date, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, BigInteger, Integer, String, Date, Boolean, ForeignKey, Enum, text, FetchedValue, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 
 from app.data.models.base import Base
@@ -24,6 +25,9 @@ class Vehiculo(Base):
     estado_aseguramiento_id = Column(Integer, ForeignKey("estado_aseguramiento.id"), nullable=False, comment="FK estado de aseguramiento")
     propietario_id = Column(BigInteger, ForeignKey("persona.id"), nullable=True, comment="FK propietario (persona)")
     estado = Column(Integer, nullable=False, default=1, comment="1 activo, 0 inactivo")
+    version = Column(Integer, nullable=False, server_default=text("1"), comment="Versión de la fila (concurrencia optimista)")
+    
+    __mapper_args__ = {"version_id_col": version}
     
     # Relaciones
     tipo_vehiculo = relationship("TipoVehiculo", back_populates="vehiculos")
@@ -48,6 +52,12 @@ class Procedimiento(Base):
     valor = Column(BigInteger, nullable=False, comment="Valor base del procedimiento")
     estado = Column(Enum("ACTIVO", "INACTIVO", name="estado_procedimiento"), nullable=False, default="ACTIVO", comment="Estado del procedimiento")
     es_traslado_primario = Column(Boolean, nullable=False, default=False, comment="Marca si es traslado primario")
+    # DEFAULT/ON UPDATE CURRENT_TIMESTAMP(6) los pone MySQL (migrations/run_add_actualizado_en_referencia.py)
+    actualizado_en = Column(mysql.TIMESTAMP(fsp=6), nullable=False, server_default=text("CURRENT_TIMESTAMP(6)"), server_onupdate=FetchedValue(), comment="Última modificación (sincronización incremental)")
+    
+    __table_args__ = (
+        Index("idx_procedimiento_actualizado_en", "actualizado_en"),
+    )
     
     # Relaciones
     detalles = relationship("AccidenteDetalle", back_populates="procedimiento")
@@ -11,6 +11,12 @@ from app.data.repositories.proyeccion_repo import ProyeccionRepository
 from app.data.repositories.persona_config_repo import PersonaConfigRepository
 from app.data.repositories.medico_tratante_repo import MedicoTratanteRepository
 from app.data.repositories.remision_repo import RemisionRepository
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
+from app.data.repositories.integridad_repo import IntegridadRepository
+from app.data.repositories.auditoria_repo import AuditoriaWriter, AuditoriaRepository
+from app.data.repositories.archivo_repo import ArchivoRepository
+from app.data.repositories.concurrencia import ConflictoVersion, verificar_version
+from app.data.repositories.sincronizacion_repo import SincronizacionRepository
 
 __all__ = [
     "CatalogoRepository",
@@ -23,4 +29,12 @@ __all__ = [
     "PersonaConfigRepository",
     "MedicoTratanteRepository",
     "RemisionRepository",
+    "AccidenteResumenRepository",
+    "IntegridadRepository",
+    "AuditoriaWriter",
+    "AuditoriaRepository",
+    "ArchivoRepository",
+    "ConflictoVersion",
+    "verificar_version",
+    "SincronizacionRepository",
 ]
@@ -1,12 +1,16 @@
 """
 Repositorio para gestión de Accidentes.
 """
+import logging
 from datetime import date
 from typing import List, Optional
 
 from sqlalchemy.orm import Session, joinedload
 
-from app.data.models import Accidente
+from app.data.models import Accidente, incluyendo_inactivos
+from app.data.repositories.archivo_repo import ArchivoRepository
+
+logger = logging.getLogger(__name__)
 
 
 class AccidenteRepository:
@@ -43,6 +47,7 @@ class AccidenteRepository:
                 Accidente.prestador_id == prestador_id,
                 Accidente.numero_consecutivo == consecutivo,
             )
+            .execution_options(incluir_inactivos=True)  # el consecutivo es único
             .first()
         )
     
@@ -116,8 +121,17 @@ class AccidenteRepository:
         return False
     
     def reactivar(self, accidente_id: int) -> bool:
-        """Reactiva un accidente anulado (cambia estado a 1)."""
-        accidente = self.get_by_id(accidente_id)
+        """
+        Reactiva un accidente anulado (cambia estado a 1).
+        Si ya fue archivado, primero lo restaura desde las tablas *_archivo.
+        """
+        with incluyendo_inactivos(self.session):
+            accidente = self.get_by_id(accidente_id)
+        if accidente is None:
+            from app.data.repositories.archivo_repo import ArchivoRepository
+            if ArchivoRepository(self.session).restaurar([accidente_id]):
+                with incluyendo_inactivos(self.session):
+                    accidente = self.get_by_id(accidente_id)
         if accidente:
             accidente.estado = 1
             self.session.flush()
@@ -139,25 +153,39 @@ class AccidenteRepository:
             .all()
         )
     
+    def get_ids_por_periodo(
+        self, desde: date, hasta: date, prestador_id: Optional[int] = None
+    ) -> List[int]:
+        """IDs de los accidentes activos con fecha_evento entre desde y hasta (inclusivo), por ID."""
+        query = self.session.query(Accidente.id).filter(
+            Accidente.estado == 1,
+            Accidente.fecha_evento.between(desde, hasta),
+        )
+        if prestador_id:
+            query = query.filter(Accidente.prestador_id == prestador_id)
+        return [accidente_id for (accidente_id,) in query.order_by(Accidente.id)]
+    
     def existe_consecutivo(self, prestador_id: int, consecutivo: str, excluir_id: Optional[int] = None) -> bool:
         """Verifica si existe un consecutivo para un prestador (útil para validación)."""
         query = self.session.query(Accidente).filter(
             Accidente.prestador_id == prestador_id,
             Accidente.numero_consecutivo == consecutivo,
-        )
+        ).execution_options(incluir_inactivos=True)  # los anulados también ocupan el consecutivo
         
         if excluir_id:
             query = query.filter(Accidente.id != excluir_id)
         
         return query.count() > 0
     
-    def get_ultimo_consecutivo(self, prestador_id: int, con_lock: bool = False) -> Optional[str]:
+    def get_ultimo_consecutivo(self, prestador_id: int, bloquear: bool = False) -> Optional[str]:
         """
         Obtiene el último (mayor) consecutivo usado por un prestador.
         
         Args:
             prestador_id: ID del prestador
-            con_lock: Si True, usa SELECT FOR UPDATE para bloquear el registro
+            bloquear: lectura con bloqueo (FOR UPDATE). Ve lo confirmado por
+                otras transacciones, que la instantánea de REPEATABLE READ de
+                una lectura normal oculta.
         """
         from sqlalchemy import func, cast, Integer
         
@@ -165,14 +193,18 @@ class AccidenteRepository:
         query = (
             self.session.query(func.max(cast(Accidente.numero_consecutivo, Integer)))
             .filter(Accidente.prestador_id == prestador_id)
+            .execution_options(incluir_inactivos=True)  # los anulados también consumen consecutivo
         )
-        
-        if con_lock:
-            # Bloquear para evitar concurrencia (FOR UPDATE)
+        if bloquear:
             query = query.with_for_update()
         
         resultado = query.scalar()
         
+        # Los consecutivos de accidentes archivados tampoco se reutilizan
+        archivado = ArchivoRepository(self.session).max_consecutivo(prestador_id)
+        if archivado and (not resultado or archivado > resultado):
+            resultado = archivado
+        
         if resultado:
             return str(resultado).zfill(12)
         
@@ -187,6 +219,12 @@ class AccidenteRepository:
         from sqlalchemy import func, case
         from app.data.models import AccidenteDetalle
 
+        # Llave de partición de accidente_detalle (el accidente suele estar ya en la sesión)
+        accidente = self.session.get(Accidente, accidente_id)
+        filtro = [AccidenteDetalle.accidente_id == accidente_id, AccidenteDetalle.estado == 1]
+        if accidente is not None and accidente.fecha_evento is not None:
+            filtro.append(AccidenteDetalle.anio_evento == accidente.fecha_evento.year)
+
         # SUM CASE: tipo_servicio_id == 4 => movilizacion, else => quirurgicos
         # Aplicar filtro adicional: considerar sólo detalles activos (estado == 1)
         movilizacion_sum = self.session.query(
@@ -196,10 +234,7 @@ class AccidenteRepository:
                     else_=0
                 )
             ), 0)
-        ).filter(
-            AccidenteDetalle.accidente_id == accidente_id,
-            AccidenteDetalle.estado == 1,
-        ).scalar() or 0
+        ).filter(*filtro).scalar() or 0
 
         qx_sum = self.session.query(
             func.coalesce(func.sum(
@@ -208,10 +243,7 @@ class AccidenteRepository:
                     else_=0
                 )
             ), 0)
-        ).filter(
-            AccidenteDetalle.accidente_id == accidente_id,
-            AccidenteDetalle.estado == 1,
-        ).scalar() or 0
+        ).filter(*filtro).scalar() or 0
 
         return {
             "accidente_id": accidente_id,
@@ -219,13 +251,15 @@ class AccidenteRepository:
             "gastosQx": float(qx_sum),
         }
     
-    def generar_siguiente_consecutivo(self, prestador_id: int) -> str:
+    def generar_siguiente_consecutivo(self, prestador_id: int, bloquear: bool = False) -> str:
         """
         Genera el siguiente consecutivo para un prestador (último + 1).
-        THREAD-SAFE: Usa lock a nivel de base de datos.
+        
+        Sin `bloquear` no toma bloqueos: si otra estación usa el mismo número
+        antes, la llave única (prestador_id, numero_consecutivo) rechaza el
+        INSERT y AccidenteService.crear_accidente reintenta con `bloquear=True`.
         """
-        # Usar lock para evitar condiciones de carrera
-        ultimo_consecutivo = self.get_ultimo_consecutivo(prestador_id, con_lock=True)
+        ultimo_consecutivo = self.get_ultimo_consecutivo(prestador_id, bloquear)
         
         if not ultimo_consecutivo:
             # Primer consecutivo para este prestador
@@ -293,27 +327,17 @@ class AccidenteRepository:
         
         # Limitar resultados
         query = query.limit(100)
-        # Intentar mostrar la consulta SQL que se ejecutará (con valores cuando sea posible)
-        try:
-            # Obtener dialecto del engine ligado a la sesión
-            dialect = self.session.get_bind().dialect
-            compiled = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
-            print("[AccidenteRepository] SQL ejecutada:", compiled)
-        except Exception as e:
-            # Fallback: mostrar representación del query
+        # Compilar la SQL con valores es costoso: solo si DEBUG está habilitado
+        if logger.isEnabledFor(logging.DEBUG):
             try:
-                print("[AccidenteRepository] SQL (fallback):", str(query))
+                dialect = self.session.get_bind().dialect
+                compiled = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+                logger.debug("SQL ejecutada: %s", compiled)
             except Exception:
-                print("[AccidenteRepository] No se pudo compilar la consulta para mostrarla")
+                logger.debug("SQL (sin valores): %s", query)
 
         results = query.all()
-        # Imprimir registros devueltos (para depuración)
-        try:
-            print(f"[AccidenteRepository] Registros devueltos: {len(results)}")
-            for r in results:
-                print(repr(r))
-        except Exception:
-            pass
+        logger.debug("Registros devueltos: %d", len(results))
 
         return results
 
@@ -387,3 +411,48 @@ class AccidenteRepository:
         )
 
         return resumen
+
+    def resumen_relaciones_lote(self, accidente_ids: List[int]) -> dict:
+        """
+        Igual que `resumen_relaciones` pero para varios accidentes a la vez.
+
+        Ejecuta un GROUP BY por tabla relacionada (7 consultas en total) en lugar
+        de 7 consultas por accidente. Devuelve {accidente_id: {clave: conteo}}.
+        """
+        from sqlalchemy import func
+        from app.data.models import (
+            AccidenteVictima,
+            AccidenteConductor,
+            AccidentePropietario,
+            AccidenteDetalle,
+            AccidenteTotales,
+            AccidenteMedicoTratante,
+            AccidenteRemision,
+        )
+
+        claves = {
+            'victimas': AccidenteVictima,
+            'conductores': AccidenteConductor,
+            'propietarios': AccidentePropietario,
+            'detalles': AccidenteDetalle,
+            'totales': AccidenteTotales,
+            'medicos_tratantes': AccidenteMedicoTratante,
+            'remisiones': AccidenteRemision,
+        }
+
+        ids = [i for i in dict.fromkeys(accidente_ids) if i]
+        resultado = {i: {clave: 0 for clave in claves} for i in ids}
+        if not ids:
+            return resultado
+
+        for clave, modelo in claves.items():
+            filas = (
+                self.session.query(modelo.accidente_id, func.count())
+                .filter(modelo.accidente_id.in_(ids))
+                .group_by(modelo.accidente_id)
+                .all()
+            )
+            for accidente_id, conteo in filas:
+                resultado[accidente_id][clave] = conteo
+
+        return resultado
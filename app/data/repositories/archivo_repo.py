@@ -0,0 +1,197 @@
+"""
+Repositorio del archivo de accidentes anulados.
+
+Un accidente anulado (estado = 0) y todas sus filas hijas se mueven a tablas
+`<tabla>_archivo` de igual estructura (migrations/run_create_tablas_archivo.py),
+así las tablas de trabajo solo guardan el conjunto activo. Cada movimiento es
+INSERT ... SELECT + DELETE por tabla en la transacción de la sesión, de modo
+que un lote se archiva o se restaura completo o no se mueve.
+
+El resumen de búsqueda (accidente_resumen) no se archiva: se borra al
+archivar y se recalcula al restaurar.
+
+Las columnas se copian por nombre (las comunes a ambas tablas), así una
+columna nueva en la tabla de trabajo no rompe el archivo antes de que su
+migración la agregue también a `<tabla>_archivo`.
+"""
+import logging
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Tablas con columna accidente_id (se borran antes que accidente)
+TABLAS_HIJAS = (
+    "accidente_detalle",
+    "accidente_totales",
+    "accidente_victima",
+    "accidente_conductor",
+    "accidente_propietario",
+    "accidente_medico_tratante",
+    "accidente_remision",
+)
+TABLAS = ("accidente",) + TABLAS_HIJAS
+
+
+def _columna_llave(tabla: str) -> str:
+    return "id" if tabla == "accidente" else "accidente_id"
+
+
+class ArchivoRepository:
+    """Mueve accidentes anulados entre las tablas de trabajo y las de archivo."""
+
+    # tabla -> columnas comunes con su archivo (el esquema no cambia en ejecución)
+    _columnas: Dict[str, str] = {}
+    # Si existe accidente_archivo (None = sin consultar); la migración requiere reiniciar
+    _archivo_existe: Optional[bool] = None
+    _lock = threading.Lock()
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _columnas_comunes(self, tabla: str) -> str:
+        """Lista de columnas (en el orden de la tabla de trabajo) presentes en ambas tablas."""
+        columnas = self._columnas.get(tabla)
+        if columnas is None:
+            filas = self.session.execute(
+                text("""
+                    SELECT c.COLUMN_NAME
+                    FROM information_schema.COLUMNS c
+                    JOIN information_schema.COLUMNS ca
+                      ON ca.TABLE_SCHEMA = c.TABLE_SCHEMA
+                     AND ca.TABLE_NAME = :archivo AND ca.COLUMN_NAME = c.COLUMN_NAME
+                    WHERE c.TABLE_SCHEMA = DATABASE() AND c.TABLE_NAME = :tabla
+                    ORDER BY c.ORDINAL_POSITION
+                """),
+                {"tabla": tabla, "archivo": f"{tabla}_archivo"},
+            )
+            columnas = ", ".join(f"`{fila[0]}`" for fila in filas)
+            if not columnas:
+                raise RuntimeError(f"No existe {tabla}_archivo (ejecute migrations/run_create_tablas_archivo.py)")
+            with self._lock:
+                self._columnas[tabla] = columnas
+        return columnas
+
+    def _copiar(self, origen: str, destino: str, tabla: str, ids: List[int]):
+        columnas = self._columnas_comunes(tabla)
+        self._ejecutar(
+            f"INSERT INTO {destino} ({columnas}) SELECT {columnas} FROM {origen} "
+            f"WHERE {_columna_llave(tabla)} IN :ids",
+            ids,
+        )
+
+    def _ejecutar(self, sql: str, ids: List[int]) -> int:
+        sentencia = text(sql).bindparams(bindparam("ids", expanding=True))
+        return self.session.execute(sentencia, {"ids": ids}).rowcount or 0
+
+    def ids_anulados(self, limite: int, antes_de: Optional[date] = None) -> List[int]:
+        """IDs de accidentes anulados pendientes de archivar (índice (estado, fecha_evento))."""
+        sql = "SELECT id FROM accidente WHERE estado = 0"
+        params = {"limite": limite}
+        if antes_de is not None:
+            sql += " AND fecha_evento < :antes_de"
+            params["antes_de"] = antes_de
+        sql += " ORDER BY id LIMIT :limite"
+        return [fila[0] for fila in self.session.execute(text(sql), params)]
+
+    def ids_archivados(self, ids: Iterable[int]) -> List[int]:
+        """De los IDs dados, los que están en el archivo."""
+        ids = list(ids)
+        if not ids:
+            return []
+        sentencia = text("SELECT id FROM accidente_archivo WHERE id IN :ids ORDER BY id").bindparams(
+            bindparam("ids", expanding=True)
+        )
+        return [fila[0] for fila in self.session.execute(sentencia, {"ids": ids})]
+
+    def archivar(self, ids: Iterable[int]) -> int:
+        """
+        Mueve al archivo los accidentes indicados que sigan anulados.
+
+        Los accidentes se bloquean (FOR UPDATE) y se vuelve a comprobar el
+        estado, por si alguno se reactivó entre la selección y el movimiento.
+
+        Returns:
+            Número de accidentes archivados
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        ids = [fila[0] for fila in self.session.execute(
+            text("SELECT id FROM accidente WHERE id IN :ids AND estado = 0 FOR UPDATE").bindparams(
+                bindparam("ids", expanding=True)
+            ),
+            {"ids": ids},
+        )]
+        if not ids:
+            return 0
+
+        for tabla in TABLAS:
+            self._copiar(tabla, f"{tabla}_archivo", tabla, ids)
+        self._ejecutar("DELETE FROM accidente_resumen WHERE accidente_id IN :ids", ids)
+        # Hijas antes que accidente (llaves foráneas)
+        for tabla in reversed(TABLAS):
+            columna = _columna_llave(tabla)
+            self._ejecutar(f"DELETE FROM {tabla} WHERE {columna} IN :ids", ids)
+        return len(ids)
+
+    def restaurar(self, ids: Iterable[int]) -> int:
+        """
+        Devuelve accidentes del archivo a las tablas de trabajo (siguen anulados;
+        reactivarlos es decisión de quien restaura).
+
+        Returns:
+            Número de accidentes restaurados
+        """
+        ids = self.ids_archivados(ids)
+        if not ids:
+            return 0
+
+        # accidente antes que sus hijas (llaves foráneas)
+        for tabla in TABLAS:
+            self._copiar(f"{tabla}_archivo", tabla, tabla, ids)
+        for tabla in TABLAS:
+            columna = _columna_llave(tabla)
+            self._ejecutar(f"DELETE FROM {tabla}_archivo WHERE {columna} IN :ids", ids)
+
+        from app.data.repositories.resumen_repo import AccidenteResumenRepository
+        AccidenteResumenRepository(self.session).refrescar_lote(ids)
+        return len(ids)
+
+    def archivo_disponible(self) -> bool:
+        """Indica si ya se creó accidente_archivo (se consulta una vez por proceso)."""
+        existe = self._archivo_existe
+        if existe is None:
+            existe = bool(self.session.execute(
+                text(
+                    "SELECT COUNT(*) FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'accidente_archivo'"
+                )
+            ).scalar())
+            if not existe:
+                logger.warning(
+                    "No existe accidente_archivo; el archivo de anulados no está disponible "
+                    "(ejecute migrations/run_create_tablas_archivo.py)"
+                )
+            with self._lock:
+                ArchivoRepository._archivo_existe = existe
+        return existe
+
+    def max_consecutivo(self, prestador_id: int) -> Optional[int]:
+        """Mayor consecutivo archivado del prestador (no debe reutilizarse).
+
+        Retorna None si aún no se creó la tabla de archivo.
+        """
+        if not self.archivo_disponible():
+            return None
+        return self.session.execute(
+            text(
+                "SELECT MAX(CAST(numero_consecutivo AS UNSIGNED)) FROM accidente_archivo "
+                "WHERE prestador_id = :prestador_id"
+            ),
+            {"prestador_id": prestador_id},
+        ).scalar()
@@ -0,0 +1,346 @@
+"""
+Escritura de la auditoría de vehículos y propietarios (vehiculo_historial y
+propietario_historial).
+
+Los eventos no se insertan uno a uno: AuditoriaWriter los acumula en la
+unidad de trabajo (`session.info`) y, justo antes del commit, se escriben con
+un INSERT multi-fila por tabla dentro de la misma transacción. Si la
+transacción se revierte, los eventos se descartan con ella.
+
+Modo asíncrono (operaciones masivas): después del commit los eventos pasan a
+un hilo que los agrupa entre transacciones y los escribe en su propia sesión.
+La transacción de negocio no ejecuta ninguna sentencia de auditoría, a cambio
+de que la auditoría deje de ser atómica con ella.
+
+Lectura (AuditoriaRepository): historial paginado por conjunto de claves
+(fecha_cambio, id) descendente, nunca con OFFSET, apoyado en los índices
+compuestos (columna filtrada, fecha_cambio) de
+migrations/run_create_indices_auditoria.py.
+"""
+import atexit
+import getpass
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, event, insert, or_, select, union
+from sqlalchemy.orm import Session
+
+from app.data.models.auditoria import PropietarioHistorial, VehiculoHistorial
+
+logger = logging.getLogger(__name__)
+
+_CLAVE_EVENTOS = "auditoria_eventos"
+_CLAVE_ASINCRONA = "auditoria_asincrona"
+
+# Filas por sentencia INSERT (acota el tamaño del paquete enviado a MySQL)
+_FILAS_POR_INSERT = 1000
+
+# tabla -> (modelo, columnas escritas). Todas las filas llevan todas las columnas:
+# un INSERT multi-fila exige las mismas en cada fila.
+_TABLAS = {
+    "vehiculo_historial": (
+        VehiculoHistorial,
+        ("accidente_id", "vehiculo_id_anterior", "vehiculo_id_nuevo", "accion",
+         "placa_anterior", "placa_nueva", "motivo", "usuario", "fecha_cambio"),
+    ),
+    "propietario_historial": (
+        PropietarioHistorial,
+        ("accidente_id", "propietario_id_anterior", "propietario_id_nuevo",
+         "persona_id_anterior", "persona_id_nueva", "accion", "documento_anterior",
+         "documento_nuevo", "motivo", "usuario", "fecha_cambio"),
+    ),
+}
+
+try:
+    _USUARIO: Optional[str] = getpass.getuser()
+except Exception:
+    _USUARIO = None
+
+EventosPorTabla = Dict[str, List[dict]]
+
+
+def _insertar(session: Session, eventos: EventosPorTabla):
+    """Un INSERT multi-fila por tabla (por bloques de _FILAS_POR_INSERT)."""
+    for tabla, filas in eventos.items():
+        modelo, columnas = _TABLAS[tabla]
+        valores = [{c: f.get(c) for c in columnas} for f in filas]
+        for inicio in range(0, len(valores), _FILAS_POR_INSERT):
+            session.execute(insert(modelo).values(valores[inicio:inicio + _FILAS_POR_INSERT]))
+
+
+class _EscritorAsincrono:
+    """Hilo que agrupa los eventos de varias transacciones y los escribe juntos."""
+
+    ESPERA = 0.5  # segundos que se esperan más eventos antes de escribir
+
+    def __init__(self):
+        self._cola: "queue.Queue[EventosPorTabla]" = queue.Queue()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def encolar(self, eventos: EventosPorTabla):
+        with self._lock:
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._trabajar, name="auditoria", daemon=True)
+                self._hilo.start()
+                atexit.register(self.vaciar, 5)
+        self._cola.put(eventos)
+
+    def vaciar(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que se escriba lo encolado. Retorna False si venció el tiempo."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while self._cola.unfinished_tasks:
+            if limite is not None and time.monotonic() >= limite:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _trabajar(self):
+        while True:
+            lote: EventosPorTabla = {}
+            tomados = 0
+            eventos = self._cola.get()
+            while True:
+                tomados += 1
+                for tabla, filas in eventos.items():
+                    lote.setdefault(tabla, []).extend(filas)
+                if sum(len(f) for f in lote.values()) >= _FILAS_POR_INSERT:
+                    break
+                try:
+                    eventos = self._cola.get(timeout=self.ESPERA)
+                except queue.Empty:
+                    break
+            try:
+                from app.config.db import get_db_session
+
+                with get_db_session() as session:
+                    _insertar(session, lote)
+            except Exception:
+                logger.exception(
+                    "No se pudo escribir la auditoría (%d filas)", sum(len(f) for f in lote.values())
+                )
+            finally:
+                for _ in range(tomados):
+                    self._cola.task_done()
+
+
+_escritor_asincrono = _EscritorAsincrono()
+
+
+class AuditoriaWriter:
+    """Registra eventos de auditoría en la unidad de trabajo de una sesión."""
+
+    def __init__(self, session: Session, asincrono: bool = False, usuario: Optional[str] = None):
+        """
+        Args:
+            session: sesión de la transacción de negocio.
+            asincrono: escribir después del commit en segundo plano (operaciones masivas).
+            usuario: usuario a registrar (por defecto el usuario del sistema operativo).
+        """
+        self.session = session
+        self.usuario = usuario or _USUARIO
+        if asincrono:
+            session.info[_CLAVE_ASINCRONA] = True
+
+    def registrar_vehiculo(
+        self,
+        accidente_id: int,
+        accion: str,
+        vehiculo_id_anterior: Optional[int] = None,
+        vehiculo_id_nuevo: Optional[int] = None,
+        placa_anterior: Optional[str] = None,
+        placa_nueva: Optional[str] = None,
+        motivo: Optional[str] = None,
+    ):
+        """Agrega un evento a vehiculo_historial (accion: ANULAR, CREAR, ACTUALIZAR)."""
+        self._registrar("vehiculo_historial", {
+            "accidente_id": accidente_id,
+            "vehiculo_id_anterior": vehiculo_id_anterior,
+            "vehiculo_id_nuevo": vehiculo_id_nuevo,
+            "accion": accion,
+            "placa_anterior": placa_anterior,
+            "placa_nueva": placa_nueva,
+            "motivo": motivo,
+        })
+
+    def registrar_propietario(
+        self,
+        accidente_id: int,
+        accion: str,
+        propietario_id_anterior: Optional[int] = None,
+        propietario_id_nuevo: Optional[int] = None,
+        persona_id_anterior: Optional[int] = None,
+        persona_id_nueva: Optional[int] = None,
+        documento_anterior: Optional[str] = None,
+        documento_nuevo: Optional[str] = None,
+        motivo: Optional[str] = None,
+    ):
+        """Agrega un evento a propietario_historial (accion: ANULAR, CREAR, ACTUALIZAR)."""
+        self._registrar("propietario_historial", {
+            "accidente_id": accidente_id,
+            "propietario_id_anterior": propietario_id_anterior,
+            "propietario_id_nuevo": propietario_id_nuevo,
+            "persona_id_anterior": persona_id_anterior,
+            "persona_id_nueva": persona_id_nueva,
+            "accion": accion,
+            "documento_anterior": documento_anterior,
+            "documento_nuevo": documento_nuevo,
+            "motivo": motivo,
+        })
+
+    def _registrar(self, tabla: str, fila: dict):
+        if fila["motivo"]:
+            fila["motivo"] = fila["motivo"][:500]
+        fila["usuario"] = self.usuario
+        # Hora del cambio, no la del commit
+        fila["fecha_cambio"] = datetime.now()
+        self.session.info.setdefault(_CLAVE_EVENTOS, {}).setdefault(tabla, []).append(fila)
+
+    @property
+    def pendientes(self) -> int:
+        """Eventos acumulados en la sesión que aún no se han escrito."""
+        return sum(len(f) for f in self.session.info.get(_CLAVE_EVENTOS, {}).values())
+
+    @staticmethod
+    def vaciar(timeout: Optional[float] = None) -> bool:
+        """Espera a que el modo asíncrono escriba lo pendiente (p. ej. al terminar un proceso masivo)."""
+        return _escritor_asincrono.vaciar(timeout)
+
+
+# ============================================================================
+# EVENTOS DE SESIÓN (aplican a todas las sesiones)
+# ============================================================================
+
+@event.listens_for(Session, "before_commit")
+def _escribir_antes_de_commit(session: Session):
+    if session.info.get(_CLAVE_ASINCRONA):
+        return
+    eventos = session.info.pop(_CLAVE_EVENTOS, None)
+    if eventos:
+        _insertar(session, eventos)
+
+
+@event.listens_for(Session, "after_commit")
+def _encolar_despues_de_commit(session: Session):
+    if not session.info.get(_CLAVE_ASINCRONA):
+        return
+    eventos = session.info.pop(_CLAVE_EVENTOS, None)
+    if eventos:
+        _escritor_asincrono.encolar(eventos)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_despues_de_rollback(session: Session):
+    eventos = session.info.pop(_CLAVE_EVENTOS, None)
+    if eventos:
+        logger.debug("Auditoría descartada por rollback (%d eventos)", sum(len(f) for f in eventos.values()))
+
+
+# ============================================================================
+# CONSULTA DEL HISTORIAL
+# ============================================================================
+
+# Posición de la última fila leída: (fecha_cambio, id)
+Cursor = Tuple[datetime, int]
+Fecha = Union[date, datetime]
+
+
+class AuditoriaRepository:
+    """Historial de vehículos y propietarios, paginado por conjunto de claves."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def historial_vehiculos(
+        self,
+        accidente_id: Optional[int] = None,
+        placa: Optional[str] = None,
+        vehiculo_id: Optional[int] = None,
+        desde: Optional[Fecha] = None,
+        hasta: Optional[Fecha] = None,
+        despues: Optional[Cursor] = None,
+        limite: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Página de vehiculo_historial, de la más reciente a la más antigua.
+
+        La placa y el vehículo se buscan tanto en la columna *_anterior como
+        en la *_nuevo/_nueva. `hasta` es exclusivo; `despues` es el cursor de
+        la última fila de la página anterior.
+        """
+        m = VehiculoHistorial
+        filtros = []
+        if accidente_id is not None:
+            filtros.append([m.accidente_id == accidente_id])
+        if vehiculo_id is not None:
+            filtros.append([m.vehiculo_id_anterior == vehiculo_id, m.vehiculo_id_nuevo == vehiculo_id])
+        if placa:
+            filtros.append([m.placa_anterior == placa, m.placa_nueva == placa])
+        return self._pagina(m, filtros, desde, hasta, despues, limite)
+
+    def historial_propietarios(
+        self,
+        accidente_id: Optional[int] = None,
+        documento: Optional[str] = None,
+        desde: Optional[Fecha] = None,
+        hasta: Optional[Fecha] = None,
+        despues: Optional[Cursor] = None,
+        limite: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Página de propietario_historial (mismas reglas que `historial_vehiculos`)."""
+        m = PropietarioHistorial
+        filtros = []
+        if accidente_id is not None:
+            filtros.append([m.accidente_id == accidente_id])
+        if documento:
+            filtros.append([m.documento_anterior == documento, m.documento_nuevo == documento])
+        return self._pagina(m, filtros, desde, hasta, despues, limite)
+
+    def _pagina(self, modelo, filtros: List[list], desde, hasta, despues, limite) -> List[Dict[str, Any]]:
+        """
+        Arma la consulta para que cada rama recorra un solo índice ya ordenado.
+
+        El primer filtro (el más selectivo) guía el índice; los demás se
+        aplican como condiciones. Si ese filtro es un OR entre dos columnas
+        (placa anterior/nueva) se resuelve como UNION de dos ramas, cada una
+        con su ORDER BY ... LIMIT sobre su propio índice (col, fecha_cambio):
+        un OR en el WHERE obligaría a ordenar todas las filas coincidentes.
+        """
+        tabla = modelo.__table__
+        comunes = [or_(*condiciones) for condiciones in filtros[1:]]
+        if desde is not None:
+            comunes.append(tabla.c.fecha_cambio >= desde)
+        if hasta is not None:
+            comunes.append(tabla.c.fecha_cambio < hasta)
+        if despues is not None:
+            fecha, ultimo_id = despues
+            # Expandido (no `(a, b) < (x, y)`) para que MySQL lo use como rango del índice
+            comunes.append(or_(
+                tabla.c.fecha_cambio < fecha,
+                and_(tabla.c.fecha_cambio == fecha, tabla.c.id < ultimo_id),
+            ))
+
+        # InnoDB agrega la llave primaria al final de cada índice: (col, fecha_cambio, id)
+        ramas = filtros[0] if filtros else [None]
+        consultas = [
+            select(tabla)
+            .where(*([rama] if rama is not None else []), *comunes)
+            .order_by(tabla.c.fecha_cambio.desc(), tabla.c.id.desc())
+            .limit(limite)
+            for rama in ramas
+        ]
+        if len(consultas) == 1:
+            stmt = consultas[0]
+        else:
+            # UNION (no ALL): una fila con la misma placa anterior y nueva sale en ambas ramas
+            combinada = union(*consultas).subquery()
+            stmt = (
+                select(combinada)
+                .order_by(combinada.c.fecha_cambio.desc(), combinada.c.id.desc())
+                .limit(limite)
+            )
+        return [dict(fila) for fila in self.session.execute(stmt).mappings()]
@@ -30,22 +30,22 @@ class CatalogoRepository:
     def get_paises(self, activos_solo: bool = True) -> List[Pais]:
         """Obtiene todos los países."""
         query = self.session.query(Pais)
-        if activos_solo:
-            query = query.filter(Pais.estado == True)
+        if not activos_solo:
+            query = query.execution_options(incluir_inactivos=True)
         return query.order_by(Pais.nombre).all()
     
     def get_departamentos_por_pais(self, pais_id: int, activos_solo: bool = True) -> List[Departamento]:
         """Obtiene departamentos de un país."""
         query = self.session.query(Departamento).filter(Departamento.pais_id == pais_id)
-        if activos_solo:
-            query = query.filter(Departamento.estado == True)
+        if not activos_solo:
+            query = query.execution_options(incluir_inactivos=True)
         return query.order_by(Departamento.nombre).all()
     
     def get_municipios_por_departamento(self, departamento_id: int, activos_solo: bool = True) -> List[Municipio]:
         """Obtiene municipios de un departamento."""
         query = self.session.query(Municipio).filter(Municipio.departamento_id == departamento_id)
-        if activos_solo:
-            query = query.filter(Municipio.estado == True)
+        if not activos_solo:
+            query = query.execution_options(incluir_inactivos=True)
         return query.order_by(Municipio.nombre).all()
     
     def get_municipio_by_id(self, municipio_id: int) -> Optional[Municipio]:
@@ -55,8 +55,8 @@ class CatalogoRepository:
     def get_todos_municipios(self, activos_solo: bool = True) -> List[Municipio]:
         """Obtiene todos los municipios sin filtrar por departamento."""
         query = self.session.query(Municipio)
-        if activos_solo:
-            query = query.filter(Municipio.estado == True)
+        if not activos_solo:
+            query = query.execution_options(incluir_inactivos=True)
         return query.order_by(Municipio.nombre).all()
     
     # ========================================================================
@@ -0,0 +1,73 @@
+"""
+Control de concurrencia optimista.
+
+Accidente, Vehiculo, Persona y AccidenteDetalle tienen columna `version`
+(version_id_col del mapper): cada UPDATE del ORM lleva `WHERE version = <leída>`
+y la incrementa. Ninguna fila queda bloqueada mientras un formulario está
+abierto, y una edición concurrente se detecta en lugar de sobrescribirse:
+
+- Entre la lectura y el flush de una misma sesión: el ORM lanza StaleDataError.
+- Desde que el formulario mostró la fila: `verificar_version` compara con la
+  versión que el presenter guardó al cargarla.
+
+ConflictoVersion hereda de StaleDataError, así los presenters atrapan los dos
+casos con un solo `except StaleDataError`.
+
+El consecutivo de accidente tampoco se bloquea: la llave única
+(prestador_id, numero_consecutivo) rechaza el duplicado y quien lo generó
+reintenta con el siguiente (ver `es_llave_duplicada`).
+"""
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+
+# Código de error de MySQL para llave única duplicada
+ER_DUP_ENTRY = 1062
+
+
+class ConflictoVersion(StaleDataError):
+    """La fila cambió en la base de datos desde que se leyó."""
+    
+    def __init__(
+        self,
+        entidad: str,
+        entidad_id: Optional[int] = None,
+        esperada: Optional[int] = None,
+        actual: Optional[int] = None,
+    ):
+        self.entidad = entidad
+        self.entidad_id = entidad_id
+        self.esperada = esperada
+        self.actual = actual
+        super().__init__(
+            f"Conflicto de versión en {entidad} {entidad_id}: "
+            f"se editó la versión {esperada} y la base de datos tiene la {actual}"
+        )
+
+
+def verificar_version(objeto, version_esperada: Optional[int], entidad: str) -> None:
+    """
+    Lanza ConflictoVersion si `objeto` ya no está en la versión que se mostró.
+    
+    Args:
+        objeto: entidad recién leída (Accidente, Vehiculo, Persona, AccidenteDetalle)
+        version_esperada: versión con la que se cargó el formulario (None = no verificar)
+        entidad: nombre para el mensaje ("el accidente", "el vehículo", ...)
+    """
+    if version_esperada is not None and objeto.version != version_esperada:
+        raise ConflictoVersion(entidad, objeto.id, version_esperada, objeto.version)
+
+
+def mensaje_conflicto(entidad: str) -> str:
+    """Mensaje para el usuario cuando su edición choca con la de otro."""
+    return (
+        f"⚠️ Otro usuario modificó {entidad} mientras usted tenía el formulario abierto.\n\n"
+        f"Sus cambios no se guardaron. Vuelva a cargar los datos y aplíquelos de nuevo."
+    )
+
+
+def es_llave_duplicada(error: IntegrityError) -> bool:
+    """True si el IntegrityError es por una llave única duplicada."""
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] == ER_DUP_ENTRY
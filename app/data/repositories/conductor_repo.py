@@ -4,7 +4,7 @@ Repositorio para la entidad AccidenteConductor.
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 
-from app.data.models import AccidenteConductor
+from app.data.models import AccidenteConductor, incluyendo_inactivos
 
 
 class ConductorRepository:
@@ -37,7 +37,8 @@ class ConductorRepository:
     
     def reactivar(self, conductor_id: int) -> bool:
         """Reactiva un conductor anulado (cambia estado a 1)."""
-        conductor = self.get_by_id(conductor_id)
+        with incluyendo_inactivos(self.session):
+            conductor = self.get_by_id(conductor_id)
         if conductor:
             conductor.estado = 1
             self.session.flush()
@@ -1,12 +1,20 @@
 """
 Repositorio para gestión de AccidenteDetalle.
+
+Los métodos por accidente reciben `anio` (año del evento) opcional: es la
+llave de partición de accidente_detalle, y con ella MySQL solo abre la
+partición de ese año en lugar de buscar el accidente en todas.
 """
-from typing import List
+import logging
+from typing import Dict, List, Optional
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 
-from app.data.models import AccidenteDetalle
+from app.data.models import Accidente, AccidenteDetalle
+from app.data.repositories.concurrencia import ConflictoVersion
+
+logger = logging.getLogger(__name__)
 
 
 class DetalleRepository:
@@ -15,27 +23,48 @@ class DetalleRepository:
     def __init__(self, session: Session):
         self.session = session
     
-    def get_by_accidente(self, accidente_id: int) -> List[AccidenteDetalle]:
+    def anio_de_accidente(self, accidente_id: int) -> Optional[int]:
+        """Año del evento del accidente (llave de partición de sus detalles)."""
+        return (
+            self.session.query(func.year(Accidente.fecha_evento))
+            .filter(Accidente.id == accidente_id)
+            .scalar()
+        )
+    
+    @staticmethod
+    def _filtro_accidente(accidente_id: int, anio: Optional[int]) -> list:
+        """Filtro por accidente, con la llave de partición si se conoce."""
+        filtro = [AccidenteDetalle.accidente_id == accidente_id]
+        if anio is not None:
+            filtro.append(AccidenteDetalle.anio_evento == anio)
+        return filtro
+    
+    def get_by_accidente(self, accidente_id: int, anio: Optional[int] = None) -> List[AccidenteDetalle]:
         """Obtiene todos los detalles de un accidente."""
-        print(f"📊 DetalleRepository.get_by_accidente() - Filtrando por accidente_id={accidente_id}")
         query = (
             self.session.query(AccidenteDetalle)
             .options(
                 joinedload(AccidenteDetalle.tipo_servicio),
                 joinedload(AccidenteDetalle.procedimiento),
             )
-            .filter(AccidenteDetalle.accidente_id == accidente_id)
+            .filter(*self._filtro_accidente(accidente_id, anio))
             .order_by(AccidenteDetalle.id)
         )
         
-        # Log del SQL generado
-        print(f"🔍 SQL Query: {query}")
-        
         result = query.all()
-        print(f"📦 Resultado: {len(result)} registros encontrados")
+        logger.debug("get_by_accidente(%s): %d registros", accidente_id, len(result))
         
         return result
     
+    def versiones_by_accidente(self, accidente_id: int, anio: Optional[int] = None) -> Dict[int, int]:
+        """{detalle_id: version} de los detalles del accidente."""
+        filas = (
+            self.session.query(AccidenteDetalle.id, AccidenteDetalle.version)
+            .filter(*self._filtro_accidente(accidente_id, anio))
+            .all()
+        )
+        return {detalle_id: version for detalle_id, version in filas}
+    
     def create(self, detalle: AccidenteDetalle) -> AccidenteDetalle:
         """Crea un nuevo detalle."""
         self.session.add(detalle)
@@ -67,17 +96,31 @@ class DetalleRepository:
             return True
         return False
     
-    def delete_by_accidente(self, accidente_id: int) -> int:
-        """Elimina todos los detalles de un accidente. Retorna cantidad eliminada."""
+    def delete_by_accidente(
+        self,
+        accidente_id: int,
+        anio: Optional[int] = None,
+        versiones: Optional[Dict[int, int]] = None,
+    ) -> int:
+        """
+        Elimina todos los detalles de un accidente. Retorna cantidad eliminada.
+        
+        Args:
+            versiones: `versiones_by_accidente` de cuando se cargaron los detalles;
+                si los detalles cambiaron desde entonces (otro usuario agregó,
+                quitó o editó alguno) lanza ConflictoVersion sin eliminar nada.
+        """
+        if versiones is not None and self.versiones_by_accidente(accidente_id, anio) != versiones:
+            raise ConflictoVersion("los detalles del accidente", accidente_id)
         count = (
             self.session.query(AccidenteDetalle)
-            .filter(AccidenteDetalle.accidente_id == accidente_id)
+            .filter(*self._filtro_accidente(accidente_id, anio))
             .delete()
         )
         self.session.flush()
         return count
     
-    def calcular_totales_gmq(self, accidente_id: int) -> dict:
+    def calcular_totales_gmq(self, accidente_id: int, anio: Optional[int] = None) -> dict:
         """
         Calcula totales de gastos médico-quirúrgicos (tipos 1, 2, 5, 6, 7, 8).
         Retorna dict con total_facturado y total_reclamado.
@@ -88,7 +131,7 @@ class DetalleRepository:
                 func.sum(AccidenteDetalle.valor_reclamado).label("total_reclamado"),
             )
             .filter(
-                AccidenteDetalle.accidente_id == accidente_id,
+                *self._filtro_accidente(accidente_id, anio),
                 AccidenteDetalle.tipo_servicio_id.in_([1, 2, 5, 6, 7, 8]),
             )
             .first()
@@ -99,7 +142,7 @@ class DetalleRepository:
             "total_reclamado": result.total_reclamado or 0,
         }
     
-    def calcular_totales_transporte(self, accidente_id: int) -> dict:
+    def calcular_totales_transporte(self, accidente_id: int, anio: Optional[int] = None) -> dict:
         """
         Calcula totales de transporte primario (tipo 3).
         Retorna dict con total_facturado y total_reclamado.
@@ -110,7 +153,7 @@ class DetalleRepository:
                 func.sum(AccidenteDetalle.valor_reclamado).label("total_reclamado"),
             )
             .filter(
-                AccidenteDetalle.accidente_id == accidente_id,
+                *self._filtro_accidente(accidente_id, anio),
                 AccidenteDetalle.tipo_servicio_id == 3,
             )
             .first()
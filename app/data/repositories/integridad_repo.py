@@ -0,0 +1,198 @@
+"""
+Repositorio de auditoría de integridad previa a la radicación.
+
+Expresa como SQL las validaciones de consistencia que FuripsValidator hace
+registro a registro (totales vs detalles, detalle = cantidad x valor unitario,
+reclamado <= facturado, vigencia de la póliza, víctima/detalles/totales
+presentes), para todos los accidentes de un periodo y prestador a la vez.
+
+Cada chequeo es una sola consulta (con GROUP BY donde agrega) y sus filas se
+leen con cursor del lado del servidor, de modo que en Python solo se
+materializan las violaciones, no los agregados.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# Tipos de servicio que suman a cada total (como DetalleRepository.calcular_totales_*)
+_TIPOS_GMQ = "1, 2, 5, 6, 7, 8"
+_TIPO_TRANSPORTE = "3"
+
+# Filtro común: usa el índice (prestador_id, fecha_evento) de accidente
+_FILTRO = "a.estado = 1 AND a.fecha_evento BETWEEN :desde AND :hasta"
+_FILTRO_PRESTADOR = " AND a.prestador_id = :prestador_id"
+
+# Llave de partición de accidente_detalle: solo se abren las particiones de los años del periodo
+_FILTRO_DETALLE = "d.anio_evento BETWEEN :anio_desde AND :anio_hasta"
+
+# regla -> (descripción, SQL). Cada SQL retorna (accidente_id, numero_consecutivo, detalle).
+CHEQUEOS: Dict[str, Tuple[str, str]] = {
+    "sin_victima": (
+        "El accidente debe tener al menos una víctima",
+        """
+        SELECT a.id, a.numero_consecutivo, 'Sin víctima activa'
+        FROM accidente a
+        WHERE {filtro}
+          AND NOT EXISTS (
+              SELECT 1 FROM accidente_victima av
+              WHERE av.accidente_id = a.id AND av.estado = 1
+          )
+        ORDER BY a.id
+        """,
+    ),
+    "sin_detalles": (
+        "El accidente debe tener detalles de facturación",
+        """
+        SELECT a.id, a.numero_consecutivo, 'Sin detalles de facturación'
+        FROM accidente a
+        WHERE {filtro}
+          AND NOT EXISTS (
+              SELECT 1 FROM accidente_detalle d
+              WHERE d.accidente_id = a.id AND {filtro_detalle}
+          )
+        ORDER BY a.id
+        """,
+    ),
+    "sin_totales": (
+        "El accidente debe tener totales calculados",
+        """
+        SELECT a.id, a.numero_consecutivo, 'Sin totales calculados'
+        FROM accidente a
+        LEFT JOIN accidente_totales t ON t.accidente_id = a.id
+        WHERE {filtro} AND t.id IS NULL
+        ORDER BY a.id
+        """,
+    ),
+    "totales_vs_detalles": (
+        "Los totales declarados no coinciden con la suma de los detalles",
+        f"""
+        SELECT a.id, a.numero_consecutivo,
+               CONCAT(
+                   'GMQ detalles=', COALESCE(SUM(CASE WHEN d.tipo_servicio_id IN ({_TIPOS_GMQ})
+                                                 THEN d.valor_facturado END), 0),
+                   ' declarado=', t.total_facturado_gmq,
+                   '; transporte detalles=', COALESCE(SUM(CASE WHEN d.tipo_servicio_id = {_TIPO_TRANSPORTE}
+                                                          THEN d.valor_facturado END), 0),
+                   ' declarado=', t.total_facturado_transporte
+               )
+        FROM accidente a
+        JOIN accidente_totales t ON t.accidente_id = a.id
+        LEFT JOIN accidente_detalle d ON d.accidente_id = a.id AND {{filtro_detalle}}
+        WHERE {{filtro}}
+        GROUP BY a.id, a.numero_consecutivo, t.total_facturado_gmq, t.total_facturado_transporte
+        HAVING COALESCE(SUM(CASE WHEN d.tipo_servicio_id IN ({_TIPOS_GMQ})
+                            THEN d.valor_facturado END), 0) <> t.total_facturado_gmq
+            OR COALESCE(SUM(CASE WHEN d.tipo_servicio_id = {_TIPO_TRANSPORTE}
+                            THEN d.valor_facturado END), 0) <> t.total_facturado_transporte
+        ORDER BY a.id
+        """,
+    ),
+    "totales_reclamado": (
+        "El total reclamado no puede exceder el facturado",
+        """
+        SELECT a.id, a.numero_consecutivo,
+               CONCAT('GMQ ', t.total_reclamado_gmq, '/', t.total_facturado_gmq,
+                      '; transporte ', t.total_reclamado_transporte, '/', t.total_facturado_transporte)
+        FROM accidente a
+        JOIN accidente_totales t ON t.accidente_id = a.id
+        WHERE {filtro}
+          AND (t.total_reclamado_gmq > t.total_facturado_gmq
+               OR t.total_reclamado_transporte > t.total_facturado_transporte)
+        ORDER BY a.id
+        """,
+    ),
+    "detalle_inconsistente": (
+        "Valor facturado distinto de cantidad x valor unitario",
+        """
+        SELECT a.id, a.numero_consecutivo,
+               CONCAT('Detalle ', d.id, ': ', d.cantidad, ' x ', d.valor_unitario,
+                      ' = ', d.cantidad * d.valor_unitario, ', declarado ', d.valor_facturado)
+        FROM accidente a
+        JOIN accidente_detalle d ON d.accidente_id = a.id AND {filtro_detalle}
+        WHERE {filtro} AND d.valor_facturado <> d.cantidad * d.valor_unitario
+        ORDER BY a.id, d.id
+        """,
+    ),
+    "detalle_reclamado": (
+        "El valor reclamado del detalle excede el facturado",
+        """
+        SELECT a.id, a.numero_consecutivo,
+               CONCAT('Detalle ', d.id, ': reclamado ', d.valor_reclamado,
+                      ' > facturado ', d.valor_facturado)
+        FROM accidente a
+        JOIN accidente_detalle d ON d.accidente_id = a.id AND {filtro_detalle}
+        WHERE {filtro} AND d.valor_reclamado > d.valor_facturado
+        ORDER BY a.id, d.id
+        """,
+    ),
+    "vigencia_poliza": (
+        "Evento fuera de la vigencia de la póliza",
+        """
+        SELECT a.id, a.numero_consecutivo,
+               CONCAT('Evento ', a.fecha_evento, ' fuera de ', v.vigencia_inicio, ' - ', v.vigencia_fin,
+                      ' (placa ', v.placa, ')')
+        FROM accidente a
+        JOIN vehiculo v ON v.id = a.vehiculo_id
+        WHERE {filtro}
+          AND v.vigencia_inicio IS NOT NULL AND v.vigencia_fin IS NOT NULL
+          AND (a.fecha_evento < v.vigencia_inicio OR a.fecha_evento > v.vigencia_fin)
+        ORDER BY a.id
+        """,
+    ),
+}
+
+
+class IntegridadRepository:
+    """Chequeos de integridad por conjuntos sobre accidente y sus tablas hijas."""
+
+    TAMANO_BLOQUE = 1000
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def violaciones(
+        self,
+        desde: date,
+        hasta: date,
+        prestador_id: Optional[int] = None,
+        reglas: Optional[Iterable[str]] = None,
+    ) -> Iterator[Tuple[str, int, str, str]]:
+        """
+        Recorre las violaciones del periodo como flujo.
+
+        Args:
+            desde, hasta: rango de fecha_evento (inclusivo).
+            prestador_id: limita a un prestador.
+            reglas: subconjunto de CHEQUEOS a ejecutar (por defecto todos).
+
+        Yields:
+            (regla, accidente_id, numero_consecutivo, detalle)
+        """
+        filtro = _FILTRO + (_FILTRO_PRESTADOR if prestador_id else "")
+        params: Dict[str, Any] = {
+            "desde": desde,
+            "hasta": hasta,
+            "anio_desde": desde.year,
+            "anio_hasta": hasta.year,
+        }
+        if prestador_id:
+            params["prestador_id"] = prestador_id
+
+        for regla in reglas or CHEQUEOS:
+            if regla not in CHEQUEOS:
+                raise ValueError(f"Regla de integridad desconocida: {regla}")
+            sql = text(CHEQUEOS[regla][1].format(filtro=filtro, filtro_detalle=_FILTRO_DETALLE))
+            resultado = self.session.execute(
+                sql,
+                params,
+                execution_options={"stream_results": True, "yield_per": self.TAMANO_BLOQUE},
+            )
+            try:
+                for accidente_id, consecutivo, detalle in resultado:
+                    yield regla, accidente_id, consecutivo, detalle
+            finally:
+                # Si el consumidor se detiene antes, liberar el cursor del servidor
+                resultado.close()
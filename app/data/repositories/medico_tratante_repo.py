@@ -28,10 +28,7 @@ class MedicoTratanteRepository:
                 joinedload(AccidenteMedicoTratante.medico),
                 joinedload(AccidenteMedicoTratante.victima)
             )
-            .filter(
-                AccidenteMedicoTratante.accidente_id == accidente_id,
-                AccidenteMedicoTratante.estado == "activo"
-            )
+            .filter(AccidenteMedicoTratante.accidente_id == accidente_id)
             .all()
         )
     
@@ -40,10 +37,7 @@ class MedicoTratanteRepository:
         return (
             self.session.query(AccidenteMedicoTratante)
             .options(joinedload(AccidenteMedicoTratante.medico))
-            .filter(
-                AccidenteMedicoTratante.accidente_victima_id == victima_id,
-                AccidenteMedicoTratante.estado == "activo"
-            )
+            .filter(AccidenteMedicoTratante.accidente_victima_id == victima_id)
             .first()
         )
     
@@ -25,6 +25,7 @@ class PersonaConfigRepository:
         return (
             self.session.query(PersonaConfig)
             .filter(PersonaConfig.persona_id == persona_id)
+            .execution_options(incluir_inactivos=True)  # persona_id es único
             .first()
         )
     
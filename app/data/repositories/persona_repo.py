@@ -1,13 +1,31 @@
 """
 Repositorio para gestión de Personas.
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session, joinedload
 
 from app.data.models import Persona
 
 
+# Columnas que el upsert puede actualizar (no id, fecha_registro ni estado)
+_COLUMNAS_ACTUALIZABLES = (
+    "primer_nombre",
+    "segundo_nombre",
+    "primer_apellido",
+    "segundo_apellido",
+    "sexo_id",
+    "fecha_nacimiento",
+    "fecha_fallecimiento",
+    "direccion",
+    "telefono",
+    "municipio_residencia_id",
+)
+
+
 class PersonaRepository:
     """Repositorio para operaciones con Persona."""
     
@@ -40,8 +58,48 @@ class PersonaRepository:
                 Persona.tipo_identificacion_id == tipo_id,
                 Persona.numero_identificacion == numero,
             )
+            .execution_options(incluir_inactivos=True)  # el documento es único
+            .first()
+        )
+    
+    def get_datos_by_documento(self, tipo_id: int, numero: str) -> Optional[dict]:
+        """
+        Busca una persona por documento y retorna sus datos básicos como dict
+        (formato de `cargar_persona` en los formularios), o None si no existe.
+        """
+        persona = (
+            self.session.query(Persona)
+            .filter(
+                Persona.tipo_identificacion_id == tipo_id,
+                Persona.numero_identificacion == numero,
+            )
+            .execution_options(incluir_inactivos=True)  # el documento es único
             .first()
         )
+        return self.datos_basicos(persona) if persona else None
+    
+    def get_datos_by_id(self, persona_id: int) -> Optional[dict]:
+        """Igual que `get_datos_by_documento`, buscando por ID."""
+        persona = self.session.get(Persona, persona_id)
+        return self.datos_basicos(persona) if persona else None
+    
+    @staticmethod
+    def datos_basicos(persona: Persona) -> dict:
+        """Datos de la persona para los formularios y la caché de personas."""
+        return {
+            "id": persona.id,
+            "tipo_identificacion_id": persona.tipo_identificacion_id,
+            "numero_identificacion": persona.numero_identificacion,
+            "primer_nombre": persona.primer_nombre,
+            "segundo_nombre": persona.segundo_nombre,
+            "primer_apellido": persona.primer_apellido,
+            "segundo_apellido": persona.segundo_apellido,
+            "fecha_nacimiento": persona.fecha_nacimiento,
+            "sexo_id": persona.sexo_id,
+            "direccion": persona.direccion,
+            "telefono": persona.telefono,
+            "municipio_residencia_id": persona.municipio_residencia_id,
+        }
     
     def get_all_activas(self, limit: int = 1000) -> List[Persona]:
         """Obtiene todas las personas activas."""
@@ -99,23 +157,106 @@ class PersonaRepository:
             return True
         return False
     
-    def obtener_o_crear(self, tipo_id: int, numero: str, datos_persona: dict) -> Persona:
+    # ------------------------------------------------------------------
+    # Upsert por documento (clave única uq_persona_documento)
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _fila_upsert(tipo_id: int, numero: str, datos_persona: dict) -> dict:
+        fila = {k: v for k, v in datos_persona.items() if k in _COLUMNAS_ACTUALIZABLES}
+        fila["tipo_identificacion_id"] = tipo_id
+        fila["numero_identificacion"] = numero
+        fila.setdefault("fecha_registro", datetime.now())
+        fila.setdefault("estado", 1)
+        return fila
+    
+    def upsert(self, tipo_id: int, numero: str, datos_persona: dict) -> int:
         """
-        Obtiene una persona existente por documento o crea una nueva.
-        Retorna la persona (existente o nueva).
+        Inserta o actualiza una persona por documento en una sola sentencia.
+        
+        `id = LAST_INSERT_ID(id)` hace que MySQL reporte el id de la fila
+        existente cuando hay duplicado, así no hace falta un SELECT previo.
+        
+        Returns:
+            ID de la persona.
+        """
+        fila = self._fila_upsert(tipo_id, numero, datos_persona)
+        stmt = mysql_insert(Persona).values(fila)
+        actualizar = {c: stmt.inserted[c] for c in fila if c in _COLUMNAS_ACTUALIZABLES}
+        # Un formulario abierto con la versión anterior debe ver el cambio como conflicto
+        actualizar["version"] = Persona.version + 1
+        actualizar["id"] = func.last_insert_id(Persona.id)
+        stmt = stmt.on_duplicate_key_update(**actualizar)
+        return self.session.execute(stmt).lastrowid
+    
+    def upsert_lote(
+        self, personas: Iterable[dict], actualizar: bool = True, tamano_lote: int = 1000
+    ) -> Dict[Tuple[int, str], int]:
         """
-        # Buscar si ya existe
-        persona = self.get_by_documento(tipo_id, numero)
+        Inserta o actualiza muchas personas con un INSERT multi-fila por bloque
+        y resuelve todos los ids con un SELECT por bloque.
         
-        if persona:
-            # Si existe, actualizar datos
-            for key, value in datos_persona.items():
-                if hasattr(persona, key):
-                    setattr(persona, key, value)
-            self.session.flush()
-            self.session.refresh(persona)
-            return persona
-        else:
-            # Si no existe, crear nueva
-            persona = Persona(**datos_persona)
-            return self.create(persona)
+        Args:
+            personas: dicts con tipo_identificacion_id, numero_identificacion y
+                los datos de la persona. Si un documento se repite, gana el último.
+            actualizar: False conserva los datos de las personas existentes
+                (solo inserta las nuevas).
+        
+        Returns:
+            {(tipo_identificacion_id, numero_identificacion): persona_id}
+        """
+        filas: Dict[Tuple[int, str], dict] = {}
+        for datos in personas:
+            clave = (datos["tipo_identificacion_id"], datos["numero_identificacion"])
+            filas[clave] = self._fila_upsert(clave[0], clave[1], datos)
+        
+        ids: Dict[Tuple[int, str], int] = {}
+        claves = list(filas)
+        for inicio in range(0, len(claves), tamano_lote):
+            bloque = claves[inicio:inicio + tamano_lote]
+            # Un INSERT multi-fila exige las mismas columnas en todas las filas
+            grupos: Dict[Tuple[str, ...], List[dict]] = {}
+            for clave in bloque:
+                grupos.setdefault(tuple(sorted(filas[clave])), []).append(filas[clave])
+            for columnas, valores in grupos.items():
+                stmt = mysql_insert(Persona).values(valores)
+                if actualizar:
+                    stmt = stmt.on_duplicate_key_update(
+                        version=Persona.version + 1,
+                        **{c: stmt.inserted[c] for c in columnas if c in _COLUMNAS_ACTUALIZABLES},
+                    )
+                else:
+                    # Sin cambios para las existentes (no usar INSERT IGNORE: ocultaría otros errores)
+                    stmt = stmt.on_duplicate_key_update(id=Persona.id)
+                self.session.execute(stmt)
+            ids.update(self.get_ids_by_documentos(bloque))
+        return ids
+    
+    def get_ids_by_documentos(self, documentos: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        """{(tipo_id, numero): id} de las personas existentes, en una sola consulta."""
+        documentos = set(documentos)
+        if not documentos:
+            return {}
+        filas = (
+            self.session.query(Persona.tipo_identificacion_id, Persona.numero_identificacion, Persona.id)
+            .filter(tuple_(Persona.tipo_identificacion_id, Persona.numero_identificacion).in_(documentos))
+            .execution_options(incluir_inactivos=True)
+            .all()
+        )
+        return {(t, n): i for t, n, i in filas}
+    
+    def obtener_o_crear(self, tipo_id: int, numero: str, datos_persona: dict) -> Persona:
+        """
+        Obtiene una persona existente por documento o crea una nueva,
+        actualizando sus datos. Retorna la persona (existente o nueva).
+        
+        Usa el upsert de una sentencia y luego carga la persona por PK.
+        """
+        persona_id = self.upsert(tipo_id, numero, datos_persona)
+        # populate_existing: la fila pudo cambiar por fuera del ORM
+        return self.session.get(
+            Persona,
+            persona_id,
+            populate_existing=True,
+            execution_options={"incluir_inactivos": True},
+        )
@@ -30,10 +30,10 @@ class ProcedimientoRepository:
             .first()
         )
     
-    def buscar(self, termino: str) -> List[Procedimiento]:
+    def buscar(self, termino: str, limite: int = 50) -> List[Procedimiento]:
         """
         Busca procedimientos por código o descripción.
-        Retorna máximo 50 resultados.
+        Retorna máximo `limite` resultados (50 por defecto).
         """
         termino_like = f"%{termino}%"
         return (
@@ -47,7 +47,7 @@ class ProcedimientoRepository:
                 )
             )
             .order_by(Procedimiento.codigo)
-            .limit(50)
+            .limit(limite)
             .all()
         )
     
@@ -60,6 +60,25 @@ class ProcedimientoRepository:
             .all()
         )
     
+    def get_todos_activos_compacto(self) -> List[tuple]:
+        """
+        Obtiene todos los procedimientos activos como tuplas (sin objetos ORM).
+        
+        Cada fila es (id, codigo, descripcion, codigo_soat, valor), ordenada por código.
+        """
+        return (
+            self.session.query(
+                Procedimiento.id,
+                Procedimiento.codigo,
+                Procedimiento.descripcion,
+                Procedimiento.codigo_soat,
+                Procedimiento.valor,
+            )
+            .filter(Procedimiento.estado == "ACTIVO")
+            .order_by(Procedimiento.codigo)
+            .all()
+        )
+    
     def get_traslados_primarios(self) -> List[Procedimiento]:
         """Obtiene todos los procedimientos de traslado primario."""
         return (
@@ -4,7 +4,7 @@ Repositorio para la entidad AccidentePropietario.
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 
-from app.data.models import AccidentePropietario
+from app.data.models import AccidentePropietario, incluyendo_inactivos
 
 
 class PropietarioRepository:
@@ -37,7 +37,8 @@ class PropietarioRepository:
     
     def reactivar(self, propietario_id: int) -> bool:
         """Reactiva un propietario anulado (cambia estado a 1)."""
-        propietario = self.get_by_id(propietario_id)
+        with incluyendo_inactivos(self.session):
+            propietario = self.get_by_id(propietario_id)
         if propietario:
             propietario.estado = 1
             self.session.flush()
@@ -1,7 +1,8 @@
 """
 Repositorio para proyecciones desde BD externa (READ-ONLY).
 """
-from typing import List, Dict, Any, Optional
+from datetime import date
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
@@ -13,9 +14,17 @@ class ProyeccionRepository:
     Usar para proyecciones, consultas históricas, etc.
     """
     
+    # Filas por bloque al recorrer consultas grandes
+    TAMANO_BLOQUE = 5000
+    
     def __init__(self, session: Session):
         self.session = session
     
+    @staticmethod
+    def _validar_select(query: str):
+        if not query.strip().upper().startswith("SELECT"):
+            raise ValueError("Solo se permiten queries SELECT en la BD externa")
+    
     def ejecutar_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Ejecuta una query SELECT y retorna resultados como lista de diccionarios.
@@ -27,14 +36,51 @@ class ProyeccionRepository:
         Returns:
             Lista de diccionarios con los resultados
         """
-        if not query.strip().upper().startswith("SELECT"):
-            raise ValueError("Solo se permiten queries SELECT en la BD externa")
+        self._validar_select(query)
         
         result = self.session.execute(text(query), params or {})
         
-        # Convertir resultado a lista de diccionarios
-        columns = result.keys()
-        return [dict(zip(columns, row)) for row in result.fetchall()]
+        # Convertir resultado a lista de diccionarios (sin fetchall intermedio)
+        columns = tuple(result.keys())
+        return [dict(zip(columns, row)) for row in result]
+    
+    def recorrer_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        tamano_bloque: Optional[int] = None,
+    ) -> Iterator[Tuple[Tuple[str, ...], List[tuple]]]:
+        """
+        Ejecuta una query SELECT como flujo, por bloques.
+        
+        Usa cursor del lado del servidor (stream_results), así que la memoria
+        queda acotada por el tamaño del bloque y no por el total de filas.
+        Las filas son tuplas; el encabezado de columnas es el mismo objeto en
+        todos los bloques. Si el consumidor deja de iterar (break, close() o
+        una excepción) el cursor se cierra y el resto no se lee.
+        
+        Args:
+            query: Query SQL (solo SELECT)
+            params: Parámetros de la query
+            tamano_bloque: Filas por bloque (por defecto TAMANO_BLOQUE)
+        
+        Yields:
+            (columnas, filas) por cada bloque
+        """
+        self._validar_select(query)
+        tamano_bloque = tamano_bloque or self.TAMANO_BLOQUE
+        
+        result = self.session.execute(
+            text(query),
+            params or {},
+            execution_options={"stream_results": True, "yield_per": tamano_bloque},
+        )
+        try:
+            columns = tuple(result.keys())
+            for bloque in result.partitions():
+                yield columns, [tuple(row) for row in bloque]
+        finally:
+            result.close()
     
     # ========================================================================
     # EJEMPLOS DE PROYECCIONES ESPECÍFICAS
@@ -45,18 +91,28 @@ class ProyeccionRepository:
         Ejemplo: Obtiene estadísticas de accidentes por mes.
         Adaptar según estructura de BD externa.
         """
+        return self.get_estadisticas_accidentes_por_rango(date(anio, 1, 1), date(anio + 1, 1, 1))
+    
+    def get_estadisticas_accidentes_por_rango(self, desde: date, hasta: date) -> List[Dict[str, Any]]:
+        """
+        Estadísticas por mes de los accidentes con desde <= fecha_evento < hasta.
+        
+        El filtro por rango (en lugar de YEAR(fecha_evento) = :anio) puede usar
+        un índice sobre fecha_evento. El rango no debe cruzar años: se agrupa
+        solo por mes.
+        """
         query = """
         SELECT 
             MONTH(fecha_evento) as mes,
             COUNT(*) as total_accidentes,
             SUM(total_facturado) as total_facturado
         FROM accidentes_historico
-        WHERE YEAR(fecha_evento) = :anio
+        WHERE fecha_evento >= :desde AND fecha_evento < :hasta
         GROUP BY MONTH(fecha_evento)
         ORDER BY mes
         """
         
-        return self.ejecutar_query(query, {"anio": anio})
+        return self.ejecutar_query(query, {"desde": desde, "hasta": hasta})
     
     def get_top_naturalezas_evento(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -73,3 +129,42 @@ class ProyeccionRepository:
         """
         
         return self.ejecutar_query(query, {"limit": limit})
+    
+    def get_conteo_naturalezas_evento(
+        self,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        incluir_sin_fecha: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Accidentes por naturaleza de evento con desde <= fecha_evento < hasta
+        (cada límite es opcional). Sin LIMIT: las naturalezas son pocas.
+        
+        Con un límite, las filas con fecha_evento NULL quedan fuera; con
+        `incluir_sin_fecha` se suman al conteo del rango.
+        
+        Returns:
+            {naturaleza_evento: total}
+        """
+        condiciones = []
+        params: Dict[str, Any] = {}
+        if desde is not None:
+            condiciones.append("fecha_evento >= :desde")
+            params["desde"] = desde
+        if hasta is not None:
+            condiciones.append("fecha_evento < :hasta")
+            params["hasta"] = hasta
+        if condiciones and incluir_sin_fecha:
+            condiciones = [f"(({' AND '.join(condiciones)}) OR fecha_evento IS NULL)"]
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        
+        query = f"""
+        SELECT 
+            naturaleza_evento,
+            COUNT(*) as total
+        FROM accidentes_historico
+        {where}
+        GROUP BY naturaleza_evento
+        """
+        
+        return {fila["naturaleza_evento"]: fila["total"] for fila in self.ejecutar_query(query, params)}
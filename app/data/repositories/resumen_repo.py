@@ -0,0 +1,176 @@
+"""
+Repositorio para el modelo de lectura AccidenteResumen.
+
+La tabla `accidente_resumen` se reconstruye por accidente con un único
+REPLACE ... SELECT cada vez que los servicios/presenters escriben datos que
+aparecen en las grillas de búsqueda (accidente, víctima, persona, vehículo).
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, exists, text
+from sqlalchemy.orm import Session
+
+from app.data.models import AccidenteResumen, AccidenteVictima, Persona
+
+
+# Recalcula las filas del resumen a partir de las tablas normalizadas.
+# La víctima mostrada es la primera activa (menor id) del accidente; el filtro
+# por documento de `buscar` considera todas las víctimas (ver _filtro_documento).
+_SQL_REFRESCAR = """
+REPLACE INTO accidente_resumen (
+    accidente_id, prestador_id, numero_consecutivo, numero_factura,
+    fecha_evento, hora_evento, placa, victima_persona_id,
+    tipo_identificacion, numero_identificacion,
+    primer_nombre, segundo_nombre, primer_apellido, segundo_apellido,
+    vehiculo_id, estado
+)
+SELECT
+    a.id, a.prestador_id, a.numero_consecutivo, a.numero_factura,
+    a.fecha_evento, a.hora_evento, v.placa, p.id,
+    ti.descripcion, p.numero_identificacion,
+    p.primer_nombre, p.segundo_nombre, p.primer_apellido, p.segundo_apellido,
+    a.vehiculo_id, a.estado
+FROM accidente a
+LEFT JOIN vehiculo v
+    ON v.id = a.vehiculo_id AND v.estado = 1
+LEFT JOIN accidente_victima av
+    ON av.id = (
+        SELECT MIN(av2.id) FROM accidente_victima av2
+        WHERE av2.accidente_id = a.id AND av2.estado = 1
+    )
+LEFT JOIN persona p ON p.id = av.persona_id
+LEFT JOIN tipo_identificacion ti ON ti.id = p.tipo_identificacion_id
+WHERE {condicion}
+"""
+
+
+class AccidenteResumenRepository:
+    """Repositorio para lectura y mantenimiento de accidente_resumen."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # Mantenimiento (se invoca en la misma transacción de la escritura)
+    # ------------------------------------------------------------------
+
+    def _refrescar_donde(self, condicion: str, params: Dict[str, Any], *bindparams) -> int:
+        """Ejecuta el REPLACE ... SELECT para las filas que cumplen la condición."""
+        # Asegurar que los cambios pendientes del ORM estén visibles para el SELECT
+        self.session.flush()
+        sql = text(_SQL_REFRESCAR.format(condicion=condicion))
+        if bindparams:
+            sql = sql.bindparams(*bindparams)
+        resultado = self.session.execute(sql, params)
+        return resultado.rowcount or 0
+
+    def refrescar(self, accidente_id: int) -> int:
+        """Recalcula la fila del resumen de un accidente."""
+        if not accidente_id:
+            return 0
+        return self._refrescar_donde("a.id = :accidente_id", {"accidente_id": accidente_id})
+
+    def refrescar_lote(self, accidente_ids: Iterable[int]) -> int:
+        """Recalcula las filas de varios accidentes en una sola sentencia."""
+        ids = [i for i in accidente_ids if i]
+        if not ids:
+            return 0
+        return self._refrescar_donde(
+            "a.id IN :accidente_ids",
+            {"accidente_ids": ids},
+            bindparam("accidente_ids", expanding=True),
+        )
+
+    def refrescar_por_persona(self, persona_id: int) -> int:
+        """Recalcula los accidentes donde la persona figura como víctima."""
+        if not persona_id:
+            return 0
+        return self._refrescar_donde(
+            "a.id IN (SELECT avp.accidente_id FROM accidente_victima avp "
+            "WHERE avp.persona_id = :persona_id)",
+            {"persona_id": persona_id},
+        )
+
+    def refrescar_por_vehiculo(self, vehiculo_id: int) -> int:
+        """Recalcula los accidentes asociados a un vehículo (cambio de placa/estado)."""
+        if not vehiculo_id:
+            return 0
+        return self._refrescar_donde("a.vehiculo_id = :vehiculo_id", {"vehiculo_id": vehiculo_id})
+
+    def reconstruir(self) -> int:
+        """Reconstruye el resumen completo (carga inicial o reparación)."""
+        return self._refrescar_donde("1 = 1", {})
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filtro_documento(documento: str):
+        """
+        EXISTS sobre accidente_victima/persona para el prefijo del documento.
+
+        La fila del resumen solo guarda la primera víctima; con este filtro un
+        accidente se encuentra también por la segunda víctima en adelante. El
+        prefijo usa idx_persona_numero_identificacion.
+        """
+        return exists().where(
+            AccidenteVictima.accidente_id == AccidenteResumen.accidente_id,
+            AccidenteVictima.estado == 1,
+            Persona.id == AccidenteVictima.persona_id,
+            Persona.numero_identificacion.startswith(documento, autoescape=True),
+        )
+
+    def buscar(self, filtros: dict, limit: int = 100) -> List[AccidenteResumen]:
+        """
+        Busca accidentes activos en el resumen.
+
+        Filtros soportados:
+        - id: ID del accidente (exacto)
+        - consecutivo: numérico -> exacto, tal cual o relleno a 12 dígitos; otro -> prefijo
+        - factura: prefijo del número de factura
+        - documento: prefijo del documento de cualquier víctima activa
+        - prestador_id, fecha_desde, fecha_hasta
+
+        Todos los filtros usan igualdad o prefijo para aprovechar los índices.
+        """
+        query = self.session.query(AccidenteResumen).filter(AccidenteResumen.estado == 1)
+
+        if filtros.get("id"):
+            query = query.filter(AccidenteResumen.accidente_id == filtros["id"])
+
+        consecutivo = str(filtros.get("consecutivo") or "").strip()
+        if consecutivo:
+            if consecutivo.isdigit() and len(consecutivo) <= 12:
+                # Hay consecutivos guardados sin relleno ("123"): se buscan ambas formas
+                query = query.filter(
+                    AccidenteResumen.numero_consecutivo.in_({consecutivo, consecutivo.zfill(12)})
+                )
+            else:
+                query = query.filter(AccidenteResumen.numero_consecutivo.startswith(consecutivo, autoescape=True))
+
+        factura = str(filtros.get("factura") or "").strip()
+        if factura:
+            query = query.filter(AccidenteResumen.numero_factura.startswith(factura, autoescape=True))
+
+        documento = str(filtros.get("documento") or "").strip()
+        if documento:
+            query = query.filter(self._filtro_documento(documento))
+
+        if filtros.get("prestador_id"):
+            query = query.filter(AccidenteResumen.prestador_id == filtros["prestador_id"])
+
+        fecha_desde: Optional[date] = filtros.get("fecha_desde")
+        if fecha_desde:
+            query = query.filter(AccidenteResumen.fecha_evento >= fecha_desde)
+
+        fecha_hasta: Optional[date] = filtros.get("fecha_hasta")
+        if fecha_hasta:
+            query = query.filter(AccidenteResumen.fecha_evento <= fecha_hasta)
+
+        return (
+            query.order_by(AccidenteResumen.fecha_evento.desc(), AccidenteResumen.accidente_id.desc())
+            .limit(limit)
+            .all()
+        )
@@ -0,0 +1,138 @@
+"""
+Repositorio de sincronización de tablas de referencia.
+
+Da a las cachés locales (ReplicaService) una forma barata de saber si una
+tabla cambió sin descargarla: la firma se calcula en el servidor y solo
+viaja un número por tabla.
+
+Las tablas con `actualizado_en` (migrations/run_add_actualizado_en_referencia.py)
+se sincronizan además por marca de agua: `cambios_desde` entrega solo las
+filas modificadas desde la marca anterior, incluidas las desactivadas.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Desde el paquete: registra todos los modelos en Base.metadata
+from app.data.models import Base
+
+# Tablas que se pueden consultar (los nombres van en el SQL)
+TABLAS_REFERENCIA = (
+    "tipo_identificacion",
+    "sexo",
+    "municipio",
+    "naturaleza_evento",
+    "estado_aseguramiento",
+    "tipo_vehiculo",
+    "tipo_servicio",
+    "prestador_salud",
+    "procedimiento",
+)
+
+# Tabla con actualizado_en -> condición SQL de fila vigente (None: todas lo son)
+TABLAS_INCREMENTALES: Dict[str, Optional[str]] = {
+    "municipio": "estado = 1",
+    "procedimiento": "estado = 'ACTIVO'",
+    "prestador_salud": None,
+    "persona_config": "estado = 1 AND es_medico = 1",
+}
+
+# Una fila confirmada poco después de tomar su actualizado_en puede no ser
+# visible todavía al consultar: la marca nunca avanza más allá de
+# NOW() - MARGEN, así esas filas entran en la consulta siguiente.
+MARGEN_MARCA = timedelta(seconds=5)
+
+
+class Cambios(NamedTuple):
+    """Resultado de `SincronizacionRepository.cambios_desde`."""
+    filas: List[dict]       # columnas pedidas + "vigente" (False = desactivada)
+    marca: datetime         # marca para la próxima consulta
+    vigentes: int           # filas vigentes en la tabla (detecta borrados físicos)
+
+
+class SincronizacionRepository:
+    """Consultas de cambios sobre las tablas de referencia."""
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def firmas(self, tablas: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        {tabla: firma del contenido} con CHECKSUM TABLE (una sentencia para todas).
+        
+        La firma cambia con cualquier INSERT, UPDATE o DELETE de la tabla;
+        None si el servidor no pudo calcularla (la tabla se trata como cambiada).
+        
+        No es una consulta barata: en InnoDB, CHECKSUM TABLE recorre la tabla
+        completa (no hay checksum en vivo). Solo se usa para
+        los catálogos pequeños; las tablas grandes se sincronizan por marca
+        de agua con `cambios_desde`.
+        """
+        tablas = sorted(set(tablas))
+        for tabla in tablas:
+            if tabla not in TABLAS_REFERENCIA:
+                raise ValueError(f"Tabla de referencia desconocida: {tabla}")
+        if not tablas:
+            return {}
+        filas = self.session.execute(
+            text("CHECKSUM TABLE " + ", ".join(f"`{t}`" for t in tablas))
+        ).fetchall()
+        # Table viene como "<esquema>.<tabla>"
+        return {
+            nombre.rsplit(".", 1)[-1]: (str(firma) if firma is not None else None)
+            for nombre, firma in filas
+        }
+    
+    def marca_actual(self) -> datetime:
+        """
+        Marca inicial para una carga completa hecha a continuación.
+        
+        Con NOW() - MARGEN_MARCA, lo modificado durante la carga se vuelve
+        a pedir en la primera consulta incremental (aplicarlo dos veces no
+        cambia el resultado).
+        """
+        return self.session.execute(text("SELECT NOW(6)")).scalar() - MARGEN_MARCA
+    
+    def cambios_desde(self, tabla: str, columnas: Sequence[str], desde: datetime) -> Cambios:
+        """
+        Filas de `tabla` con actualizado_en posterior a `desde`, vigentes o no.
+        
+        Args:
+            tabla: una de TABLAS_INCREMENTALES
+            columnas: columnas a retornar (deben existir en el modelo)
+            desde: marca retornada por la consulta anterior (o `marca_actual`)
+        
+        Returns:
+            Cambios; las filas vienen ordenadas por actualizado_en.
+        """
+        if tabla not in TABLAS_INCREMENTALES:
+            raise ValueError(f"Tabla sin sincronización incremental: {tabla}")
+        definidas = Base.metadata.tables[tabla].c
+        for columna in columnas:
+            if columna not in definidas:
+                raise ValueError(f"Columna desconocida: {tabla}.{columna}")
+        vigente = TABLAS_INCREMENTALES[tabla] or "1"
+        
+        ahora = self.session.execute(text("SELECT NOW(6)")).scalar()
+        resultado = self.session.execute(
+            text(
+                f"SELECT {', '.join(f'`{c}`' for c in columnas)}, ({vigente}) AS vigente, "
+                f"actualizado_en FROM `{tabla}` "
+                "WHERE actualizado_en > :desde ORDER BY actualizado_en"
+            ),
+            {"desde": desde},
+        )
+        filas = []
+        ultima = desde
+        for fila in resultado.mappings():
+            fila = dict(fila)
+            ultima = max(ultima, fila.pop("actualizado_en"))
+            fila["vigente"] = bool(fila["vigente"])
+            filas.append(fila)
+        
+        vigentes = self.session.execute(
+            text(f"SELECT COUNT(*) FROM `{tabla}` WHERE {vigente}")
+        ).scalar()
+        return Cambios(filas, min(ultima, ahora - MARGEN_MARCA), vigentes)
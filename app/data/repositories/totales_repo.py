@@ -19,6 +19,7 @@ class TotalesRepository:
         return (
             self.session.query(AccidenteTotales)
             .filter(AccidenteTotales.accidente_id == accidente_id)
+            .execution_options(incluir_inactivos=True)  # accidente_id es único
             .first()
         )
     
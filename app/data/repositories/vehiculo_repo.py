@@ -5,6 +5,7 @@ from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 
 from app.data.models.vehiculo import Vehiculo
+from app.data.models.activos import incluyendo_inactivos
 
 
 class VehiculoRepository:
@@ -37,7 +38,8 @@ class VehiculoRepository:
     
     def reactivar(self, vehiculo_id: int) -> bool:
         """Reactiva un vehículo anulado (cambia estado a 1)."""
-        vehiculo = self.get_by_id(vehiculo_id)
+        with incluyendo_inactivos(self.session):
+            vehiculo = self.get_by_id(vehiculo_id)
         if vehiculo:
             vehiculo.estado = 1
             self.session.flush()
@@ -67,6 +69,7 @@ class VehiculoRepository:
                 joinedload(Vehiculo.propietario)
             )
             .filter(Vehiculo.placa == placa.upper())
+            .execution_options(incluir_inactivos=True)  # placa es única: también las anuladas
             .first()
         )
     
@@ -4,7 +4,7 @@ Repositorio para la entidad AccidenteVictima.
 from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 
-from app.data.models import AccidenteVictima
+from app.data.models import AccidenteVictima, incluyendo_inactivos
 
 
 class VictimaRepository:
@@ -37,7 +37,8 @@ class VictimaRepository:
     
     def reactivar(self, victima_id: int) -> bool:
         """Reactiva una víctima anulada (cambia estado a 1)."""
-        victima = self.get_by_id(victima_id)
+        with incluyendo_inactivos(self.session):
+            victima = self.get_by_id(victima_id)
         if victima:
             victima.estado = 1
             self.session.flush()
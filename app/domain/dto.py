@@ -211,3 +211,21 @@ class FURIPS2ExportDTO(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# ============================================================================
+# DTOs PARA IMPORTACIÓN
+# ============================================================================
+class ResultadoImportacionDTO(BaseModel):
+    """Resumen de una importación de archivos planos FURIPS."""
+    lineas_leidas: int = 0
+    accidentes_creados: int = 0
+    detalles_creados: int = 0
+    filas_con_error: int = 0
+    segundos: float = 0.0
+    archivo_errores: Optional[str] = None
+    
+    @property
+    def lineas_por_minuto(self) -> float:
+        """Throughput de la importación."""
+        return self.lineas_leidas * 60 / self.segundos if self.segundos else 0.0
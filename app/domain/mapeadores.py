@@ -0,0 +1,207 @@
+"""
+Conversión rápida entre modelos ORM, DTOs y dicts.
+
+`model_dump()` recorre y copia todos los campos de un DTO ya validado, y
+validar una lista de entrada con `Modelo(**datos)` por fila entra al núcleo
+de pydantic una vez por registro. `Mapeador` compila una vez por DTO:
+
+- una función generada (como hacen dataclasses/namedtuple) que arma el dict
+  de un objeto ORM o de un DTO (tienen los mismos nombres) con un literal
+  `{"campo": o.campo, ...}`: igual de rápida que escribirlo a mano y sin
+  repetir la lista de campos en cada presenter;
+- un `TypeAdapter(List[DTO])` para validar una lista completa de datos
+  externos (formularios, archivos) en una sola pasada del núcleo de pydantic.
+
+Para ORM -> DTO se sigue usando `DTO.model_validate(obj, from_attributes=True)`:
+`model_construct` resultó más lento (ver `medir()`).
+
+Uso:
+    filas = DETALLE_VISTA.a_dicts(detalles_orm)         # vista, sin validar
+    dtos = DETALLE_VISTA.validar_lista(datos_formulario)  # entrada externa
+    AccidenteDetalle(accidente_id=..., **DETALLE_COLUMNAS.a_dict(dto))
+
+`medir()` compara estos caminos contra los de campo a campo.
+"""
+import time
+from datetime import date, time as hora
+from functools import cached_property
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Generic, Iterable, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.domain.dto import AccidenteDTO, DetalleDTO, VehiculoDTO, VictimaDTO
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _compilar_lectores(campos: Tuple[str, ...]) -> Tuple[Callable[[Any], dict], Callable[[Iterable[Any]], list]]:
+    """Genera `a_dict(o)` y `a_dicts(objetos)` con el literal de dict de los campos."""
+    # Los campos de un modelo pydantic son identificadores válidos
+    literal = "{" + ", ".join(f"{c!r}: o.{c}" for c in campos) + "}"
+    codigo = (
+        f"def a_dict(o):\n    return {literal}\n"
+        f"def a_dicts(objetos):\n    return [{literal} for o in objetos]\n"
+    )
+    espacio: Dict[str, Any] = {}
+    exec(codigo, espacio)
+    return espacio["a_dict"], espacio["a_dicts"]
+
+
+class Mapeador(Generic[T]):
+    """Lectura de los campos de un DTO como dict, compilada una sola vez."""
+
+    def __init__(self, dto: Type[T], excluir: Iterable[str] = ()):
+        excluir = set(excluir)
+        self.dto = dto
+        self.campos: Tuple[str, ...] = tuple(c for c in dto.model_fields if c not in excluir)
+        self._a_dict, self._a_dicts = _compilar_lectores(self.campos)
+
+    @cached_property
+    def _adaptador_lista(self) -> TypeAdapter:
+        # Construirlo compila el esquema: solo si se usa
+        return TypeAdapter(List[self.dto])
+
+    def a_dict(self, objeto: Any) -> Dict[str, Any]:
+        """Campos de un objeto ORM o DTO como dict (sin validar ni model_dump)."""
+        return self._a_dict(objeto)
+
+    def a_dicts(self, objetos: Iterable[Any]) -> List[Dict[str, Any]]:
+        return self._a_dicts(objetos)
+
+    def validar_lista(self, filas: Iterable[Dict[str, Any]]) -> List[T]:
+        """
+        Valida datos externos como List[DTO] en una sola llamada.
+
+        Lanza pydantic.ValidationError con la posición de cada fila inválida
+        en `loc` (p. ej. (3, "cantidad")).
+        """
+        return self._adaptador_lista.validate_python(filas if isinstance(filas, list) else list(filas))
+
+
+# ============================================================================
+# MAPEADORES DE LA APLICACIÓN
+# ============================================================================
+
+# Datos del formulario de accidente (sin el vehículo, que tiene su pestaña)
+ACCIDENTE_VISTA = Mapeador(AccidenteDTO, excluir=("vehiculo_id",))
+# Columnas de la entidad al crear/actualizar (el id lo asigna la BD)
+ACCIDENTE_COLUMNAS = Mapeador(AccidenteDTO, excluir=("id",))
+DETALLE_VISTA = Mapeador(DetalleDTO, excluir=("accidente_id",))
+DETALLE_COLUMNAS = Mapeador(DetalleDTO, excluir=("id", "accidente_id"))
+VEHICULO_VISTA = Mapeador(VehiculoDTO, excluir=("propietario_id",))
+VICTIMA_COLUMNAS = Mapeador(VictimaDTO, excluir=("id", "accidente_id"))
+
+
+# ============================================================================
+# MEDICIÓN
+# ============================================================================
+
+def _detalles_sinteticos(cantidad: int) -> List[SimpleNamespace]:
+    """Objetos con los atributos de AccidenteDetalle (como los entrega el ORM)."""
+    return [
+        SimpleNamespace(
+            id=i,
+            accidente_id=i // 10 + 1,
+            tipo_servicio_id=1 + i % 8,
+            procedimiento_id=1000 + i % 500,
+            codigo_servicio=f"{890200 + i % 500}",
+            descripcion=f"PROCEDIMIENTO SINTETICO {i % 500}",
+            cantidad=1 + i % 3,
+            valor_unitario=10_000 + i % 97,
+            valor_facturado=(1 + i % 3) * (10_000 + i % 97),
+            valor_reclamado=(1 + i % 3) * (10_000 + i % 97),
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _accidentes_sinteticos(cantidad: int) -> List[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=i,
+            prestador_id=1,
+            numero_consecutivo=str(i + 1).zfill(6),
+            numero_factura=f"FE{i:08d}",
+            numero_rad_siras=f"{i:012d}",
+            naturaleza_evento_id=1,
+            descripcion_otro_evento=None,
+            fecha_evento=date(2026, 1, 1),
+            hora_evento=hora(12, 30),
+            municipio_evento_id=1,
+            direccion_evento="CALLE 1 # 2-3",
+            zona="U",
+            vehiculo_id=None,
+            estado_aseguramiento_id=1,
+        )
+        for i in range(cantidad)
+    ]
+
+
+def _cronometrar(funcion: Callable[[], Any], repeticiones: int = 5) -> float:
+    """Mejor tiempo de `repeticiones` ejecuciones (una sola medición es muy ruidosa)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def medir(cantidad: int = 10_000) -> Dict[str, Dict[str, float]]:
+    """
+    Compara, sobre `cantidad` objetos sintéticos, la conversión campo a campo
+    (dicts literales, DTO(**datos), model_dump por registro) con los mapeadores.
+
+    Returns:
+        {caso: {"antes": segundos, "despues": segundos}}
+    """
+    detalles = _detalles_sinteticos(cantidad)
+    accidentes = _accidentes_sinteticos(cantidad)
+    entradas = [{c: getattr(d, c) for c in DETALLE_VISTA.campos} for d in detalles]
+    accidentes_dto = [AccidenteDTO.model_validate(a, from_attributes=True) for a in accidentes]
+    DETALLE_VISTA.validar_lista(entradas[:1])  # compilar el esquema fuera de la medición
+
+    def dicts_campo_a_campo():
+        return [
+            {
+                "id": d.id,
+                "tipo_servicio_id": d.tipo_servicio_id,
+                "procedimiento_id": d.procedimiento_id,
+                "codigo_servicio": d.codigo_servicio,
+                "descripcion": d.descripcion,
+                "cantidad": d.cantidad,
+                "valor_unitario": d.valor_unitario,
+                "valor_facturado": d.valor_facturado,
+                "valor_reclamado": d.valor_reclamado,
+            }
+            for d in detalles
+        ]
+
+    def validar_uno_a_uno():
+        return [DetalleDTO(**e) for e in entradas]
+
+    def columnas_model_dump():
+        # Como crear_accidente antes: un model_dump para validar y otro para la entidad
+        for dto in accidentes_dto:
+            dto.model_dump()
+            dto.model_dump(exclude={"id"})
+
+    def columnas_mapeador():
+        for dto in accidentes_dto:
+            ACCIDENTE_COLUMNAS.a_dict(dto)
+
+    return {
+        "ORM -> dicts de vista": {
+            "antes": _cronometrar(dicts_campo_a_campo),
+            "despues": _cronometrar(lambda: DETALLE_VISTA.a_dicts(detalles)),
+        },
+        "validar lista de entrada": {
+            "antes": _cronometrar(validar_uno_a_uno),
+            "despues": _cronometrar(lambda: DETALLE_VISTA.validar_lista(entradas)),
+        },
+        "DTO -> columnas de la entidad": {
+            "antes": _cronometrar(columnas_model_dump),
+            "despues": _cronometrar(columnas_mapeador),
+        },
+    }
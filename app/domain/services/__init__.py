@@ -1,12 +1,45 @@
 """Servicios de negocio."""
-from app.domain.services.accidente_service import AccidenteService
-from app.domain.services.export_service import ExportService
-from app.domain.services.pdf_service import PDFService
-from app.domain.services.proyeccion_service import ProyeccionService
+from typing import TYPE_CHECKING
+
+from app.utils.lazy import exportacion_diferida
+
+# Importación diferida (app.utils.lazy): {nombre: módulo que lo define}
+_MODULOS = {
+    "AccidenteService": "app.domain.services.accidente_service",
+    "ExportService": "app.domain.services.export_service",
+    "PDFService": "app.domain.services.pdf_service",
+    "ProyeccionService": "app.domain.services.proyeccion_service",
+    "CatalogoService": "app.domain.services.catalogo_service",
+    "ImportService": "app.domain.services.import_service",
+    "TrabajosService": "app.domain.services.trabajos_service",
+    "AuditoriaService": "app.domain.services.auditoria_service",
+    "ArchivoService": "app.domain.services.archivo_service",
+    "ReplicaService": "app.domain.services.replica_service",
+}
+
+if TYPE_CHECKING:
+    from app.domain.services.accidente_service import AccidenteService
+    from app.domain.services.export_service import ExportService
+    from app.domain.services.pdf_service import PDFService
+    from app.domain.services.proyeccion_service import ProyeccionService
+    from app.domain.services.catalogo_service import CatalogoService
+    from app.domain.services.import_service import ImportService
+    from app.domain.services.trabajos_service import TrabajosService
+    from app.domain.services.auditoria_service import AuditoriaService
+    from app.domain.services.archivo_service import ArchivoService
+    from app.domain.services.replica_service import ReplicaService
 
 __all__ = [
     "AccidenteService",
     "ExportService",
     "PDFService",
     "ProyeccionService",
+    "CatalogoService",
+    "ImportService",
+    "TrabajosService",
+    "AuditoriaService",
+    "ArchivoService",
+    "ReplicaService",
 ]
+
+__getattr__, __dir__ = exportacion_diferida(__name__, globals(), _MODULOS, __all__)
@@ -4,7 +4,9 @@ Servicio de negocio para gestión de Accidentes.
 from typing import List, Optional, Tuple
 from datetime import date
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.data.models import (
     Accidente,
@@ -18,7 +20,9 @@ from app.data.repositories import (
     AccidenteRepository,
     DetalleRepository,
     TotalesRepository,
+    AccidenteResumenRepository,
 )
+from app.data.repositories.concurrencia import es_llave_duplicada, mensaje_conflicto, verificar_version
 from app.domain.dto import (
     AccidenteDTO,
     VictimaDTO,
@@ -26,17 +30,22 @@ from app.domain.dto import (
     TotalesDTO,
     AccidenteCompletoDTO,
 )
+from app.domain.mapeadores import ACCIDENTE_COLUMNAS, DETALLE_COLUMNAS, VICTIMA_COLUMNAS
 from app.domain.validators import FuripsValidator
 
 
 class AccidenteService:
     """Servicio de negocio para operaciones con Accidente."""
     
+    # Intentos de INSERT con consecutivo autogenerado si otra estación toma el mismo número
+    REINTENTOS_CONSECUTIVO = 5
+    
     def __init__(self, session: Session):
         self.session = session
         self.accidente_repo = AccidenteRepository(session)
         self.detalle_repo = DetalleRepository(session)
         self.totales_repo = TotalesRepository(session)
+        self.resumen_repo = AccidenteResumenRepository(session)
         self.validator = FuripsValidator()
     
     # ========================================================================
@@ -49,6 +58,13 @@ class AccidenteService:
         - Si consecutivo está vacío: autogenera el siguiente consecutivo
         - Si consecutivo tiene valor: valida que no exista
         Retorna (accidente_creado, lista_errores).
+        
+        El consecutivo autogenerado no se reserva con bloqueos: cada intento
+        va en un SAVEPOINT y, si la llave única lo rechaza porque otra estación
+        lo usó primero, se genera el siguiente y se reintenta. El reintento lee
+        el máximo con bloqueo (FOR UPDATE): en REPEATABLE READ una lectura normal
+        repite la instantánea de la transacción, que no incluye el número que
+        la otra estación confirmó, y generaría el mismo duplicado.
         """
         errores = []
         
@@ -58,8 +74,9 @@ class AccidenteService:
         
         # Manejar consecutivo: autogenerar si está vacío, validar si tiene valor
         consecutivo_final = accidente_dto.numero_consecutivo.strip() if accidente_dto.numero_consecutivo else ""
+        autogenerado = not consecutivo_final
         
-        if not consecutivo_final:
+        if autogenerado:
             # AUTOGENERAR: Obtener el siguiente consecutivo
             consecutivo_final = self.accidente_repo.generar_siguiente_consecutivo(accidente_dto.prestador_id)
         else:
@@ -70,16 +87,33 @@ class AccidenteService:
         # Actualizar el DTO con el consecutivo final
         accidente_dto.numero_consecutivo = consecutivo_final
         
+        # El DTO ya se validó al construirse: sus campos se leen una sola vez
+        datos = ACCIDENTE_COLUMNAS.a_dict(accidente_dto)
+        
         # Validar datos completos
-        es_valido, errores_validacion = self.validator.validar_accidente_completo(accidente_dto.model_dump())
+        es_valido, errores_validacion = self.validator.validar_accidente_completo(datos)
         if not es_valido:
             return None, errores_validacion
         
-        # Crear entidad
-        accidente = Accidente(**accidente_dto.model_dump(exclude={"id"}))
-        
         try:
-            accidente_creado = self.accidente_repo.create(accidente)
+            for intento in range(1, self.REINTENTOS_CONSECUTIVO + 1):
+                try:
+                    with self.session.begin_nested():
+                        if intento > 1:
+                            datos["numero_consecutivo"] = self.accidente_repo.generar_siguiente_consecutivo(
+                                datos["prestador_id"], bloquear=True
+                            )
+                        accidente_creado = self.accidente_repo.create(Accidente(**datos))
+                    break
+                except IntegrityError as e:
+                    if not es_llave_duplicada(e):
+                        raise
+                    if not autogenerado:
+                        self.session.rollback()
+                        return None, [f"⚠️ El consecutivo '{datos['numero_consecutivo']}' ya existe para este prestador"]
+                    if intento == self.REINTENTOS_CONSECUTIVO:
+                        raise
+            self.resumen_repo.refrescar(accidente_creado.id)
             self.session.commit()
             return accidente_creado, []
         except Exception as e:
@@ -90,10 +124,18 @@ class AccidenteService:
         """Obtiene un accidente por ID con todas sus relaciones."""
         return self.accidente_repo.get_by_id(accidente_id)
     
-    def actualizar_accidente(self, accidente_id: int, accidente_dto: AccidenteDTO) -> Tuple[Optional[Accidente], List[str]]:
-        """Actualiza un accidente existente."""
+    def actualizar_accidente(
+        self, accidente_id: int, accidente_dto: AccidenteDTO, version: Optional[int] = None
+    ) -> Tuple[Optional[Accidente], List[str]]:
+        """
+        Actualiza un accidente existente.
+        
+        `version` es la que tenía el accidente al cargarse en el formulario;
+        si otro usuario lo guardó después, no se sobrescribe y se retorna el error.
+        """
         # Validar datos
-        es_valido, errores = self.validator.validar_accidente_completo(accidente_dto.model_dump())
+        datos = ACCIDENTE_COLUMNAS.a_dict(accidente_dto)
+        es_valido, errores = self.validator.validar_accidente_completo(datos)
         if not es_valido:
             return None, errores
         
@@ -110,14 +152,20 @@ class AccidenteService:
         ):
             return None, ["El consecutivo ya existe para este prestador"]
         
-        # Actualizar campos
-        for campo, valor in accidente_dto.model_dump(exclude={"id"}).items():
-            setattr(accidente, campo, valor)
-        
         try:
+            verificar_version(accidente, version, "el accidente")
+            
+            # Actualizar campos
+            for campo, valor in datos.items():
+                setattr(accidente, campo, valor)
+            
             accidente_actualizado = self.accidente_repo.update(accidente)
+            self.resumen_repo.refrescar(accidente_id)
             self.session.commit()
             return accidente_actualizado, []
+        except StaleDataError:
+            self.session.rollback()
+            return None, [mensaje_conflicto("el accidente")]
         except Exception as e:
             self.session.rollback()
             return None, [f"Error al actualizar accidente: {str(e)}"]
@@ -148,13 +196,14 @@ class AccidenteService:
         # Crear víctima
         victima = AccidenteVictima(
             accidente_id=accidente_id,
-            **victima_dto.model_dump(exclude={"id", "accidente_id"})
+            **VICTIMA_COLUMNAS.a_dict(victima_dto)
         )
         
         try:
             self.session.add(victima)
             self.session.flush()
             self.session.refresh(victima)
+            self.resumen_repo.refrescar(accidente_id)
             self.session.commit()
             return victima, []
         except Exception as e:
@@ -179,7 +228,7 @@ class AccidenteService:
         # Crear detalle
         detalle = AccidenteDetalle(
             accidente_id=accidente_id,
-            **detalle_dto.model_dump(exclude={"id", "accidente_id"})
+            **DETALLE_COLUMNAS.a_dict(detalle_dto)
         )
         
         try:
@@ -195,11 +244,14 @@ class AccidenteService:
         Calcula totales desde los detalles y guarda en accidente_totales.
         """
         try:
+            # Año del evento: limita ambas sumas a la partición del accidente
+            anio = self.detalle_repo.anio_de_accidente(accidente_id)
+            
             # Calcular totales GMQ
-            totales_gmq = self.detalle_repo.calcular_totales_gmq(accidente_id)
+            totales_gmq = self.detalle_repo.calcular_totales_gmq(accidente_id, anio)
             
             # Calcular totales transporte
-            totales_transporte = self.detalle_repo.calcular_totales_transporte(accidente_id)
+            totales_transporte = self.detalle_repo.calcular_totales_transporte(accidente_id, anio)
             
             # Crear/actualizar totales
             totales = AccidenteTotales(
@@ -249,8 +301,9 @@ class AccidenteService:
         
         # Validar consistencia de totales
         if accidente.totales:
-            totales_gmq = self.detalle_repo.calcular_totales_gmq(accidente_id)
-            totales_transporte = self.detalle_repo.calcular_totales_transporte(accidente_id)
+            anio = accidente.fecha_evento.year if accidente.fecha_evento else None
+            totales_gmq = self.detalle_repo.calcular_totales_gmq(accidente_id, anio)
+            totales_transporte = self.detalle_repo.calcular_totales_transporte(accidente_id, anio)
             
             ok, err = self.validator.validar_totales_vs_detalles(
                 totales_gmq["total_facturado"],
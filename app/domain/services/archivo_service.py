@@ -0,0 +1,71 @@
+"""
+Archivo de accidentes anulados.
+
+Mueve por lotes los accidentes con estado = 0 (y sus filas hijas) a las
+tablas *_archivo, cada lote en su propia transacción: un proceso interrumpido
+deja archivados los lotes confirmados y el resto sigue en las tablas de
+trabajo. Ver app.data.repositories.archivo_repo.
+"""
+from datetime import date
+from typing import Callable, Iterable, Optional
+
+from app.config.db import get_db_session
+from app.data.repositories.archivo_repo import ArchivoRepository
+
+
+class ArchivoService:
+    """Archivado por lotes y restauración de accidentes anulados."""
+
+    TAMANO_LOTE = 200
+
+    def __init__(self, tamano_lote: Optional[int] = None):
+        self.tamano_lote = tamano_lote or self.TAMANO_LOTE
+
+    def archivar_anulados(
+        self,
+        antes_de: Optional[date] = None,
+        progreso: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Archiva todos los accidentes anulados (opcionalmente solo los de
+        eventos anteriores a `antes_de`).
+
+        Args:
+            progreso: se llama con la cantidad archivada en cada lote.
+
+        Returns:
+            Total de accidentes archivados
+        """
+        total = 0
+        while True:
+            with get_db_session() as session:
+                repo = ArchivoRepository(session)
+                ids = repo.ids_anulados(self.tamano_lote, antes_de)
+                if not ids:
+                    return total
+                archivados = repo.archivar(ids)
+            total += archivados
+            if progreso:
+                progreso(archivados)
+
+    def restaurar(self, accidente_ids: Iterable[int], reactivar: bool = False) -> int:
+        """
+        Devuelve accidentes archivados a las tablas de trabajo (en una sola
+        transacción). Con `reactivar` además quedan con estado = 1.
+
+        Returns:
+            Número de accidentes restaurados
+        """
+        with get_db_session() as session:
+            repo = ArchivoRepository(session)
+            ids = repo.ids_archivados(accidente_ids)
+            repo.restaurar(ids)
+            if ids and reactivar:
+                from app.data.repositories.accidente_repo import AccidenteRepository
+                from app.data.repositories.resumen_repo import AccidenteResumenRepository
+
+                accidente_repo = AccidenteRepository(session)
+                for accidente_id in ids:
+                    accidente_repo.reactivar(accidente_id)
+                AccidenteResumenRepository(session).refrescar_lote(ids)
+        return len(ids)
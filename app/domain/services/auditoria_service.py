@@ -0,0 +1,103 @@
+"""
+Consulta y exportación del historial de auditoría de vehículos y propietarios.
+
+Las páginas se piden con un cursor opaco (fecha_cambio e id de la última fila)
+en lugar de un número de página: cada página cuesta lo mismo sin importar qué
+tan atrás esté, y la exportación CSV recorre millones de filas como una
+sucesión de consultas cortas en vez de una sola que puede vencer el tiempo de
+espera del servidor.
+"""
+import csv
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.data.models.auditoria import PropietarioHistorial, VehiculoHistorial
+from app.data.repositories.auditoria_repo import AuditoriaRepository, Cursor
+
+VEHICULOS = "vehiculos"
+PROPIETARIOS = "propietarios"
+
+_MODELOS = {VEHICULOS: VehiculoHistorial, PROPIETARIOS: PropietarioHistorial}
+
+
+class AuditoriaService:
+    """Historial de auditoría paginado y exportación a CSV."""
+
+    TAMANO_PAGINA_EXPORTACION = 5000
+
+    def __init__(self, session: Session):
+        self.auditoria_repo = AuditoriaRepository(session)
+
+    @staticmethod
+    def codificar_cursor(fila: Dict[str, Any]) -> str:
+        """Cursor de la fila (para pedir la página siguiente)."""
+        return f"{fila['fecha_cambio'].isoformat()},{fila['id']}"
+
+    @staticmethod
+    def decodificar_cursor(cursor: str) -> Cursor:
+        """Inverso de `codificar_cursor`. Lanza ValueError si el cursor no es válido."""
+        fecha, _, fila_id = cursor.rpartition(",")
+        return datetime.fromisoformat(fecha), int(fila_id)
+
+    def pagina(
+        self,
+        tabla: str,
+        limite: int = 100,
+        cursor: Optional[str] = None,
+        **filtros,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Una página del historial (de lo más reciente a lo más antiguo).
+
+        Args:
+            tabla: VEHICULOS o PROPIETARIOS
+            limite: filas por página
+            cursor: cursor retornado por la página anterior
+            **filtros: accidente_id, placa, vehiculo_id (vehículos), documento
+                (propietarios), desde, hasta (hasta es exclusivo)
+
+        Returns:
+            (filas, cursor de la página siguiente o None si no hay más)
+        """
+        despues = self.decodificar_cursor(cursor) if cursor else None
+        if tabla == VEHICULOS:
+            filas = self.auditoria_repo.historial_vehiculos(despues=despues, limite=limite, **filtros)
+        elif tabla == PROPIETARIOS:
+            filas = self.auditoria_repo.historial_propietarios(despues=despues, limite=limite, **filtros)
+        else:
+            raise ValueError(f"Tabla de auditoría desconocida: {tabla}")
+        siguiente = self.codificar_cursor(filas[-1]) if len(filas) == limite else None
+        return filas, siguiente
+
+    def recorrer(
+        self,
+        tabla: str,
+        tamano_pagina: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filtros,
+    ) -> Iterator[Dict[str, Any]]:
+        """Todas las filas del historial que cumplen los filtros, página por página."""
+        tamano_pagina = tamano_pagina or self.TAMANO_PAGINA_EXPORTACION
+        while True:
+            filas, cursor = self.pagina(tabla, tamano_pagina, cursor, **filtros)
+            yield from filas
+            if cursor is None:
+                return
+
+    def exportar_csv(self, salida: TextIO, tabla: str, **filtros) -> int:
+        """
+        Escribe el historial en CSV sin cargarlo completo en memoria.
+
+        Returns:
+            Número de filas escritas
+        """
+        columnas = [c.name for c in _MODELOS[tabla].__table__.columns]
+        writer = csv.writer(salida)
+        writer.writerow(columnas)
+        total = 0
+        for fila in self.recorrer(tabla, **filtros):
+            writer.writerow([fila[c] for c in columnas])
+            total += 1
+        return total
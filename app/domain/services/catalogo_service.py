@@ -0,0 +1,204 @@
+"""
+Servicio de catálogos con caché en memoria.
+
+Los catálogos (tipos de documento, sexos, municipios, etc.) cambian muy poco y
+los consultaban todos los presenters en su constructor. Este servicio los carga
+una sola vez (idealmente en segundo plano al arrancar con `precargar`) y los
+entrega como listas de dicts listas para los combos.
+
+Si el catálogo no está en memoria se lee primero de la réplica local (SQLite,
+app.infra.replica_local) y solo si no está ahí se consulta la BD; ReplicaService
+mantiene la réplica al día en segundo plano.
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.db import get_db_session
+from app.data.repositories.catalogo_repo import CatalogoRepository
+from app.data.repositories.prestador_repo import PrestadorRepository
+from app.infra.replica_local import replica_compartida
+
+
+def _codigo_descripcion(items) -> List[dict]:
+    return [{"id": i.id, "codigo": i.codigo, "descripcion": i.descripcion} for i in items]
+
+
+# nombre de catálogo -> función que lo consulta y lo convierte a dicts
+_CARGADORES: Dict[str, Callable[[Session], List[dict]]] = {
+    "tipos_identificacion": lambda s: _codigo_descripcion(CatalogoRepository(s).get_tipos_identificacion()),
+    "sexos": lambda s: _codigo_descripcion(CatalogoRepository(s).get_sexos()),
+    "municipios": lambda s: [
+        {"id": m.id, "nombre": m.nombre} for m in CatalogoRepository(s).get_todos_municipios()
+    ],
+    "naturalezas_evento": lambda s: _codigo_descripcion(CatalogoRepository(s).get_naturalezas_evento()),
+    "estados_aseguramiento": lambda s: _codigo_descripcion(CatalogoRepository(s).get_estados_aseguramiento()),
+    "tipos_vehiculo": lambda s: _codigo_descripcion(CatalogoRepository(s).get_tipos_vehiculo()),
+    "tipos_servicio": lambda s: _codigo_descripcion(CatalogoRepository(s).get_tipos_servicio()),
+    "prestadores": lambda s: [
+        {"id": p.id, "razon_social": p.razon_social} for p in PrestadorRepository(s).get_all(limit=None)
+    ],
+}
+
+# nombre de catálogo -> tabla de origen (para detectar cambios al sincronizar)
+TABLAS_ORIGEN: Dict[str, str] = {
+    "tipos_identificacion": "tipo_identificacion",
+    "sexos": "sexo",
+    "municipios": "municipio",
+    "naturalezas_evento": "naturaleza_evento",
+    "estados_aseguramiento": "estado_aseguramiento",
+    "tipos_vehiculo": "tipo_vehiculo",
+    "tipos_servicio": "tipo_servicio",
+    "prestadores": "prestador_salud",
+}
+
+
+class CatalogoService:
+    """
+    Caché de catálogos compartida por toda la aplicación (thread-safe).
+
+    La réplica y la BD se leen sin tener el lock; solo la publicación en la
+    caché lo toma. Dos hilos que no encuentran el mismo catálogo pueden
+    consultarlo a la vez; queda en caché el primero que se publica.
+    """
+
+    _cache: Dict[str, List[dict]] = {}
+    _lock = threading.Lock()
+    # Aumenta con cada invalidar(): una carga que empezó antes no se publica
+    _generacion = 0
+
+    @classmethod
+    def _publicar(cls, nombre: str, datos: List[dict], generacion: int) -> Tuple[List[dict], bool]:
+        """
+        Guarda en caché un catálogo cargado fuera del lock.
+
+        Returns:
+            (datos en caché, True si se publicaron los recibidos)
+        """
+        with cls._lock:
+            actual = cls._cache.get(nombre)
+            if actual is not None:
+                return actual, False
+            if generacion != cls._generacion:
+                # Se invalidó durante la carga: se entregan sin guardarlos
+                return datos, False
+            cls._cache[nombre] = datos
+            return datos, True
+
+    @classmethod
+    def obtener(cls, nombre: str) -> List[dict]:
+        """Retorna un catálogo; lo consulta en BD solo si no está en caché."""
+        if nombre not in _CARGADORES:
+            raise ValueError(f"Catálogo desconocido: {nombre}")
+
+        datos = cls._cache.get(nombre)
+        if datos is None:
+            generacion = cls._generacion
+            replica = replica_compartida()
+            datos = replica.leer(nombre)
+            if datos is not None:
+                datos, _ = cls._publicar(nombre, datos, generacion)
+            else:
+                with get_db_session() as session:
+                    datos = cls.consultar(nombre, session)
+                datos, publicado = cls._publicar(nombre, datos, generacion)
+                if publicado:
+                    replica.guardar(nombre, datos)
+        # Copia superficial: las vistas no deben alterar la caché
+        return list(datos)
+
+    @classmethod
+    def precargar(cls, nombres: Optional[Iterable[str]] = None) -> int:
+        """
+        Carga en caché los catálogos indicados (todos por defecto): los que
+        están en la réplica local sin tocar la red, el resto en una sola sesión.
+
+        Returns:
+            Cantidad de catálogos cargados.
+        """
+        pendientes = [n for n in (nombres or _CARGADORES) if n not in cls._cache]
+        if not pendientes:
+            return 0
+
+        generacion = cls._generacion
+        replica = replica_compartida()
+        faltantes = []
+        for nombre in pendientes:
+            datos = replica.leer(nombre)
+            if datos is None:
+                faltantes.append(nombre)
+            else:
+                cls._publicar(nombre, datos, generacion)
+        if faltantes:
+            with get_db_session() as session:
+                consultados = {nombre: cls.consultar(nombre, session) for nombre in faltantes}
+            for nombre, datos in consultados.items():
+                _, publicado = cls._publicar(nombre, datos, generacion)
+                if publicado:
+                    replica.guardar(nombre, datos)
+        return len(pendientes)
+
+    @staticmethod
+    def nombres() -> List[str]:
+        """Nombres de los catálogos disponibles."""
+        return list(_CARGADORES)
+
+    @staticmethod
+    def consultar(nombre: str, session: Session) -> List[dict]:
+        """Consulta un catálogo en BD (sin caché ni réplica)."""
+        return _CARGADORES[nombre](session)
+
+    @classmethod
+    def actualizar(cls, nombre: str, datos: List[dict]):
+        """Reemplaza un catálogo en caché (lo usa la sincronización de la réplica)."""
+        with cls._lock:
+            cls._cache[nombre] = datos
+
+    @classmethod
+    def invalidar(cls, nombre: Optional[str] = None):
+        """Descarta un catálogo (o todos), también de la réplica, para forzar una nueva consulta."""
+        catalogos = list(_CARGADORES) if nombre is None else [nombre]
+        with cls._lock:
+            cls._generacion += 1
+            for catalogo in catalogos:
+                cls._cache.pop(catalogo, None)
+        replica = replica_compartida()
+        for catalogo in catalogos:
+            replica.descartar(catalogo)
+
+    # ========================================================================
+    # ACCESOS DIRECTOS
+    # ========================================================================
+
+    @classmethod
+    def tipos_identificacion(cls) -> List[dict]:
+        return cls.obtener("tipos_identificacion")
+
+    @classmethod
+    def sexos(cls) -> List[dict]:
+        return cls.obtener("sexos")
+
+    @classmethod
+    def municipios(cls) -> List[dict]:
+        return cls.obtener("municipios")
+
+    @classmethod
+    def naturalezas_evento(cls) -> List[dict]:
+        return cls.obtener("naturalezas_evento")
+
+    @classmethod
+    def estados_aseguramiento(cls) -> List[dict]:
+        return cls.obtener("estados_aseguramiento")
+
+    @classmethod
+    def tipos_vehiculo(cls) -> List[dict]:
+        return cls.obtener("tipos_vehiculo")
+
+    @classmethod
+    def tipos_servicio(cls) -> List[dict]:
+        return cls.obtener("tipos_servicio")
+
+    @classmethod
+    def prestadores(cls) -> List[dict]:
+        return cls.obtener("prestadores")
@@ -0,0 +1,669 @@
+"""
+Servicio de importación de archivos planos FURIPS1 y FURIPS2.
+
+Los archivos se leen como flujo (línea a línea) y se procesan por lotes:
+- validación por lotes con ValidadorLote (reglas de FuripsValidator),
+- catálogos resueltos con mapas código -> id cargados una sola vez,
+- personas con un upsert multi-fila por lote y vehículos con una consulta
+  por lote (los nuevos insertados con executemany),
+- inserción del lote en su propia transacción.
+
+Las filas rechazadas se escriben en un CSV de errores (archivo, línea,
+consecutivo, error) y el resto del archivo continúa. `validar` aplica solo el
+formato y las reglas de la circular, sin consultar ni escribir en la BD.
+
+Formato (separador "|", codificación latin-1, una fila por línea):
+
+FURIPS1 (un accidente con su víctima, vehículo y totales por línea):
+    ver COLUMNAS_FURIPS1. Fechas AAAA-MM-DD o DD/MM/AAAA; horas HH:MM[:SS].
+
+FURIPS2 (un ítem de detalle por línea, igual que la exportación):
+    consecutivo|tipo_servicio|codigo_servicio|descripcion|cantidad|
+    valor_unitario|valor_facturado|valor_reclamado
+"""
+import csv
+import logging
+from collections import ChainMap
+import time as _time
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.data.models import (
+    Accidente,
+    AccidenteDetalle,
+    AccidenteTotales,
+    AccidenteVictima,
+    EstadoAseguramiento,
+    Municipio,
+    NaturalezaEvento,
+    PrestadorSalud,
+    Procedimiento,
+    Sexo,
+    TipoIdentificacion,
+    TipoServicio,
+    TipoVehiculo,
+    Vehiculo,
+)
+from app.data.repositories import AccidenteResumenRepository, PersonaRepository
+from app.domain.dto import ResultadoImportacionDTO
+from app.domain.validators import ValidadorLote, a_columnas
+
+logger = logging.getLogger(__name__)
+
+
+SEPARADOR = "|"
+CODIFICACION = "latin-1"
+
+COLUMNAS_FURIPS1 = (
+    "codigo_habilitacion",
+    "numero_consecutivo",
+    "numero_factura",
+    "numero_rad_siras",
+    "naturaleza_codigo",
+    "descripcion_otro_evento",
+    "fecha_evento",
+    "hora_evento",
+    "municipio_evento_dane",
+    "direccion_evento",
+    "zona",
+    "estado_aseguramiento_codigo",
+    "placa",
+    "tipo_vehiculo_codigo",
+    "aseguradora_codigo",
+    "numero_poliza",
+    "vigencia_inicio",
+    "vigencia_fin",
+    "tipo_identificacion_codigo",
+    "numero_identificacion",
+    "primer_nombre",
+    "segundo_nombre",
+    "primer_apellido",
+    "segundo_apellido",
+    "sexo_codigo",
+    "fecha_nacimiento",
+    "direccion",
+    "telefono",
+    "municipio_residencia_dane",
+    "condicion_codigo",
+    "total_facturado_gmq",
+    "total_reclamado_gmq",
+    "total_facturado_transporte",
+    "total_reclamado_transporte",
+    "manifestacion_servicios",
+    "descripcion_evento",
+)
+
+COLUMNAS_FURIPS2 = (
+    "numero_consecutivo",
+    "tipo_servicio_codigo",
+    "codigo_servicio",
+    "descripcion",
+    "cantidad",
+    "valor_unitario",
+    "valor_facturado",
+    "valor_reclamado",
+)
+
+
+# ============================================================================
+# CONVERSIÓN DE CAMPOS
+# ============================================================================
+
+def _fecha(valor: str) -> Optional[date]:
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        return datetime.strptime(valor, "%d/%m/%Y").date()
+
+
+def _hora(valor: str) -> Optional[time]:
+    return time.fromisoformat(valor) if valor else None
+
+
+def _entero(valor: str) -> int:
+    return int(valor) if valor else 0
+
+
+class _EscritorErrores:
+    """CSV de filas rechazadas; el archivo se crea con el primer error."""
+
+    def __init__(self, ruta: Path):
+        self.ruta = ruta
+        self.cantidad = 0
+        self._archivo = None
+        self._writer = None
+
+    def escribir(self, archivo: str, linea: int, consecutivo: str, errores: List[str]):
+        if self._writer is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._archivo = open(self.ruta, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._archivo)
+            self._writer.writerow(["archivo", "linea", "consecutivo", "error"])
+        self._writer.writerow([archivo, linea, consecutivo, "; ".join(errores)])
+        self.cantidad += 1
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class ImportService:
+    """Importa archivos planos FURIPS1/FURIPS2 por lotes."""
+
+    TAMANO_LOTE = 1000
+
+    def __init__(self, session: Optional[Session], tamano_lote: int = TAMANO_LOTE):
+        """
+        Args:
+            session: sesión de la BD principal (None solo para `validar`).
+        """
+        self.session = session
+        self.tamano_lote = tamano_lote
+        self.validador = ValidadorLote()
+        self.settings = get_settings()
+        self._catalogos: Optional[Dict[str, Dict[str, int]]] = None
+        # (prestador_id, consecutivo) -> accidente_id creados en esta importación
+        self._consecutivos: Dict[Tuple[int, str], int] = {}
+
+    # ========================================================================
+    # API PÚBLICA
+    # ========================================================================
+
+    def importar(
+        self,
+        furips1: Optional[Path] = None,
+        furips2: Optional[Path] = None,
+        codigo_habilitacion: Optional[str] = None,
+        archivo_errores: Optional[Path] = None,
+    ) -> ResultadoImportacionDTO:
+        """
+        Importa un archivo FURIPS1 y/o FURIPS2.
+
+        Args:
+            furips1: archivo de accidentes (encabezado, víctima, vehículo, totales).
+            furips2: archivo de detalles. Sus consecutivos se resuelven contra el
+                prestador `codigo_habilitacion` o, si no se indica, contra el
+                único prestador del FURIPS1 importado en la misma llamada.
+            archivo_errores: CSV de filas rechazadas (por defecto en el
+                directorio de salida).
+        """
+        inicio = _time.perf_counter()
+        resultado = ResultadoImportacionDTO()
+        if archivo_errores is None:
+            archivo_errores = self.settings.get_output_dir() / (
+                f"importacion_errores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            )
+        errores = _EscritorErrores(Path(archivo_errores))
+
+        try:
+            if furips1:
+                for lote in self._lotes(Path(furips1)):
+                    resultado.lineas_leidas += len(lote)
+                    resultado.accidentes_creados += self._procesar_lote_furips1(lote, errores)
+                    logger.info(
+                        "FURIPS1: %d líneas leídas, %d accidentes creados",
+                        resultado.lineas_leidas, resultado.accidentes_creados,
+                    )
+
+            if furips2:
+                prestador_id = self._prestador_para_furips2(codigo_habilitacion)
+                for lote in self._lotes(Path(furips2)):
+                    resultado.lineas_leidas += len(lote)
+                    resultado.detalles_creados += self._procesar_lote_furips2(lote, prestador_id, errores)
+                    logger.info(
+                        "FURIPS2: %d líneas leídas, %d detalles creados",
+                        resultado.lineas_leidas, resultado.detalles_creados,
+                    )
+        finally:
+            errores.cerrar()
+
+        resultado.filas_con_error = errores.cantidad
+        resultado.archivo_errores = str(errores.ruta) if errores.cantidad else None
+        resultado.segundos = _time.perf_counter() - inicio
+        logger.info(
+            "Importación terminada en %.1f s (%.0f líneas/min, %d errores)",
+            resultado.segundos, resultado.lineas_por_minuto, resultado.filas_con_error,
+        )
+        return resultado
+
+    def validar(
+        self,
+        furips1: Optional[Path] = None,
+        furips2: Optional[Path] = None,
+        archivo_errores: Optional[Path] = None,
+    ) -> ResultadoImportacionDTO:
+        """
+        Valida archivos FURIPS1 y/o FURIPS2 sin importarlos.
+
+        Revisa el formato de los campos y las reglas de la circular; no resuelve
+        catálogos ni consecutivos (no usa la BD). Los contadores de creados
+        quedan en cero.
+        """
+        inicio = _time.perf_counter()
+        resultado = ResultadoImportacionDTO()
+        if archivo_errores is None:
+            archivo_errores = self.settings.get_output_dir() / (
+                f"validacion_errores_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            )
+        errores = _EscritorErrores(Path(archivo_errores))
+
+        try:
+            for archivo, ruta, validar_lote in (
+                ("FURIPS1", furips1, self._validar_lote_furips1),
+                ("FURIPS2", furips2, self._validar_lote_furips2),
+            ):
+                if not ruta:
+                    continue
+                for lote in self._lotes(Path(ruta)):
+                    resultado.lineas_leidas += len(lote)
+                    for numero, registro, lista in validar_lote(lote, errores):
+                        if lista:
+                            errores.escribir(archivo, numero, registro["numero_consecutivo"], lista)
+                    logger.info("%s: %d líneas validadas, %d errores", archivo, resultado.lineas_leidas, errores.cantidad)
+        finally:
+            errores.cerrar()
+
+        resultado.filas_con_error = errores.cantidad
+        resultado.archivo_errores = str(errores.ruta) if errores.cantidad else None
+        resultado.segundos = _time.perf_counter() - inicio
+        return resultado
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def _lotes(self, ruta: Path) -> Iterator[List[Tuple[int, List[str]]]]:
+        """Lee el archivo como flujo y entrega lotes de (número de línea, campos)."""
+        lote: List[Tuple[int, List[str]]] = []
+        with open(ruta, "r", encoding=CODIFICACION, newline="") as archivo:
+            for numero, linea in enumerate(archivo, start=1):
+                linea = linea.rstrip("\r\n")
+                if not linea.strip():
+                    continue
+                lote.append((numero, [c.strip() for c in linea.split(SEPARADOR)]))
+                if len(lote) >= self.tamano_lote:
+                    yield lote
+                    lote = []
+        if lote:
+            yield lote
+
+    def _cargar_catalogos(self) -> Dict[str, Dict[str, int]]:
+        """Mapas código -> id de los catálogos (una consulta por catálogo)."""
+        if self._catalogos is None:
+            def mapa(col_codigo, col_id) -> Dict[str, int]:
+                return {codigo: id_ for codigo, id_ in self.session.query(col_codigo, col_id).all()}
+
+            self._catalogos = {
+                "prestador": mapa(PrestadorSalud.codigo_habilitacion, PrestadorSalud.id),
+                "tipo_identificacion": mapa(TipoIdentificacion.codigo, TipoIdentificacion.id),
+                "sexo": mapa(Sexo.codigo, Sexo.id),
+                "naturaleza": mapa(NaturalezaEvento.codigo, NaturalezaEvento.id),
+                "estado_aseguramiento": mapa(EstadoAseguramiento.codigo, EstadoAseguramiento.id),
+                "tipo_vehiculo": mapa(TipoVehiculo.codigo, TipoVehiculo.id),
+                "tipo_servicio": mapa(TipoServicio.codigo, TipoServicio.id),
+                "municipio": mapa(Municipio.codigo_dane, Municipio.id),
+            }
+        return self._catalogos
+
+    # ========================================================================
+    # FURIPS1
+    # ========================================================================
+
+    def _convertir_furips1(self, campos: List[str]) -> Tuple[Optional[dict], List[str]]:
+        """
+        Convierte los campos de una línea FURIPS1 (fechas, horas, valores).
+
+        Retorna (registro, errores); el registro es None si la línea no se pudo leer.
+        """
+        if len(campos) != len(COLUMNAS_FURIPS1):
+            return None, [f"Se esperaban {len(COLUMNAS_FURIPS1)} campos y se recibieron {len(campos)}"]
+
+        c = dict(zip(COLUMNAS_FURIPS1, campos))
+        try:
+            for nombre in ("fecha_evento", "vigencia_inicio", "vigencia_fin", "fecha_nacimiento"):
+                c[nombre] = _fecha(c[nombre])
+            c["hora_evento"] = _hora(c["hora_evento"])
+            for nombre in (
+                "total_facturado_gmq", "total_reclamado_gmq",
+                "total_facturado_transporte", "total_reclamado_transporte",
+            ):
+                c[nombre] = _entero(c[nombre])
+        except ValueError as e:
+            return None, [f"Formato inválido: {e}"]
+
+        errores: List[str] = []
+        if not c["fecha_evento"] or not c["hora_evento"]:
+            errores.append("La fecha y hora del evento son obligatorias")
+        if not c["fecha_nacimiento"]:
+            errores.append("La fecha de nacimiento de la víctima es obligatoria")
+        if not c["numero_identificacion"] or not c["primer_nombre"] or not c["primer_apellido"]:
+            errores.append("Documento, primer nombre y primer apellido de la víctima son obligatorios")
+        return c, errores
+
+    def _resolver_furips1(self, c: dict) -> Tuple[Optional[dict], List[str]]:
+        """Resuelve los catálogos de un registro ya validado y arma las filas a insertar."""
+        cat = self._cargar_catalogos()
+        errores: List[str] = []
+
+        def resolver(catalogo: str, codigo: str, nombre: str, obligatorio: bool = True) -> Optional[int]:
+            if not codigo:
+                if obligatorio:
+                    errores.append(f"{nombre} es obligatorio")
+                return None
+            id_ = cat[catalogo].get(codigo)
+            if id_ is None:
+                errores.append(f"{nombre} '{codigo}' no existe")
+            return id_
+
+        prestador_id = resolver("prestador", c["codigo_habilitacion"], "Prestador")
+        naturaleza_id = resolver("naturaleza", c["naturaleza_codigo"], "Naturaleza del evento")
+        municipio_evento_id = resolver("municipio", c["municipio_evento_dane"], "Municipio del evento")
+        estado_aseg_id = resolver("estado_aseguramiento", c["estado_aseguramiento_codigo"], "Estado de aseguramiento")
+        tipo_vehiculo_id = resolver("tipo_vehiculo", c["tipo_vehiculo_codigo"], "Tipo de vehículo", obligatorio=False)
+        tipo_id = resolver("tipo_identificacion", c["tipo_identificacion_codigo"], "Tipo de identificación")
+        sexo_id = resolver("sexo", c["sexo_codigo"], "Sexo")
+        municipio_residencia_id = resolver("municipio", c["municipio_residencia_dane"], "Municipio de residencia")
+
+        if errores:
+            return None, errores
+
+        return {
+            "accidente": {
+                "prestador_id": prestador_id,
+                "numero_consecutivo": c["numero_consecutivo"],
+                "numero_factura": c["numero_factura"],
+                "numero_rad_siras": c["numero_rad_siras"],
+                "naturaleza_evento_id": naturaleza_id,
+                "descripcion_otro_evento": c["descripcion_otro_evento"] or None,
+                "fecha_evento": c["fecha_evento"],
+                "hora_evento": c["hora_evento"],
+                "municipio_evento_id": municipio_evento_id,
+                "direccion_evento": c["direccion_evento"],
+                "zona": c["zona"] or None,
+                "estado_aseguramiento_id": estado_aseg_id,
+                "estado": 1,
+            },
+            "vehiculo": {
+                "placa": c["placa"],
+                "tipo_vehiculo_id": tipo_vehiculo_id,
+                "aseguradora_codigo": c["aseguradora_codigo"] or None,
+                "numero_poliza": c["numero_poliza"] or None,
+                "vigencia_inicio": c["vigencia_inicio"],
+                "vigencia_fin": c["vigencia_fin"],
+                "estado_aseguramiento_id": estado_aseg_id,
+                "estado": 1,
+            } if c["placa"] else None,
+            "persona": {
+                "tipo_identificacion_id": tipo_id,
+                "numero_identificacion": c["numero_identificacion"],
+                "primer_nombre": c["primer_nombre"],
+                "segundo_nombre": c["segundo_nombre"] or None,
+                "primer_apellido": c["primer_apellido"],
+                "segundo_apellido": c["segundo_apellido"] or None,
+                "sexo_id": sexo_id,
+                "fecha_nacimiento": c["fecha_nacimiento"],
+                "direccion": c["direccion"] or "N/A",
+                "telefono": c["telefono"] or "N/A",
+                "municipio_residencia_id": municipio_residencia_id,
+            },
+            "condicion_codigo": c["condicion_codigo"] or None,
+            "totales": {
+                "total_facturado_gmq": c["total_facturado_gmq"],
+                "total_reclamado_gmq": c["total_reclamado_gmq"],
+                "total_facturado_transporte": c["total_facturado_transporte"],
+                "total_reclamado_transporte": c["total_reclamado_transporte"],
+                "manifestacion_servicios": c["manifestacion_servicios"] == "1",
+                "descripcion_evento": c["descripcion_evento"],
+            },
+        }, []
+
+    def _validar_lote_furips1(
+        self, lote: List[Tuple[int, List[str]]], errores: _EscritorErrores
+    ) -> List[Tuple[int, dict, List[str]]]:
+        """
+        Convierte y valida un lote FURIPS1 (sin BD). Las líneas ilegibles van
+        directo al archivo de errores; retorna (línea, registro, errores) del resto.
+        """
+        registros: List[Tuple[int, dict, List[str]]] = []
+        for numero, campos in lote:
+            registro, lista = self._convertir_furips1(campos)
+            if registro is None:
+                errores.escribir("FURIPS1", numero, campos[1] if len(campos) > 1 else "", lista)
+            else:
+                registros.append((numero, registro, lista))
+
+        # Reglas de la circular sobre todo el lote a la vez
+        matriz = self.validador.validar_accidentes(
+            a_columnas([r for _, r, _ in registros], COLUMNAS_FURIPS1)
+        )
+        return [
+            (numero, registro, matriz.mensajes(i) + lista)
+            for i, (numero, registro, lista) in enumerate(registros)
+        ]
+
+    def _procesar_lote_furips1(self, lote: List[Tuple[int, List[str]]], errores: _EscritorErrores) -> int:
+        """Valida e inserta un lote FURIPS1 en una transacción. Retorna accidentes creados."""
+        validas: List[Tuple[int, dict]] = []
+        for numero, registro, lista in self._validar_lote_furips1(lote, errores):
+            if not lista:
+                fila, lista = self._resolver_furips1(registro)
+            if lista:
+                errores.escribir("FURIPS1", numero, registro["numero_consecutivo"], lista)
+            else:
+                validas.append((numero, fila))
+        if not validas:
+            return 0
+
+        # Consecutivos repetidos (en el archivo o ya existentes en BD)
+        claves = [(f["accidente"]["prestador_id"], f["accidente"]["numero_consecutivo"]) for _, f in validas]
+        # Los anulados también ocupan el consecutivo (llave única)
+        existentes = self._ids_accidentes(claves, incluir_inactivos=True)
+        vistos = set()
+        nuevas: List[Tuple[int, dict]] = []
+        for (numero, fila), clave in zip(validas, claves):
+            if clave in existentes or clave in self._consecutivos or clave in vistos:
+                errores.escribir("FURIPS1", numero, clave[1], [f"El consecutivo '{clave[1]}' ya existe para el prestador"])
+                continue
+            vistos.add(clave)
+            nuevas.append((numero, fila))
+        if not nuevas:
+            return 0
+
+        try:
+            personas = self._resolver_personas([f["persona"] for _, f in nuevas])
+            vehiculos = self._resolver_vehiculos([f["vehiculo"] for _, f in nuevas if f["vehiculo"]])
+
+            filas_accidente = []
+            for _, fila in nuevas:
+                accidente = dict(fila["accidente"])
+                accidente["vehiculo_id"] = vehiculos.get(fila["vehiculo"]["placa"]) if fila["vehiculo"] else None
+                filas_accidente.append(accidente)
+            self.session.execute(insert(Accidente), filas_accidente)
+            ids = self._ids_accidentes([(a["prestador_id"], a["numero_consecutivo"]) for a in filas_accidente])
+
+            filas_victima, filas_totales = [], []
+            for accidente, (_, fila) in zip(filas_accidente, nuevas):
+                accidente_id = ids[(accidente["prestador_id"], accidente["numero_consecutivo"])]
+                persona = fila["persona"]
+                filas_victima.append({
+                    "accidente_id": accidente_id,
+                    "persona_id": personas[(persona["tipo_identificacion_id"], persona["numero_identificacion"])],
+                    "condicion_codigo": fila["condicion_codigo"],
+                    "estado": 1,
+                })
+                filas_totales.append({"accidente_id": accidente_id, **fila["totales"]})
+            self.session.execute(insert(AccidenteVictima), filas_victima)
+            self.session.execute(insert(AccidenteTotales), filas_totales)
+
+            AccidenteResumenRepository(self.session).refrescar_lote(ids.values())
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.exception("Lote FURIPS1 rechazado")
+            for numero, fila in nuevas:
+                errores.escribir("FURIPS1", numero, fila["accidente"]["numero_consecutivo"], [f"Lote rechazado: {e}"])
+            return 0
+
+        self._consecutivos.update(ids)
+        return len(ids)
+
+    def _ids_accidentes(
+        self, claves: List[Tuple[int, str]], incluir_inactivos: bool = False
+    ) -> Dict[Tuple[int, str], int]:
+        """(prestador_id, consecutivo) -> id de los accidentes existentes."""
+        if not claves:
+            return {}
+        filas = (
+            self.session.query(Accidente.prestador_id, Accidente.numero_consecutivo, Accidente.id)
+            .filter(tuple_(Accidente.prestador_id, Accidente.numero_consecutivo).in_(set(claves)))
+            .execution_options(incluir_inactivos=incluir_inactivos)
+            .all()
+        )
+        return {(p, c): i for p, c, i in filas}
+
+    def _resolver_personas(self, personas: List[dict]) -> Dict[Tuple[int, str], int]:
+        """
+        (tipo_id, numero) -> persona_id. Las personas existentes se reutilizan
+        sin modificar; las nuevas se insertan en el mismo INSERT multi-fila.
+        """
+        return PersonaRepository(self.session).upsert_lote(
+            personas, actualizar=False, tamano_lote=self.tamano_lote
+        )
+
+    def _resolver_vehiculos(self, vehiculos: List[dict]) -> Dict[str, int]:
+        """placa -> vehiculo_id; los vehículos nuevos se insertan con executemany."""
+        if not vehiculos:
+            return {}
+
+        def ids(placas) -> Dict[str, int]:
+            filas = (
+                self.session.query(Vehiculo.placa, Vehiculo.id)
+                .filter(Vehiculo.placa.in_(set(placas)))
+                .execution_options(incluir_inactivos=True)  # placa es única
+                .all()
+            )
+            return {p: i for p, i in filas}
+
+        mapa = ids(v["placa"] for v in vehiculos)
+        nuevos = {}
+        for vehiculo in vehiculos:
+            if vehiculo["placa"] not in mapa and vehiculo["placa"] not in nuevos:
+                nuevos[vehiculo["placa"]] = vehiculo
+        if nuevos:
+            self.session.execute(insert(Vehiculo), list(nuevos.values()))
+            mapa.update(ids(nuevos.keys()))
+        return mapa
+
+    # ========================================================================
+    # FURIPS2
+    # ========================================================================
+
+    def _prestador_para_furips2(self, codigo_habilitacion: Optional[str]) -> int:
+        """Prestador contra el que se resuelven los consecutivos del FURIPS2."""
+        if codigo_habilitacion:
+            prestador_id = self._cargar_catalogos()["prestador"].get(codigo_habilitacion)
+            if prestador_id is None:
+                raise ValueError(f"Prestador '{codigo_habilitacion}' no existe")
+            return prestador_id
+
+        prestadores = {p for p, _ in self._consecutivos}
+        if len(prestadores) != 1:
+            raise ValueError(
+                "Indique el código de habilitación del prestador para importar el FURIPS2"
+            )
+        return prestadores.pop()
+
+    def _convertir_furips2(self, campos: List[str]) -> Tuple[Optional[dict], List[str]]:
+        """Convierte los campos de una línea FURIPS2; el registro es None si no se pudo leer."""
+        if len(campos) != len(COLUMNAS_FURIPS2):
+            return None, [f"Se esperaban {len(COLUMNAS_FURIPS2)} campos y se recibieron {len(campos)}"]
+        c = dict(zip(COLUMNAS_FURIPS2, campos))
+        try:
+            for nombre in ("cantidad", "valor_unitario", "valor_facturado", "valor_reclamado"):
+                c[nombre] = _entero(c[nombre])
+        except ValueError as e:
+            return None, [f"Formato inválido: {e}"]
+        return c, []
+
+    def _validar_lote_furips2(
+        self, lote: List[Tuple[int, List[str]]], errores: _EscritorErrores
+    ) -> List[Tuple[int, dict, List[str]]]:
+        """Igual que `_validar_lote_furips1` para un lote FURIPS2."""
+        registros: List[Tuple[int, dict]] = []
+        for numero, campos in lote:
+            registro, lista = self._convertir_furips2(campos)
+            if registro is None:
+                errores.escribir("FURIPS2", numero, campos[0] if campos else "", lista)
+            else:
+                registros.append((numero, registro))
+
+        matriz = self.validador.validar_detalles(a_columnas([c for _, c in registros], COLUMNAS_FURIPS2))
+        return [(numero, c, matriz.mensajes(i)) for i, (numero, c) in enumerate(registros)]
+
+    def _procesar_lote_furips2(
+        self, lote: List[Tuple[int, List[str]]], prestador_id: int, errores: _EscritorErrores
+    ) -> int:
+        """Valida e inserta un lote FURIPS2 en una transacción. Retorna detalles creados."""
+        cat = self._cargar_catalogos()
+
+        # Accidentes y procedimientos del lote: una consulta para cada uno
+        consecutivos = {campos[0] for _, campos in lote if campos}
+        pendientes = [(prestador_id, c) for c in consecutivos if (prestador_id, c) not in self._consecutivos]
+        # Sin copiar el mapa de la importación (crece con cada lote FURIPS1)
+        accidentes = ChainMap(self._ids_accidentes(pendientes), self._consecutivos)
+        codigos = {campos[2] for _, campos in lote if len(campos) > 2 and campos[2]}
+        procedimientos = dict(
+            self.session.query(Procedimiento.codigo, Procedimiento.id)
+            .filter(Procedimiento.codigo.in_(codigos), Procedimiento.estado == "ACTIVO")
+            .all()
+        ) if codigos else {}
+
+        filas = []
+        lineas = []
+        for numero, c, lista in self._validar_lote_furips2(lote, errores):
+            consecutivo = c["numero_consecutivo"]
+            accidente_id = accidentes.get((prestador_id, consecutivo))
+            if accidente_id is None:
+                lista.append(f"No existe accidente con consecutivo '{consecutivo}'")
+            tipo_servicio_id = cat["tipo_servicio"].get(c["tipo_servicio_codigo"])
+            if tipo_servicio_id is None:
+                lista.append(f"Tipo de servicio '{c['tipo_servicio_codigo']}' no existe")
+            if lista:
+                errores.escribir("FURIPS2", numero, consecutivo, lista)
+                continue
+
+            filas.append({
+                "accidente_id": accidente_id,
+                "tipo_servicio_id": tipo_servicio_id,
+                "procedimiento_id": procedimientos.get(c["codigo_servicio"]),
+                "codigo_servicio": c["codigo_servicio"] or None,
+                "descripcion": c["descripcion"] or None,
+                "cantidad": c["cantidad"],
+                "valor_unitario": c["valor_unitario"],
+                "valor_facturado": c["valor_facturado"],
+                "valor_reclamado": c["valor_reclamado"],
+                "estado": 1,
+            })
+            lineas.append((numero, consecutivo))
+
+        if not filas:
+            return 0
+
+        try:
+            self.session.execute(insert(AccidenteDetalle), filas)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.exception("Lote FURIPS2 rechazado")
+            for numero, consecutivo in lineas:
+                errores.escribir("FURIPS2", numero, consecutivo, [f"Lote rechazado: {e}"])
+            return 0
+        return len(filas)
@@ -0,0 +1,94 @@
+"""
+Caché de personas por accidente.
+
+La misma persona suele ser víctima, conductor y propietario del mismo
+accidente. AccidentePresenter crea una caché por accidente abierto y la
+comparte con las pestañas de víctima, conductor, propietario y vehículo: la
+primera búsqueda consulta la BD y las siguientes (en cualquier pestaña, por
+documento o por id) se responden desde memoria.
+
+Las entradas son dicts con el formato de `PersonaRepository.get_datos_*`.
+Se invalidan al guardar la persona y se descartan al cambiar de accidente.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.db import get_db_session
+from app.data.repositories.persona_repo import PersonaRepository
+
+
+class PersonaCache:
+    """Personas consultadas durante la edición de un accidente (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._por_id: Dict[int, dict] = {}
+        self._id_por_documento: Dict[Tuple[int, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._por_id)
+
+    # ------------------------------------------------------------------
+    # Consulta (las búsquedas corren en hilos del pool de búsquedas)
+    # ------------------------------------------------------------------
+
+    def por_documento(self, tipo_id: int, numero: str, session: Optional[Session] = None) -> Optional[dict]:
+        """Datos de la persona por documento; consulta la BD solo la primera vez."""
+        with self._lock:
+            persona_id = self._id_por_documento.get((tipo_id, numero))
+            datos = self._por_id.get(persona_id) if persona_id else None
+        if datos is None:
+            datos = self._cargar(lambda repo: repo.get_datos_by_documento(tipo_id, numero), session)
+        return dict(datos) if datos else None
+
+    def por_id(self, persona_id: int, session: Optional[Session] = None) -> Optional[dict]:
+        """Datos de la persona por id; consulta la BD solo la primera vez."""
+        if not persona_id:
+            return None
+        with self._lock:
+            datos = self._por_id.get(persona_id)
+        if datos is None:
+            datos = self._cargar(lambda repo: repo.get_datos_by_id(persona_id), session)
+        return dict(datos) if datos else None
+
+    def _cargar(self, consulta, session: Optional[Session]) -> Optional[dict]:
+        if session is not None:
+            datos = consulta(PersonaRepository(session))
+        else:
+            with get_db_session() as nueva:
+                datos = consulta(PersonaRepository(nueva))
+        if datos:
+            self.guardar(datos)
+        return datos
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+
+    def guardar(self, datos: dict):
+        """Agrega (o reemplaza) una persona ya leída por cualquier pestaña."""
+        persona_id = datos.get("id")
+        if not persona_id:
+            return
+        with self._lock:
+            self._por_id[persona_id] = dict(datos)
+            documento = (datos.get("tipo_identificacion_id"), datos.get("numero_identificacion"))
+            if all(documento):
+                self._id_por_documento[documento] = persona_id
+
+    def invalidar(self, persona_id: Optional[int]):
+        """Descarta una persona (después de guardarla)."""
+        if not persona_id:
+            return
+        with self._lock:
+            self._por_id.pop(persona_id, None)
+            for documento in [d for d, i in self._id_por_documento.items() if i == persona_id]:
+                del self._id_por_documento[documento]
+
+    def limpiar(self):
+        """Descarta todo (al cambiar de accidente)."""
+        with self._lock:
+            self._por_id.clear()
+            self._id_por_documento.clear()
@@ -6,8 +6,8 @@ que proviene del usuario (modo `furips_cte`).
 
 from pathlib import Path
 from typing import Dict, Any, Optional
-import traceback
 import datetime
+import logging
 
 from app.config.settings import get_settings
 from app.config.db import get_db_session
@@ -15,6 +15,8 @@ from app.infra.pdf.stamper import PDFStamper
 from app.data.repositories.accidente_repo import AccidenteRepository
 from sqlalchemy import text
 
+logger = logging.getLogger(__name__)
+
 
 class PrintService:
     def __init__(self) -> None:
@@ -44,26 +46,24 @@ class PrintService:
                 output_path = output_dir / f"furips_{cte_id}_{tipo}.pdf"
 
                 # Logear el id tomado de la consulta para depuración
-                print(f"[PrintService] idAccidente desde CTE: {cte_id}")
+                logger.debug("idAccidente desde CTE: %s", cte_id)
 
                 template = self.settings.get_pdf_template_path("furips2")
-                print(f"[PrintService] plantilla: {template}")
-                print(f"[PrintService] output_path: {output_path}")
+                logger.debug("plantilla: %s | output_path: %s", template, output_path)
                 if not Path(template).exists():
                     # Intentar crear una plantilla mínima de prueba automáticamente
                     try:
                         Path(template).parent.mkdir(parents=True, exist_ok=True)
-                        print(f"[PrintService] Plantilla no encontrada, creando plantilla de prueba en {template}")
+                        logger.warning("Plantilla no encontrada, creando plantilla de prueba en %s", template)
                         try:
                             import fitz
                             doc = fitz.open()
                             doc.new_page()
                             doc.save(str(template))
                             doc.close()
-                            print(f"[PrintService] Plantilla de prueba creada: {template}")
+                            logger.info("Plantilla de prueba creada: %s", template)
                         except Exception as e:
-                            print("[PrintService] No se pudo crear la plantilla automática:")
-                            traceback.print_exc()
+                            logger.exception("No se pudo crear la plantilla automática")
                             raise FileNotFoundError(f"No such file: '{template}' - could not create placeholder (see console)")
                     except Exception:
                         # Si no podemos crear la carpeta/archivo, informar al usuario
@@ -71,7 +71,6 @@ class PrintService:
 
                 # Si existe la imagen de encabezado, generar desde cero usando esa imagen.
                 image_path = Path("imagenes") / "Encabezado_Furips.png"
-                print("[PrintService] Llamando a estampar_furips_desde_cero (si existe la imagen)...")
                 try:
                     if image_path.exists():
                         saved = self.stamper.estampar_furips_desde_cero(image_path, output_path, datos)
@@ -79,10 +78,9 @@ class PrintService:
                         # Si no hay imagen, usar el flujo anterior con plantilla (si existe)
                         saved = self.stamper.estampar_furips2(template, output_path, datos)
                 except Exception:
-                    print("[PrintService] Error durante el estampeo:")
-                    traceback.print_exc()
+                    logger.exception("Error durante el estampeo")
                     raise
-                print(f"[PrintService] PDF guardado en: {saved}")
+                logger.info("PDF guardado en: %s", saved)
                 return Path(saved)
 
             repo = AccidenteRepository(session)
@@ -384,23 +382,17 @@ class PrintService:
                    
         """)
 
-        # Debug: show SQL and params
-        try:
-            print("[PrintService] Ejecutando CTE SQL:")
-            print(sql)
-            print("[PrintService] Params:", {"accidente_id": accidente_id})
-        except Exception:
-            pass
+        logger.debug("Ejecutando CTE FURIPS para accidente_id=%s", accidente_id)
 
         try:
             result = session.execute(sql, {"accidente_id": accidente_id})
-        except Exception as e:
-            print("[PrintService] Error ejecutando SQL:")
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error ejecutando la CTE FURIPS (accidente_id=%s)", accidente_id)
             raise
 
         mapping = result.mappings().first()
-        print("[PrintService] RowMapping first():", dict(mapping) if mapping is not None else None)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fila de la CTE: %s", dict(mapping) if mapping is not None else None)
         if mapping is None:
             return None
 
@@ -475,11 +467,9 @@ class PrintService:
         datos["idAccidente"] = mapping.get("idAccidente") or mapping.get("idAccidenteTotal") or accidente_id
 
         # Debug: mostrar un resumen de datos esenciales antes de devolver
-        try:
+        if logger.isEnabledFor(logging.DEBUG):
             resumen = {k: datos.get(k) for k in ("idAccidente", "codigo_habilitacion", "razon_social", "consecutivo", "placa")}
-            print("[PrintService] Datos resumen:", resumen)
-        except Exception:
-            pass
+            logger.debug("Datos resumen: %s", resumen)
 
         # Asegurar clave 'prestador' para el stamper (FURIPS2 espera esta clave)
         datos["prestador"] = datos.get("razon_social", "")
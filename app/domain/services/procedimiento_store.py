@@ -0,0 +1,236 @@
+"""
+Almacén compacto de procedimientos (CUPS/SOAT) para el selector de detalles.
+
+En lugar de miles de objetos ORM o dicts (uno por procedimiento), guarda los
+datos por columnas: ids y valores en `array('q')` y los textos empaquetados en
+un único str por columna con sus desplazamientos en `array('I')`. Los dicts se
+construyen solo para la fila que el usuario selecciona.
+
+La primera carga lee la réplica local (SQLite) si existe, así el selector no
+espera la red; ReplicaService la mantiene al día y reemplaza el almacén
+compartido cuando la tabla cambia.
+"""
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.config.db import get_db_session
+from app.data.repositories.procedimiento_repo import ProcedimientoRepository
+from app.infra.replica_local import replica_compartida
+from app.utils.texto import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+# Nombre del catálogo en la réplica local y columnas de cada fila
+CATALOGO_REPLICA = "procedimientos"
+COLUMNAS = ("id", "codigo", "descripcion", "codigo_soat", "valor")
+
+
+_SEPARADOR = "\n"
+
+
+class _ColumnaTexto:
+    """Columna de textos empaquetada en un solo str (una fila por línea)."""
+
+    __slots__ = ("_blob", "_inicios")
+
+    def __init__(self, valores: Iterable[Optional[str]]):
+        partes = []
+        inicios = array("I")
+        pos = 0
+        for valor in valores:
+            valor = (valor or "").replace(_SEPARADOR, " ")
+            inicios.append(pos)
+            partes.append(valor)
+            pos += len(valor) + 1
+        inicios.append(pos)
+        self._blob = _SEPARADOR.join(partes) + _SEPARADOR if partes else ""
+        self._inicios = inicios
+
+    def __len__(self) -> int:
+        return len(self._inicios) - 1
+
+    def __getitem__(self, fila: int) -> str:
+        return self._blob[self._inicios[fila]:self._inicios[fila + 1] - 1]
+
+    def filas_que_contienen(self, termino: str) -> Iterator[int]:
+        """Filas cuyo texto contiene `termino` (una sola pasada sobre el blob)."""
+        blob = self._blob
+        pos = blob.find(termino)
+        while pos != -1:
+            fila = bisect_right(self._inicios, pos) - 1
+            yield fila
+            # Continuar desde el inicio de la fila siguiente
+            pos = blob.find(termino, self._inicios[fila + 1])
+
+    def fila_exacta(self, valor: str) -> Optional[int]:
+        """Primera fila cuyo texto es exactamente `valor`."""
+        buscado = valor + _SEPARADOR
+        pos = self._blob.find(buscado)
+        while pos != -1:
+            fila = bisect_right(self._inicios, pos) - 1
+            if self._inicios[fila] == pos:
+                return fila
+            pos = self._blob.find(buscado, pos + 1)
+        return None
+
+
+class ProcedimientoStore:
+    """
+    Procedimientos activos en memoria, por columnas.
+
+    Las filas provienen de `ProcedimientoRepository.get_todos_activos_compacto`:
+    (id, codigo, descripcion, codigo_soat, valor).
+    """
+
+    _compartido: Optional["ProcedimientoStore"] = None
+    _lock = threading.Lock()
+
+    def __init__(self, filas: Iterable[tuple]):
+        ids = array("q")
+        valores = array("q")
+        codigos, descripciones, soats = [], [], []
+        for id_, codigo, descripcion, codigo_soat, valor in filas:
+            ids.append(id_)
+            valores.append(int(valor or 0))
+            codigos.append(codigo)
+            descripciones.append(descripcion)
+            soats.append(codigo_soat)
+
+        self._ids = ids
+        self._valores = valores
+        self._codigos = _ColumnaTexto(codigos)
+        self._descripciones = _ColumnaTexto(descripciones)
+        self._soats = _ColumnaTexto(soats)
+        # Texto de búsqueda normalizado (minúsculas, sin tildes): "codigo descripcion soat"
+        self._busqueda = _ColumnaTexto(
+            normalizar_texto(f"{c or ''} {d or ''} {s or ''}")
+            for c, d, s in zip(codigos, descripciones, soats)
+        )
+
+    # ------------------------------------------------------------------
+    # Carga compartida
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def consultar(session: Session) -> List[dict]:
+        """Procedimientos activos como dicts (formato de la réplica local)."""
+        return [
+            dict(zip(COLUMNAS, fila))
+            for fila in ProcedimientoRepository(session).get_todos_activos_compacto()
+        ]
+
+    @classmethod
+    def desde_dicts(cls, filas: Iterable[dict]) -> "ProcedimientoStore":
+        return cls(tuple(fila[c] for c in COLUMNAS) for fila in filas)
+
+    @classmethod
+    def compartido(cls) -> "ProcedimientoStore":
+        """Retorna el almacén de la aplicación; la primera vez lo lee de la réplica local o de la BD."""
+        store = cls._compartido
+        if store is None:
+            with cls._lock:
+                store = cls._compartido
+                if store is None:
+                    filas = replica_compartida().leer(CATALOGO_REPLICA)
+                    if filas is None:
+                        with get_db_session() as session:
+                            filas = cls.consultar(session)
+                        replica_compartida().guardar(CATALOGO_REPLICA, filas)
+                    store = cls.desde_dicts(filas)
+                    cls._compartido = store
+                    logger.info("%d procedimientos cargados en memoria", len(store))
+        return store
+
+    @classmethod
+    def cargado(cls) -> Optional["ProcedimientoStore"]:
+        """El almacén compartido si ya se cargó (None sin consultar nada)."""
+        return cls._compartido
+
+    @classmethod
+    def actualizar(cls, filas: Iterable[dict]):
+        """
+        Reemplaza el almacén compartido (lo usa la sincronización de la réplica).
+        Los selectores ya construidos conservan el anterior hasta que se recrean.
+        """
+        store = cls.desde_dicts(filas)
+        with cls._lock:
+            cls._compartido = store
+
+    @classmethod
+    def invalidar(cls):
+        """Descarta el almacén compartido (y su réplica) para forzar una nueva consulta."""
+        with cls._lock:
+            cls._compartido = None
+            replica_compartida().descartar(CATALOGO_REPLICA)
+
+    # ------------------------------------------------------------------
+    # Acceso por fila
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def id(self, fila: int) -> int:
+        return self._ids[fila]
+
+    def codigo(self, fila: int) -> str:
+        return self._codigos[fila]
+
+    def descripcion(self, fila: int) -> str:
+        return self._descripciones[fila]
+
+    def valor(self, fila: int) -> int:
+        return self._valores[fila]
+
+    def texto(self, fila: int) -> str:
+        """Texto a mostrar en el selector."""
+        return f"{self._codigos[fila]} - {self._descripciones[fila]} (${self._valores[fila]:,})"
+
+    def como_dict(self, fila: int) -> dict:
+        """Dict con el mismo formato que usaba el combo de procedimientos."""
+        return {
+            "id": self._ids[fila],
+            "codigo": self._codigos[fila],
+            "descripcion": self._descripciones[fila],
+            "codigo_soat": self._soats[fila] or None,
+            "valor": self._valores[fila],
+        }
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+
+    def filas_coincidentes(self, termino: str) -> Optional[Set[int]]:
+        """
+        Filas cuyo código, descripción o código SOAT contienen el término,
+        sin distinguir mayúsculas ni tildes (como la collation de MySQL).
+
+        Returns:
+            Conjunto de filas, o None si el término está vacío (sin filtro).
+        """
+        termino = normalizar_texto((termino or "").replace(_SEPARADOR, " ").strip())
+        if not termino:
+            return None
+        return set(self._busqueda.filas_que_contienen(termino))
+
+    def buscar(self, termino: str, limite: int) -> List[dict]:
+        """
+        Hasta `limite` procedimientos cuyo código, descripción o código SOAT
+        contienen el término, ordenados por código (como ProcedimientoRepository.buscar).
+        """
+        filas = self.filas_coincidentes(termino)
+        if filas is None:
+            return []
+        return [self.como_dict(fila) for fila in sorted(filas)[:limite]]
+
+    def fila_por_codigo(self, codigo: str) -> Optional[int]:
+        """Fila del procedimiento con el código exacto."""
+        codigo = (codigo or "").strip()
+        if not codigo:
+            return None
+        return self._codigos.fila_exacta(codigo)
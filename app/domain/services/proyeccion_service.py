@@ -1,30 +1,151 @@
 """
 Servicio para proyecciones desde BD externa.
+
+Las proyecciones (estadísticas mensuales, top de naturalezas) agregan toda la
+tabla histórica, así que se guardan en una caché compartida por todas las
+instancias del servicio, con clave (consulta, parámetros). Vencido el TTL
+(PROYECCION_CACHE_TTL) no se recalcula todo: los meses anteriores al mes en
+curso se consideran cerrados y solo se consulta desde la marca de agua (inicio
+del último mes abierto) en adelante.
+
+La BD externa no expone cuándo se insertó o corrigió una fila, así que un
+registro cargado tarde con fecha de un mes cerrado no lo ve el refresco
+incremental: cada PROYECCION_RECALCULO_COMPLETO segundos se releen también los
+meses cerrados. `invalidar` fuerza el recálculo completo de inmediato.
+
+Las consultas se hacen sin tener el lock de la caché; solo la lectura y la
+publicación de la entrada lo toman.
 """
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import Counter
+from datetime import date
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.config import get_settings
 from app.data.repositories import ProyeccionRepository
 
 
+def _inicio_mes_actual() -> date:
+    return date.today().replace(day=1)
+
+
 class ProyeccionService:
     """Servicio para consultas y proyecciones desde BD externa (READ-ONLY)."""
     
-    def __init__(self, session_ext: Session):
+    # (consulta, parámetros) -> entrada; compartida por todas las instancias
+    _cache: Dict[Tuple[str, tuple], Dict[str, Any]] = {}
+    _lock = threading.Lock()
+    # Aumenta con cada invalidar(): un cálculo que empezó antes no se publica
+    _generacion = 0
+    
+    def __init__(
+        self,
+        session_ext: Session,
+        ttl: Optional[int] = None,
+        recalculo_completo: Optional[int] = None,
+    ):
         """
         Args:
             session_ext: Sesión de BD externa (READ-ONLY)
+            ttl: Segundos de vigencia de la caché (por defecto PROYECCION_CACHE_TTL)
+            recalculo_completo: Segundos antes de releer los meses cerrados
+                (por defecto PROYECCION_RECALCULO_COMPLETO)
         """
+        settings = get_settings()
         self.proyeccion_repo = ProyeccionRepository(session_ext)
+        self.ttl = settings.PROYECCION_CACHE_TTL if ttl is None else ttl
+        self.recalculo_completo = (
+            settings.PROYECCION_RECALCULO_COMPLETO if recalculo_completo is None else recalculo_completo
+        )
+    
+    @classmethod
+    def invalidar(cls):
+        """Descarta todas las proyecciones en caché (el próximo acceso recalcula todo)."""
+        with cls._lock:
+            cls._cache.clear()
+            cls._generacion += 1
+    
+    def _vigente(self, entrada: Optional[Dict[str, Any]]) -> bool:
+        return entrada is not None and time.monotonic() < entrada["vence"]
+    
+    def _leer(self, clave: Tuple[str, tuple]) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Entrada en caché y generación actual. Las entradas no se modifican una vez publicadas."""
+        with self._lock:
+            return self._cache.get(clave), self._generacion
+    
+    def _publicar(self, clave: Tuple[str, tuple], entrada: Dict[str, Any], generacion: int):
+        with self._lock:
+            # Si se invalidó mientras se consultaba, el resultado puede venir de datos viejos
+            if generacion == self._generacion:
+                self._cache[clave] = entrada
+    
+    def _base_incremental(self, entrada: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """La entrada anterior sirve de base salvo que toque releer los meses cerrados."""
+        if entrada is None or time.monotonic() >= entrada["completo_vence"]:
+            return None
+        return entrada
+    
+    def _nueva_entrada(self, base: Optional[Dict[str, Any]], **datos) -> Dict[str, Any]:
+        ahora = time.monotonic()
+        datos["vence"] = ahora + self.ttl
+        datos["completo_vence"] = base["completo_vence"] if base else ahora + self.recalculo_completo
+        return datos
     
     def obtener_estadisticas_mensuales(self, anio: int) -> List[Dict[str, Any]]:
         """Obtiene estadísticas de accidentes por mes."""
-        return self.proyeccion_repo.get_estadisticas_accidentes_por_mes(anio)
+        if self.ttl <= 0:
+            return self.proyeccion_repo.get_estadisticas_accidentes_por_mes(anio)
+        
+        clave = ("estadisticas_mensuales", (anio,))
+        entrada, generacion = self._leer(clave)
+        if not self._vigente(entrada):
+            base = self._base_incremental(entrada)
+            inicio_anio, fin_anio = date(anio, 1, 1), date(anio + 1, 1, 1)
+            meses = dict(base["meses"]) if base else {}
+            desde = base["marca"] if base else inicio_anio
+            if desde < fin_anio:
+                # Los meses desde la marca se recalculan completos
+                meses = {m: f for m, f in meses.items() if m < desde.month}
+                for fila in self.proyeccion_repo.get_estadisticas_accidentes_por_rango(desde, fin_anio):
+                    meses[fila["mes"]] = fila
+            # Años pasados quedan cerrados (marca = fin de año); el actual, hasta el mes en curso
+            marca = min(max(_inicio_mes_actual(), inicio_anio), fin_anio)
+            entrada = self._nueva_entrada(base, meses=meses, marca=marca)
+            self._publicar(clave, entrada, generacion)
+        meses = entrada["meses"]
+        return [dict(meses[m]) for m in sorted(meses)]
     
     def obtener_top_naturalezas(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Obtiene las naturalezas de evento más frecuentes."""
-        return self.proyeccion_repo.get_top_naturalezas_evento(limit)
+        if self.ttl <= 0:
+            return self.proyeccion_repo.get_top_naturalezas_evento(limit)
+        
+        # El límite se aplica en memoria: una sola entrada sirve para cualquier top N
+        clave = ("conteo_naturalezas", ())
+        entrada, generacion = self._leer(clave)
+        if not self._vigente(entrada):
+            base = self._base_incremental(entrada)
+            marca = _inicio_mes_actual()
+            if base is None:
+                cerrado = Counter(self.proyeccion_repo.get_conteo_naturalezas_evento(hasta=marca))
+            else:
+                cerrado = base["cerrado"]
+                if marca > base["marca"]:
+                    # Cambió el mes: sumar solo los meses que se cerraron desde la última vez
+                    cerrado = cerrado + Counter(
+                        self.proyeccion_repo.get_conteo_naturalezas_evento(desde=base["marca"], hasta=marca)
+                    )
+            # Las filas sin fecha_evento no caen en ningún mes: se cuentan con el mes abierto
+            abierto = Counter(
+                self.proyeccion_repo.get_conteo_naturalezas_evento(desde=marca, incluir_sin_fecha=True)
+            )
+            entrada = self._nueva_entrada(base, cerrado=cerrado, total=cerrado + abierto, marca=marca)
+            self._publicar(clave, entrada, generacion)
+        top = entrada["total"].most_common(limit)
+        return [{"naturaleza_evento": naturaleza, "total": total} for naturaleza, total in top]
     
     def ejecutar_consulta_personalizada(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -32,3 +153,15 @@ class ProyeccionService:
         SOLO permite SELECT.
         """
         return self.proyeccion_repo.ejecutar_query(query, params)
+    
+    def recorrer_consulta_personalizada(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        tamano_bloque: Optional[int] = None,
+    ) -> Iterator[Tuple[Tuple[str, ...], List[tuple]]]:
+        """
+        Igual que `ejecutar_consulta_personalizada` pero como flujo de bloques
+        (columnas, filas), para consultas históricas grandes.
+        """
+        return self.proyeccion_repo.recorrer_query(query, params, tamano_bloque)
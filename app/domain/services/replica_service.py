@@ -0,0 +1,163 @@
+"""
+Sincronización de la réplica local de catálogos y procedimientos.
+
+El arranque lee los catálogos de la réplica SQLite (app.infra.replica_local)
+sin esperar la red. `sincronizar` compara la firma de cada tabla de origen con
+la guardada en la última sincronización y solo vuelve a descargar los
+catálogos cuya tabla cambió; los cambios se aplican también a las cachés en
+memoria (CatalogoService, ProcedimientoStore). `iniciar` repite la
+sincronización en un hilo cada REPLICA_INTERVALO segundos.
+
+Municipios, prestadores y procedimientos se sincronizan por marca de agua
+(_INCREMENTALES): solo viajan las filas con actualizado_en posterior a la
+marca guardada, se combinan por id con la réplica (las desactivadas se
+quitan) y el catálogo se reordena en memoria. Si el número de filas vigentes
+no coincide con el del servidor (una fila se borró en lugar de desactivarse)
+el catálogo se descarga completo.
+"""
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.config.db import get_db_session
+from app.data.repositories.sincronizacion_repo import SincronizacionRepository
+from app.domain.services.catalogo_service import TABLAS_ORIGEN, CatalogoService
+from app.domain.services.procedimiento_store import CATALOGO_REPLICA, COLUMNAS, ProcedimientoStore
+from app.infra.replica_local import replica_compartida
+from app.utils.texto import normalizar_texto
+
+logger = logging.getLogger(__name__)
+
+# catálogo -> (tabla de origen, consulta en BD, aplicar a la caché en memoria)
+Replicado = Tuple[str, Callable[[Session], List[dict]], Callable[[List[dict]], None]]
+
+# catálogo sincronizado por marca de agua -> (columnas de cada fila, columna de orden)
+_INCREMENTALES: Dict[str, Tuple[Sequence[str], str]] = {
+    "municipios": (("id", "nombre"), "nombre"),
+    "prestadores": (("id", "razon_social"), "razon_social"),
+    CATALOGO_REPLICA: (COLUMNAS, "codigo"),
+}
+
+
+def _replicados() -> Dict[str, Replicado]:
+    replicados: Dict[str, Replicado] = {
+        nombre: (
+            tabla,
+            lambda s, nombre=nombre: CatalogoService.consultar(nombre, s),
+            lambda datos, nombre=nombre: CatalogoService.actualizar(nombre, datos),
+        )
+        for nombre, tabla in TABLAS_ORIGEN.items()
+    }
+    replicados[CATALOGO_REPLICA] = ("procedimiento", ProcedimientoStore.consultar, ProcedimientoStore.actualizar)
+    return replicados
+
+
+class ReplicaService:
+    """Mantiene la réplica local al día con la BD principal."""
+
+    _hilo: Optional[threading.Thread] = None
+    _detener = threading.Event()
+    _lock = threading.Lock()
+
+    @classmethod
+    def sincronizar(cls) -> List[str]:
+        """
+        Descarga los catálogos cuya tabla cambió desde la última sincronización
+        (de los incrementales, solo las filas cambiadas).
+
+        La firma de los catálogos no incrementales es un CHECKSUM TABLE, que
+        recorre cada tabla completa en el servidor en cada ciclo: por eso solo
+        se aplica a tablas de pocas filas (tipos, sexos, naturalezas...) y no
+        conviene bajar mucho REPLICA_INTERVALO.
+
+        Returns:
+            Nombres de los catálogos actualizados.
+        """
+        replica = replica_compartida()
+        replicados = _replicados()
+        actualizados = []
+        with cls._lock:
+            anteriores = replica.firmas()
+            marcas = replica.marcas()
+            with get_db_session() as session:
+                repo = SincronizacionRepository(session)
+                firmas = repo.firmas(
+                    tabla for nombre, (tabla, _, _) in replicados.items() if nombre not in _INCREMENTALES
+                )
+                for nombre, replicado in replicados.items():
+                    if nombre in _INCREMENTALES:
+                        if cls._sincronizar_incremental(repo, nombre, replicado, marcas.get(nombre)):
+                            actualizados.append(nombre)
+                        continue
+                    tabla, consultar, aplicar = replicado
+                    firma = firmas.get(tabla)
+                    if firma is not None and nombre in anteriores and anteriores[nombre] == firma:
+                        continue
+                    datos = consultar(session)
+                    replica.guardar(nombre, datos, firma)
+                    aplicar(datos)
+                    actualizados.append(nombre)
+        if actualizados:
+            logger.info("Réplica local actualizada: %s", ", ".join(actualizados))
+        return actualizados
+
+    @staticmethod
+    def _sincronizar_incremental(
+        repo: SincronizacionRepository, nombre: str, replicado: Replicado, marca: Optional[datetime]
+    ) -> bool:
+        """Aplica a la réplica y a la caché las filas cambiadas desde `marca` (sin marca: carga completa)."""
+        replica = replica_compartida()
+        tabla, consultar, aplicar = replicado
+        columnas, orden = _INCREMENTALES[nombre]
+
+        actuales = replica.leer(nombre) if marca is not None else None
+        if actuales is not None:
+            cambios = repo.cambios_desde(tabla, columnas, marca)
+            if not cambios.filas and len(actuales) == cambios.vigentes:
+                return False
+            por_id = {fila["id"]: fila for fila in actuales}
+            for fila in cambios.filas:
+                if fila.pop("vigente"):
+                    por_id[fila["id"]] = fila
+                else:
+                    por_id.pop(fila["id"], None)
+            if len(por_id) == cambios.vigentes:
+                # Sin tildes, como la collation de MySQL ("Ábrego" va con la A)
+                datos = sorted(por_id.values(), key=lambda f: normalizar_texto(str(f[orden] or "")))
+                replica.guardar(nombre, datos, marca=cambios.marca)
+                aplicar(datos)
+                return True
+            logger.info("%s: hay filas borradas en el servidor, se descarga completo", nombre)
+
+        nueva_marca = repo.marca_actual()
+        datos = consultar(repo.session)
+        replica.guardar(nombre, datos, marca=nueva_marca)
+        aplicar(datos)
+        return True
+
+    @classmethod
+    def iniciar(cls, intervalo: Optional[int] = None):
+        """Sincroniza cada `intervalo` segundos en un hilo (REPLICA_INTERVALO por defecto; 0 = no repetir)."""
+        intervalo = get_settings().REPLICA_INTERVALO if intervalo is None else intervalo
+        if intervalo <= 0 or (cls._hilo is not None and cls._hilo.is_alive()):
+            return
+        cls._detener.clear()
+
+        def _ciclo():
+            while not cls._detener.wait(intervalo):
+                try:
+                    cls.sincronizar()
+                except Exception as e:
+                    # Sin red se sigue trabajando con la réplica; se reintenta en el próximo ciclo
+                    logger.warning("No se pudo sincronizar la réplica local: %s", e)
+
+        cls._hilo = threading.Thread(target=_ciclo, name="replica", daemon=True)
+        cls._hilo.start()
+
+    @classmethod
+    def detener(cls):
+        cls._detener.set()
@@ -0,0 +1,101 @@
+"""
+Exportaciones e impresiones por lotes sobre la cola de trabajos persistente.
+
+Un lote de 10k accidentes interrumpido (cierre de la aplicación, caída de la
+BD) continúa desde el último bloque confirmado en lugar de empezar de nuevo.
+Ver app.infra.cola_trabajos.
+"""
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.config import get_settings
+from app.infra.cola_trabajos import ColaTrabajos
+
+EXPORTAR = "exportar"
+IMPRIMIR = "imprimir"
+
+
+def _exportar(parametros: dict, items: List[int]) -> List[Tuple[bool, str]]:
+    """Manejador: exporta los planos FURIPS1/FURIPS2 de un bloque de accidentes."""
+    from app.config.db import get_db_session
+    from app.domain.services.export_service import ExportService
+
+    formato = parametros.get("formato", "ambos")
+    formatos = ("furips1", "furips2") if formato == "ambos" else (formato,)
+    resultados: List[Tuple[bool, str]] = []
+    with get_db_session() as session:
+        servicio = ExportService(session)
+        for accidente_id in items:
+            rutas, errores = [], []
+            for f in formatos:
+                exito, ruta, error = getattr(servicio, f"exportar_{f}")(accidente_id)
+                if exito:
+                    rutas.append(str(ruta))
+                else:
+                    errores.append(f"{f.upper()}: {error}")
+            if errores:
+                # ExportService atrapa todo: si la conexión se cayó, que se reintente el bloque
+                session.execute(text("SELECT 1"))
+                resultados.append((False, "; ".join(errores)))
+            else:
+                resultados.append((True, ";".join(rutas)))
+    return resultados
+
+
+def _imprimir(parametros: dict, items: List[int]) -> List[Tuple[bool, str]]:
+    """Manejador: genera los PDF de un bloque de accidentes."""
+    from app.domain.services.print_service import PrintService
+
+    servicio = PrintService()
+    tipo = parametros.get("tipo", "furips_cte")
+    resultados: List[Tuple[bool, str]] = []
+    for accidente_id in items:
+        try:
+            resultados.append((True, str(servicio.generar_pdf_accidente(accidente_id, tipo=tipo))))
+        except DBAPIError:
+            raise  # error de BD: reintentar el bloque completo
+        except Exception as e:
+            resultados.append((False, str(e)))
+    return resultados
+
+
+class TrabajosService:
+    """Acceso a la cola de trabajos compartida por la aplicación y la CLI."""
+
+    _cola: Optional[ColaTrabajos] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def cola(cls) -> ColaTrabajos:
+        """Cola compartida (se crea sin tocar el disco; iniciar() lanza los hilos)."""
+        if cls._cola is None:
+            with cls._lock:
+                if cls._cola is None:
+                    settings = get_settings()
+                    cls._cola = ColaTrabajos(
+                        Path(settings.COLA_TRABAJOS_DB),
+                        {EXPORTAR: _exportar, IMPRIMIR: _imprimir},
+                        hilos=settings.COLA_TRABAJOS_HILOS,
+                        tamano_lote=settings.COLA_TRABAJOS_LOTE,
+                        vencimiento=settings.COLA_TRABAJOS_VENCIMIENTO,
+                    )
+        return cls._cola
+
+    @classmethod
+    def encolar_exportacion(cls, accidente_ids: Iterable[int], formato: str = "ambos") -> int:
+        """Encola la exportación de planos (furips1, furips2 o ambos). Retorna el ID del trabajo."""
+        return cls.cola().encolar(EXPORTAR, {"formato": formato}, accidente_ids)
+
+    @classmethod
+    def encolar_impresion(cls, accidente_ids: Iterable[int], tipo: str = "furips_cte") -> int:
+        """Encola la generación de PDF. Retorna el ID del trabajo."""
+        return cls.cola().encolar(IMPRIMIR, {"tipo": tipo}, accidente_ids)
+
+    @classmethod
+    def suscribir(cls, callback: Callable[[dict], None]):
+        """Ver ColaTrabajos.suscribir (el callback corre en un hilo trabajador)."""
+        cls.cola().suscribir(callback)
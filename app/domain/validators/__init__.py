@@ -1,4 +1,5 @@
 """Validadores."""
 from app.domain.validators.furips_validator import FuripsValidator
+from app.domain.validators.batch_validator import MatrizErrores, ValidadorLote, a_columnas
 
-__all__ = ["FuripsValidator"]
+__all__ = ["FuripsValidator", "ValidadorLote", "MatrizErrores", "a_columnas"]
@@ -0,0 +1,349 @@
+"""
+Validación por lotes de datos FURIPS.
+
+Aplica las mismas reglas de FuripsValidator pero por columnas: los códigos
+válidos se compilan a frozensets y las comprobaciones aritméticas se hacen con
+map/operator sobre columnas completas. Cada regla recorre su columna una sola vez y marca un bit
+en la máscara de la fila; el resultado es una matriz compacta (un entero por
+fila) de la que los mensajes se generan solo para las filas que fallan, con
+los valores de la fila y el mismo texto que FuripsValidator.
+
+Uso:
+    validador = ValidadorLote()
+    matriz = validador.validar_accidentes({"numero_consecutivo": [...], ...})
+    for fila in matriz.filas_con_error():
+        print(fila, matriz.mensajes(fila))
+
+Las columnas ausentes se omiten, así que se puede validar un subconjunto.
+
+`medir()` compara el tiempo contra la validación registro a registro.
+"""
+import operator
+import random
+import time
+from array import array
+from datetime import date, timedelta
+from itertools import compress
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from app.domain.validators.furips_validator import FuripsValidator
+
+
+class Regla(NamedTuple):
+    """Regla de validación: bit en la máscara, código corto y mensaje genérico."""
+    bit: int
+    codigo: str
+    mensaje: str
+
+
+# ============================================================================
+# REGLAS
+# ============================================================================
+
+def _reglas(*definiciones: Tuple[str, str]) -> Dict[str, Regla]:
+    return {codigo: Regla(1 << i, codigo, mensaje) for i, (codigo, mensaje) in enumerate(definiciones)}
+
+
+REGLAS_ACCIDENTE = _reglas(
+    ("consecutivo", "El consecutivo es obligatorio, de hasta 12 dígitos"),
+    ("factura", "El número de factura es obligatorio (máximo 20 caracteres)"),
+    ("rad_siras", "El radicado SIRAS es obligatorio (máximo 20 caracteres)"),
+    ("zona", "Zona no válida (debe ser U o R)"),
+    ("naturaleza", "Código de naturaleza no válido"),
+    ("otro_evento", "Cuando la naturaleza es 'Otro' (17), debe especificar una descripción"),
+    ("estado_aseguramiento", "Código de estado de aseguramiento no válido"),
+    ("tipo_vehiculo", "Código de tipo de vehículo no válido"),
+    ("placa", "La placa no puede exceder 10 caracteres"),
+    ("condicion", "Código de condición de la víctima no válido"),
+    ("vigencia", "Evento fuera de vigencia de póliza"),
+    ("totales_gmq", "El total reclamado GMQ no puede exceder el facturado"),
+    ("totales_transporte", "El total reclamado de transporte no puede exceder el facturado"),
+)
+
+REGLAS_DETALLE = _reglas(
+    ("tipo_servicio", "Código de tipo de servicio no válido"),
+    ("detalle", "Valor facturado inconsistente con cantidad x valor unitario"),
+    ("reclamado", "El valor reclamado no puede exceder el facturado"),
+)
+
+
+# ============================================================================
+# COMPROBACIONES POR COLUMNA (cada una retorna una lista de bool: True = falla)
+# ============================================================================
+
+def _fuera_de(validos: frozenset, opcional: bool = False) -> Callable[[Sequence], List[bool]]:
+    if opcional:
+        return lambda col: [bool(v) and v not in validos for v in col]
+    return lambda col: [v not in validos for v in col]
+
+
+def _obligatorio_max(largo: int) -> Callable[[Sequence], List[bool]]:
+    return lambda col: [not v or len(v) > largo for v in col]
+
+
+def _consecutivo(col: Sequence) -> List[bool]:
+    return [not v or len(v) > 12 or not v.isdigit() for v in col]
+
+
+def _placa(col: Sequence) -> List[bool]:
+    return [bool(v) and len(v) > 10 for v in col]
+
+
+def _otro_evento(naturalezas: Sequence, descripciones: Sequence) -> List[bool]:
+    return [n == "17" and not d for n, d in zip(naturalezas, descripciones)]
+
+
+def _vigencia(fechas: Sequence, inicios: Sequence, fines: Sequence) -> List[bool]:
+    return [
+        bool(fe and i and f) and not (i <= fe <= f)
+        for fe, i, f in zip(fechas, inicios, fines)
+    ]
+
+
+def _excede(facturados: Sequence, reclamados: Sequence) -> List[bool]:
+    return list(map(operator.gt, reclamados, facturados))
+
+
+def _detalle(cantidades: Sequence, unitarios: Sequence, facturados: Sequence) -> List[bool]:
+    return list(map(operator.ne, facturados, map(operator.mul, cantidades, unitarios)))
+
+
+# ============================================================================
+# MENSAJES POR FILA (reciben los valores de las columnas de entrada de la regla)
+# ============================================================================
+
+def _de_validador(validar: Callable[..., Tuple[bool, Optional[str]]]) -> Callable[..., Optional[str]]:
+    """Mensaje de la validación registro a registro equivalente."""
+    return lambda *valores: validar(*valores)[1]
+
+
+def _excede_mensaje(que: str) -> Callable[[int, int], str]:
+    return lambda facturado, reclamado: f"{que} ({reclamado}) no puede exceder el facturado ({facturado})"
+
+
+# ============================================================================
+# MATRIZ DE ERRORES
+# ============================================================================
+
+# bit de la regla -> (columnas de entrada, mensaje a partir de sus valores)
+_Detalles = Dict[int, Tuple[Tuple[str, ...], Callable[..., Optional[str]]]]
+
+
+class MatrizErrores:
+    """
+    Máscara de reglas fallidas por fila (0 = fila válida).
+
+    Conserva las columnas validadas para armar los mensajes de una fila con
+    sus valores; sin ellas se usa el mensaje genérico de la regla.
+    """
+
+    __slots__ = ("mascaras", "reglas", "_columnas", "_detalles")
+
+    def __init__(
+        self,
+        mascaras: array,
+        reglas: Mapping[str, Regla],
+        columnas: Optional[Mapping[str, Sequence]] = None,
+        detalles: Optional[_Detalles] = None,
+    ):
+        self.mascaras = mascaras
+        self.reglas = reglas
+        self._columnas = columnas or {}
+        self._detalles = detalles or {}
+
+    def __len__(self) -> int:
+        return len(self.mascaras)
+
+    def es_valida(self, fila: int) -> bool:
+        return not self.mascaras[fila]
+
+    def filas_con_error(self) -> List[int]:
+        return [i for i, m in enumerate(self.mascaras) if m]
+
+    def reglas_fallidas(self, fila: int) -> List[Regla]:
+        mascara = self.mascaras[fila]
+        return [r for r in self.reglas.values() if mascara & r.bit]
+
+    def mensajes(self, fila: int) -> List[str]:
+        mensajes = []
+        for regla in self.reglas_fallidas(fila):
+            detalle = self._detalles.get(regla.bit)
+            if detalle is None:
+                mensajes.append(regla.mensaje)
+                continue
+            entradas, describir = detalle
+            mensajes.append(describir(*(self._columnas[c][fila] for c in entradas)) or regla.mensaje)
+        return mensajes
+
+    def conteo_por_regla(self) -> Dict[str, int]:
+        """Cantidad de filas que incumplen cada regla."""
+        conteo = {}
+        for regla in self.reglas.values():
+            n = sum(1 for m in self.mascaras if m & regla.bit)
+            if n:
+                conteo[regla.codigo] = n
+        return conteo
+
+
+# ============================================================================
+# VALIDADOR
+# ============================================================================
+
+# Paso del plan: (regla, columnas de entrada, comprobación por columna, mensaje por fila)
+_Paso = Tuple[Regla, Tuple[str, ...], Callable[..., List[bool]], Callable[..., Optional[str]]]
+
+
+class ValidadorLote:
+    """Ejecuta las reglas de FuripsValidator sobre columnas completas."""
+
+    def __init__(self):
+        v = FuripsValidator
+        r = REGLAS_ACCIDENTE
+        self._plan_accidente: List[_Paso] = [
+            (r["consecutivo"], ("numero_consecutivo",), _consecutivo, _de_validador(v.validar_consecutivo)),
+            (r["factura"], ("numero_factura",), _obligatorio_max(20), _de_validador(v.validar_factura)),
+            (r["rad_siras"], ("numero_rad_siras",), _obligatorio_max(20), _de_validador(v.validar_rad_siras)),
+            (r["zona"], ("zona",), _fuera_de(frozenset(v.ZONAS_VALIDAS), opcional=True),
+             _de_validador(v.validar_zona)),
+            (r["naturaleza"], ("naturaleza_codigo",), _fuera_de(frozenset(v.NATURALEZAS_VALIDAS)),
+             _de_validador(v.validar_naturaleza_evento)),
+            (r["otro_evento"], ("naturaleza_codigo", "descripcion_otro_evento"), _otro_evento,
+             _de_validador(v.validar_descripcion_otro_evento)),
+            (r["estado_aseguramiento"], ("estado_aseguramiento_codigo",),
+             _fuera_de(frozenset(v.ESTADOS_ASEGURAMIENTO_VALIDOS)), _de_validador(v.validar_estado_aseguramiento)),
+            (r["tipo_vehiculo"], ("tipo_vehiculo_codigo",),
+             _fuera_de(frozenset(v.TIPOS_VEHICULO_VALIDOS), opcional=True), _de_validador(v.validar_tipo_vehiculo)),
+            (r["placa"], ("placa",), _placa, _de_validador(v.validar_placa)),
+            (r["condicion"], ("condicion_codigo",),
+             _fuera_de(frozenset(v.CONDICIONES_VICTIMA_VALIDAS), opcional=True),
+             _de_validador(v.validar_condicion_victima)),
+            (r["vigencia"], ("fecha_evento", "vigencia_inicio", "vigencia_fin"), _vigencia,
+             lambda fecha, inicio, fin: v.validar_vigencia_poliza(inicio, fin, fecha)[1]),
+            (r["totales_gmq"], ("total_facturado_gmq", "total_reclamado_gmq"), _excede,
+             _excede_mensaje("El total reclamado GMQ")),
+            (r["totales_transporte"], ("total_facturado_transporte", "total_reclamado_transporte"), _excede,
+             _excede_mensaje("El total reclamado de transporte")),
+        ]
+        d = REGLAS_DETALLE
+        self._plan_detalle: List[_Paso] = [
+            (d["tipo_servicio"], ("tipo_servicio_codigo",), _fuera_de(frozenset(v.TIPOS_SERVICIO_VALIDOS)),
+             _de_validador(v.validar_tipo_servicio)),
+            (d["detalle"], ("cantidad", "valor_unitario", "valor_facturado"), _detalle,
+             _de_validador(v.validar_detalle_consistente)),
+            (d["reclamado"], ("valor_facturado", "valor_reclamado"), _excede,
+             _excede_mensaje("El valor reclamado")),
+        ]
+
+    def validar_accidentes(self, columnas: Mapping[str, Sequence]) -> MatrizErrores:
+        """Valida columnas de accidentes (nombres como en COLUMNAS_FURIPS1)."""
+        return self._ejecutar(self._plan_accidente, columnas, REGLAS_ACCIDENTE)
+
+    def validar_detalles(self, columnas: Mapping[str, Sequence]) -> MatrizErrores:
+        """Valida columnas de detalles (nombres como en COLUMNAS_FURIPS2)."""
+        return self._ejecutar(self._plan_detalle, columnas, REGLAS_DETALLE)
+
+    @staticmethod
+    def _ejecutar(plan: List[_Paso], columnas: Mapping[str, Sequence], reglas: Mapping[str, Regla]) -> MatrizErrores:
+        n = len(next(iter(columnas.values()))) if columnas else 0
+        mascaras = array("I", bytes(4 * n))
+        filas = range(n)
+        detalles: _Detalles = {}
+        for regla, entradas, comprobar, describir in plan:
+            if not all(c in columnas for c in entradas):
+                continue
+            fallos = comprobar(*(columnas[c] for c in entradas))
+            bit = regla.bit
+            for i in compress(filas, fallos):
+                mascaras[i] |= bit
+            detalles[bit] = (entradas, describir)
+        return MatrizErrores(mascaras, reglas, columnas, detalles)
+
+
+def a_columnas(registros: Sequence[Mapping], nombres: Sequence[str]) -> Dict[str, list]:
+    """Transpone una lista de dicts a columnas."""
+    return {nombre: [r.get(nombre) for r in registros] for nombre in nombres}
+
+
+# ============================================================================
+# COMPARACIÓN CON LA VALIDACIÓN REGISTRO A REGISTRO
+# ============================================================================
+
+def _validar_registro(r: Mapping) -> bool:
+    """Mismas reglas que el plan de accidentes, llamando a FuripsValidator."""
+    v = FuripsValidator
+    ok, _ = v.validar_accidente_completo(r)
+    resultados = [
+        ok,
+        v.validar_naturaleza_evento(r["naturaleza_codigo"])[0],
+        v.validar_estado_aseguramiento(r["estado_aseguramiento_codigo"])[0],
+        v.validar_placa(r["placa"])[0],
+        v.validar_condicion_victima(r["condicion_codigo"])[0],
+        v.validar_vigencia_poliza(r["vigencia_inicio"], r["vigencia_fin"], r["fecha_evento"])[0],
+        v.validar_totales_consistentes(r["total_facturado_gmq"], r["total_reclamado_gmq"])[0],
+        v.validar_totales_consistentes(r["total_facturado_transporte"], r["total_reclamado_transporte"])[0],
+    ]
+    if r["tipo_vehiculo_codigo"]:
+        resultados.append(v.validar_tipo_vehiculo(r["tipo_vehiculo_codigo"])[0])
+    return all(resultados)
+
+
+def _registros_sinteticos(cantidad: int, semilla: int = 7) -> List[dict]:
+    azar = random.Random(semilla)
+    v = FuripsValidator
+    base = date(2024, 1, 1)
+    registros = []
+    for i in range(cantidad):
+        fecha = base + timedelta(days=azar.randrange(365))
+        facturado = azar.randrange(0, 5_000_000, 100)
+        registros.append({
+            "numero_consecutivo": str(i).zfill(12) if azar.random() > 0.01 else "ABC",
+            "numero_factura": f"FE{i}",
+            "numero_rad_siras": f"SIRAS{i}",
+            "zona": azar.choice(v.ZONAS_VALIDAS + ["X"] if azar.random() < 0.01 else v.ZONAS_VALIDAS),
+            "naturaleza_codigo": azar.choice(v.NATURALEZAS_VALIDAS),
+            "descripcion_otro_evento": "Otro" if azar.random() > 0.1 else None,
+            "estado_aseguramiento_codigo": azar.choice(v.ESTADOS_ASEGURAMIENTO_VALIDOS),
+            "tipo_vehiculo_codigo": azar.choice(v.TIPOS_VEHICULO_VALIDOS + [""]),
+            "placa": f"ABC{i % 1000:03d}",
+            "condicion_codigo": azar.choice(v.CONDICIONES_VICTIMA_VALIDAS),
+            "fecha_evento": fecha,
+            "vigencia_inicio": fecha - timedelta(days=azar.randrange(400)),
+            "vigencia_fin": fecha + timedelta(days=azar.randrange(-10, 365)),
+            "total_facturado_gmq": facturado,
+            "total_reclamado_gmq": facturado if azar.random() > 0.02 else facturado + 1,
+            "total_facturado_transporte": 0,
+            "total_reclamado_transporte": 0,
+        })
+    return registros
+
+
+def medir(cantidad: int = 10_000) -> Dict[str, float]:
+    """Compara el tiempo de la validación por lotes contra la de registro a registro."""
+    registros = _registros_sinteticos(cantidad)
+
+    inicio = time.perf_counter()
+    invalidos_registro = sum(1 for r in registros if not _validar_registro(r))
+    t_registro = time.perf_counter() - inicio
+
+    validador = ValidadorLote()
+    inicio = time.perf_counter()
+    columnas = a_columnas(registros, list(registros[0]))
+    t_transponer = time.perf_counter() - inicio
+    matriz = validador.validar_accidentes(columnas)
+    invalidos_lote = len(matriz.filas_con_error())
+    t_lote = time.perf_counter() - inicio - t_transponer
+
+    if invalidos_registro != invalidos_lote:
+        raise AssertionError(
+            f"Resultados distintos: {invalidos_registro} por registro vs {invalidos_lote} por lote"
+        )
+
+    return {
+        "registros": cantidad,
+        "invalidos": invalidos_lote,
+        "segundos_registro": t_registro,
+        "segundos_transponer": t_transponer,
+        "segundos_lote": t_lote,
+        "aceleracion": t_registro / t_lote if t_lote else 0.0,
+    }
+
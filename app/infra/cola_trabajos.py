@@ -0,0 +1,497 @@
+"""
+Cola de trabajos local y persistente (SQLite) para tareas largas por lotes.
+
+Cada trabajo guarda sus ítems (IDs de accidente) en un archivo SQLite local y
+los hilos trabajadores lo procesan por bloques. El resultado de cada bloque se
+confirma en una sola transacción (punto de control): si la aplicación se cierra
+o la BD principal se cae a mitad de un trabajo, al reanudar solo se procesan
+los ítems pendientes y, como mucho, se repite el bloque que estaba en curso.
+
+Los manejadores se registran por tipo de trabajo:
+
+    manejador(parametros: dict, items: List[int]) -> List[Tuple[bool, str]]
+
+y retornan (éxito, resultado o error) por ítem, en el mismo orden. Un error de
+un ítem queda registrado y el trabajo sigue; si el manejador lanza excepción
+(p. ej. se perdió la conexión) el bloque se reintenta con espera creciente y,
+tras MAX_INTENTOS, el trabajo queda interrumpido hasta que se reanude.
+
+Estados de un trabajo: pendiente -> en_curso -> completado, o interrumpido /
+cancelado. Un trabajo completado puede tener ítems fallidos (`fallidos`).
+
+Varios procesos (la aplicación, la CLI con --cola) pueden compartir el
+archivo. Un trabajo en curso pertenece al proceso que lo tomó (`propietario`,
+equipo:pid) y ese proceso renueva `actualizado_en` en cada punto de control:
+solo se recupera (vuelve a pendiente) un trabajo cuyo propietario lleva más de
+`vencimiento` segundos sin dar señales, así nunca lo procesan dos procesos a
+la vez. Si otro proceso lo recuperó, el anterior descarta su bloque en curso.
+"""
+import json
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "pendiente"
+EN_CURSO = "en_curso"
+COMPLETADO = "completado"
+INTERRUMPIDO = "interrumpido"
+CANCELADO = "cancelado"
+
+ESTADOS_FINALES = (COMPLETADO, INTERRUMPIDO, CANCELADO)
+
+Manejador = Callable[[dict, List[int]], List[Tuple[bool, str]]]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS trabajo (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    procesados INTEGER NOT NULL DEFAULT 0,
+    fallidos INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    propietario TEXT,
+    creado_en TEXT NOT NULL,
+    actualizado_en TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trabajo_item (
+    trabajo_id INTEGER NOT NULL,
+    posicion INTEGER NOT NULL,
+    item INTEGER NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendiente',
+    resultado TEXT,
+    PRIMARY KEY (trabajo_id, posicion)
+);
+CREATE INDEX IF NOT EXISTS idx_trabajo_item_estado ON trabajo_item (trabajo_id, estado, posicion);
+CREATE INDEX IF NOT EXISTS idx_trabajo_estado ON trabajo (estado);
+"""
+
+
+def _ahora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _propietario_actual() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ColaTrabajos:
+    """Cola de trabajos persistente con hilos trabajadores (thread-safe)."""
+
+    MAX_INTENTOS = 3
+    ESPERA_REINTENTO = 5  # segundos; se duplica en cada intento
+
+    def __init__(
+        self,
+        ruta: Path,
+        manejadores: Dict[str, Manejador],
+        hilos: int = 2,
+        tamano_lote: int = 100,
+        vencimiento: int = 600,
+    ):
+        """
+        Args:
+            vencimiento: segundos sin punto de control tras los que un trabajo
+                en curso se da por abandonado; debe superar lo que tarda un bloque.
+        """
+        self.ruta = Path(ruta)
+        self.manejadores = dict(manejadores)
+        self.hilos = max(1, hilos)
+        self.tamano_lote = max(1, tamano_lote)
+        self.vencimiento = max(1, vencimiento)
+        self.propietario = _propietario_actual()
+        # El archivo se abre al primer uso: crear la cola no toca el disco
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._cola: "queue.Queue[Optional[int]]" = queue.Queue()
+        self._programados: set = set()
+        self._detener = threading.Event()
+        self._trabajadores: List[threading.Thread] = []
+        self._suscriptores: List[Callable[[dict], None]] = []
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conexion is None:
+                self.ruta.parent.mkdir(parents=True, exist_ok=True)
+                conexion = sqlite3.connect(
+                    str(self.ruta), timeout=30, check_same_thread=False, isolation_level=None
+                )
+                conexion.row_factory = sqlite3.Row
+                conexion.execute("PRAGMA journal_mode=WAL")
+                conexion.execute("PRAGMA synchronous=NORMAL")
+                conexion.executescript(_ESQUEMA)
+                columnas = {f["name"] for f in conexion.execute("PRAGMA table_info(trabajo)")}
+                if "propietario" not in columnas:
+                    # Archivo creado por una versión anterior
+                    conexion.execute("ALTER TABLE trabajo ADD COLUMN propietario TEXT")
+                self._conexion = conexion
+            return self._conexion
+
+    @contextmanager
+    def _transaccion(self):
+        with self._lock:
+            conexion = self._db()
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                yield conexion
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+            conexion.execute("COMMIT")
+
+    def _cambiar_estado(
+        self,
+        trabajo_id: int,
+        estado: str,
+        desde: Iterable[str],
+        error: Optional[str] = None,
+        propio: bool = False,
+    ) -> bool:
+        """
+        Cambia el estado solo si el actual está en `desde` (atómico) y, con
+        `propio`, si el trabajo sigue siendo de este proceso. Retorna si cambió.
+        """
+        desde = tuple(desde)
+        sql = (
+            f"UPDATE trabajo SET estado = ?, error = ?, actualizado_en = ? "
+            f"WHERE id = ? AND estado IN ({', '.join('?' * len(desde))})"
+        )
+        params = [estado, error, _ahora(), trabajo_id, *desde]
+        if propio:
+            sql += " AND propietario = ?"
+            params.append(self.propietario)
+        with self._transaccion() as conexion:
+            return conexion.execute(sql, params).rowcount > 0
+
+    def _limite_vencimiento(self) -> str:
+        """actualizado_en anterior a este valor = propietario sin señales (trabajo abandonado)."""
+        return (datetime.now() - timedelta(seconds=self.vencimiento)).isoformat(timespec="seconds")
+
+    def _tomar(self, trabajo_id: int) -> bool:
+        """Pasa un trabajo pendiente a en curso a nombre de este proceso (atómico)."""
+        with self._transaccion() as conexion:
+            return conexion.execute(
+                "UPDATE trabajo SET estado = ?, propietario = ?, actualizado_en = ? WHERE id = ? AND estado = ?",
+                (EN_CURSO, self.propietario, _ahora(), trabajo_id, PENDIENTE),
+            ).rowcount > 0
+
+    def _recuperar_abandonados(self) -> int:
+        """Vuelve a pendiente los trabajos en curso cuyo propietario dejó de renovar su plazo."""
+        with self._transaccion() as conexion:
+            recuperados = conexion.execute(
+                "UPDATE trabajo SET estado = ?, propietario = NULL, actualizado_en = ? "
+                "WHERE estado = ? AND actualizado_en < ?",
+                (PENDIENTE, _ahora(), EN_CURSO, self._limite_vencimiento()),
+            ).rowcount
+        if recuperados:
+            logger.warning("%d trabajo(s) abandonados vuelven a pendiente", recuperados)
+        return recuperados
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def encolar(self, tipo: str, parametros: dict, items: Iterable[int]) -> int:
+        """Registra un trabajo nuevo y lo programa si los trabajadores están activos. Retorna su ID."""
+        if tipo not in self.manejadores:
+            raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+        items = list(items)
+        ahora = _ahora()
+        with self._transaccion() as conexion:
+            cursor = conexion.execute(
+                "INSERT INTO trabajo (tipo, parametros, estado, total, creado_en, actualizado_en) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (tipo, json.dumps(parametros), PENDIENTE if items else COMPLETADO, len(items), ahora, ahora),
+            )
+            trabajo_id = cursor.lastrowid
+            conexion.executemany(
+                "INSERT INTO trabajo_item (trabajo_id, posicion, item) VALUES (?, ?, ?)",
+                ((trabajo_id, posicion, item) for posicion, item in enumerate(items)),
+            )
+        logger.info("Trabajo %s encolado: %s de %d ítems", trabajo_id, tipo, len(items))
+        if items and self.activa:
+            self._programar(trabajo_id)
+        return trabajo_id
+
+    def trabajo(self, trabajo_id: int) -> Optional[dict]:
+        """Estado actual de un trabajo como dict, o None si no existe."""
+        with self._lock:
+            fila = self._db().execute("SELECT * FROM trabajo WHERE id = ?", (trabajo_id,)).fetchone()
+        return dict(fila) if fila else None
+
+    def trabajos(self, estados: Optional[Iterable[str]] = None, limite: int = 50) -> List[dict]:
+        """Trabajos más recientes primero, opcionalmente filtrados por estado."""
+        sql, params = "SELECT * FROM trabajo", []
+        if estados:
+            estados = list(estados)
+            sql += f" WHERE estado IN ({', '.join('?' * len(estados))})"
+            params.extend(estados)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limite)
+        with self._lock:
+            return [dict(f) for f in self._db().execute(sql, params).fetchall()]
+
+    def resultados(self, trabajo_id: int, solo_errores: bool = False) -> List[Tuple[int, str, Optional[str]]]:
+        """(item, estado, resultado) de los ítems ya procesados, en orden."""
+        sql = "SELECT item, estado, resultado FROM trabajo_item WHERE trabajo_id = ? AND estado "
+        sql += "= 'error'" if solo_errores else "<> 'pendiente'"
+        with self._lock:
+            filas = self._db().execute(sql + " ORDER BY posicion", (trabajo_id,)).fetchall()
+        return [tuple(f) for f in filas]
+
+    def cancelar(self, trabajo_id: int) -> bool:
+        """Cancela un trabajo no terminado; el bloque en curso termina y no se toma otro."""
+        cancelado = self._cambiar_estado(trabajo_id, CANCELADO, (PENDIENTE, EN_CURSO, INTERRUMPIDO))
+        if cancelado:
+            self._notificar(trabajo_id)
+        return cancelado
+
+    def reanudar(self, trabajo_id: Optional[int] = None) -> List[int]:
+        """
+        Vuelve a pendiente los trabajos interrumpidos (todos o uno) y, si los
+        trabajadores están activos, programa los pendientes. Con un ID explícito
+        también retoma un trabajo que quedó en curso porque su proceso terminó
+        sin cerrarlo (solo si su plazo venció: puede seguir vivo en otro proceso).
+
+        Returns:
+            IDs de los trabajos pendientes resultantes.
+        """
+        ahora = _ahora()
+        with self._transaccion() as conexion:
+            if trabajo_id is None:
+                conexion.execute(
+                    "UPDATE trabajo SET estado = ?, error = NULL, actualizado_en = ? WHERE estado = ?",
+                    (PENDIENTE, ahora, INTERRUMPIDO),
+                )
+                filas = conexion.execute("SELECT id FROM trabajo WHERE estado = ? ORDER BY id", (PENDIENTE,))
+            else:
+                conexion.execute(
+                    "UPDATE trabajo SET estado = ?, error = NULL, propietario = NULL, actualizado_en = ? "
+                    "WHERE id = ? AND (estado = ? OR (estado = ? AND actualizado_en < ?))",
+                    (PENDIENTE, ahora, trabajo_id, INTERRUMPIDO, EN_CURSO, self._limite_vencimiento()),
+                )
+                filas = conexion.execute(
+                    "SELECT id FROM trabajo WHERE id = ? AND estado = ?", (trabajo_id, PENDIENTE)
+                )
+            ids = [f["id"] for f in filas.fetchall()]
+        if self.activa:
+            for pendiente in ids:
+                self._programar(pendiente)
+        return ids
+
+    def suscribir(self, callback: Callable[[dict], None]):
+        """
+        Registra una función que recibe el estado del trabajo tras cada bloque
+        y al terminar. Se llama desde los hilos trabajadores.
+        """
+        with self._lock:
+            self._suscriptores.append(callback)
+
+    # ------------------------------------------------------------------
+    # Trabajadores
+    # ------------------------------------------------------------------
+
+    @property
+    def activa(self) -> bool:
+        return any(h.is_alive() for h in self._trabajadores)
+
+    def iniciar(self, recuperar: bool = False):
+        """
+        Lanza los hilos trabajadores (una sola vez).
+
+        Args:
+            recuperar: volver a pendiente los trabajos en curso abandonados
+                (su propietario no renovó el plazo en `vencimiento` segundos)
+                y programar todos los pendientes. False solo procesa lo que
+                se encole o se reanude después.
+        """
+        with self._lock:
+            if self.activa:
+                return
+            self._detener.clear()
+            # Cola en memoria nueva: descarta marcas de fin de una ejecución anterior
+            self._cola = queue.Queue()
+            self._programados.clear()
+            if recuperar:
+                self._recuperar_abandonados()
+                for pendiente in reversed(self.trabajos((PENDIENTE,), limite=1_000_000)):
+                    self._programar(pendiente["id"])
+            self._trabajadores = [
+                threading.Thread(target=self._trabajar, name=f"cola-trabajos-{i}", daemon=True)
+                for i in range(self.hilos)
+            ]
+            for hilo in self._trabajadores:
+                hilo.start()
+        logger.info("Cola de trabajos iniciada (%d hilos, %s)", self.hilos, self.ruta)
+
+    def detener(self, esperar: bool = True, timeout: Optional[float] = None):
+        """
+        Pide a los trabajadores que paren al terminar su bloque actual. Los
+        trabajos sin terminar quedan pendientes para la próxima vez.
+        """
+        self._detener.set()
+        for _ in self._trabajadores:
+            self._cola.put(None)
+        if esperar:
+            for hilo in self._trabajadores:
+                hilo.join(timeout)
+
+    def esperar(
+        self,
+        trabajo_ids: Iterable[int],
+        intervalo: float = 0.5,
+        al_progresar: Optional[Callable[[List[dict]], None]] = None,
+    ) -> List[dict]:
+        """Bloquea hasta que los trabajos lleguen a un estado final. Retorna su estado."""
+        trabajo_ids = list(trabajo_ids)
+        while True:
+            estados = [self.trabajo(i) for i in trabajo_ids]
+            if al_progresar:
+                al_progresar(estados)
+            if all(e is None or e["estado"] in ESTADOS_FINALES for e in estados):
+                return estados
+            if not self.activa:
+                raise RuntimeError("La cola de trabajos no está activa")
+            time.sleep(intervalo)
+
+    def _programar(self, trabajo_id: int):
+        with self._lock:
+            if trabajo_id not in self._programados:
+                self._programados.add(trabajo_id)
+                self._cola.put(trabajo_id)
+
+    def _trabajar(self):
+        while not self._detener.is_set():
+            trabajo_id = self._cola.get()
+            if trabajo_id is None:
+                break
+            try:
+                self._ejecutar(trabajo_id)
+            except Exception:
+                logger.exception("Error inesperado en el trabajo %s", trabajo_id)
+            finally:
+                with self._lock:
+                    self._programados.discard(trabajo_id)
+
+    def _ejecutar(self, trabajo_id: int):
+        """Procesa los ítems pendientes de un trabajo, bloque por bloque."""
+        # Tomar el trabajo de forma atómica (otro proceso pudo tomarlo)
+        if not self._tomar(trabajo_id):
+            return
+        trabajo = self.trabajo(trabajo_id)
+        manejador = self.manejadores.get(trabajo["tipo"])
+        if manejador is None:
+            self._cambiar_estado(trabajo_id, INTERRUMPIDO, (EN_CURSO,), f"Tipo desconocido: {trabajo['tipo']}", propio=True)
+            self._notificar(trabajo_id)
+            return
+        parametros = json.loads(trabajo["parametros"])
+        logger.info("Trabajo %s: %s (%d/%d procesados)", trabajo_id, trabajo["tipo"],
+                    trabajo["procesados"], trabajo["total"])
+
+        intentos = 0
+        while not self._detener.is_set():
+            with self._lock:
+                conexion = self._db()
+                estado, propietario = conexion.execute(
+                    "SELECT estado, propietario FROM trabajo WHERE id = ?", (trabajo_id,)
+                ).fetchone()
+                bloque = conexion.execute(
+                    "SELECT posicion, item FROM trabajo_item WHERE trabajo_id = ? AND estado = ? "
+                    "ORDER BY posicion LIMIT ?",
+                    (trabajo_id, PENDIENTE, self.tamano_lote),
+                ).fetchall()
+            if estado != EN_CURSO or propietario != self.propietario:
+                return  # cancelado, o recuperado por otro proceso, mientras tanto
+            if not bloque:
+                self._cambiar_estado(trabajo_id, COMPLETADO, (EN_CURSO,), propio=True)
+                self._notificar(trabajo_id)
+                logger.info("Trabajo %s completado", trabajo_id)
+                return
+
+            try:
+                resultados = manejador(parametros, [f["item"] for f in bloque])
+                if len(resultados) != len(bloque):
+                    raise ValueError(f"El manejador retornó {len(resultados)} resultados para {len(bloque)} ítems")
+            except Exception as e:
+                intentos += 1
+                logger.warning("Trabajo %s: bloque fallido (intento %d de %d): %s",
+                               trabajo_id, intentos, self.MAX_INTENTOS, e)
+                if intentos >= self.MAX_INTENTOS:
+                    self._cambiar_estado(trabajo_id, INTERRUMPIDO, (EN_CURSO,), str(e), propio=True)
+                    self._notificar(trabajo_id)
+                    return
+                self._renovar(trabajo_id)
+                self._detener.wait(self.ESPERA_REINTENTO * 2 ** (intentos - 1))
+                continue
+
+            intentos = 0
+            if not self._confirmar_bloque(trabajo_id, bloque, resultados):
+                logger.warning("Trabajo %s: lo recuperó otro proceso, se descarta el bloque", trabajo_id)
+                return
+            self._notificar(trabajo_id)
+
+        # Detenido: el trabajo queda pendiente y se retoma desde el último bloque confirmado
+        with self._transaccion() as conexion:
+            conexion.execute(
+                "UPDATE trabajo SET estado = ?, propietario = NULL, actualizado_en = ? "
+                "WHERE id = ? AND estado = ? AND propietario = ?",
+                (PENDIENTE, _ahora(), trabajo_id, EN_CURSO, self.propietario),
+            )
+
+    def _renovar(self, trabajo_id: int):
+        """Renueva el plazo del trabajo (sigue vivo aunque no confirme bloques)."""
+        with self._transaccion() as conexion:
+            conexion.execute(
+                "UPDATE trabajo SET actualizado_en = ? WHERE id = ? AND estado = ? AND propietario = ?",
+                (_ahora(), trabajo_id, EN_CURSO, self.propietario),
+            )
+
+    def _confirmar_bloque(self, trabajo_id: int, bloque, resultados: List[Tuple[bool, str]]) -> bool:
+        """
+        Punto de control: guarda el resultado del bloque y los contadores en una
+        transacción y renueva el plazo. No guarda nada (retorna False) si el
+        trabajo ya no es de este proceso.
+        """
+        fallidos = sum(1 for exito, _ in resultados if not exito)
+        with self._transaccion() as conexion:
+            # Un trabajo cancelado durante el bloque conserva sus resultados
+            propio = conexion.execute(
+                "UPDATE trabajo SET procesados = procesados + ?, fallidos = fallidos + ?, actualizado_en = ? "
+                "WHERE id = ? AND propietario = ? AND estado IN (?, ?)",
+                (len(bloque), fallidos, _ahora(), trabajo_id, self.propietario, EN_CURSO, CANCELADO),
+            ).rowcount > 0
+            if not propio:
+                return False
+            conexion.executemany(
+                "UPDATE trabajo_item SET estado = ?, resultado = ? WHERE trabajo_id = ? AND posicion = ?",
+                (
+                    ("ok" if exito else "error", resultado, trabajo_id, fila["posicion"])
+                    for fila, (exito, resultado) in zip(bloque, resultados)
+                ),
+            )
+        return True
+
+    def _notificar(self, trabajo_id: int):
+        estado = self.trabajo(trabajo_id)
+        with self._lock:
+            suscriptores = list(self._suscriptores)
+        for callback in suscriptores:
+            try:
+                callback(estado)
+            except Exception:
+                logger.exception("Error notificando el trabajo %s", trabajo_id)
@@ -1,56 +1,204 @@
 """
 Configuración de logging para la aplicación.
+
+Los loggers solo encolan el registro (QueueHandler); un hilo aparte
+(QueueListener) le aplica el formato de cada handler y lo escribe en consola
+y en el archivo rotativo. Así la E/S sale del hilo que registra (UI,
+repositorios, servicios).
+
+- Archivo en JSON (una línea por registro) o texto, según LOG_FORMAT.
+- Nivel por módulo con LOG_LEVELS: los loggers silenciados descartan la
+  llamada antes de crear el registro.
+- Muestreo de eventos DEBUG frecuentes con LOG_SAMPLING (1 de cada N por
+  módulo y plantilla de mensaje).
 """
+import atexit
+import copy
+import datetime
+import json
 import logging
 import logging.handlers
+import queue
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from typing import Dict, Optional
 
 from app.config import get_settings
 
 
+# Atributos estándar de LogRecord; lo demás se considera "extra" estructurado
+_ATRIBUTOS_ESTANDAR = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como un objeto JSON en una sola línea."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensaje": record.getMessage(),
+            "hilo": record.threadName,
+        }
+        # Campos estructurados pasados con extra={...}
+        for clave, valor in record.__dict__.items():
+            if clave not in _ATRIBUTOS_ESTANDAR and not clave.startswith("_"):
+                datos[clave] = valor
+        if record.exc_info:
+            datos["excepcion"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Ya formateada al encolar (_QueueHandlerDiferido.prepare)
+            datos["excepcion"] = record.exc_text
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+class FiltroMuestreo(logging.Filter):
+    """
+    Deja pasar 1 de cada N registros DEBUG de los módulos configurados.
+
+    El conteo es por (logger, plantilla del mensaje), de modo que un evento
+    frecuente no oculta a otro esporádico del mismo módulo. Solo se guardan
+    las `max_claves` plantillas usadas más recientemente (LRU): un mensaje
+    armado con f-string es una plantilla nueva en cada llamada.
+    """
+
+    MAX_CLAVES = 1024
+
+    def __init__(self, tasas: Dict[str, int], max_claves: int = MAX_CLAVES):
+        super().__init__()
+        # Prefijos más largos primero para que el más específico gane
+        self._tasas = sorted(((p, int(n)) for p, n in tasas.items() if int(n) > 1), key=lambda x: -len(x[0]))
+        self._contadores: "OrderedDict[tuple, int]" = OrderedDict()
+        self._max_claves = max_claves
+        self._lock = threading.Lock()
+
+    def _tasa(self, nombre: str) -> int:
+        for prefijo, n in self._tasas:
+            if nombre == prefijo or nombre.startswith(prefijo + "."):
+                return n
+        return 1
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self._tasas:
+            return True
+        n = self._tasa(record.name)
+        if n <= 1:
+            return True
+        clave = (record.name, record.msg)
+        with self._lock:
+            cuenta = self._contadores.get(clave, 0)
+            self._contadores[clave] = cuenta + 1
+            self._contadores.move_to_end(clave)
+            if len(self._contadores) > self._max_claves:
+                self._contadores.popitem(last=False)
+        if cuenta % n:
+            return False
+        record.muestreo = n
+        return True
+
+
+class _QueueHandlerDiferido(logging.handlers.QueueHandler):
+    """
+    QueueHandler que resuelve el mensaje al encolar, como el estándar.
+
+    Igual que QueueHandler.prepare, interpola `msg % args` y formatea la
+    excepción en el hilo que registra: los argumentos pueden ser objetos que
+    cambian (o que no son seguros entre hilos) antes de que el listener los
+    lea, y el traceback retiene frames vivos. A diferencia del estándar no
+    aplica el formato de línea (fecha, nivel...), porque cada handler del
+    listener tiene el suyo (texto o JSON); la excepción queda en `exc_text`.
+    """
+
+    _formatter_excepciones = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        mensaje = record.getMessage()
+        # Copia: otros handlers del mismo logger deben ver el registro original
+        record = copy.copy(record)
+        record.message = mensaje
+        record.msg = mensaje
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._formatter_excepciones.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _nivel(nombre: str) -> int:
+    return getattr(logging, (nombre or "INFO").upper(), logging.INFO)
+
+
 def setup_logging():
     """Configura el sistema de logging."""
+    global _listener
     settings = get_settings()
-    
+
+    if _listener is not None:
+        return
+
     # Crear directorio de logs si no existe
     log_file = Path(settings.LOG_FILE)
     log_file.parent.mkdir(parents=True, exist_ok=True)
-    
+
     # Configurar formato
     formatter = logging.Formatter(
         fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
-    
-    # Handler para archivo con rotación
+
+    # Handler para archivo con rotación (corre en el hilo del listener)
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10 MB
         backupCount=5,
         encoding="utf-8",
     )
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT.lower() == "json" else formatter)
     file_handler.setLevel(logging.DEBUG)
-    
+
     # Handler para consola
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.INFO)
-    
+    console_handler.setLevel(_nivel(settings.LOG_CONSOLE_LEVEL))
+
+    # Cola sin límite: registrar nunca bloquea al hilo que llama
+    cola: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _QueueHandlerDiferido(cola)
+    queue_handler.addFilter(FiltroMuestreo(settings.LOG_SAMPLING))
+
+    _listener = logging.handlers.QueueListener(
+        cola, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(detener_logging)
+
     # Configurar root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
-    # Silenciar logs verbosos de SQLAlchemy
-    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-    
+    root_logger.setLevel(_nivel(settings.LOG_LEVEL))
+    root_logger.addHandler(queue_handler)
+
+    # Niveles por módulo (silencia, p. ej., los logs verbosos de SQLAlchemy)
+    for nombre, nivel in settings.LOG_LEVELS.items():
+        logging.getLogger(nombre).setLevel(_nivel(nivel))
+
     logging.info("=" * 60)
-    logging.info(f"{settings.APP_NAME} v{settings.APP_VERSION} iniciado")
+    logging.info("%s v%s iniciado", settings.APP_NAME, settings.APP_VERSION)
     logging.info("=" * 60)
 
 
+def detener_logging():
+    """Vacía la cola y detiene el hilo de escritura (se llama al salir)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Retorna un logger con el nombre especificado."""
     return logging.getLogger(name)
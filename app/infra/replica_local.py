@@ -0,0 +1,180 @@
+"""
+Réplica local (SQLite) de catálogos y procedimientos.
+
+Guarda cada catálogo tal como lo entregan CatalogoService y ProcedimientoStore
+(listas de dicts) para que el arranque y la construcción de formularios lean
+del disco local en lugar de la BD remota. Cada catálogo registra la firma de
+su tabla de origen en la última sincronización: ReplicaService solo vuelve a
+descargar los catálogos cuya tabla cambió. Los catálogos sincronizados por
+marca de agua guardan en su lugar la marca (actualizado_en) hasta la que están
+al día.
+
+Un fallo de la réplica (archivo bloqueado, disco lleno) nunca es fatal: se
+registra en el log y el llamador consulta la BD como antes.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fila (
+    catalogo TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    posicion INTEGER NOT NULL,
+    datos TEXT NOT NULL,
+    PRIMARY KEY (catalogo, id)
+);
+CREATE INDEX IF NOT EXISTS idx_fila_posicion ON fila (catalogo, posicion);
+CREATE TABLE IF NOT EXISTS sincronizacion (
+    catalogo TEXT PRIMARY KEY,
+    firma TEXT,
+    sincronizado_en TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS marca_agua (
+    catalogo TEXT PRIMARY KEY,
+    marca TEXT NOT NULL
+);
+"""
+
+
+class ReplicaLocal:
+    """Catálogos replicados en un archivo SQLite local (thread-safe)."""
+
+    def __init__(self, ruta: Path):
+        self.ruta = Path(ruta)
+        # El archivo se abre al primer uso
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _db(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conexion is None:
+                self.ruta.parent.mkdir(parents=True, exist_ok=True)
+                conexion = sqlite3.connect(
+                    str(self.ruta), timeout=30, check_same_thread=False, isolation_level=None
+                )
+                conexion.execute("PRAGMA journal_mode=WAL")
+                conexion.execute("PRAGMA synchronous=NORMAL")
+                conexion.executescript(_ESQUEMA)
+                self._conexion = conexion
+            return self._conexion
+
+    def leer(self, catalogo: str) -> Optional[List[dict]]:
+        """Filas del catálogo en su orden original, o None si nunca se sincronizó."""
+        try:
+            with self._lock:
+                conexion = self._db()
+                if conexion.execute(
+                    "SELECT 1 FROM sincronizacion WHERE catalogo = ?", (catalogo,)
+                ).fetchone() is None:
+                    return None
+                filas = conexion.execute(
+                    "SELECT datos FROM fila WHERE catalogo = ? ORDER BY posicion", (catalogo,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Réplica local no disponible (%s): %s", catalogo, e)
+            return None
+        return [json.loads(datos) for (datos,) in filas]
+
+    def guardar(
+        self,
+        catalogo: str,
+        filas: List[dict],
+        firma: Optional[str] = None,
+        marca: Optional[datetime] = None,
+    ) -> bool:
+        """Reemplaza el catálogo completo (cada fila debe tener "id") y su firma o marca."""
+        try:
+            with self._lock:
+                conexion = self._db()
+                conexion.execute("BEGIN IMMEDIATE")
+                try:
+                    conexion.execute("DELETE FROM fila WHERE catalogo = ?", (catalogo,))
+                    conexion.executemany(
+                        "INSERT INTO fila (catalogo, id, posicion, datos) VALUES (?, ?, ?, ?)",
+                        (
+                            (catalogo, fila["id"], posicion, json.dumps(fila, ensure_ascii=False))
+                            for posicion, fila in enumerate(filas)
+                        ),
+                    )
+                    conexion.execute(
+                        "INSERT OR REPLACE INTO sincronizacion (catalogo, firma, sincronizado_en) VALUES (?, ?, ?)",
+                        (catalogo, firma, datetime.now().isoformat(timespec="seconds")),
+                    )
+                    if marca is None:
+                        conexion.execute("DELETE FROM marca_agua WHERE catalogo = ?", (catalogo,))
+                    else:
+                        conexion.execute(
+                            "INSERT OR REPLACE INTO marca_agua (catalogo, marca) VALUES (?, ?)",
+                            (catalogo, marca.isoformat()),
+                        )
+                except BaseException:
+                    conexion.execute("ROLLBACK")
+                    raise
+                conexion.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.warning("No se pudo guardar %s en la réplica local: %s", catalogo, e)
+            return False
+        return True
+
+    def firmas(self) -> Dict[str, Optional[str]]:
+        """{catálogo: firma de su tabla en la última sincronización}."""
+        try:
+            with self._lock:
+                filas = self._db().execute("SELECT catalogo, firma FROM sincronizacion").fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Réplica local no disponible: %s", e)
+            return {}
+        return dict(filas)
+
+    def marcas(self) -> Dict[str, datetime]:
+        """{catálogo: marca de agua hasta la que está al día} (solo los incrementales)."""
+        try:
+            with self._lock:
+                filas = self._db().execute(
+                    "SELECT m.catalogo, m.marca FROM marca_agua m "
+                    "JOIN sincronizacion s ON s.catalogo = m.catalogo"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Réplica local no disponible: %s", e)
+            return {}
+        return {catalogo: datetime.fromisoformat(marca) for catalogo, marca in filas}
+
+    def descartar(self, catalogo: Optional[str] = None):
+        """Olvida un catálogo (o todos): la próxima lectura irá a la BD."""
+        try:
+            with self._lock:
+                conexion = self._db()
+                if catalogo is None:
+                    conexion.execute("DELETE FROM sincronizacion")
+                else:
+                    conexion.execute("DELETE FROM sincronizacion WHERE catalogo = ?", (catalogo,))
+        except sqlite3.Error as e:
+            logger.warning("No se pudo descartar %s de la réplica local: %s", catalogo or "la réplica", e)
+
+    def cerrar(self):
+        with self._lock:
+            if self._conexion is not None:
+                self._conexion.close()
+                self._conexion = None
+
+
+_compartida: Optional[ReplicaLocal] = None
+_lock_compartida = threading.Lock()
+
+
+def replica_compartida() -> ReplicaLocal:
+    """Réplica de la aplicación (ruta REPLICA_DB de la configuración)."""
+    global _compartida
+    if _compartida is None:
+        with _lock_compartida:
+            if _compartida is None:
+                from app.config import get_settings
+                _compartida = ReplicaLocal(Path(get_settings().REPLICA_DB))
+    return _compartida
@@ -0,0 +1,104 @@
+"""
+Utilidades de arranque de la interfaz.
+
+- MedidorPrimerPintado: registra en el log el tiempo hasta el primer pintado
+  de la ventana principal.
+- ArranqueEnSegundoPlano: carga los catálogos y procedimientos de la réplica
+  local, verifica la conexión a BD, precalienta el pool, sincroniza la réplica
+  y reanuda la cola de trabajos en un hilo, sin bloquear la ventana.
+"""
+import threading
+import time
+from typing import Optional
+
+from PySide6.QtCore import QEvent, QObject, Signal
+
+
+class MedidorPrimerPintado(QObject):
+    """Filtro de eventos que mide el tiempo hasta el primer Paint de un widget."""
+
+    def __init__(self, widget, inicio: float, logger):
+        super().__init__(widget)
+        self._widget = widget
+        self._inicio = inicio
+        self._logger = logger
+        self.milisegundos: Optional[float] = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.milisegundos is None:
+            self.milisegundos = (time.perf_counter() - self._inicio) * 1000
+            self._logger.info("Tiempo hasta el primer pintado: %.0f ms", self.milisegundos)
+            self._widget.removeEventFilter(self)
+        return False
+
+
+class ArranqueEnSegundoPlano(QObject):
+    """
+    Ejecuta la inicialización de BD y catálogos en un hilo.
+
+    Emite `terminado(ok, mensaje)`; como el objeto vive en el hilo de la UI,
+    la señal se entrega en ese hilo y el receptor puede tocar widgets.
+    """
+
+    terminado = Signal(bool, str)
+
+    def __init__(self, logger, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._logger = logger
+        self._hilo: Optional[threading.Thread] = None
+
+    def iniciar(self):
+        """Lanza el hilo de inicialización (una sola vez)."""
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._ejecutar, name="arranque", daemon=True)
+        self._hilo.start()
+
+    def _ejecutar(self):
+        inicio = time.perf_counter()
+        try:
+            # Catálogos desde la réplica local: los formularios no esperan la red
+            # (los que aún no estén en la réplica se consultan al sincronizar)
+            from app.domain.services.catalogo_service import CatalogoService
+            from app.domain.services.procedimiento_store import CATALOGO_REPLICA, ProcedimientoStore
+            from app.infra.replica_local import replica_compartida
+            replica = replica_compartida()
+            for nombre, datos in ((n, replica.leer(n)) for n in CatalogoService.nombres()):
+                if datos is not None:
+                    CatalogoService.actualizar(nombre, datos)
+            procedimientos = replica.leer(CATALOGO_REPLICA)
+            if procedimientos is not None:
+                ProcedimientoStore.actualizar(procedimientos)
+            self._logger.info("Réplica local leída en %.0f ms", (time.perf_counter() - inicio) * 1000)
+
+            from app.config.db import check_db_connection, warmup_pools
+
+            if not check_db_connection():
+                self.terminado.emit(
+                    False,
+                    "No se pudo conectar a la base de datos.\n"
+                    "Verifique la configuración en el archivo .env",
+                )
+                return
+            self._logger.info("Conexión a base de datos establecida")
+
+            # Ya estamos en segundo plano: precalentar de forma síncrona
+            warmup_pools(en_segundo_plano=False)
+
+            # Solo se descargan los catálogos cuya tabla cambió; luego cada REPLICA_INTERVALO
+            from app.domain.services.replica_service import ReplicaService
+            cargados = len(ReplicaService.sincronizar())
+            ReplicaService.iniciar()
+
+            # Retomar exportaciones/impresiones que quedaron a medias: solo las
+            # abandonadas (plazo vencido), no las que otro proceso sigue procesando
+            from app.domain.services.trabajos_service import TrabajosService
+            TrabajosService.cola().iniciar(recuperar=True)
+
+            ms = (time.perf_counter() - inicio) * 1000
+            self._logger.info("Inicialización en segundo plano completada en %.0f ms (%d catálogos descargados)", ms, cargados)
+            self.terminado.emit(True, "Listo")
+        except Exception as e:
+            self._logger.exception("Error en la inicialización en segundo plano: %s", e)
+            self.terminado.emit(False, f"Error inicializando la aplicación: {e}")
@@ -0,0 +1,214 @@
+"""
+Controlador reutilizable para búsquedas en segundo plano desde los formularios.
+
+- Debounce: las solicitudes que llegan dentro de la ventana de espera se
+  agrupan y solo se consulta la última.
+- Generación: cada consulta lanzada lleva un número; si llega una solicitud
+  nueva, el resultado de la anterior se descarta al llegar (y si aún no había
+  empezado, ni siquiera se ejecuta). Así los resultados nunca se pintan fuera
+  de orden.
+- Deduplicación: una clave que ya está en curso no se vuelve a consultar.
+- Caché por clave y reutilización de prefijos: si el usuario sigue escribiendo
+  y el resultado del prefijo anterior estaba completo (no truncado), se filtra
+  localmente en lugar de ir a la BD.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from app.utils.texto import normalizar_texto
+
+
+logger = logging.getLogger(__name__)
+
+# Pool compartido y pequeño: las búsquedas no deben acaparar conexiones del pool de BD
+_POOL: Optional[QThreadPool] = None
+
+
+def _pool() -> QThreadPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = QThreadPool()
+        _POOL.setMaxThreadCount(2)
+    return _POOL
+
+
+class _Trabajo(QRunnable):
+    """Ejecuta una búsqueda en el pool y devuelve el resultado por señal."""
+
+    def __init__(self, controlador: "ControladorBusqueda", generacion: int, clave: Hashable):
+        super().__init__()
+        self._controlador = controlador
+        self._generacion = generacion
+        self._clave = clave
+
+    def run(self):
+        controlador = self._controlador
+        # Si ya hay una solicitud más reciente, ni siquiera consultar
+        if controlador._generacion != self._generacion:
+            return
+        try:
+            resultado, error = controlador._buscar(self._clave), ""
+        except Exception as e:
+            resultado, error = None, str(e)
+        try:
+            # Emitida desde el hilo del pool: Qt la entrega en el hilo de la UI
+            controlador._terminado.emit(self._generacion, self._clave, resultado, error)
+        except RuntimeError:
+            # El formulario (y el controlador) se destruyó mientras se consultaba
+            pass
+
+
+class ControladorBusqueda(QObject):
+    """
+    Coordina las búsquedas de un formulario.
+
+    Emite `resultado(clave, valor)` en el hilo de la UI solo para la solicitud
+    más reciente, o `error(clave, mensaje)` si la consulta falló.
+    """
+
+    resultado = Signal(object, object)
+    error = Signal(object, str)
+    _terminado = Signal(int, object, object, str)
+
+    def __init__(
+        self,
+        buscar: Callable[[Any], Any],
+        parent: Optional[QObject] = None,
+        espera_ms: int = 300,
+        refinar: Optional[Callable[[Any, str], Any]] = None,
+        es_completo: Optional[Callable[[Any], bool]] = None,
+        max_cache: int = 32,
+    ):
+        """
+        Args:
+            buscar: función (clave) -> resultado. Corre en un hilo del pool,
+                por lo que debe abrir su propia sesión y no tocar widgets.
+            espera_ms: ventana de debounce para `solicitar`.
+            refinar: función (resultado_prefijo, clave) -> resultado que filtra
+                localmente un resultado previo (solo claves str).
+            es_completo: indica si un resultado no fue truncado por el límite;
+                solo los resultados completos se pueden refinar.
+            max_cache: cantidad de claves en caché (0 = sin caché).
+        """
+        super().__init__(parent)
+        self._buscar = buscar
+        self._espera_ms = espera_ms
+        self._refinar = refinar
+        self._es_completo = es_completo
+        self._max_cache = max_cache
+        self._cache: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+        self._pendiente: Optional[Hashable] = None
+        self._en_curso: Optional[Hashable] = None
+        self._generacion = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._lanzar)
+        self._terminado.connect(self._on_terminado)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def solicitar(self, clave: Hashable):
+        """Programa una búsqueda tras la ventana de debounce (mientras se escribe)."""
+        self._pendiente = clave
+        self._timer.start(self._espera_ms)
+
+    def solicitar_inmediato(self, clave: Hashable):
+        """Busca sin esperar (Enter, botón Buscar)."""
+        self._timer.stop()
+        self._pendiente = clave
+        self._lanzar()
+
+    def cancelar(self):
+        """Descarta la solicitud pendiente y cualquier resultado en curso."""
+        self._timer.stop()
+        self._pendiente = None
+        self._en_curso = None
+        self._generacion += 1
+
+    def invalidar(self):
+        """Vacía la caché (p. ej. después de guardar datos que afectan la búsqueda)."""
+        self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _lanzar(self):
+        clave, self._pendiente = self._pendiente, None
+        if clave is None:
+            return
+
+        # La misma clave ya se está consultando: su resultado será el vigente
+        if clave == self._en_curso:
+            return
+
+        local = self._desde_cache(clave)
+        if local is not None:
+            # Invalida cualquier consulta anterior que siga en vuelo
+            self._generacion += 1
+            self._en_curso = None
+            self.resultado.emit(clave, local)
+            return
+
+        self._generacion += 1
+        self._en_curso = clave
+        _pool().start(_Trabajo(self, self._generacion, clave))
+
+    def _desde_cache(self, clave: Hashable) -> Optional[Any]:
+        """Resultado exacto en caché o, si se puede, refinado desde un prefijo."""
+        if not self._max_cache:
+            return None
+
+        if clave in self._cache:
+            self._cache.move_to_end(clave)
+            return self._cache[clave]
+
+        if self._refinar is None or not isinstance(clave, str):
+            return None
+
+        # Prefijo más largo ya consultado cuyo resultado estaba completo
+        base = normalizar_texto(clave)
+        mejor = None
+        for previa, valor in self._cache.items():
+            if not isinstance(previa, str):
+                continue
+            previa_norm = normalizar_texto(previa)
+            if base.startswith(previa_norm) and (mejor is None or len(previa_norm) > len(mejor[0])):
+                if self._es_completo is None or self._es_completo(valor):
+                    mejor = (previa_norm, valor)
+        if mejor is None:
+            return None
+
+        refinado = self._refinar(mejor[1], clave)
+        self._guardar_cache(clave, refinado)
+        return refinado
+
+    def _guardar_cache(self, clave: Hashable, valor: Any):
+        if not self._max_cache:
+            return
+        self._cache[clave] = valor
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self._max_cache:
+            self._cache.popitem(last=False)
+
+    def _on_terminado(self, generacion: int, clave, valor, mensaje: str):
+        if not mensaje:
+            # Aunque llegue tarde, el resultado sigue siendo válido para su clave
+            self._guardar_cache(clave, valor)
+
+        if generacion != self._generacion:
+            logger.debug("Resultado descartado (búsqueda obsoleta): %r", clave)
+            return
+
+        self._en_curso = None
+        if mensaje:
+            self.error.emit(clave, mensaje)
+        else:
+            self.resultado.emit(clave, valor)
@@ -1,9 +1,23 @@
 """Presenters de la aplicación."""
-from app.ui.presenters.main_presenter import MainPresenter
-from app.ui.presenters.accidente_presenter import AccidentePresenter
-from app.ui.presenters.detalle_presenter import DetallePresenter
-from app.ui.presenters.medico_tratante_presenter import MedicoTratantePresenter
-from app.ui.presenters.remision_presenter import RemisionPresenter
+from typing import TYPE_CHECKING
+
+from app.utils.lazy import exportacion_diferida
+
+# Importación diferida (app.utils.lazy): {nombre: módulo que lo define}
+_MODULOS = {
+    "MainPresenter": "app.ui.presenters.main_presenter",
+    "AccidentePresenter": "app.ui.presenters.accidente_presenter",
+    "DetallePresenter": "app.ui.presenters.detalle_presenter",
+    "MedicoTratantePresenter": "app.ui.presenters.medico_tratante_presenter",
+    "RemisionPresenter": "app.ui.presenters.remision_presenter",
+}
+
+if TYPE_CHECKING:
+    from app.ui.presenters.main_presenter import MainPresenter
+    from app.ui.presenters.accidente_presenter import AccidentePresenter
+    from app.ui.presenters.detalle_presenter import DetallePresenter
+    from app.ui.presenters.medico_tratante_presenter import MedicoTratantePresenter
+    from app.ui.presenters.remision_presenter import RemisionPresenter
 
 __all__ = [
     "MainPresenter",
@@ -12,3 +26,5 @@ __all__ = [
     "MedicoTratantePresenter",
     "RemisionPresenter",
 ]
+
+__getattr__, __dir__ = exportacion_diferida(__name__, globals(), _MODULOS, __all__)
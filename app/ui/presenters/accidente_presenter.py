@@ -1,13 +1,22 @@
 """
 Presenter para el formulario de accidente (patrón MVP).
 """
-from PySide6.QtCore import QObject
+import logging
+
+from PySide6.QtCore import QObject, QTimer
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.ui.views import AccidenteForm
 from app.config import get_db_session
-from app.data.repositories import CatalogoRepository, PrestadorRepository
-from app.domain.services import AccidenteService
+from app.domain.services.accidente_service import AccidenteService
+from app.domain.services.catalogo_service import CatalogoService
+from app.domain.services.persona_cache import PersonaCache
 from app.domain.dto import AccidenteDTO
+from app.domain.mapeadores import ACCIDENTE_VISTA
+from app.data.repositories.concurrencia import mensaje_conflicto, verificar_version
+
+
+logger = logging.getLogger(__name__)
 
 
 class AccidentePresenter(QObject):
@@ -17,42 +26,121 @@ class AccidentePresenter(QObject):
         super().__init__()
         self.view = view
         self.accidente_id = None  # ID del accidente actual
+        self.accidente_version = None  # Versión del accidente mostrada en el formulario
         
-        # Inicializar presenters
-        from app.ui.presenters.victima_presenter import VictimaPresenter
-        from app.ui.presenters.conductor_presenter import ConductorPresenter
-        from app.ui.presenters.propietario_presenter import PropietarioPresenter
-        from app.ui.presenters.vehiculo_presenter import VehiculoPresenter
-        from app.ui.presenters.medico_tratante_presenter import MedicoTratantePresenter
-        from app.ui.presenters.remision_presenter import RemisionPresenter
-        from app.ui.presenters.detalle_presenter import DetallePresenter
-        
-        self.victima_presenter = VictimaPresenter(self.view.victima_form)
-        self.conductor_presenter = ConductorPresenter(self.view.conductor_form)
-        self.propietario_presenter = PropietarioPresenter(self.view.propietario_form)
-        self.vehiculo_presenter = VehiculoPresenter(self.view.vehiculo_form)
-        self.medico_tratante_presenter = MedicoTratantePresenter(self.view.medico_tratante_form)
-        self.remision_presenter = RemisionPresenter(self.view.remision_form)
-        self.detalle_presenter = DetallePresenter(self.view.detalle_form)
-        
-        # Establecer referencias cruzadas para copiar datos entre tabs
-        self.victima_presenter.conductor_presenter = self.conductor_presenter
-        self.victima_presenter.propietario_presenter = self.propietario_presenter
+        # Presenters de pestañas: se crean al activar la pestaña por primera vez
+        self._presenters = {}
+        # Accidente con el que se vinculó cada presenter (la carga de datos se
+        # difiere hasta que la pestaña es visible)
+        self._vinculados = {}
+        # Víctima pendiente de informar al médico tratante si aún no existe
+        self._victima_medico_pendiente = None
+        # Personas del accidente abierto, compartidas por víctima, conductor,
+        # propietario y vehículo (una misma persona suele estar en varias pestañas)
+        self.persona_cache = PersonaCache()
         
-        # Conectar víctima con médico tratante
-        self.view.victima_form.guardar_victima_signal.connect(self._on_victima_guardada)
-        self.view.victima_form.actualizar_victima_signal.connect(self._on_victima_actualizada)
-        
-        # Conectar callbacks entre Vehículo y Propietario
-        self.vehiculo_presenter.set_propietario_cargado_callback(self._cargar_propietario_desde_vehiculo)
-        self.propietario_presenter.set_vehiculos_cargados_callback(self._cargar_vehiculos_desde_propietario)
-        self.propietario_presenter.set_propietario_guardado_callback(self._notificar_vehiculo_propietario_guardado)
+        self.view.tabs.currentChanged.connect(self._on_tab_activada)
         
         # Conectar señales
         self._connect_signals()
         
         # Cargar catálogos iniciales
         self._cargar_catalogos()
+        
+        # Construir la pestaña visible después del primer pintado
+        QTimer.singleShot(0, lambda: self._on_tab_activada(self.view.tabs.currentIndex()))
+    
+    # ========================================================================
+    # PRESENTERS DE PESTAÑAS (CREACIÓN DIFERIDA)
+    # ========================================================================
+    
+    _CLASES_PRESENTER = {
+        "victima": ("app.ui.presenters.victima_presenter", "VictimaPresenter"),
+        "conductor": ("app.ui.presenters.conductor_presenter", "ConductorPresenter"),
+        "propietario": ("app.ui.presenters.propietario_presenter", "PropietarioPresenter"),
+        "vehiculo": ("app.ui.presenters.vehiculo_presenter", "VehiculoPresenter"),
+        "medico_tratante": ("app.ui.presenters.medico_tratante_presenter", "MedicoTratantePresenter"),
+        "remision": ("app.ui.presenters.remision_presenter", "RemisionPresenter"),
+        "detalle": ("app.ui.presenters.detalle_presenter", "DetallePresenter"),
+    }
+    
+    # Pestañas cuyo presenter se vincula con set_accidente_id
+    _TABS_CON_ACCIDENTE = ("victima", "conductor", "propietario", "vehiculo", "remision", "detalle")
+    
+    def _obtener_presenter(self, clave: str):
+        """Retorna el presenter de una pestaña, creándolo (con su formulario) si no existe."""
+        presenter = self._presenters.get(clave)
+        if presenter is not None:
+            return presenter
+        
+        from importlib import import_module
+        modulo, clase = self._CLASES_PRESENTER[clave]
+        presenter = getattr(import_module(modulo), clase)(self.view.get_form(clave))
+        self._presenters[clave] = presenter
+        self._conectar_presenter(clave, presenter)
+        logger.debug("Pestaña '%s' construida", clave)
+        return presenter
+    
+    def _conectar_presenter(self, clave: str, presenter):
+        """Establece las referencias cruzadas del presenter recién creado."""
+        if clave in ("victima", "conductor", "propietario", "vehiculo"):
+            presenter.persona_cache = self.persona_cache
+        
+        if clave == "victima":
+            # Copiar datos entre tabs: solo si ya existen (si no, se cargarán al abrirlos)
+            presenter.conductor_presenter = self._presenters.get("conductor")
+            presenter.propietario_presenter = self._presenters.get("propietario")
+            # Conectar víctima con médico tratante
+            presenter.view.guardar_victima_signal.connect(self._on_victima_guardada)
+            presenter.view.actualizar_victima_signal.connect(self._on_victima_actualizada)
+        elif clave in ("conductor", "propietario"):
+            victima = self._presenters.get("victima")
+            if victima is not None:
+                setattr(victima, f"{clave}_presenter", presenter)
+        
+        # Conectar callbacks entre Vehículo y Propietario
+        if clave == "vehiculo":
+            presenter.set_propietario_cargado_callback(self._cargar_propietario_desde_vehiculo)
+        elif clave == "propietario":
+            presenter.set_vehiculos_cargados_callback(self._cargar_vehiculos_desde_propietario)
+            presenter.set_propietario_guardado_callback(self._notificar_vehiculo_propietario_guardado)
+        elif clave == "medico_tratante" and self._victima_medico_pendiente:
+            presenter.set_accidente_victima(*self._victima_medico_pendiente)
+            self._victima_medico_pendiente = None
+    
+    def _on_tab_activada(self, index: int):
+        """Construye la pestaña al activarla y vincula el accidente actual si cambió."""
+        clave = self.view.clave_tab(index)
+        if clave is None:
+            return
+        if clave == "medico_tratante" and self.accidente_id:
+            # El médico depende de la víctima: vincularla para que informe sus datos
+            self._vincular_presenter("victima", self._obtener_presenter("victima"))
+        presenter = self._obtener_presenter(clave)
+        self._vincular_presenter(clave, presenter)
+    
+    def _vincular_presenter(self, clave: str, presenter):
+        """Llama a set_accidente_id solo si el presenter no está vinculado al accidente actual."""
+        if clave not in self._TABS_CON_ACCIDENTE or not self.accidente_id:
+            return
+        if self._vinculados.get(clave) != self.accidente_id:
+            self._vinculados[clave] = self.accidente_id
+            presenter.set_accidente_id(self.accidente_id)
+    
+    def _vincular_accidente(self, accidente_id: int):
+        """Cambia el accidente actual; solo la pestaña visible carga datos de inmediato."""
+        if accidente_id != self.accidente_id:
+            self.persona_cache.limpiar()
+        self.accidente_id = accidente_id
+        self._on_tab_activada(self.view.tabs.currentIndex())
+    
+    victima_presenter = property(lambda self: self._obtener_presenter("victima"))
+    conductor_presenter = property(lambda self: self._obtener_presenter("conductor"))
+    propietario_presenter = property(lambda self: self._obtener_presenter("propietario"))
+    vehiculo_presenter = property(lambda self: self._obtener_presenter("vehiculo"))
+    medico_tratante_presenter = property(lambda self: self._obtener_presenter("medico_tratante"))
+    remision_presenter = property(lambda self: self._obtener_presenter("remision"))
+    detalle_presenter = property(lambda self: self._obtener_presenter("detalle"))
     
     def _connect_signals(self):
         """Conecta las señales de la vista."""
@@ -62,43 +150,12 @@ class AccidentePresenter(QObject):
         self.view.buscar_accidente_signal.connect(self.abrir_buscar_accidente)
     
     def _cargar_catalogos(self):
-        """Carga los catálogos necesarios en los combos."""
+        """Carga los catálogos necesarios en los combos (desde la caché de catálogos)."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                prestador_repo = PrestadorRepository(session)
-                
-                # Cargar prestadores
-                prestadores = prestador_repo.get_all()
-                prestadores_data = [
-                    {"id": p.id, "razon_social": p.razon_social}
-                    for p in prestadores
-                ]
-                self.view.cargar_prestadores(prestadores_data)
-                
-                # Cargar naturalezas de evento
-                naturalezas = catalogo_repo.get_naturalezas_evento()
-                naturalezas_data = [
-                    {"id": n.id, "codigo": n.codigo, "descripcion": n.descripcion}
-                    for n in naturalezas
-                ]
-                self.view.cargar_naturalezas(naturalezas_data)
-                
-                # Cargar TODOS los municipios
-                municipios = catalogo_repo.get_todos_municipios()
-                municipios_data = [
-                    {"id": m.id, "nombre": m.nombre}
-                    for m in municipios
-                ]
-                self.view.cargar_municipios(municipios_data)
-                
-                # Cargar estados de aseguramiento
-                estados = catalogo_repo.get_estados_aseguramiento()
-                estados_data = [
-                    {"id": e.id, "codigo": e.codigo, "descripcion": e.descripcion}
-                    for e in estados
-                ]
-                self.view.cargar_estados_aseguramiento(estados_data)
+            self.view.cargar_prestadores(CatalogoService.prestadores())
+            self.view.cargar_naturalezas(CatalogoService.naturalezas_evento())
+            self.view.cargar_municipios(CatalogoService.municipios())
+            self.view.cargar_estados_aseguramiento(CatalogoService.estados_aseguramiento())
         
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
@@ -147,17 +204,13 @@ class AccidentePresenter(QObject):
                 if accidente:
                     # Guardar ID del accidente actual
                     self.accidente_id = accidente.id
+                    self.accidente_version = accidente.version
                     
                     # Actualizar la vista con el ID y consecutivo
                     self.view.mostrar_accidente_guardado(accidente.id, accidente.numero_consecutivo)
                     
-                    # Pasar el ID del accidente a todos los presenters
-                    self.victima_presenter.set_accidente_id(accidente.id)
-                    self.conductor_presenter.set_accidente_id(accidente.id)
-                    self.propietario_presenter.set_accidente_id(accidente.id)
-                    self.vehiculo_presenter.set_accidente_id(accidente.id)
-                    self.remision_presenter.set_accidente_id(accidente.id)
-                    self.detalle_presenter.set_accidente_id(accidente.id)
+                    # Vincular el accidente (las pestañas ocultas se vinculan al activarse)
+                    self._vincular_accidente(accidente.id)
                     # Cargar totales informativos desde repo y actualizar vista
                     try:
                         with get_db_session() as session:
@@ -246,6 +299,10 @@ class AccidentePresenter(QObject):
                     self._mostrar_error(f"No se encontró el accidente con ID {accidente_id}")
                     return
                 
+                # Otro usuario pudo guardarlo desde que se cargó en el formulario
+                if accidente_id == self.accidente_id:
+                    verificar_version(accidente, self.accidente_version, "el accidente")
+                
                 # Actualizar campos
                 accidente.prestador_id = datos["prestador_id"]
                 accidente.numero_factura = datos["numero_factura"]
@@ -259,12 +316,21 @@ class AccidentePresenter(QObject):
                 accidente.zona = datos.get("zona")
                 accidente.estado_aseguramiento_id = datos.get("estado_aseguramiento_id")
                 
+                # Mantener el resumen de búsqueda en la misma transacción
+                from app.data.repositories.resumen_repo import AccidenteResumenRepository
+                AccidenteResumenRepository(session).refrescar(accidente_id)
+                
                 session.commit()
+                if accidente_id == self.accidente_id:
+                    self.accidente_version = accidente.version
                 
                 self._mostrar_exito(f"✅ Accidente actualizado exitosamente\n\nID: {accidente.id}")
                 
                 print(f"✓ Accidente {accidente.id} actualizado")
         
+        except StaleDataError as e:
+            print(f"⚠️ Conflicto actualizando accidente: {e}")
+            self._mostrar_error(mensaje_conflicto("el accidente"))
         except Exception as e:
             print(f"❌ Error actualizando accidente: {e}")
             import traceback
@@ -282,6 +348,8 @@ class AccidentePresenter(QObject):
                 
                 # Anular el accidente
                 if repo.anular(accidente_id):
+                    from app.data.repositories.resumen_repo import AccidenteResumenRepository
+                    AccidenteResumenRepository(session).refrescar(accidente_id)
                     session.commit()
                     
                     self._mostrar_exito(f"✅ Accidente anulado exitosamente\n\nID: {accidente_id}\n\n"
@@ -327,35 +395,14 @@ class AccidentePresenter(QObject):
                     return
                 
                 # Preparar datos para la vista
-                accidente_dict = {
-                    "id": accidente.id,
-                    "prestador_id": accidente.prestador_id,
-                    "numero_consecutivo": accidente.numero_consecutivo,
-                    "numero_factura": accidente.numero_factura,
-                    "numero_rad_siras": accidente.numero_rad_siras,
-                    "naturaleza_evento_id": accidente.naturaleza_evento_id,
-                    "descripcion_otro_evento": accidente.descripcion_otro_evento,
-                    "fecha_evento": accidente.fecha_evento,
-                    "hora_evento": accidente.hora_evento,
-                    "municipio_evento_id": accidente.municipio_evento_id,
-                    "direccion_evento": accidente.direccion_evento,
-                    "zona": accidente.zona,
-                    "estado_aseguramiento_id": accidente.estado_aseguramiento_id,
-                }
+                accidente_dict = ACCIDENTE_VISTA.a_dict(accidente)
                 
                 # Cargar en la vista
                 self.view.cargar_accidente(accidente_dict)
                 
-                # Guardar ID
-                self.accidente_id = accidente.id
-                
-                # Pasar el ID a los presenters de tabs
-                self.victima_presenter.set_accidente_id(accidente.id)
-                self.conductor_presenter.set_accidente_id(accidente.id)
-                self.propietario_presenter.set_accidente_id(accidente.id)
-                self.vehiculo_presenter.set_accidente_id(accidente.id)
-                self.remision_presenter.set_accidente_id(accidente.id)
-                self.detalle_presenter.set_accidente_id(accidente.id)
+                # Guardar ID y vincular la pestaña visible (las demás al activarse)
+                self._vincular_accidente(accidente.id)
+                self.accidente_version = accidente.version
                 # Calcular y mostrar totales en la pestaña correspondiente
                 try:
                     with get_db_session() as session_tot:
@@ -390,20 +437,18 @@ class AccidentePresenter(QObject):
     def _cargar_propietario_desde_vehiculo(self, propietario_id: int):
         """Callback: Carga el propietario en su tab cuando se busca un vehículo."""
         try:
-            from app.data.repositories.persona_repo import PersonaRepository
+            # VehiculoPresenter.buscar_vehiculo deja al propietario en la caché compartida
+            persona = self.persona_cache.por_id(propietario_id)
             
-            with get_db_session() as session:
-                persona_repo = PersonaRepository(session)
-                persona = persona_repo.get_by_id(propietario_id)
+            if persona:
+                # Cambiar al tab de propietario primero: al activarse se construye
+                # y vincula, y luego se sobreponen los datos del propietario del vehículo
+                self.view.tabs.setCurrentWidget(self.view.tab_propietario)
                 
-                if persona:
-                    # Cargar en el tab de propietario
-                    self.propietario_presenter.cargar_propietario_existente_desde_persona(persona)
-                    
-                    # Cambiar al tab de propietario para que el usuario vea los datos
-                    self.view.tabs.setCurrentWidget(self.view.tab_propietario)
-                    
-                    print(f"✓ Propietario cargado desde vehículo: {persona.primer_nombre} {persona.primer_apellido}")
+                # Cargar en el tab de propietario
+                self.propietario_presenter.cargar_propietario_existente_desde_persona(persona)
+                
+                print(f"✓ Propietario cargado desde vehículo: {persona['primer_nombre']} {persona['primer_apellido']}")
         
         except Exception as e:
             print(f"❌ Error cargando propietario desde vehículo: {e}")
@@ -423,7 +468,10 @@ class AccidentePresenter(QObject):
     
     def _notificar_vehiculo_propietario_guardado(self):
         """Callback: Notifica al vehículo que se guardó un propietario."""
-        self.vehiculo_presenter.notificar_propietario_guardado()
+        # Si la pestaña de vehículo no se ha abierto, cargará el estado actual al abrirse
+        vehiculo_presenter = self._presenters.get("vehiculo")
+        if vehiculo_presenter is not None:
+            vehiculo_presenter.notificar_propietario_guardado()
     
     def _on_victima_guardada(self, datos: dict):
         """Callback: Notifica al médico tratante cuando se guarda una víctima."""
@@ -431,7 +479,12 @@ class AccidentePresenter(QObject):
             if self.accidente_id and datos.get("victima_id"):
                 victima_id = datos["victima_id"]
                 nombre = f"{datos.get('primer_nombre', '')} {datos.get('primer_apellido', '')}".strip()
-                self.medico_tratante_presenter.set_accidente_victima(
+                medico_presenter = self._presenters.get("medico_tratante")
+                if medico_presenter is None:
+                    # Se aplicará cuando se abra la pestaña de médico tratante
+                    self._victima_medico_pendiente = (self.accidente_id, victima_id, nombre)
+                    return
+                medico_presenter.set_accidente_victima(
                     self.accidente_id,
                     victima_id,
                     nombre
@@ -2,7 +2,7 @@
 Presenter para búsqueda de accidentes.
 """
 from typing import Dict, Any, List
-from app.data.repositories.accidente_repo import AccidenteRepository
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
 from app.config.db import get_db_session
 
 
@@ -14,36 +14,27 @@ class BuscarAccidentePresenter:
         self.view.presenter = self
     
     def buscar_accidentes(self, filtros: Dict[str, Any]):
-        """Busca accidentes según filtros."""
+        """Busca accidentes según filtros (sobre el resumen desnormalizado)."""
         try:
             with get_db_session() as session:
-                repo = AccidenteRepository(session)
-                resultados = repo.buscar_accidentes_con_victima(filtros)
+                repo = AccidenteResumenRepository(session)
+                resultados = repo.buscar(filtros)
                 
                 # Convertir a diccionarios para la vista
                 accidentes_dict = []
                 for acc in resultados:
-                    # Obtener placa del vehículo si existe
-                    placa = ""
-                    if hasattr(acc, 'vehiculo_id') and acc.vehiculo_id:
-                        from app.data.repositories.vehiculo_repo import VehiculoRepository
-                        vehiculo_repo = VehiculoRepository(session)
-                        vehiculo = vehiculo_repo.get_by_id(acc.vehiculo_id)
-                        if vehiculo:
-                            placa = vehiculo.placa or ""
-                    
                     accidentes_dict.append({
-                        "id": acc.id,
+                        "id": acc.accidente_id,
                         "consecutivo": acc.numero_consecutivo,
                         "factura": acc.numero_factura,
                         "fecha_evento": acc.fecha_evento,
                         "hora_evento": acc.hora_evento.strftime("%H:%M") if acc.hora_evento else "",
-                        "placa": placa,
-                        "tipo_identificacion": acc.tipo_identificacion if hasattr(acc, 'tipo_identificacion') else "",
-                        "numero_identificacion": acc.numero_identificacion if hasattr(acc, 'numero_identificacion') else "",
-                        "primer_nombre": acc.primer_nombre if hasattr(acc, 'primer_nombre') else "",
-                        "primer_apellido": acc.primer_apellido if hasattr(acc, 'primer_apellido') else "",
-                        "segundo_apellido": acc.segundo_apellido if hasattr(acc, 'segundo_apellido') else "",
+                        "placa": acc.placa or "",
+                        "tipo_identificacion": acc.tipo_identificacion or "",
+                        "numero_identificacion": acc.numero_identificacion or "",
+                        "primer_nombre": acc.primer_nombre or "",
+                        "primer_apellido": acc.primer_apellido or "",
+                        "segundo_apellido": acc.segundo_apellido or "",
                     })
                 
                 self.view.cargar_resultados(accidentes_dict)
@@ -6,8 +6,11 @@ from typing import Optional, Dict, Any
 from app.ui.views.conductor_form import ConductorForm
 from app.data.repositories.persona_repo import PersonaRepository
 from app.data.repositories.conductor_repo import ConductorRepository
-from app.data.repositories.catalogo_repo import CatalogoRepository
+from app.domain.services.catalogo_service import CatalogoService
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
 from app.config.db import get_db_session
+from app.ui.busqueda import ControladorBusqueda
+from app.domain.services.persona_cache import PersonaCache
 from app.data.models import AccidenteConductor
 
 
@@ -18,6 +21,16 @@ class ConductorPresenter:
         self.view = view
         self.accidente_id: Optional[int] = None
         
+        # Personas del accidente; AccidentePresenter la comparte entre pestañas
+        self.persona_cache = PersonaCache()
+        
+        # Búsqueda de persona en segundo plano (debounce y descarte de resultados obsoletos)
+        self._busqueda_persona = ControladorBusqueda(
+            self._consultar_persona, parent=self.view, espera_ms=150, max_cache=0
+        )
+        self._busqueda_persona.resultado.connect(self._mostrar_persona)
+        self._busqueda_persona.error.connect(self._mostrar_error_busqueda)
+        
         # Conectar señales
         self._conectar_signals()
         
@@ -32,28 +45,11 @@ class ConductorPresenter:
         self.view.anular_conductor_signal.connect(self.anular_conductor)
     
     def _cargar_catalogos(self):
-        """Carga los catálogos necesarios."""
+        """Carga los catálogos necesarios (desde la caché de catálogos)."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                
-                # Tipos de identificación
-                tipos = catalogo_repo.get_tipos_identificacion()
-                self.view.cargar_tipos_identificacion(
-                    [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
-                )
-                
-                # Sexos
-                sexos = catalogo_repo.get_sexos()
-                self.view.cargar_sexos(
-                    [{"id": s.id, "descripcion": s.descripcion} for s in sexos]
-                )
-                
-                # Municipios
-                municipios = catalogo_repo.get_todos_municipios()
-                self.view.cargar_municipios(
-                    [{"id": m.id, "nombre": m.nombre} for m in municipios]
-                )
+            self.view.cargar_tipos_identificacion(CatalogoService.tipos_identificacion())
+            self.view.cargar_sexos(CatalogoService.sexos())
+            self.view.cargar_municipios(CatalogoService.municipios())
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
     
@@ -63,34 +59,29 @@ class ConductorPresenter:
         self.cargar_conductor_existente()
     
     def buscar_persona(self, tipo_id: str, numero: str):
-        """Busca una persona por documento."""
+        """Busca una persona por documento (en segundo plano)."""
         if not tipo_id or not numero:
             return
         
-        try:
-            with get_db_session() as session:
-                persona_repo = PersonaRepository(session)
-                persona = persona_repo.get_by_documento(int(tipo_id), numero)
-                
-                if persona:
-                    self.view.cargar_persona({
-                        "id": persona.id,
-                        "primer_nombre": persona.primer_nombre,
-                        "segundo_nombre": persona.segundo_nombre,
-                        "primer_apellido": persona.primer_apellido,
-                        "segundo_apellido": persona.segundo_apellido,
-                        "fecha_nacimiento": persona.fecha_nacimiento,
-                        "sexo_id": persona.sexo_id,
-                        "direccion": persona.direccion,
-                        "telefono": persona.telefono,
-                        "municipio_residencia_id": persona.municipio_residencia_id,
-                    })
-                else:
-                    self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
-                    self.view.persona_id_actual = None
-        except Exception as e:
-            print(f"Error buscando persona: {e}")
-            self.view.lbl_persona_encontrada.setText(f"❌ Error: {str(e)}")
+        self.view.lbl_persona_encontrada.setText("🔍 Buscando...")
+        self._busqueda_persona.solicitar((int(tipo_id), numero))
+    
+    def _consultar_persona(self, clave):
+        """Consulta la persona (caché del accidente); corre en un hilo del pool de búsquedas."""
+        tipo_id, numero = clave
+        return self.persona_cache.por_documento(tipo_id, numero)
+    
+    def _mostrar_persona(self, clave, persona: Optional[Dict[str, Any]]):
+        """Carga en el formulario el resultado de la búsqueda vigente."""
+        if persona:
+            self.view.cargar_persona(persona)
+        else:
+            self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
+            self.view.persona_id_actual = None
+    
+    def _mostrar_error_busqueda(self, clave, mensaje: str):
+        print(f"Error buscando persona: {mensaje}")
+        self.view.lbl_persona_encontrada.setText(f"❌ Error: {mensaje}")
     
     def guardar_conductor(self, datos: Dict[str, Any]):
         """Guarda el conductor."""
@@ -156,7 +147,11 @@ class ConductorPresenter:
                     conductor = conductor_repo.create(conductor)
                     session.flush()
                 
+                # Los datos de la persona se muestran en el resumen si también es víctima
+                AccidenteResumenRepository(session).refrescar_por_persona(persona.id)
+                
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
                 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 print(f"✓ Conductor guardado: {nombre_completo}")
@@ -222,7 +217,9 @@ class ConductorPresenter:
                 
                 conductor.persona_id = persona.id
                 session.flush()
+                AccidenteResumenRepository(session).refrescar_por_persona(persona.id)
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
                 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 print(f"✓ Conductor actualizado: {nombre_completo}")
@@ -282,22 +279,12 @@ class ConductorPresenter:
                     conductor = conductores[0]  # Solo debe haber uno
                     persona = conductor.persona
                     
+                    datos_persona = PersonaRepository.datos_basicos(persona)
+                    self.persona_cache.guardar(datos_persona)
+                    
                     self.view.cargar_conductor_existente({
                         "id": conductor.id,
-                        "persona": {
-                            "id": persona.id,
-                            "tipo_identificacion_id": persona.tipo_identificacion_id,
-                            "numero_identificacion": persona.numero_identificacion,
-                            "primer_nombre": persona.primer_nombre,
-                            "segundo_nombre": persona.segundo_nombre,
-                            "primer_apellido": persona.primer_apellido,
-                            "segundo_apellido": persona.segundo_apellido,
-                            "fecha_nacimiento": persona.fecha_nacimiento,
-                            "sexo_id": persona.sexo_id,
-                            "direccion": persona.direccion,
-                            "telefono": persona.telefono,
-                            "municipio_residencia_id": persona.municipio_residencia_id,
-                        }
+                        "persona": datos_persona,
                     })
                     
         except Exception as e:
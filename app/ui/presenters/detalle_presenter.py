@@ -1,14 +1,37 @@
 """
 Presenter para el formulario de detalle (patrón MVP).
 """
-from typing import Any, Dict, List
+import logging
+from typing import Any, Dict, List, Optional
 from PySide6.QtCore import QObject
+from pydantic import ValidationError
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.ui.views import DetalleForm
 from app.config import get_db_session
-from app.data.repositories import DetalleRepository, CatalogoRepository
+from app.data.repositories import DetalleRepository
 from app.data.repositories.procedimiento_repo import ProcedimientoRepository
+from app.data.repositories.concurrencia import mensaje_conflicto
 from app.data.models.accidente_detalle import AccidenteDetalle
+from app.domain.mapeadores import DETALLE_COLUMNAS, DETALLE_VISTA
+from app.domain.services.catalogo_service import CatalogoService
+from app.domain.services.procedimiento_store import ProcedimientoStore
+from app.ui.busqueda import ControladorBusqueda, normalizar_texto
+
+
+logger = logging.getLogger(__name__)
+
+# Máximo de resultados por búsqueda en BD
+_LIMITE_BUSQUEDA = 50
+
+
+def _refinar_procedimientos(previos: List[Dict[str, Any]], termino: str) -> List[Dict[str, Any]]:
+    """Filtra localmente un resultado previo con el mismo criterio que la consulta (contiene)."""
+    termino = normalizar_texto(termino)
+    return [
+        p for p in previos
+        if any(termino in normalizar_texto(p.get(campo)) for campo in ("codigo", "descripcion", "codigo_soat"))
+    ]
 
 
 class DetallePresenter(QObject):
@@ -18,6 +41,8 @@ class DetallePresenter(QObject):
         super().__init__()
         self.view = view
         self.accidente_id = None
+        # {detalle_id: version} de los detalles mostrados (None = aún no cargados)
+        self._versiones: Optional[Dict[int, int]] = None
         
         # Conectar señales
         self._connect_signals()
@@ -27,37 +52,30 @@ class DetallePresenter(QObject):
     
     def _connect_signals(self):
         """Conecta las señales de la vista."""
+        # Búsquedas en BD en segundo plano; al seguir escribiendo sobre un
+        # resultado completo se filtra localmente sin nueva consulta
+        self._busqueda = ControladorBusqueda(
+            self._consultar_procedimientos,
+            parent=self,
+            refinar=_refinar_procedimientos,
+            es_completo=lambda resultado: len(resultado) < _LIMITE_BUSQUEDA,
+        )
+        self._busqueda.resultado.connect(self._mostrar_procedimientos)
+        self._busqueda.error.connect(self._mostrar_error_busqueda)
+        
         self.view.buscar_procedimiento_signal.connect(self.buscar_procedimientos)
         self.view.guardar_detalles_signal.connect(self.guardar_detalles)
     
     def _cargar_catalogos(self):
         """Carga los catálogos necesarios."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                
-                # Tipos de servicio
-                tipos = catalogo_repo.get_tipos_servicio()
-                self.view.cargar_tipos_servicio(
-                    [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
-                )
-                
-                # Cargar TODOS los procedimientos en el combo al inicio
-                print("📦 Cargando todos los procedimientos...")
-                procedimiento_repo = ProcedimientoRepository(session)
-                todos_procedimientos = procedimiento_repo.get_todos_activos()
-                print(f"✓ {len(todos_procedimientos)} procedimientos encontrados en BD")
-                
-                resultado = [{
-                    "id": p.id,
-                    "codigo": p.codigo,
-                    "descripcion": p.descripcion,
-                    "codigo_soat": p.codigo_soat,
-                    "valor": p.valor,
-                } for p in todos_procedimientos]
-                
-                self.view.cargar_procedimientos(resultado)
-                print(f"✓ Combo de procedimientos cargado con {len(resultado)} items")
+            # Tipos de servicio (desde la caché de catálogos)
+            self.view.cargar_tipos_servicio(CatalogoService.tipos_servicio())
+            
+            # Procedimientos: almacén compacto compartido (se consulta una sola vez)
+            store = ProcedimientoStore.compartido()
+            self.view.set_procedimiento_store(store)
+            logger.debug("Selector de procedimientos listo (%d items)", len(store))
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
             import traceback
@@ -66,58 +84,60 @@ class DetallePresenter(QObject):
     def set_accidente_id(self, accidente_id: int):
         """Establece el ID del accidente actual y carga los detalles."""
         self.accidente_id = accidente_id
+        self._versiones = None
         self._cargar_detalles()
     
     def buscar_procedimientos(self, termino: str):
         """Busca procedimientos por código o descripción."""
-        print(f"🔍 DetallePresenter.buscar_procedimientos() llamado con término: '{termino}'")
+        termino = (termino or "").strip()
+        logger.debug("buscar_procedimientos(%r)", termino)
         
-        if not termino or len(termino) < 2:
-            print(f"⚠️ Término muy corto o vacío, ignorando búsqueda")
+        if len(termino) < 2:
             return
         
-        try:
-            with get_db_session() as session:
-                procedimiento_repo = ProcedimientoRepository(session)
-                procedimientos = procedimiento_repo.buscar(termino)
-                
-                print(f"📊 Resultado de la búsqueda en BD: {len(procedimientos)} procedimientos")
-                
-                resultado = [{
-                    "id": p.id,
-                    "codigo": p.codigo,
-                    "descripcion": p.descripcion,
-                    "codigo_soat": p.codigo_soat,
-                    "valor": p.valor,
-                } for p in procedimientos]
-                
-                # Si solo hay un resultado, auto-completar directamente
-                if len(resultado) == 1:
-                    print(f"✨ Solo 1 resultado, auto-completando campos...")
-                    proc = resultado[0]
-                    self.view.txt_codigo_servicio.setText(proc["codigo"])
-                    self.view.txt_descripcion.setText(proc["descripcion"])
-                    self.view.txt_valor_unitario.setText(str(proc["valor"]))
-                    self.view._calcular_valores()
-                    # También cargar en combo para referencia
-                    self.view.cargar_procedimientos(resultado)
-                    self.view.combo_procedimiento.setCurrentIndex(1)  # Seleccionar el único resultado
-                    print(f"✓ Campos completados con: {proc['codigo']} - {proc['descripcion']}")
-                else:
-                    # Varios resultados, cargar en combo
-                    print(f"📋 Cargando {len(resultado)} procedimientos en combo...")
-                    self.view.cargar_procedimientos(resultado)
-                    print(f"✓ Combo cargado")
-                
-                if not resultado:
-                    print(f"ℹ️ No se encontraron procedimientos para: {termino}")
-                else:
-                    print(f"✅ {len(resultado)} procedimientos encontrados")
+        # Código exacto: se resuelve en memoria sin ir a la BD
+        store = self.view.modelo_procedimientos.store
+        fila = store.fila_por_codigo(termino) if store is not None else None
+        if fila is not None:
+            self._busqueda.cancelar()
+            self.view.seleccionar_procedimiento(store.como_dict(fila))
+            logger.debug("Procedimiento %s encontrado en memoria", termino)
+            return
         
-        except Exception as e:
-            print(f"❌ Error buscando procedimientos: {e}")
-            import traceback
-            traceback.print_exc()
+        self._busqueda.solicitar_inmediato(termino)
+    
+    @staticmethod
+    def _consultar_procedimientos(termino: str) -> List[Dict[str, Any]]:
+        """Busca procedimientos (en memoria si ya se cargaron, si no en BD); corre en un hilo del pool de búsquedas."""
+        store = ProcedimientoStore.cargado()
+        if store is not None:
+            return store.buscar(termino, _LIMITE_BUSQUEDA)
+        with get_db_session() as session:
+            procedimientos = ProcedimientoRepository(session).buscar(termino, limite=_LIMITE_BUSQUEDA)
+            return [{
+                "id": p.id,
+                "codigo": p.codigo,
+                "descripcion": p.descripcion,
+                "codigo_soat": p.codigo_soat,
+                "valor": p.valor,
+            } for p in procedimientos]
+    
+    def _mostrar_procedimientos(self, termino: str, resultado: List[Dict[str, Any]]):
+        """Aplica a la vista el resultado de la búsqueda vigente."""
+        logger.debug("Búsqueda %r: %d procedimientos", termino, len(resultado))
+        
+        # Si solo hay un resultado, auto-completar directamente
+        if len(resultado) == 1:
+            proc = resultado[0]
+            self.view.seleccionar_procedimiento(proc)
+        elif resultado:
+            # Varios resultados: desplegarlos filtrando el selector
+            self.view.mostrar_coincidencias_procedimiento(termino)
+        else:
+            logger.debug("No se encontraron procedimientos para: %s", termino)
+    
+    def _mostrar_error_busqueda(self, termino: str, mensaje: str):
+        logger.error("Error buscando procedimientos (%s): %s", termino, mensaje)
     
     def _cargar_detalles(self):
         """Carga los detalles del accidente."""
@@ -126,27 +146,19 @@ class DetallePresenter(QObject):
             return
         
         try:
-            print(f"🔍 DetallePresenter: Buscando detalles para accidente_id={self.accidente_id}")
+            logger.debug("Buscando detalles para accidente_id=%s", self.accidente_id)
             with get_db_session() as session:
                 detalle_repo = DetalleRepository(session)
-                detalles = detalle_repo.get_by_accidente(self.accidente_id)
+                anio = detalle_repo.anio_de_accidente(self.accidente_id)
+                detalles = detalle_repo.get_by_accidente(self.accidente_id, anio)
+                # Estado que se muestra: al guardar se comprueba que nadie lo cambió
+                self._versiones = {d.id: d.version for d in detalles}
                 
                 if detalles:
-                    print(f"✓ DetallePresenter: {len(detalles)} detalles encontrados")
-                    detalles_dict = []
-                    for d in detalles:
-                        detalles_dict.append({
-                            "id": d.id,
-                            "tipo_servicio_id": d.tipo_servicio_id,
-                            "tipo_servicio_nombre": d.tipo_servicio.descripcion if d.tipo_servicio else "",
-                            "procedimiento_id": d.procedimiento_id,
-                            "codigo_servicio": d.codigo_servicio,
-                            "descripcion": d.descripcion,
-                            "cantidad": d.cantidad,
-                            "valor_unitario": d.valor_unitario,
-                            "valor_facturado": d.valor_facturado,
-                            "valor_reclamado": d.valor_reclamado,
-                        })
+                    logger.debug("%d detalles encontrados", len(detalles))
+                    detalles_dict = DETALLE_VISTA.a_dicts(detalles)
+                    for fila, d in zip(detalles_dict, detalles):
+                        fila["tipo_servicio_nombre"] = d.tipo_servicio.descripcion if d.tipo_servicio else ""
                     
                     self.view.cargar_detalles(detalles_dict)
                 else:
@@ -157,6 +169,15 @@ class DetallePresenter(QObject):
             import traceback
             traceback.print_exc()
     
+    @staticmethod
+    def _mensaje_validacion(error: ValidationError) -> str:
+        """Errores de la validación por lote, uno por línea con su número de fila."""
+        lineas = []
+        for err in error.errors():
+            fila, *campo = err["loc"]
+            lineas.append(f"Fila {fila + 1}, {'.'.join(map(str, campo))}: {err['msg']}")
+        return "\n".join(lineas)
+    
     def guardar_detalles(self, detalles: List[Dict[str, Any]]):
         """Guarda todos los detalles del accidente."""
         if not self.accidente_id:
@@ -167,32 +188,30 @@ class DetallePresenter(QObject):
             print("Error: No hay detalles para guardar")
             return
         
+        # Toda la tabla se valida en una sola llamada (antes de tocar la BD)
+        try:
+            detalles_dto = DETALLE_VISTA.validar_lista(detalles)
+        except ValidationError as e:
+            from PySide6.QtWidgets import QMessageBox
+            QMessageBox.warning(self.view, "Detalles inválidos", self._mensaje_validacion(e))
+            return
+        
         try:
             with get_db_session() as session:
                 detalle_repo = DetalleRepository(session)
                 
                 # 1. Eliminar detalles existentes
                 print(f"🗑️ Eliminando detalles existentes...")
-                count_eliminados = detalle_repo.delete_by_accidente(self.accidente_id)
+                anio = detalle_repo.anio_de_accidente(self.accidente_id)
+                count_eliminados = detalle_repo.delete_by_accidente(self.accidente_id, anio, self._versiones)
                 print(f"  ✓ {count_eliminados} detalles eliminados")
                 
                 # 2. Crear nuevos detalles
-                print(f"💾 Guardando {len(detalles)} nuevos detalles...")
-                nuevos_detalles = []
-                for datos in detalles:
-                    detalle = AccidenteDetalle(
-                        accidente_id=self.accidente_id,
-                        tipo_servicio_id=datos["tipo_servicio_id"],
-                        procedimiento_id=datos.get("procedimiento_id"),
-                        codigo_servicio=datos.get("codigo_servicio"),
-                        descripcion=datos.get("descripcion"),
-                        cantidad=datos["cantidad"],
-                        valor_unitario=datos["valor_unitario"],
-                        valor_facturado=datos["valor_facturado"],
-                        valor_reclamado=datos["valor_reclamado"],
-                        estado=1
-                    )
-                    nuevos_detalles.append(detalle)
+                print(f"💾 Guardando {len(detalles_dto)} nuevos detalles...")
+                nuevos_detalles = [
+                    AccidenteDetalle(accidente_id=self.accidente_id, estado=1, **DETALLE_COLUMNAS.a_dict(dto))
+                    for dto in detalles_dto
+                ]
                 
                 # Guardar en lote
                 detalle_repo.create_bulk(nuevos_detalles)
@@ -237,6 +256,10 @@ class DetallePresenter(QObject):
                 # Mostrar mensaje de éxito
                 self.view.mostrar_detalles_guardados()
         
+        except StaleDataError as e:
+            print(f"⚠️ Conflicto guardando detalles: {e}")
+            from PySide6.QtWidgets import QMessageBox
+            QMessageBox.warning(self.view, "⚠️ Detalles modificados", mensaje_conflicto("los detalles del accidente"))
         except Exception as e:
             print(f"❌ Error guardando detalles: {e}")
             import traceback
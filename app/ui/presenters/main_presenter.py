@@ -1,25 +1,35 @@
 """
 Presenter principal de la aplicación (patrón MVP).
 """
-from PySide6.QtCore import QObject
+from typing import TYPE_CHECKING
 
-from app.ui.views import MainWindow, AccidenteForm
-from app.ui.views.buscar_imprimir_dialog import BuscarImprimirDialog
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QMessageBox
-from app.ui.presenters.accidente_presenter import AccidentePresenter
-from app.domain.services.print_service import PrintService
+
+# Las vistas/presenters/servicios pesados se importan al usarse por primera vez
+# para que la ventana principal aparezca lo antes posible.
+if TYPE_CHECKING:
+    from app.ui.views.main_window import MainWindow
 
 
 class MainPresenter(QObject):
     """Presenter principal que orquesta la aplicación."""
     
-    def __init__(self, main_window: MainWindow):
+    # Emitida desde los hilos de la cola de trabajos; Qt la entrega en el hilo de la UI
+    _trabajo_actualizado = Signal(dict)
+    
+    def __init__(self, main_window: "MainWindow"):
         super().__init__()
         self.view = main_window
         
         # Presenters hijos
         self.accidente_presenter = None
         
+        # Trabajos encolados desde esta ventana (se informa su resultado)
+        self._trabajos = set()
+        self._suscrito_cola = False
+        self._trabajo_actualizado.connect(self._on_trabajo_actualizado)
+        
         # Conectar señales
         self._connect_signals()
     
@@ -34,6 +44,9 @@ class MainPresenter(QObject):
     def mostrar_diligenciar_furips(self):
         """Muestra el formulario para diligenciar FURIPS."""
         if self.accidente_presenter is None:
+            from app.ui.views.accidente_form import AccidenteForm
+            from app.ui.presenters.accidente_presenter import AccidentePresenter
+            
             # Crear vista y presenter
             accidente_form = AccidenteForm()
             self.accidente_presenter = AccidentePresenter(accidente_form)
@@ -43,32 +56,64 @@ class MainPresenter(QObject):
     
     def mostrar_exportar_magneticos(self):
         """Muestra el diálogo para exportar archivos magnéticos."""
-        # TODO: Implementar
+        # TODO: Implementar el diálogo; mientras tanto la exportación por lotes está en la CLI
         self.view.mostrar_mensaje(
             "Exportar Magnéticos",
-            "Funcionalidad en desarrollo",
+            "Funcionalidad en desarrollo.\n\n"
+            "Para exportar por lotes use:\n"
+            "python -m app.cli exportar --desde AAAA-MM-DD --hasta AAAA-MM-DD",
             "info"
         )
     
     def mostrar_imprimir_pdf(self):
         """Muestra el diálogo para imprimir PDFs."""
+        from app.ui.views.buscar_imprimir_dialog import BuscarImprimirDialog
+        
         # Mostrar el panel de búsqueda/imprimir embebido en la ventana principal
         self.imprimir_panel = BuscarImprimirDialog(self.view)
         self.imprimir_panel.imprimir_accidente.connect(self._on_imprimir_accidente)
         self.view.set_content(self.imprimir_panel)
 
     def _on_imprimir_accidente(self, accidente_id: int):
-        # Invocar el servicio de generación de PDF (sin bloquear UI por mucho tiempo)
+        # Encolar la generación del PDF: corre en la cola de trabajos sin bloquear la UI
+        # y, si la aplicación se cierra antes de terminar, se retoma al volver a abrirla
         try:
-            self.view.mostrar_estado(f"Generando PDF para accidente {accidente_id}...")
-            svc = PrintService()
+            from app.domain.services.trabajos_service import TrabajosService
+            
+            if not self._suscrito_cola:
+                TrabajosService.suscribir(self._trabajo_actualizado.emit)
+                self._suscrito_cola = True
+            TrabajosService.cola().iniciar()
             # Generar PDF usando la consulta CTE (rellena DTO desde una sola consulta)
-            output = svc.generar_pdf_accidente(accidente_id, tipo="furips_cte")
-            self.view.mostrar_estado(f"PDF generado: {output}")
-            QMessageBox.information(self.view, "Imprimir", f"PDF generado: {output}")
+            trabajo_id = TrabajosService.encolar_impresion([accidente_id], tipo="furips_cte")
+            self._trabajos.add(trabajo_id)
+            self.view.mostrar_estado(f"Generando PDF para accidente {accidente_id}...")
         except Exception as e:
             QMessageBox.critical(self.view, "Error impresión", f"No se pudo generar el PDF: {e}")
     
+    def _on_trabajo_actualizado(self, trabajo: dict):
+        """Informa el progreso/resultado de los trabajos encolados desde esta ventana."""
+        if trabajo["id"] not in self._trabajos:
+            return
+        from app.domain.services.trabajos_service import TrabajosService
+        from app.infra.cola_trabajos import COMPLETADO, ESTADOS_FINALES
+        
+        if trabajo["estado"] not in ESTADOS_FINALES:
+            self.view.mostrar_estado(f"Trabajo {trabajo['id']}: {trabajo['procesados']}/{trabajo['total']}")
+            return
+        self._trabajos.discard(trabajo["id"])
+        
+        resultados = TrabajosService.cola().resultados(trabajo["id"])
+        if trabajo["estado"] == COMPLETADO and not trabajo["fallidos"]:
+            rutas = "\n".join(r for _, _, r in resultados)
+            self.view.mostrar_estado(f"PDF generado: {rutas}")
+            QMessageBox.information(self.view, "Imprimir", f"PDF generado: {rutas}")
+        else:
+            errores = "\n".join(f"{item}: {r}" for item, estado, r in resultados if estado == "error")
+            mensaje = errores or trabajo["error"] or trabajo["estado"]
+            self.view.mostrar_estado(f"Trabajo {trabajo['id']} {trabajo['estado']}")
+            QMessageBox.critical(self.view, "Error impresión", f"No se pudo generar el PDF: {mensaje}")
+    
     def mostrar_configuracion(self):
         """Muestra el diálogo de configuración."""
         # TODO: Implementar
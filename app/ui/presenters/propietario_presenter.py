@@ -3,11 +3,17 @@ Presenter para gestión del propietario.
 """
 from typing import Optional, Dict, Any
 
+from sqlalchemy import and_
+
 from app.ui.views.propietario_form import PropietarioForm
 from app.data.repositories.persona_repo import PersonaRepository
 from app.data.repositories.propietario_repo import PropietarioRepository
-from app.data.repositories.catalogo_repo import CatalogoRepository
+from app.domain.services.catalogo_service import CatalogoService
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
+from app.data.repositories.auditoria_repo import AuditoriaWriter
 from app.config.db import get_db_session
+from app.ui.busqueda import ControladorBusqueda
+from app.domain.services.persona_cache import PersonaCache
 from app.data.models import AccidentePropietario
 
 
@@ -20,6 +26,16 @@ class PropietarioPresenter:
         self.vehiculos_cargados_callback = None  # Callback para notificar cuando se carga un propietario
         self.propietario_guardado_callback = None  # Callback para notificar cuando se guarda un propietario
         
+        # Personas del accidente; AccidentePresenter la comparte entre pestañas
+        self.persona_cache = PersonaCache()
+        
+        # Búsqueda de persona en segundo plano (debounce y descarte de resultados obsoletos)
+        self._busqueda_persona = ControladorBusqueda(
+            self._consultar_persona, parent=self.view, espera_ms=150, max_cache=0
+        )
+        self._busqueda_persona.resultado.connect(self._mostrar_persona)
+        self._busqueda_persona.error.connect(self._mostrar_error_busqueda)
+        
         # Conectar señales
         self._conectar_signals()
         
@@ -42,28 +58,11 @@ class PropietarioPresenter:
         self.view.anular_propietario_signal.connect(self.anular_propietario)
     
     def _cargar_catalogos(self):
-        """Carga los catálogos necesarios."""
+        """Carga los catálogos necesarios (desde la caché de catálogos)."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                
-                # Tipos de identificación
-                tipos = catalogo_repo.get_tipos_identificacion()
-                self.view.cargar_tipos_identificacion(
-                    [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
-                )
-                
-                # Sexos
-                sexos = catalogo_repo.get_sexos()
-                self.view.cargar_sexos(
-                    [{"id": s.id, "descripcion": s.descripcion} for s in sexos]
-                )
-                
-                # Municipios
-                municipios = catalogo_repo.get_todos_municipios()
-                self.view.cargar_municipios(
-                    [{"id": m.id, "nombre": m.nombre} for m in municipios]
-                )
+            self.view.cargar_tipos_identificacion(CatalogoService.tipos_identificacion())
+            self.view.cargar_sexos(CatalogoService.sexos())
+            self.view.cargar_municipios(CatalogoService.municipios())
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
     
@@ -73,71 +72,63 @@ class PropietarioPresenter:
         self.cargar_propietario_existente()
     
     def buscar_persona(self, tipo_id: str, numero: str):
-        """Busca una persona por documento con validación de uso previo."""
+        """Busca una persona por documento con validación de uso previo (en segundo plano)."""
         if not tipo_id or not numero:
             return
         
-        try:
-            with get_db_session() as session:
-                persona_repo = PersonaRepository(session)
-                persona = persona_repo.get_by_documento(int(tipo_id), numero)
-                
-                if persona:
-                    # SEGURIDAD: Verificar si esta persona ya es propietario en otro accidente activo
-                    from app.data.repositories.propietario_repo import PropietarioRepository
-                    from sqlalchemy import and_
-                    from app.data.models.accidente import AccidentePropietario
-                    
-                    propietario_repo = PropietarioRepository(session)
-                    otros_propietarios = session.query(AccidentePropietario).filter(
-                        and_(
-                            AccidentePropietario.persona_id == persona.id,
-                            AccidentePropietario.accidente_id != self.accidente_id,
-                            AccidentePropietario.estado == 1
-                        )
-                    ).first()
-                    
-                    if otros_propietarios:
-                        from PySide6.QtWidgets import QMessageBox
-                        nombre = f"{persona.primer_nombre} {persona.primer_apellido}"
-                        respuesta = QMessageBox.information(
-                            self.view,
-                            "ℹ️ Persona ya registrada",
-                            f"<b>La persona {nombre}</b><br>"
-                            f"Documento: {numero}<br><br>"
-                            f"Ya está registrada como <b>propietario en otro accidente</b><br>"
-                            f"(Accidente ID: {otros_propietarios.accidente_id})<br><br>"
-                            f"Se cargará la información para este accidente.",
-                            QMessageBox.Ok
-                        )
-                    
-                    self.view.cargar_persona({
-                        "id": persona.id,
-                        "primer_nombre": persona.primer_nombre,
-                        "segundo_nombre": persona.segundo_nombre,
-                        "primer_apellido": persona.primer_apellido,
-                        "segundo_apellido": persona.segundo_apellido,
-                        "fecha_nacimiento": persona.fecha_nacimiento,
-                        "sexo_id": persona.sexo_id,
-                        "direccion": persona.direccion,
-                        "telefono": persona.telefono,
-                        "municipio_residencia_id": persona.municipio_residencia_id,
-                    })
-                    
-                    self.view.lbl_persona_encontrada.setText(f"✓ Persona encontrada en BD (ID: {persona.id})")
-                    self.view.lbl_persona_encontrada.setStyleSheet("color: green; font-weight: bold;")
-                    
-                    # Notificar para cargar vehículos en tab Vehículo
-                    if self.vehiculos_cargados_callback:
-                        self.vehiculos_cargados_callback(persona.id)
-                else:
-                    self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
-                    self.view.persona_id_actual = None
-        except Exception as e:
-            print(f"Error buscando persona: {e}")
-            import traceback
-            traceback.print_exc()
-            self.view.lbl_persona_encontrada.setText(f"❌ Error: {str(e)}")
+        self.view.lbl_persona_encontrada.setText("🔍 Buscando...")
+        self._busqueda_persona.solicitar((int(tipo_id), numero, self.accidente_id))
+    
+    def _consultar_persona(self, clave):
+        """Consulta la persona y su uso como propietario; corre en un hilo del pool."""
+        tipo_id, numero, accidente_id = clave
+        with get_db_session() as session:
+            persona = self.persona_cache.por_documento(tipo_id, numero, session)
+            if persona:
+                # SEGURIDAD: Verificar si esta persona ya es propietario en otro accidente activo
+                otro = session.query(AccidentePropietario.accidente_id).filter(
+                    and_(
+                        AccidentePropietario.persona_id == persona["id"],
+                        AccidentePropietario.accidente_id != accidente_id,
+                        AccidentePropietario.estado == 1
+                    )
+                ).first()
+                persona["otro_accidente_id"] = otro.accidente_id if otro else None
+            return persona
+    
+    def _mostrar_persona(self, clave, persona: Optional[Dict[str, Any]]):
+        """Carga en el formulario el resultado de la búsqueda vigente."""
+        if not persona:
+            self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
+            self.view.persona_id_actual = None
+            return
+        
+        if persona.get("otro_accidente_id"):
+            from PySide6.QtWidgets import QMessageBox
+            nombre = f"{persona['primer_nombre']} {persona['primer_apellido']}"
+            QMessageBox.information(
+                self.view,
+                "ℹ️ Persona ya registrada",
+                f"<b>La persona {nombre}</b><br>"
+                f"Documento: {clave[1]}<br><br>"
+                f"Ya está registrada como <b>propietario en otro accidente</b><br>"
+                f"(Accidente ID: {persona['otro_accidente_id']})<br><br>"
+                f"Se cargará la información para este accidente.",
+                QMessageBox.Ok
+            )
+        
+        self.view.cargar_persona(persona)
+        
+        self.view.lbl_persona_encontrada.setText(f"✓ Persona encontrada en BD (ID: {persona['id']})")
+        self.view.lbl_persona_encontrada.setStyleSheet("color: green; font-weight: bold;")
+        
+        # Notificar para cargar vehículos en tab Vehículo
+        if self.vehiculos_cargados_callback:
+            self.vehiculos_cargados_callback(persona["id"])
+    
+    def _mostrar_error_busqueda(self, clave, mensaje: str):
+        print(f"Error buscando persona: {mensaje}")
+        self.view.lbl_persona_encontrada.setText(f"❌ Error: {mensaje}")
     
     def guardar_propietario(self, datos: Dict[str, Any]):
         """Guarda el propietario."""
@@ -187,12 +178,25 @@ class PropietarioPresenter:
                 session.flush()
 
                 # 2. Crear/actualizar propietario
+                auditoria = AuditoriaWriter(session)
                 if datos.get("propietario_id"):
                     # Actualizar existente
                     propietario = propietario_repo.get_by_id(datos["propietario_id"])
                     if propietario:
+                        anterior = persona_repo.get_datos_by_id(propietario.persona_id)
                         propietario.persona_id = persona.id
                         session.flush()
+                        auditoria.registrar_propietario(
+                            self.accidente_id,
+                            "ACTUALIZAR",
+                            propietario_id_anterior=propietario.id,
+                            propietario_id_nuevo=propietario.id,
+                            persona_id_anterior=anterior["id"] if anterior else None,
+                            persona_id_nueva=persona.id,
+                            documento_anterior=anterior["numero_identificacion"] if anterior else None,
+                            documento_nuevo=persona.numero_identificacion,
+                            motivo="Propietario actualizado",
+                        )
                 else:
                     # Crear nuevo
                     propietario = AccidentePropietario(
@@ -201,8 +205,20 @@ class PropietarioPresenter:
                     )
                     propietario = propietario_repo.create(propietario)
                     session.flush()
+                    auditoria.registrar_propietario(
+                        self.accidente_id,
+                        "CREAR",
+                        propietario_id_nuevo=propietario.id,
+                        persona_id_nueva=persona.id,
+                        documento_nuevo=persona.numero_identificacion,
+                        motivo="Propietario registrado",
+                    )
+
+                # Los datos de la persona se muestran en el resumen si también es víctima
+                AccidenteResumenRepository(session).refrescar_por_persona(persona.id)
 
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 print(f"✓ Propietario guardado: {nombre_completo}")
@@ -269,9 +285,23 @@ class PropietarioPresenter:
                     print("❌ Error: Propietario no encontrado")
                     return
                 
+                anterior = persona_repo.get_datos_by_id(propietario.persona_id)
                 propietario.persona_id = persona.id
                 session.flush()
+                AuditoriaWriter(session).registrar_propietario(
+                    self.accidente_id,
+                    "ACTUALIZAR",
+                    propietario_id_anterior=propietario.id,
+                    propietario_id_nuevo=propietario.id,
+                    persona_id_anterior=anterior["id"] if anterior else None,
+                    persona_id_nueva=persona.id,
+                    documento_anterior=anterior["numero_identificacion"] if anterior else None,
+                    documento_nuevo=persona.numero_identificacion,
+                    motivo="Propietario actualizado",
+                )
+                AccidenteResumenRepository(session).refrescar_por_persona(persona.id)
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
                 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 print(f"✓ Propietario actualizado: {nombre_completo}")
@@ -293,7 +323,17 @@ class PropietarioPresenter:
             with get_db_session() as session:
                 propietario_repo = PropietarioRepository(session)
                 
-                if propietario_repo.anular(propietario_id):
+                propietario = propietario_repo.get_by_id(propietario_id)
+                if propietario and propietario_repo.anular(propietario_id):
+                    anterior = PersonaRepository(session).get_datos_by_id(propietario.persona_id)
+                    AuditoriaWriter(session).registrar_propietario(
+                        propietario.accidente_id,
+                        "ANULAR",
+                        propietario_id_anterior=propietario_id,
+                        persona_id_anterior=propietario.persona_id,
+                        documento_anterior=anterior["numero_identificacion"] if anterior else None,
+                        motivo="Propietario anulado",
+                    )
                     session.commit()
                     print(f"✓ Propietario {propietario_id} anulado correctamente")
                     
@@ -335,49 +375,28 @@ class PropietarioPresenter:
                     propietario = propietarios[0]  # Solo debe haber uno
                     persona = propietario.persona
 
+                    datos_persona = PersonaRepository.datos_basicos(persona)
+                    self.persona_cache.guardar(datos_persona)
+                    
                     self.view.cargar_propietario_existente({
                         "id": propietario.id,
-                        "persona": {
-                            "id": persona.id,
-                            "tipo_identificacion_id": persona.tipo_identificacion_id,
-                            "numero_identificacion": persona.numero_identificacion,
-                            "primer_nombre": persona.primer_nombre,
-                            "segundo_nombre": persona.segundo_nombre,
-                            "primer_apellido": persona.primer_apellido,
-                            "segundo_apellido": persona.segundo_apellido,
-                            "fecha_nacimiento": persona.fecha_nacimiento,
-                            "sexo_id": persona.sexo_id,
-                            "direccion": persona.direccion,
-                            "telefono": persona.telefono,
-                            "municipio_residencia_id": persona.municipio_residencia_id,
-                        }
+                        "persona": datos_persona,
                     })
                 # Si no hay propietarios activos, no cargar ninguno (no mostrar anulados)
                     
         except Exception as e:
             print(f"❌ Error cargando propietario: {e}")
     
-    def cargar_propietario_existente_desde_persona(self, persona):
-        """Carga un propietario desde un objeto Persona (llamado desde vehículo)."""
+    def cargar_propietario_existente_desde_persona(self, persona: dict):
+        """Carga un propietario desde los datos de la caché de personas (llamado desde vehículo)."""
         try:
-            self.view.cargar_persona({
-                "id": persona.id,
-                "primer_nombre": persona.primer_nombre,
-                "segundo_nombre": persona.segundo_nombre,
-                "primer_apellido": persona.primer_apellido,
-                "segundo_apellido": persona.segundo_apellido,
-                "fecha_nacimiento": persona.fecha_nacimiento,
-                "sexo_id": persona.sexo_id,
-                "direccion": persona.direccion,
-                "telefono": persona.telefono,
-                "municipio_residencia_id": persona.municipio_residencia_id,
-            })
+            self.view.cargar_persona(persona)
             
             # También cargar en los campos de documento
             self.view.combo_tipo_id.setCurrentIndex(
-                self.view.combo_tipo_id.findData(persona.tipo_identificacion_id)
+                self.view.combo_tipo_id.findData(persona["tipo_identificacion_id"])
             )
-            self.view.txt_numero_id.setText(persona.numero_identificacion)
+            self.view.txt_numero_id.setText(persona["numero_identificacion"])
             
         except Exception as e:
             print(f"❌ Error cargando propietario desde persona: {e}")
@@ -87,25 +87,11 @@ class RemisionPresenter(QObject):
         try:
             with get_db_session() as session:
                 remision_repo = RemisionRepository(session)
+                # Solo trae las activas (filtro global de filas activas)
                 remisiones = remision_repo.get_by_accidente(self.accidente_id)
-                # Mostrar estados para depuración y normalizar valores
-                estados = [getattr(r, 'estado', None) for r in remisiones]
-                print(f"[RemisionPresenter] Remisiones encontradas estados: {estados}")
-
-                def _is_activo(estado_value):
-                    if estado_value is None:
-                        return False
-                    try:
-                        s = str(estado_value).strip().lower()
-                    except Exception:
-                        return False
-                    return s in ("activo", "1", "true", "t", "si", "s", "yes")
-
-                # Filtrar solo las remisiones consideradas activas según varias representaciones
-                remisiones_activas = [r for r in remisiones if _is_activo(getattr(r, 'estado', None))]
                 # Solo mostramos la primera remisión activa (solo se permite 1 por accidente)
-                if remisiones_activas:
-                    remision = remisiones_activas[0]
+                if remisiones:
+                    remision = remisiones[0]
                     datos = {
                         "id": remision.id,
                         "accidente_id": remision.accidente_id,
@@ -151,12 +137,11 @@ class RemisionPresenter(QObject):
             with get_db_session() as session:
                 remision_repo = RemisionRepository(session)
 
+                # Solo activas: las inactivas no se reactivan ni se actualizan
                 existentes = remision_repo.get_by_accidente(self.accidente_id)
-                # Solo consideramos remisiones activas como 'existentes' para evitar reactivar/actualizar inactivas
-                existentes_activas = [r for r in existentes if getattr(r, 'estado', 'activo') == 'activo']
-                if existentes_activas:
+                if existentes:
                     # Si ya existe una remisión activa, actualizamos la primera (no creamos otra)
-                    remision = existentes_activas[0]
+                    remision = existentes[0]
                     remision.tipo_referencia = datos["tipo_referencia"]
                     remision.fecha_remision = datos["fecha_remision"]
                     remision.hora_salida = datos["hora_salida"]
@@ -215,8 +200,8 @@ class RemisionPresenter(QObject):
         try:
             with get_db_session() as session:
                 remision_repo = RemisionRepository(session)
-                remision = remision_repo.get_by_id(remision_id)
-                if remision and getattr(remision, 'estado', 'activo') == 'activo':
+                remision = remision_repo.get_by_id(remision_id)  # None si ya está inactiva
+                if remision:
                     remision.estado = 'inactivo'
                     session.commit()
                     print(f"✅ Remisión {remision_id} anulada (estado inactivo)")
@@ -3,11 +3,17 @@ Presenter para gestión del vehículo.
 """
 from typing import Optional, Dict, Any
 
+from sqlalchemy.orm.exc import StaleDataError
+
 from app.ui.views.vehiculo_form import VehiculoForm
 from app.data.repositories.vehiculo_repo import VehiculoRepository
-from app.data.repositories.catalogo_repo import CatalogoRepository
+from app.data.repositories.auditoria_repo import AuditoriaWriter
+from app.data.repositories.concurrencia import mensaje_conflicto, verificar_version
+from app.domain.services.catalogo_service import CatalogoService
+from app.domain.mapeadores import VEHICULO_VISTA
 from app.config.db import get_db_session
 from app.data.models.vehiculo import Vehiculo
+from app.domain.services.persona_cache import PersonaCache
 
 
 class VehiculoPresenter:
@@ -17,6 +23,11 @@ class VehiculoPresenter:
         self.view = view
         self.accidente_id: Optional[int] = None
         self.propietario_cargado_callback = None  # Callback para notificar cuando se carga propietario
+        # vehiculo_id -> versión mostrada en el formulario (concurrencia optimista)
+        self._versiones: Dict[int, int] = {}
+        
+        # Personas del accidente; AccidentePresenter la comparte entre pestañas
+        self.persona_cache = PersonaCache()
         
         # Conectar señales
         self._conectar_signals()
@@ -36,22 +47,10 @@ class VehiculoPresenter:
         self.view.anular_vehiculo_signal.connect(self.anular_vehiculo)
     
     def _cargar_catalogos(self):
-        """Carga los catálogos necesarios."""
+        """Carga los catálogos necesarios (desde la caché de catálogos)."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                
-                # Tipos de vehículo
-                tipos = catalogo_repo.get_tipos_vehiculo()
-                self.view.cargar_tipos_vehiculo(
-                    [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
-                )
-                
-                # Estados de aseguramiento
-                estados = catalogo_repo.get_estados_aseguramiento()
-                self.view.cargar_estados_aseguramiento(
-                    [{"id": e.id, "descripcion": e.descripcion} for e in estados]
-                )
+            self.view.cargar_tipos_vehiculo(CatalogoService.tipos_vehiculo())
+            self.view.cargar_estados_aseguramiento(CatalogoService.estados_aseguramiento())
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
     
@@ -96,16 +95,13 @@ class VehiculoPresenter:
                     
                     if vehiculo.propietario_id and propietario_actual_id and vehiculo.propietario_id != propietario_actual_id:
                         # CONFLICTO: Vehículo existente tiene otro propietario
-                        from app.data.repositories.persona_repo import PersonaRepository
-                        persona_repo = PersonaRepository(session)
-                        
-                        persona_vehiculo = persona_repo.get_by_id(vehiculo.propietario_id)
-                        persona_actual = persona_repo.get_by_id(propietario_actual_id)
+                        persona_vehiculo = self.persona_cache.por_id(vehiculo.propietario_id, session)
+                        persona_actual = self.persona_cache.por_id(propietario_actual_id, session)
                         
-                        nombre_vehiculo = f"{persona_vehiculo.primer_nombre} {persona_vehiculo.primer_apellido}" if persona_vehiculo else "Desconocido"
-                        doc_vehiculo = persona_vehiculo.numero_identificacion if persona_vehiculo else "N/A"
-                        nombre_actual = f"{persona_actual.primer_nombre} {persona_actual.primer_apellido}" if persona_actual else "Desconocido"
-                        doc_actual = persona_actual.numero_identificacion if persona_actual else "N/A"
+                        nombre_vehiculo = f"{persona_vehiculo['primer_nombre']} {persona_vehiculo['primer_apellido']}" if persona_vehiculo else "Desconocido"
+                        doc_vehiculo = persona_vehiculo["numero_identificacion"] if persona_vehiculo else "N/A"
+                        nombre_actual = f"{persona_actual['primer_nombre']} {persona_actual['primer_apellido']}" if persona_actual else "Desconocido"
+                        doc_actual = persona_actual["numero_identificacion"] if persona_actual else "N/A"
                         
                         from PySide6.QtWidgets import QMessageBox
                         
@@ -157,17 +153,8 @@ class VehiculoPresenter:
                             self.view.vehiculo_propietario_bd = vehiculo.propietario_id
                             
                             # Cargar datos del vehículo
-                            self.view.cargar_vehiculo({
-                                "id": vehiculo.id,
-                                "placa": vehiculo.placa,
-                                "marca": vehiculo.marca,
-                                "tipo_vehiculo_id": vehiculo.tipo_vehiculo_id,
-                                "aseguradora_codigo": vehiculo.aseguradora_codigo,
-                                "numero_poliza": vehiculo.numero_poliza,
-                                "vigencia_inicio": vehiculo.vigencia_inicio,
-                                "vigencia_fin": vehiculo.vigencia_fin,
-                                "estado_aseguramiento_id": vehiculo.estado_aseguramiento_id,
-                            })
+                            self._versiones[vehiculo.id] = vehiculo.version
+                            self.view.cargar_vehiculo(VEHICULO_VISTA.a_dict(vehiculo))
                             
                             # Verificar si el propietario actual ya está guardado en este accidente
                             if propietarios_actuales:
@@ -212,23 +199,16 @@ class VehiculoPresenter:
                         # Continuar con carga normal
                     
                     # Cargar vehículo existente
-                    self.view.cargar_vehiculo({
-                        "id": vehiculo.id,
-                        "placa": vehiculo.placa,
-                        "marca": vehiculo.marca,
-                        "tipo_vehiculo_id": vehiculo.tipo_vehiculo_id,
-                        "aseguradora_codigo": vehiculo.aseguradora_codigo,
-                        "numero_poliza": vehiculo.numero_poliza,
-                        "vigencia_inicio": vehiculo.vigencia_inicio,
-                        "vigencia_fin": vehiculo.vigencia_fin,
-                        "estado_aseguramiento_id": vehiculo.estado_aseguramiento_id,
-                    })
+                    self._versiones[vehiculo.id] = vehiculo.version
+                    self.view.cargar_vehiculo(VEHICULO_VISTA.a_dict(vehiculo))
                     
                     self.view.lbl_vehiculo_encontrado.setText(f"✓ Vehículo encontrado en BD (ID: {vehiculo.id})")
                     self.view.lbl_vehiculo_encontrado.setStyleSheet("color: green; font-weight: bold;")
                     
                     # Si el vehículo tiene propietario, notificar para cargar en tab Propietario
                     if vehiculo.propietario_id and self.propietario_cargado_callback:
+                        # Leerlo con esta sesión: el callback lo toma de la caché compartida
+                        self.persona_cache.por_id(vehiculo.propietario_id, session)
                         self.propietario_cargado_callback(vehiculo.propietario_id)
                 else:
                     self.view.lbl_vehiculo_encontrado.setText("⚠️ Vehículo no encontrado. Se creará nuevo.")
@@ -257,7 +237,6 @@ class VehiculoPresenter:
         if datos.get("vehiculo_id") and not propietario_actualizado:
             from PySide6.QtWidgets import QMessageBox
             from app.data.repositories.propietario_repo import PropietarioRepository
-            from app.data.repositories.persona_repo import PersonaRepository
             
             try:
                 with get_db_session() as session:
@@ -274,12 +253,11 @@ class VehiculoPresenter:
                             
                             if vehiculo.propietario_id != propietario_accidente_id:
                                 # El propietario del vehículo es diferente al del accidente
-                                persona_repo = PersonaRepository(session)
-                                persona_vehiculo = persona_repo.get_by_id(vehiculo.propietario_id)
-                                persona_accidente = persona_repo.get_by_id(propietario_accidente_id)
+                                persona_vehiculo = self.persona_cache.por_id(vehiculo.propietario_id, session)
+                                persona_accidente = self.persona_cache.por_id(propietario_accidente_id, session)
                                 
-                                nombre_vehiculo = f"{persona_vehiculo.primer_nombre} {persona_vehiculo.primer_apellido}" if persona_vehiculo else "Desconocido"
-                                nombre_accidente = f"{persona_accidente.primer_nombre} {persona_accidente.primer_apellido}" if persona_accidente else "Desconocido"
+                                nombre_vehiculo = f"{persona_vehiculo['primer_nombre']} {persona_vehiculo['primer_apellido']}" if persona_vehiculo else "Desconocido"
+                                nombre_accidente = f"{persona_accidente['primer_nombre']} {persona_accidente['primer_apellido']}" if persona_accidente else "Desconocido"
                                 
                                 QMessageBox.warning(
                                     self.view,
@@ -296,9 +274,8 @@ class VehiculoPresenter:
                                 return
                         else:
                             # No hay propietario guardado en el accidente
-                            persona_repo = PersonaRepository(session)
-                            persona_vehiculo = persona_repo.get_by_id(vehiculo.propietario_id)
-                            nombre_vehiculo = f"{persona_vehiculo.primer_nombre} {persona_vehiculo.primer_apellido}" if persona_vehiculo else "Desconocido"
+                            persona_vehiculo = self.persona_cache.por_id(vehiculo.propietario_id, session)
+                            nombre_vehiculo = f"{persona_vehiculo['primer_nombre']} {persona_vehiculo['primer_apellido']}" if persona_vehiculo else "Desconocido"
                             
                             QMessageBox.warning(
                                 self.view,
@@ -372,6 +349,7 @@ class VehiculoPresenter:
         try:
             with get_db_session() as session:
                 vehiculo_repo = VehiculoRepository(session)
+                auditoria = AuditoriaWriter(session)
                 
                 # Verificar si ya existe un vehículo para este accidente
                 vehiculo_existente = vehiculo_repo.get_by_accidente(self.accidente_id)
@@ -398,6 +376,13 @@ class VehiculoPresenter:
                         propietario_anterior = vehiculo.propietario_id
                         vehiculo.propietario_id = propietario_actual_id
                         session.flush()
+                        auditoria.registrar_propietario(
+                            self.accidente_id,
+                            "ACTUALIZAR",
+                            persona_id_anterior=propietario_anterior,
+                            persona_id_nueva=propietario_actual_id,
+                            motivo=f"Cambio de propietario del vehículo {vehiculo.placa}",
+                        )
                         print(f"  🔄 Propietario del vehículo actualizado: {propietario_anterior} → {propietario_actual_id}")
                     
                     print(f"  ✓ Usando vehículo existente ID={vehiculo.id}, propietario_id={vehiculo.propietario_id}")
@@ -439,10 +424,23 @@ class VehiculoPresenter:
                     return
                 
                 print(f"  📌 ANTES: Accidente.vehiculo_id = {accidente.vehiculo_id}")
+                vehiculo_anterior_id = accidente.vehiculo_id
+                vehiculo_anterior = vehiculo_repo.get_by_id(vehiculo_anterior_id) if vehiculo_anterior_id else None
                 accidente.vehiculo_id = vehiculo.id
                 session.flush()
                 print(f"  📌 DESPUÉS: Accidente.vehiculo_id = {accidente.vehiculo_id}")
                 
+                if vehiculo_anterior_id != vehiculo.id:
+                    auditoria.registrar_vehiculo(
+                        self.accidente_id,
+                        "ACTUALIZAR" if vehiculo_anterior_id else "CREAR",
+                        vehiculo_id_anterior=vehiculo_anterior_id,
+                        vehiculo_id_nuevo=vehiculo.id,
+                        placa_anterior=vehiculo_anterior.placa if vehiculo_anterior else None,
+                        placa_nueva=vehiculo.placa,
+                        motivo="Vehículo asociado al accidente",
+                    )
+                
                 # Verificar la asociación antes de commit
                 session.refresh(accidente)
                 if accidente.vehiculo_id != vehiculo.id:
@@ -450,7 +448,14 @@ class VehiculoPresenter:
                     print(f"  ❌ ERROR: No se pudo asociar vehiculo_id al accidente")
                     return
                 
+                # Mantener el resumen de búsqueda (placa del accidente)
+                from app.data.repositories.resumen_repo import AccidenteResumenRepository
+                resumen_repo = AccidenteResumenRepository(session)
+                resumen_repo.refrescar(self.accidente_id)
+                resumen_repo.refrescar_por_vehiculo(vehiculo.id)
+                
                 session.commit()
+                self._versiones[vehiculo.id] = vehiculo.version
                 print(f"  ✅ COMMIT exitoso - Vehículo {vehiculo.id} asociado a Accidente {self.accidente_id}")
                 
                 placa = vehiculo.placa or "N/A"
@@ -470,6 +475,9 @@ class VehiculoPresenter:
                 
                 self.view.mostrar_vehiculo_guardado(vehiculo.id, placa)
                 
+        except StaleDataError as e:
+            print(f"⚠️ Conflicto guardando vehículo: {e}")
+            self._mostrar_conflicto()
         except Exception as e:
             print(f"❌ Error guardando vehículo: {e}")
             import traceback
@@ -498,6 +506,12 @@ class VehiculoPresenter:
                 if not vehiculo:
                     print("❌ Error: Vehículo no encontrado")
                     return
+                # Otro usuario pudo guardarlo desde que se cargó en el formulario
+                verificar_version(vehiculo, self._versiones.get(vehiculo.id), "el vehículo")
+                
+                auditoria = AuditoriaWriter(session)
+                placa_anterior = vehiculo.placa
+                propietario_anterior = vehiculo.propietario_id
                 
                 # Obtener propietario del accidente si existe
                 from app.data.repositories.propietario_repo import PropietarioRepository
@@ -518,6 +532,24 @@ class VehiculoPresenter:
                 
                 session.flush()
                 
+                auditoria.registrar_vehiculo(
+                    self.accidente_id,
+                    "ACTUALIZAR",
+                    vehiculo_id_anterior=vehiculo.id,
+                    vehiculo_id_nuevo=vehiculo.id,
+                    placa_anterior=placa_anterior,
+                    placa_nueva=vehiculo.placa,
+                    motivo="Datos del vehículo actualizados",
+                )
+                if vehiculo.propietario_id != propietario_anterior:
+                    auditoria.registrar_propietario(
+                        self.accidente_id,
+                        "ACTUALIZAR",
+                        persona_id_anterior=propietario_anterior,
+                        persona_id_nueva=vehiculo.propietario_id,
+                        motivo=f"Cambio de propietario del vehículo {vehiculo.placa}",
+                    )
+                
                 # Verificar que el accidente tenga asociado este vehículo
                 from app.data.repositories.accidente_repo import AccidenteRepository
                 accidente_repo = AccidenteRepository(session)
@@ -528,13 +560,23 @@ class VehiculoPresenter:
                     accidente.vehiculo_id = vehiculo.id
                     session.flush()
                 
+                # La placa pudo cambiar: refrescar todos los accidentes del vehículo
+                from app.data.repositories.resumen_repo import AccidenteResumenRepository
+                resumen_repo = AccidenteResumenRepository(session)
+                resumen_repo.refrescar(self.accidente_id)
+                resumen_repo.refrescar_por_vehiculo(vehiculo.id)
+                
                 session.commit()
+                self._versiones[vehiculo.id] = vehiculo.version
                 
                 placa = vehiculo.placa or "N/A"
                 print(f"✓ Vehículo actualizado: {placa}")
                 
                 self.view.mostrar_vehiculo_guardado(vehiculo.id, placa)
                 
+        except StaleDataError as e:
+            print(f"⚠️ Conflicto actualizando vehículo: {e}")
+            self._mostrar_conflicto()
         except Exception as e:
             print(f"❌ Error actualizando vehículo: {e}")
             import traceback
@@ -545,6 +587,8 @@ class VehiculoPresenter:
         try:
             with get_db_session() as session:
                 vehiculo_repo = VehiculoRepository(session)
+                # Antes de anular: después el filtro de filas activas ya no lo trae
+                vehiculo = vehiculo_repo.get_by_id(vehiculo_id)
                 
                 if vehiculo_repo.anular(vehiculo_id):
                     # CRÍTICO: Quitar el vehiculo_id del accidente para romper la asociación
@@ -558,9 +602,23 @@ class VehiculoPresenter:
                             accidente.vehiculo_id = None
                             session.flush()
                             print(f"  📌 DESPUÉS de anular: Accidente.vehiculo_id = {accidente.vehiculo_id}")
+                            
+                            AuditoriaWriter(session).registrar_vehiculo(
+                                self.accidente_id,
+                                "ANULAR",
+                                vehiculo_id_anterior=vehiculo_id,
+                                placa_anterior=vehiculo.placa if vehiculo else None,
+                                motivo="Vehículo anulado",
+                            )
                         else:
                             print(f"  ⚠️ Accidente no tiene este vehículo asociado o no se encontró")
                     
+                    from app.data.repositories.resumen_repo import AccidenteResumenRepository
+                    resumen_repo = AccidenteResumenRepository(session)
+                    resumen_repo.refrescar_por_vehiculo(vehiculo_id)
+                    if self.accidente_id:
+                        resumen_repo.refrescar(self.accidente_id)
+                    
                     session.commit()
                     print(f"✓ Vehículo {vehiculo_id} anulado y desasociado del accidente correctamente")
                     
@@ -589,6 +647,11 @@ class VehiculoPresenter:
                 f"Error al anular vehículo: {str(e)}"
             )
     
+    def _mostrar_conflicto(self):
+        """Avisa que otro usuario guardó el vehículo mientras se editaba."""
+        from PySide6.QtWidgets import QMessageBox
+        QMessageBox.warning(self.view, "⚠️ Vehículo modificado", mensaje_conflicto("el vehículo"))
+    
     def cargar_vehiculo_existente(self):
         """Carga el vehículo existente si hay uno."""
         if not self.accidente_id:
@@ -603,17 +666,8 @@ class VehiculoPresenter:
                 
                 if vehiculo:
                     print(f"✓ VehiculoPresenter: Vehículo encontrado - Placa: {vehiculo.placa}, ID: {vehiculo.id}")
-                    self.view.cargar_vehiculo_existente({
-                        "id": vehiculo.id,
-                        "placa": vehiculo.placa,
-                        "marca": vehiculo.marca,
-                        "tipo_vehiculo_id": vehiculo.tipo_vehiculo_id,
-                        "aseguradora_codigo": vehiculo.aseguradora_codigo,
-                        "numero_poliza": vehiculo.numero_poliza,
-                        "vigencia_inicio": vehiculo.vigencia_inicio,
-                        "vigencia_fin": vehiculo.vigencia_fin,
-                        "estado_aseguramiento_id": vehiculo.estado_aseguramiento_id,
-                    })
+                    self._versiones[vehiculo.id] = vehiculo.version
+                    self.view.cargar_vehiculo_existente(VEHICULO_VISTA.a_dict(vehiculo))
                 else:
                     print(f"ℹ️ VehiculoPresenter: No hay vehículo registrado para accidente_id={self.accidente_id}")
                     # Mostrar mensaje informativo en el formulario
@@ -642,36 +696,16 @@ class VehiculoPresenter:
                 if len(vehiculos) == 1:
                     # Solo un vehículo, cargar automáticamente
                     vehiculo = vehiculos[0]
-                    self.view.cargar_vehiculo({
-                        "id": vehiculo.id,
-                        "placa": vehiculo.placa,
-                        "marca": vehiculo.marca,
-                        "tipo_vehiculo_id": vehiculo.tipo_vehiculo_id,
-                        "aseguradora_codigo": vehiculo.aseguradora_codigo,
-                        "numero_poliza": vehiculo.numero_poliza,
-                        "vigencia_inicio": vehiculo.vigencia_inicio,
-                        "vigencia_fin": vehiculo.vigencia_fin,
-                        "estado_aseguramiento_id": vehiculo.estado_aseguramiento_id,
-                    })
+                    self._versiones[vehiculo.id] = vehiculo.version
+                    self.view.cargar_vehiculo(VEHICULO_VISTA.a_dict(vehiculo))
                     print(f"✓ Vehículo {vehiculo.placa} cargado automáticamente")
                 else:
                     # Varios vehículos, mostrar modal de selección
                     from app.ui.views.seleccionar_vehiculo_dialog import SeleccionarVehiculoDialog
                     
-                    vehiculos_data = []
-                    for v in vehiculos:
-                        vehiculos_data.append({
-                            "id": v.id,
-                            "placa": v.placa,
-                            "marca": v.marca,
-                            "tipo_vehiculo": v.tipo_vehiculo.descripcion if v.tipo_vehiculo else "",
-                            "aseguradora_codigo": v.aseguradora_codigo,
-                            "numero_poliza": v.numero_poliza,
-                            "vigencia_inicio": v.vigencia_inicio,
-                            "vigencia_fin": v.vigencia_fin,
-                            "tipo_vehiculo_id": v.tipo_vehiculo_id,
-                            "estado_aseguramiento_id": v.estado_aseguramiento_id,
-                        })
+                    vehiculos_data = VEHICULO_VISTA.a_dicts(vehiculos)
+                    for datos, v in zip(vehiculos_data, vehiculos):
+                        datos["tipo_vehiculo"] = v.tipo_vehiculo.descripcion if v.tipo_vehiculo else ""
                     
                     dialog = SeleccionarVehiculoDialog(vehiculos_data, self.view)
                     if dialog.exec():
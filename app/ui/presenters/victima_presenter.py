@@ -9,8 +9,11 @@ from app.data.repositories.persona_repo import PersonaRepository
 from app.data.repositories.victima_repo import VictimaRepository
 from app.data.repositories.conductor_repo import ConductorRepository
 from app.data.repositories.propietario_repo import PropietarioRepository
-from app.data.repositories.catalogo_repo import CatalogoRepository
+from app.domain.services.catalogo_service import CatalogoService
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
 from app.config.db import get_db_session
+from app.ui.busqueda import ControladorBusqueda
+from app.domain.services.persona_cache import PersonaCache
 from app.data.models import AccidenteVictima, AccidenteConductor, AccidentePropietario
 
 
@@ -24,6 +27,16 @@ class VictimaPresenter:
         self.conductor_presenter = None  # Se establece desde AccidentePresenter
         self.propietario_presenter = None  # Se establece desde AccidentePresenter
         
+        # Personas del accidente; AccidentePresenter la comparte entre pestañas
+        self.persona_cache = PersonaCache()
+        
+        # Búsqueda de persona en segundo plano (debounce y descarte de resultados obsoletos)
+        self._busqueda_persona = ControladorBusqueda(
+            self._consultar_persona, parent=self.view, espera_ms=150, max_cache=0
+        )
+        self._busqueda_persona.resultado.connect(self._mostrar_persona)
+        self._busqueda_persona.error.connect(self._mostrar_error_busqueda)
+        
         # Conectar señales
         self._conectar_signals()
         
@@ -38,28 +51,11 @@ class VictimaPresenter:
         self.view.anular_victima_signal.connect(self.anular_victima)
     
     def _cargar_catalogos(self):
-        """Carga los catálogos necesarios."""
+        """Carga los catálogos necesarios (desde la caché de catálogos)."""
         try:
-            with get_db_session() as session:
-                catalogo_repo = CatalogoRepository(session)
-                
-                # Tipos de identificación
-                tipos = catalogo_repo.get_tipos_identificacion()
-                self.view.cargar_tipos_identificacion(
-                    [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
-                )
-                
-                # Sexos
-                sexos = catalogo_repo.get_sexos()
-                self.view.cargar_sexos(
-                    [{"id": s.id, "descripcion": s.descripcion} for s in sexos]
-                )
-                
-                # Municipios
-                municipios = catalogo_repo.get_todos_municipios()
-                self.view.cargar_municipios(
-                    [{"id": m.id, "nombre": m.nombre} for m in municipios]
-                )
+            self.view.cargar_tipos_identificacion(CatalogoService.tipos_identificacion())
+            self.view.cargar_sexos(CatalogoService.sexos())
+            self.view.cargar_municipios(CatalogoService.municipios())
         except Exception as e:
             print(f"Error cargando catálogos: {e}")
     
@@ -69,35 +65,29 @@ class VictimaPresenter:
         self.cargar_victima_existente()
     
     def buscar_persona(self, tipo_id: str, numero: str):
-        """Busca una persona por documento."""
+        """Busca una persona por documento (en segundo plano)."""
         if not tipo_id or not numero:
             return
         
-        try:
-            with get_db_session() as session:
-                persona_repo = PersonaRepository(session)
-                persona = persona_repo.get_by_documento(int(tipo_id), numero)
-                
-                if persona:
-                    # Cargar datos en el formulario
-                    self.view.cargar_persona({
-                        "id": persona.id,
-                        "primer_nombre": persona.primer_nombre,
-                        "segundo_nombre": persona.segundo_nombre,
-                        "primer_apellido": persona.primer_apellido,
-                        "segundo_apellido": persona.segundo_apellido,
-                        "fecha_nacimiento": persona.fecha_nacimiento,
-                        "sexo_id": persona.sexo_id,
-                        "direccion": persona.direccion,
-                        "telefono": persona.telefono,
-                        "municipio_residencia_id": persona.municipio_residencia_id,
-                    })
-                else:
-                    self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
-                    self.view.persona_id_actual = None
-        except Exception as e:
-            print(f"Error buscando persona: {e}")
-            self.view.lbl_persona_encontrada.setText(f"❌ Error: {str(e)}")
+        self.view.lbl_persona_encontrada.setText("🔍 Buscando...")
+        self._busqueda_persona.solicitar((int(tipo_id), numero))
+    
+    def _consultar_persona(self, clave):
+        """Consulta la persona (caché del accidente); corre en un hilo del pool de búsquedas."""
+        tipo_id, numero = clave
+        return self.persona_cache.por_documento(tipo_id, numero)
+    
+    def _mostrar_persona(self, clave, persona: Optional[Dict[str, Any]]):
+        """Carga en el formulario el resultado de la búsqueda vigente."""
+        if persona:
+            self.view.cargar_persona(persona)
+        else:
+            self.view.lbl_persona_encontrada.setText("⚠️ Persona no encontrada. Se creará nueva.")
+            self.view.persona_id_actual = None
+    
+    def _mostrar_error_busqueda(self, clave, mensaje: str):
+        print(f"Error buscando persona: {mensaje}")
+        self.view.lbl_persona_encontrada.setText(f"❌ Error: {mensaje}")
     
     def guardar_victima(self, datos: Dict[str, Any]):
         """Guarda una víctima."""
@@ -218,7 +208,13 @@ class VictimaPresenter:
                     else:
                         print(f"⚠️ Ya existe un propietario registrado para este accidente")
                 
+                # 5. Mantener el resumen de búsqueda (la persona puede figurar en otros accidentes)
+                resumen_repo = AccidenteResumenRepository(session)
+                resumen_repo.refrescar(self.accidente_id)
+                resumen_repo.refrescar_por_persona(persona.id)
+                
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
                 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 mensaje = f"✓ Víctima guardada: {nombre_completo}"
@@ -230,7 +226,7 @@ class VictimaPresenter:
                 
                 self.view.mostrar_victima_guardada(victima.id, nombre_completo)
                 
-                # 5. Recargar los otros tabs si se copiaron los datos
+                # 6. Recargar los otros tabs si se copiaron los datos
                 if datos.get("es_conductor") and self.conductor_presenter:
                     self.conductor_presenter.cargar_conductor_existente()
                 if datos.get("es_propietario") and self.propietario_presenter:
@@ -314,7 +310,13 @@ class VictimaPresenter:
                 victima.condicion_codigo = datos["condicion"]
                 
                 session.flush()
+                
+                resumen_repo = AccidenteResumenRepository(session)
+                resumen_repo.refrescar(self.accidente_id)
+                resumen_repo.refrescar_por_persona(persona.id)
+                
                 session.commit()
+                self.persona_cache.invalidar(persona.id)
                 
                 nombre_completo = f"{persona.primer_nombre} {persona.primer_apellido}"
                 print(f"✓ Víctima actualizada: {nombre_completo}")
@@ -333,6 +335,7 @@ class VictimaPresenter:
                 victima_repo = VictimaRepository(session)
                 
                 if victima_repo.anular(victima_id):
+                    AccidenteResumenRepository(session).refrescar(self.accidente_id)
                     session.commit()
                     print(f"✓ Víctima {victima_id} anulada correctamente")
                     
@@ -374,34 +377,22 @@ class VictimaPresenter:
                     victima = victimas[0]  # Solo debe haber una
                     persona = victima.persona
                     
+                    datos_persona = PersonaRepository.datos_basicos(persona)
+                    self.persona_cache.guardar(datos_persona)
+                    
                     datos_victima = {
                         "id": victima.id,
                         "condicion": victima.condicion_codigo,
-                        "persona": {
-                            "id": persona.id,
-                            "tipo_identificacion_id": persona.tipo_identificacion_id,
-                            "numero_identificacion": persona.numero_identificacion,
-                            "primer_nombre": persona.primer_nombre,
-                            "segundo_nombre": persona.segundo_nombre,
-                            "primer_apellido": persona.primer_apellido,
-                            "segundo_apellido": persona.segundo_apellido,
-                            "fecha_nacimiento": persona.fecha_nacimiento,
-                            "sexo_id": persona.sexo_id,
-                            "direccion": persona.direccion,
-                            "telefono": persona.telefono,
-                            "municipio_residencia_id": persona.municipio_residencia_id,
-                        }
+                        "persona": datos_persona,
                     }
                     # Asegurar que el combo de tipos tenga el valor disponible.
                     try:
                         idx = self.view.combo_tipo_id.findData(persona.tipo_identificacion_id)
                         if idx < 0:
-                            # El combo no contiene ese tipo => recargar catálogos de tipos
-                            from app.data.repositories.catalogo_repo import CatalogoRepository
-                            tipos = CatalogoRepository(session).get_tipos_identificacion()
-                            tipos_data = [{"id": t.id, "descripcion": t.descripcion} for t in tipos]
+                            # El combo no contiene ese tipo => la caché está desactualizada, recargar
+                            CatalogoService.invalidar("tipos_identificacion")
                             try:
-                                self.view.cargar_tipos_identificacion(tipos_data)
+                                self.view.cargar_tipos_identificacion(CatalogoService.tipos_identificacion())
                             except Exception:
                                 pass
                     except Exception:
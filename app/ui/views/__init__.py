@@ -1,9 +1,23 @@
 """Vistas de la aplicación."""
-from app.ui.views.main_window import MainWindow
-from app.ui.views.accidente_form import AccidenteForm
-from app.ui.views.detalle_form import DetalleForm
-from app.ui.views.medico_tratante_form import MedicoTratanteForm
-from app.ui.views.remision_form import RemisionForm
+from typing import TYPE_CHECKING
+
+from app.utils.lazy import exportacion_diferida
+
+# Importación diferida (app.utils.lazy): {nombre: módulo que lo define}
+_MODULOS = {
+    "MainWindow": "app.ui.views.main_window",
+    "AccidenteForm": "app.ui.views.accidente_form",
+    "DetalleForm": "app.ui.views.detalle_form",
+    "MedicoTratanteForm": "app.ui.views.medico_tratante_form",
+    "RemisionForm": "app.ui.views.remision_form",
+}
+
+if TYPE_CHECKING:
+    from app.ui.views.main_window import MainWindow
+    from app.ui.views.accidente_form import AccidenteForm
+    from app.ui.views.detalle_form import DetalleForm
+    from app.ui.views.medico_tratante_form import MedicoTratanteForm
+    from app.ui.views.remision_form import RemisionForm
 
 __all__ = [
     "MainWindow",
@@ -12,3 +26,5 @@ __all__ = [
     "MedicoTratanteForm",
     "RemisionForm",
 ]
+
+__getattr__, __dir__ = exportacion_diferida(__name__, globals(), _MODULOS, __all__)
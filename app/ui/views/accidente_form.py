@@ -17,9 +17,25 @@ from PySide6.QtWidgets import (
     QLabel,
     QScrollArea,
 )
+from importlib import import_module
+from typing import Dict, Optional
+
 from PySide6.QtCore import Signal, QDate, QTime, Qt
 
 
+# Pestañas con formulario propio: clave -> (título, módulo, clase).
+# Los formularios se construyen la primera vez que se necesitan.
+TABS_FORMULARIO = {
+    "victima": ("👤 Víctima", "app.ui.views.victima_form", "VictimaForm"),
+    "conductor": ("🚗 Conductor", "app.ui.views.conductor_form", "ConductorForm"),
+    "propietario": ("📝 Propietario", "app.ui.views.propietario_form", "PropietarioForm"),
+    "vehiculo": ("🚙 Vehículo", "app.ui.views.vehiculo_form", "VehiculoForm"),
+    "medico_tratante": ("🩺 Médico Tratante", "app.ui.views.medico_tratante_form", "MedicoTratanteForm"),
+    "remision": ("🚑 Remisiones", "app.ui.views.remision_form", "RemisionForm"),
+    "detalle": ("📋 Detalle (FURIPS2)", "app.ui.views.detalle_form", "DetalleForm"),
+}
+
+
 class AccidenteForm(QWidget):
     """Formulario para diligenciar datos del accidente."""
     
@@ -32,6 +48,7 @@ class AccidenteForm(QWidget):
     def __init__(self):
         super().__init__()
         self.accidente_id_actual = None  # Para trackear el accidente cargado
+        self._forms: Dict[str, QWidget] = {}  # Formularios de pestañas ya construidos
         self._setup_ui()
     
     def _setup_ui(self):
@@ -184,22 +201,17 @@ class AccidenteForm(QWidget):
         
         # Pestañas inferiores
         self.tabs = QTabWidget()
-        self.tab_victima = self._create_victima_tab()
-        self.tab_conductor = self._create_conductor_tab()
-        self.tab_propietario = self._create_propietario_tab()
-        self.tab_vehiculo = self._create_vehiculo_tab()
-        self.tab_medico_tratante = self._create_medico_tratante_tab()
-        self.tab_remision = self._create_remision_tab()
-        self.tab_detalle = self._create_detalle_tab()
-        self.tab_totales = self._create_totales_tab()
         
-        self.tabs.addTab(self.tab_victima, "👤 Víctima")
-        self.tabs.addTab(self.tab_conductor, "🚗 Conductor")
-        self.tabs.addTab(self.tab_propietario, "📝 Propietario")
-        self.tabs.addTab(self.tab_vehiculo, "🚙 Vehículo")
-        self.tabs.addTab(self.tab_medico_tratante, "🩺 Médico Tratante")
-        self.tabs.addTab(self.tab_remision, "🚑 Remisiones")
-        self.tabs.addTab(self.tab_detalle, "📋 Detalle (FURIPS2)")
+        # Pestañas con formulario: contenedor vacío, el formulario se crea al activarla
+        for clave, (titulo, _modulo, _clase) in TABS_FORMULARIO.items():
+            contenedor = QWidget()
+            contenedor.setObjectName(f"tab_{clave}")
+            contenedor_layout = QVBoxLayout(contenedor)
+            contenedor_layout.setContentsMargins(0, 0, 0, 0)
+            setattr(self, f"tab_{clave}", contenedor)
+            self.tabs.addTab(contenedor, titulo)
+        
+        self.tab_totales = self._create_totales_tab()
         self.tabs.addTab(self.tab_totales, "💰 Totales / Declaración")
         
         layout.addWidget(self.tabs, 1)
@@ -315,47 +327,39 @@ class AccidenteForm(QWidget):
         group.setLayout(grid)
         return group
     
-    def _create_victima_tab(self) -> QWidget:
-        """Crea la pestaña de víctima."""
-        from app.ui.views.victima_form import VictimaForm
-        self.victima_form = VictimaForm()
-        return self.victima_form
-    
-    def _create_conductor_tab(self) -> QWidget:
-        """Crea la pestaña de conductor."""
-        from app.ui.views.conductor_form import ConductorForm
-        self.conductor_form = ConductorForm()
-        return self.conductor_form
-    
-    def _create_propietario_tab(self) -> QWidget:
-        """Crea la pestaña de propietario."""
-        from app.ui.views.propietario_form import PropietarioForm
-        self.propietario_form = PropietarioForm()
-        return self.propietario_form
+    # ========================================================================
+    # PESTAÑAS DIFERIDAS
+    # ========================================================================
     
-    def _create_vehiculo_tab(self) -> QWidget:
-        """Crea la pestaña de vehículo."""
-        from app.ui.views.vehiculo_form import VehiculoForm
-        self.vehiculo_form = VehiculoForm()
-        return self.vehiculo_form
+    def clave_tab(self, index: int) -> Optional[str]:
+        """Retorna la clave de la pestaña con formulario en `index` (None si no tiene)."""
+        widget = self.tabs.widget(index)
+        for clave in TABS_FORMULARIO:
+            if getattr(self, f"tab_{clave}", None) is widget:
+                return clave
+        return None
     
-    def _create_detalle_tab(self) -> QWidget:
-        """Crea la pestaña de detalle."""
-        from app.ui.views.detalle_form import DetalleForm
-        self.detalle_form = DetalleForm()
-        return self.detalle_form
+    def form_creado(self, clave: str) -> bool:
+        """Indica si el formulario de la pestaña ya fue construido."""
+        return clave in self._forms
     
-    def _create_medico_tratante_tab(self) -> QWidget:
-        """Crea la pestaña de médico tratante."""
-        from app.ui.views.medico_tratante_form import MedicoTratanteForm
-        self.medico_tratante_form = MedicoTratanteForm()
-        return self.medico_tratante_form
+    def get_form(self, clave: str) -> QWidget:
+        """Retorna el formulario de una pestaña, construyéndolo la primera vez."""
+        form = self._forms.get(clave)
+        if form is None:
+            _titulo, modulo, clase = TABS_FORMULARIO[clave]
+            form = getattr(import_module(modulo), clase)()
+            getattr(self, f"tab_{clave}").layout().addWidget(form)
+            self._forms[clave] = form
+        return form
     
-    def _create_remision_tab(self) -> QWidget:
-        """Crea la pestaña de remisiones."""
-        from app.ui.views.remision_form import RemisionForm
-        self.remision_form = RemisionForm()
-        return self.remision_form
+    victima_form = property(lambda self: self.get_form("victima"))
+    conductor_form = property(lambda self: self.get_form("conductor"))
+    propietario_form = property(lambda self: self.get_form("propietario"))
+    vehiculo_form = property(lambda self: self.get_form("vehiculo"))
+    medico_tratante_form = property(lambda self: self.get_form("medico_tratante"))
+    remision_form = property(lambda self: self.get_form("remision"))
+    detalle_form = property(lambda self: self.get_form("detalle"))
     
     def _create_totales_tab(self) -> QWidget:
         """Crea la pestaña de totales."""
@@ -439,15 +443,11 @@ class AccidenteForm(QWidget):
         self.btn_actualizar_accidente.setVisible(False)
         self.btn_anular_accidente.setVisible(False)
         
-        # Limpiar todos los tabs
-        self.vehiculo_form.limpiar_formulario()
-        self.victima_form.limpiar_formulario()
-        self.conductor_form.limpiar_formulario()
-        self.propietario_form.limpiar_formulario()
-        self.medico_tratante_form.limpiar_formulario()
-        self.remision_form.limpiar_formulario()
-        self.remision_form.limpiar_tabla()
-        self.detalle_form.limpiar_formulario()
+        # Limpiar los tabs ya construidos (los demás aún están vacíos)
+        for clave, form in self._forms.items():
+            form.limpiar_formulario()
+            if clave == "remision":
+                form.limpiar_tabla()
     
     def _on_guardar_accidente(self):
         """Maneja el clic en guardar accidente."""
@@ -21,6 +21,7 @@ from PySide6.QtCore import Signal, Qt
 
 from app.config.db import get_db_session
 from app.data.repositories.accidente_repo import AccidenteRepository
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
 
 
 class BuscarImprimirDialog(QWidget):
@@ -168,7 +169,9 @@ class BuscarImprimirDialog(QWidget):
         # Ejecutar consulta en contexto de sesión
         with get_db_session() as session:
             repo = AccidenteRepository(session)
-            rows = repo.buscar_accidentes_con_victima(filtros)
+            rows = AccidenteResumenRepository(session).buscar(filtros)
+            # Conteos de relaciones en lote (evita 7 consultas por fila)
+            conteos = repo.resumen_relaciones_lote([r.accidente_id for r in rows])
             # Desactivar ordenamiento y actualizaciones visuales durante la carga
             was_sorting = self.table.isSortingEnabled()
             self.table.setSortingEnabled(False)
@@ -180,31 +183,16 @@ class BuscarImprimirDialog(QWidget):
             self.table.setRowCount(len(rows))
 
             for row_idx, r in enumerate(rows):
-                # Depuración: imprimir lo que vamos a pintar
-                try:
-                    print(f"[BuscarImprimirDialog] Pintando fila {row_idx}")
-                except Exception:
-                    pass
-                # r puede ser Row/KeyedTuple o tupla; manejar ambos casos
-                try:
-                    accidente_id = getattr(r, 'id', None) or r[0]
-                except Exception:
-                    accidente_id = r[0]
-
-                consecutivo = getattr(r, 'numero_consecutivo', None) or r[1]
-                factura = getattr(r, 'numero_factura', None) or r[2]
-                fecha = getattr(r, 'fecha_evento', None) or r[3]
-                hora = getattr(r, 'hora_evento', None) or r[4]
-                tipo_id = getattr(r, 'tipo_identificacion', None) or r[5]
-                documento = getattr(r, 'numero_identificacion', None) or r[6]
-                nombres = (
-                    f"{getattr(r, 'primer_nombre', None) or r[7]} "
-                    f"{getattr(r, 'segundo_nombre', '') or (r[8] if len(r) > 8 else '')} "
-                    f"{getattr(r, 'primer_apellido', None) or (r[9] if len(r) > 9 else '')} "
-                    f"{getattr(r, 'segundo_apellido', '') or (r[10] if len(r) > 10 else '')}"
-                ).strip()
-
-                resumen = repo.resumen_relaciones(accidente_id)
+                accidente_id = r.accidente_id
+                consecutivo = r.numero_consecutivo
+                factura = r.numero_factura
+                fecha = r.fecha_evento
+                hora = r.hora_evento or ""
+                tipo_id = r.tipo_identificacion or ""
+                documento = r.numero_identificacion or ""
+                nombres = r.nombre_victima
+
+                resumen = conteos.get(accidente_id, {})
                 resumen_txt = (
                     f"V:{resumen.get('victimas',0)} "
                     f"C:{resumen.get('conductores',0)} "
@@ -230,12 +218,6 @@ class BuscarImprimirDialog(QWidget):
                 btn.clicked.connect(self._make_imprimir_handler(accidente_id))
 
                 self.table.setCellWidget(row_idx, 9, btn)
-                # Depuración: confirmar textos escritos en celdas
-                try:
-                    texts = [self.table.item(row_idx, c).text() if self.table.item(row_idx, c) else "<None>" for c in range(self.table.columnCount())]
-                    print(f"[BuscarImprimirDialog] Fila {row_idx} valores: {texts}")
-                except Exception:
-                    pass
 
             # Restaurar actualizaciones y ordenamiento
             self.table.setUpdatesEnabled(True)
@@ -103,6 +103,7 @@ class ConductorForm(QWidget):
         # Validador: solo números
         validator_numeros = QRegularExpressionValidator(QRegularExpression(r"^\d*$"))
         self.txt_numero_id.setValidator(validator_numeros)
+        self.txt_numero_id.returnPressed.connect(self._on_buscar_persona)
         grid.addWidget(self.txt_numero_id, 0, 3)
         
         self.btn_buscar = QPushButton("🔍 Buscar")
@@ -249,7 +250,9 @@ class ConductorForm(QWidget):
         return layout
     
     def _on_buscar_persona(self):
-        """Maneja el evento de búsqueda de persona."""
+        """Maneja el evento de búsqueda de persona (botón o Enter en el número)."""
+        if not self.btn_buscar.isEnabled():
+            return
         tipo_id = self.combo_tipo_id.currentData()
         numero = self.txt_numero_id.text().strip()
         
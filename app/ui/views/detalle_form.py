@@ -16,10 +16,13 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QMessageBox,
     QScrollArea,
+    QCompleter,
 )
-from PySide6.QtCore import Signal, Qt
+from PySide6.QtCore import Signal, Qt, QModelIndex
 from PySide6.QtGui import QIntValidator
 
+from app.ui.views.procedimiento_model import ProcedimientoListModel, ProcedimientoFiltroProxy
+
 
 class DetalleForm(QWidget):
     """Formulario para gestionar los detalles (FURIPS2)."""
@@ -32,6 +35,7 @@ class DetalleForm(QWidget):
         super().__init__()
         self.accidente_id = None
         self.detalles_temp = []  # Lista temporal de detalles
+        self._procedimiento_actual = None  # Dict del procedimiento seleccionado
         self._setup_ui()
     
     def _setup_ui(self):
@@ -79,14 +83,26 @@ class DetalleForm(QWidget):
         self.txt_codigo_servicio.returnPressed.connect(self._on_buscar_por_codigo)
         layout.addWidget(self.txt_codigo_servicio)
         
-        # Procedimiento (buscable)
+        # Procedimiento (buscable): completer sobre un modelo, solo se pintan las filas visibles
         layout.addWidget(QLabel("Procedimiento:"))
-        self.combo_procedimiento = QComboBox()
-        self.combo_procedimiento.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        self.combo_procedimiento.setEditable(True)  # Permitir escribir para buscar
-        self.combo_procedimiento.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)  # No insertar nuevos
-        self.combo_procedimiento.currentIndexChanged.connect(self._on_procedimiento_seleccionado)
-        layout.addWidget(self.combo_procedimiento, 1)
+        self.txt_procedimiento = QLineEdit()
+        self.txt_procedimiento.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.txt_procedimiento.setPlaceholderText("Escriba código o descripción (vacío = ingreso manual)")
+        self.txt_procedimiento.setClearButtonEnabled(True)
+        self.txt_procedimiento.textEdited.connect(self._on_procedimiento_editado)
+        layout.addWidget(self.txt_procedimiento, 1)
+        
+        self.modelo_procedimientos = ProcedimientoListModel(self)
+        self.proxy_procedimientos = ProcedimientoFiltroProxy(self)
+        self.proxy_procedimientos.setSourceModel(self.modelo_procedimientos)
+        
+        # El filtrado lo hace el proxy; el completer solo muestra el popup
+        self.completer_procedimiento = QCompleter(self.proxy_procedimientos, self)
+        self.completer_procedimiento.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer_procedimiento.setMaxVisibleItems(15)
+        self.completer_procedimiento.popup().setUniformItemSizes(True)
+        self.completer_procedimiento.activated[QModelIndex].connect(self._on_procedimiento_activado)
+        self.txt_procedimiento.setCompleter(self.completer_procedimiento)
         
         # Cantidad
         layout.addWidget(QLabel("Cant:"))
@@ -243,15 +259,21 @@ class DetalleForm(QWidget):
         else:
             print(f"⚠️ Campo vacío, no se emite signal")
     
-    def _on_procedimiento_seleccionado(self, index: int):
-        """Cuando se selecciona un procedimiento."""
-        if index >= 0:
-            data = self.combo_procedimiento.currentData()
-            if data:
-                self.txt_codigo_servicio.setText(data.get("codigo", ""))
-                self.txt_descripcion.setText(data.get("descripcion", ""))
-                self.txt_valor_unitario.setText(str(data.get("valor", 0)))
-                self._calcular_valores()
+    def _on_procedimiento_editado(self, texto: str):
+        """Filtra el selector mientras el usuario escribe."""
+        # Al editar el texto se descarta la selección anterior
+        self._procedimiento_actual = None
+        self.proxy_procedimientos.set_termino(texto)
+        if texto.strip():
+            self.completer_procedimiento.complete()
+    
+    def _on_procedimiento_activado(self, index: QModelIndex):
+        """Cuando se elige un procedimiento del popup."""
+        fila = index.data(ProcedimientoListModel.ROL_FILA)
+        store = self.modelo_procedimientos.store
+        if fila is None or store is None:
+            return
+        self.seleccionar_procedimiento(store.como_dict(fila))
     
     def _calcular_valores(self):
         """Calcula el valor facturado."""
@@ -273,14 +295,14 @@ class DetalleForm(QWidget):
             QMessageBox.warning(self, "Error", "Debe seleccionar un tipo de servicio")
             return
         
-        if not self.txt_descripcion.text().strip() and self.combo_procedimiento.currentIndex() == 0:
+        if not self.txt_descripcion.text().strip() and self._procedimiento_actual is None:
             QMessageBox.warning(self, "Error", "Debe seleccionar un procedimiento o ingresar una descripción")
             return
         
         datos = {
             "tipo_servicio_id": self.combo_tipo_servicio.currentData(),
             "tipo_servicio_nombre": self.combo_tipo_servicio.currentText(),
-            "procedimiento_id": self.combo_procedimiento.currentData().get("id") if self.combo_procedimiento.currentIndex() > 0 else None,
+            "procedimiento_id": self._procedimiento_actual.get("id") if self._procedimiento_actual else None,
             "codigo_servicio": self.txt_codigo_servicio.text().strip() or None,
             "descripcion": self.txt_descripcion.text().strip() or None,
             "cantidad": self.spin_cantidad.value(),
@@ -361,7 +383,9 @@ class DetalleForm(QWidget):
     def _limpiar_campos_entrada(self):
         """Limpia los campos de entrada."""
         self.txt_buscar_procedimiento.clear()
-        self.combo_procedimiento.setCurrentIndex(0)
+        self._procedimiento_actual = None
+        self.txt_procedimiento.clear()
+        self.proxy_procedimientos.set_termino("")
         self.txt_codigo_servicio.clear()
         self.txt_descripcion.clear()
         self.spin_cantidad.setValue(1)
@@ -414,21 +438,27 @@ class DetalleForm(QWidget):
         for tipo in tipos:
             self.combo_tipo_servicio.addItem(tipo["descripcion"], tipo["id"])
     
-    def cargar_procedimientos(self, procedimientos: list):
-        """Carga los procedimientos en el combo."""
-        print(f"📦 DetalleForm.cargar_procedimientos() - Recibidos {len(procedimientos)} procedimientos")
-        self.combo_procedimiento.clear()
-        self.combo_procedimiento.addItem("-- Ninguno / Ingreso Manual --", None)
-        for i, proc in enumerate(procedimientos):
-            texto = f"{proc['codigo']} - {proc['descripcion']} (${proc['valor']:,})"
-            self.combo_procedimiento.addItem(texto, proc)
-            print(f"  [{i+1}] {texto}")
-        print(f"✓ Combo cargado con {len(procedimientos)} items (+ 1 default)")
-        
-        # Si hay resultados, mostrar el dropdown automáticamente
-        if len(procedimientos) > 1:
-            print(f"📋 Mostrando dropdown automáticamente...")
-            self.combo_procedimiento.showPopup()
+    def set_procedimiento_store(self, store):
+        """Asigna el almacén de procedimientos que alimenta el selector."""
+        self.modelo_procedimientos.set_store(store)
+        self.proxy_procedimientos.set_termino(self.txt_procedimiento.text() if self._procedimiento_actual is None else "")
+    
+    def seleccionar_procedimiento(self, proc: dict):
+        """Selecciona un procedimiento y completa código, descripción y valor."""
+        self._procedimiento_actual = proc
+        self.txt_procedimiento.setText(f"{proc['codigo']} - {proc['descripcion']} (${proc['valor']:,})")
+        self.txt_codigo_servicio.setText(proc.get("codigo") or "")
+        self.txt_descripcion.setText(proc.get("descripcion") or "")
+        self.txt_valor_unitario.setText(str(proc.get("valor") or 0))
+        self._calcular_valores()
+    
+    def mostrar_coincidencias_procedimiento(self, termino: str):
+        """Filtra el selector por el término y despliega las coincidencias."""
+        self._procedimiento_actual = None
+        self.txt_procedimiento.setText(termino)
+        self.proxy_procedimientos.set_termino(termino)
+        self.txt_procedimiento.setFocus()
+        self.completer_procedimiento.complete()
     
     def cargar_detalles(self, detalles: list):
         """Carga detalles existentes del accidente."""
@@ -0,0 +1,63 @@
+"""
+Modelos Qt para el selector de procedimientos del formulario de detalles.
+
+El modelo de lista lee directamente del ProcedimientoStore, de modo que la
+vista (popup del QCompleter) solo pide los textos de las filas visibles.
+"""
+from typing import Optional, Set
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt
+
+
+class ProcedimientoListModel(QAbstractListModel):
+    """Modelo de lista de solo lectura sobre un ProcedimientoStore."""
+
+    # Rol con la fila del almacén (atraviesa los proxies sin mapear índices)
+    ROL_FILA = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._store = None
+
+    @property
+    def store(self):
+        return self._store
+
+    def set_store(self, store):
+        """Reemplaza el almacén mostrado."""
+        self.beginResetModel()
+        self._store = store
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self._store is None:
+            return 0
+        return len(self._store)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self._store is None:
+            return None
+        fila = index.row()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._store.texto(fila)
+        if role == self.ROL_FILA:
+            return fila
+        return None
+
+
+class ProcedimientoFiltroProxy(QSortFilterProxyModel):
+    """Proxy que filtra por código/descripción usando la búsqueda del almacén."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas: Optional[Set[int]] = None
+
+    def set_termino(self, termino: str):
+        """Aplica el filtro (término vacío = todos)."""
+        modelo = self.sourceModel()
+        store = modelo.store if modelo is not None else None
+        self._filas = store.filas_coincidentes(termino) if store is not None else None
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        return self._filas is None or source_row in self._filas
@@ -0,0 +1 @@
+"""Utilidades generales sin dependencias de la aplicación."""
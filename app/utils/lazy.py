@@ -0,0 +1,44 @@
+"""
+Importación diferida de los nombres que exporta un paquete.
+
+Los `__init__` de vistas, presenters y servicios no importan sus módulos al
+cargarse: cada módulo se importa la primera vez que se accede a uno de sus
+nombres (PEP 562), así el arranque no paga el costo de importar todo.
+"""
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping, Tuple
+
+
+def exportacion_diferida(
+    paquete: str,
+    espacio: MutableMapping[str, Any],
+    modulos: Dict[str, str],
+    exportados: Iterable[str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Construye el `__getattr__` y el `__dir__` de un paquete.
+
+    Args:
+        paquete: `__name__` del paquete (para el mensaje de AttributeError)
+        espacio: `globals()` del paquete; cada nombre resuelto se guarda ahí
+            y los accesos siguientes ya no pasan por `__getattr__`
+        modulos: {nombre: módulo que lo define}
+        exportados: `__all__` del paquete
+
+    Uso:
+        __getattr__, __dir__ = exportacion_diferida(__name__, globals(), _MODULOS, __all__)
+    """
+    exportados = list(exportados)
+
+    def __getattr__(nombre: str) -> Any:
+        modulo = modulos.get(nombre)
+        if modulo is None:
+            raise AttributeError(f"module {paquete!r} has no attribute {nombre!r}")
+        valor = getattr(import_module(modulo), nombre)
+        espacio[nombre] = valor
+        return valor
+
+    def __dir__() -> List[str]:
+        return sorted(set(espacio) | set(exportados))
+
+    return __getattr__, __dir__
@@ -0,0 +1,11 @@
+"""
+Normalización de textos para búsquedas en memoria.
+"""
+import unicodedata
+from typing import Optional
+
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Minúsculas y sin tildes, para comparar como lo hace la collation de MySQL."""
+    texto = unicodedata.normalize("NFKD", (texto or "").lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
@@ -1,6 +1,11 @@
 """
 Punto de entrada de la aplicación FURIPS Desktop.
 """
+import time
+
+# Referencia para medir el tiempo hasta el primer pintado (antes de importar Qt)
+_INICIO = time.perf_counter()
+
 import sys
 from pathlib import Path
 
@@ -9,10 +14,8 @@ from PySide6.QtWidgets import QApplication
 # Agregar el directorio raíz al path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.config import check_db_connection, get_settings
+from app.config.settings import get_settings
 from app.infra.logging_conf import setup_logging, get_logger
-from app.ui.views import MainWindow
-from app.ui.presenters import MainPresenter
 
 
 def main():
@@ -25,33 +28,44 @@ def main():
     
     # Verificar configuración
     settings = get_settings()
-    logger.info(f"Versión: {settings.APP_VERSION}")
-    
-    # Verificar conexión a BD
-    if not check_db_connection():
-        logger.error("No se pudo conectar a la base de datos principal")
-        print("ERROR: No se pudo conectar a la base de datos.")
-        print("Verifique la configuración en el archivo .env")
-        return 1
-    
-    logger.info("Conexión a base de datos establecida")
+    logger.info("Versión: %s", settings.APP_VERSION)
     
     # Crear aplicación Qt
     app = QApplication(sys.argv)
     app.setApplicationName(settings.APP_NAME)
     app.setApplicationVersion(settings.APP_VERSION)
     
-    # Crear ventana principal y presenter
+    # Crear ventana principal y presenter (el resto de vistas se importan al usarse)
+    from app.ui.views.main_window import MainWindow
+    from app.ui.presenters.main_presenter import MainPresenter
+    from app.ui.arranque import ArranqueEnSegundoPlano, MedidorPrimerPintado
+    
     main_window = MainWindow()
+    medidor = MedidorPrimerPintado(main_window, _INICIO, logger)
     main_presenter = MainPresenter(main_window)
     
-    # Mostrar ventana
+    # Mostrar ventana de inmediato; BD y catálogos se inicializan en segundo plano
     main_window.show()
+    main_window.mostrar_estado("Conectando a la base de datos...")
     
     logger.info("Interfaz gráfica iniciada")
     
+    def _on_arranque_terminado(ok: bool, mensaje: str):
+        main_window.mostrar_estado(mensaje)
+        if not ok:
+            logger.error(mensaje)
+            main_window.mostrar_mensaje("Error", mensaje, "error")
+    
+    arranque = ArranqueEnSegundoPlano(logger, main_window)
+    arranque.terminado.connect(_on_arranque_terminado)
+    arranque.iniciar()
+    
     # Ejecutar aplicación
-    return app.exec()
+    codigo_salida = app.exec()
+    
+    from app.config.db import get_pool_stats
+    logger.info("Estadísticas del pool de BD: %s", get_pool_stats())
+    return codigo_salida
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Marca de actualización en tablas de referencia
+Fecha: 2026-10-19
+Descripción: Agrega `actualizado_en` TIMESTAMP(6) (DEFAULT y ON UPDATE
+             CURRENT_TIMESTAMP(6)) con índice a municipio, procedimiento,
+             prestador_salud y persona_config (médicos). El servidor la
+             mantiene en cada INSERT y UPDATE, también en los que no pasan
+             por el ORM, así la sincronización incremental
+             (SincronizacionRepository.cambios_desde) pide solo las filas
+             cambiadas desde la última marca en lugar de la tabla completa.
+
+             persona_config ya tenía actualizado_en sin fracciones de
+             segundo ni ON UPDATE en el servidor: se redefine.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+TABLAS = ["municipio", "procedimiento", "prestador_salud", "persona_config"]
+
+DEFINICION = (
+    "TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6) "
+    "COMMENT 'Última modificación (sincronización incremental)'"
+)
+
+def _nombre_indice(tabla: str) -> str:
+    return f"idx_{tabla}_actualizado_en"
+
+def _agregar_columna(conn, tabla: str):
+    result = conn.execute(text(f"SHOW COLUMNS FROM `{tabla}` LIKE 'actualizado_en'"))
+    if result.fetchone() is None:
+        conn.execute(text(f"ALTER TABLE `{tabla}` ADD COLUMN `actualizado_en` {DEFINICION}"))
+        print(f"   ✓ {tabla}.actualizado_en agregada")
+    else:
+        # Filas antiguas sin valor quedan con la fecha de la migración
+        conn.execute(text(
+            f"UPDATE `{tabla}` SET `actualizado_en` = CURRENT_TIMESTAMP(6) WHERE `actualizado_en` IS NULL"
+        ))
+        conn.execute(text(f"ALTER TABLE `{tabla}` MODIFY COLUMN `actualizado_en` {DEFINICION}"))
+        print(f"   ✓ {tabla}.actualizado_en redefinida")
+    conn.commit()
+
+def _agregar_indice(conn, tabla: str):
+    indice = _nombre_indice(tabla)
+    result = conn.execute(
+        text(f"SHOW INDEX FROM `{tabla}` WHERE Key_name = :indice"),
+        {"indice": indice},
+    )
+    if result.fetchone() is not None:
+        print(f"   ⏭️  {indice} ya existe")
+        return
+    conn.execute(text(f"ALTER TABLE `{tabla}` ADD INDEX `{indice}` (`actualizado_en`)"))
+    conn.commit()
+    print(f"   ✓ {indice} creado")
+
+def ejecutar_migracion():
+    """Agrega actualizado_en e índice a las tablas de referencia."""
+    print("=" * 60)
+    print("MIGRACIÓN: actualizado_en en tablas de referencia")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            for tabla in TABLAS:
+                print(f"\n📝 {tabla}...")
+                _agregar_columna(conn, tabla)
+                _agregar_indice(conn, tabla)
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+        print("\n💡 La réplica local pasa a sincronizar por marca en el próximo ciclo")
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Clave única de documento en persona
+Fecha: 2026-10-19
+Descripción: Agrega UNIQUE (tipo_identificacion_id, numero_identificacion)
+             a persona. El upsert de personas (INSERT ... ON DUPLICATE KEY
+             UPDATE) depende de esta clave. Si hay documentos duplicados la
+             migración se detiene y los lista para depurarlos primero.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+def ejecutar_migracion():
+    """Agrega la clave única de documento a persona."""
+    print("=" * 60)
+    print("MIGRACIÓN: UNIQUE (tipo_identificacion_id, numero_identificacion) en persona")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            result = conn.execute(text("SHOW INDEX FROM `persona` WHERE Key_name = 'uq_persona_documento'"))
+            if result.fetchone() is not None:
+                print("   ⏭️  uq_persona_documento ya existe")
+            else:
+                print("\n📝 Buscando documentos duplicados...")
+                duplicados = conn.execute(text("""
+                    SELECT tipo_identificacion_id, numero_identificacion,
+                           COUNT(*) AS cantidad, GROUP_CONCAT(id ORDER BY id) AS ids
+                    FROM persona
+                    GROUP BY tipo_identificacion_id, numero_identificacion
+                    HAVING COUNT(*) > 1
+                """)).fetchall()
+
+                if duplicados:
+                    print(f"   ❌ {len(duplicados)} documento(s) duplicado(s); unifíquelos antes de continuar:")
+                    for tipo_id, numero, cantidad, ids in duplicados[:50]:
+                        print(f"      tipo={tipo_id} numero={numero} ({cantidad}): ids {ids}")
+                    if len(duplicados) > 50:
+                        print(f"      ... y {len(duplicados) - 50} más")
+                    sys.exit(1)
+
+                print("\n📝 Creando uq_persona_documento...")
+                conn.execute(text("""
+                    ALTER TABLE `persona`
+                    ADD UNIQUE KEY `uq_persona_documento` (`tipo_identificacion_id`, `numero_identificacion`)
+                """))
+                conn.commit()
+                print("   ✓ Clave única creada")
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Columnas de versión para concurrencia optimista
+Fecha: 2026-10-19
+Descripción: Agrega `version` a accidente, vehiculo, persona y
+             accidente_detalle (y a las tablas de archivo que existan).
+             El ORM la usa como version_id_col: cada UPDATE comprueba la
+             versión leída y la incrementa, así una edición concurrente se
+             detecta sin bloquear filas (app/data/repositories/concurrencia.py).
+
+             Agrega también UNIQUE (prestador_id, numero_consecutivo) a
+             accidente: el consecutivo ya no se reserva con SELECT ... FOR
+             UPDATE, la llave única rechaza el duplicado y se reintenta. Si
+             hay consecutivos repetidos la migración se detiene y los lista.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+TABLAS = ["accidente", "vehiculo", "persona", "accidente_detalle"]
+TABLAS_ARCHIVO = ["accidente_archivo", "accidente_detalle_archivo"]
+
+INDICE_CONSECUTIVO = "uq_accidente_prestador_consecutivo"
+
+def _existe_tabla(conn, tabla: str) -> bool:
+    return conn.execute(text("SHOW TABLES LIKE :tabla"), {"tabla": tabla}).fetchone() is not None
+
+def _agregar_version(conn, tabla: str):
+    result = conn.execute(text(f"SHOW COLUMNS FROM `{tabla}` LIKE 'version'"))
+    if result.fetchone() is not None:
+        print(f"   ⏭️  {tabla}.version ya existe")
+        return
+    conn.execute(text(f"""
+        ALTER TABLE `{tabla}`
+        ADD COLUMN `version` INT NOT NULL DEFAULT 1
+        COMMENT 'Versión de la fila (concurrencia optimista)'
+    """))
+    conn.commit()
+    print(f"   ✓ {tabla}.version agregada")
+
+def _agregar_unico_consecutivo(conn):
+    result = conn.execute(
+        text("SHOW INDEX FROM `accidente` WHERE Key_name = :indice"),
+        {"indice": INDICE_CONSECUTIVO},
+    )
+    if result.fetchone() is not None:
+        print(f"   ⏭️  {INDICE_CONSECUTIVO} ya existe")
+        return
+
+    print("\n📝 Buscando consecutivos duplicados...")
+    duplicados = conn.execute(text("""
+        SELECT prestador_id, numero_consecutivo,
+               COUNT(*) AS cantidad, GROUP_CONCAT(id ORDER BY id) AS ids
+        FROM accidente
+        GROUP BY prestador_id, numero_consecutivo
+        HAVING COUNT(*) > 1
+    """)).fetchall()
+
+    if duplicados:
+        print(f"   ❌ {len(duplicados)} consecutivo(s) duplicado(s); corríjalos antes de continuar:")
+        for prestador_id, consecutivo, cantidad, ids in duplicados[:50]:
+            print(f"      prestador={prestador_id} consecutivo={consecutivo} ({cantidad}): ids {ids}")
+        if len(duplicados) > 50:
+            print(f"      ... y {len(duplicados) - 50} más")
+        sys.exit(1)
+
+    print(f"\n📝 Creando {INDICE_CONSECUTIVO}...")
+    conn.execute(text(f"""
+        ALTER TABLE `accidente`
+        ADD UNIQUE KEY `{INDICE_CONSECUTIVO}` (`prestador_id`, `numero_consecutivo`)
+    """))
+    conn.commit()
+    print("   ✓ Clave única creada")
+
+def ejecutar_migracion():
+    """Agrega las columnas de versión y la clave única del consecutivo."""
+    print("=" * 60)
+    print("MIGRACIÓN: Concurrencia optimista (version + consecutivo único)")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            print("\n📝 Agregando columnas version...")
+            for tabla in TABLAS:
+                _agregar_version(conn, tabla)
+            for tabla in TABLAS_ARCHIVO:
+                if _existe_tabla(conn, tabla):
+                    _agregar_version(conn, tabla)
+
+            _agregar_unico_consecutivo(conn)
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Crear tabla accidente_resumen (modelo de lectura)
+Fecha: 2026-10-19
+Descripción: Crea la tabla desnormalizada que usan las grillas de búsqueda
+             e impresión, con índices para los filtros soportados, y la
+             llena a partir de accidente/víctima/persona/vehículo. El
+             filtro por documento busca en todas las víctimas (persona),
+             por lo que también agrega un índice sobre el documento.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.config.db import get_engine_app
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
+
+def ejecutar_migracion():
+    """Ejecuta la migración del resumen de accidentes."""
+    print("=" * 60)
+    print("MIGRACIÓN: Crear tabla accidente_resumen")
+    print("=" * 60)
+
+    try:
+        # Configurar conexión
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            result = conn.execute(text("SHOW TABLES LIKE 'accidente_resumen'"))
+            existe = result.fetchone() is not None
+
+            if not existe:
+                print("\n📝 Creando tabla accidente_resumen...")
+                conn.execute(text("""
+                    CREATE TABLE `accidente_resumen` (
+                      `accidente_id` BIGINT NOT NULL COMMENT 'PK/FK accidente',
+                      `prestador_id` BIGINT NOT NULL COMMENT 'Prestador que radica',
+                      `numero_consecutivo` VARCHAR(12) NOT NULL COMMENT 'Consecutivo del accidente',
+                      `numero_factura` VARCHAR(20) NOT NULL COMMENT 'Número de factura',
+                      `fecha_evento` DATE NOT NULL COMMENT 'Fecha del evento',
+                      `hora_evento` TIME DEFAULT NULL COMMENT 'Hora del evento',
+                      `placa` VARCHAR(10) DEFAULT NULL COMMENT 'Placa del vehículo activo',
+                      `victima_persona_id` BIGINT DEFAULT NULL COMMENT 'Persona de la víctima activa',
+                      `tipo_identificacion` VARCHAR(50) DEFAULT NULL COMMENT 'Tipo de documento de la víctima',
+                      `numero_identificacion` VARCHAR(20) DEFAULT NULL COMMENT 'Documento de la víctima',
+                      `primer_nombre` VARCHAR(30) DEFAULT NULL,
+                      `segundo_nombre` VARCHAR(30) DEFAULT NULL,
+                      `primer_apellido` VARCHAR(30) DEFAULT NULL,
+                      `segundo_apellido` VARCHAR(30) DEFAULT NULL,
+                      `vehiculo_id` BIGINT DEFAULT NULL COMMENT 'Vehículo del accidente',
+                      `estado` TINYINT NOT NULL DEFAULT 1 COMMENT '1 activo, 0 inactivo',
+                      PRIMARY KEY (`accidente_id`),
+                      KEY `idx_resumen_estado_fecha` (`estado`, `fecha_evento`),
+                      KEY `idx_resumen_consecutivo` (`numero_consecutivo`),
+                      KEY `idx_resumen_factura` (`numero_factura`),
+                      KEY `idx_resumen_documento` (`numero_identificacion`),
+                      KEY `idx_resumen_prestador_fecha` (`prestador_id`, `fecha_evento`),
+                      KEY `idx_resumen_persona` (`victima_persona_id`),
+                      KEY `idx_resumen_vehiculo` (`vehiculo_id`),
+                      CONSTRAINT `fk_resumen_accidente` FOREIGN KEY (`accidente_id`)
+                        REFERENCES `accidente` (`id`) ON DELETE CASCADE
+                    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                    COMMENT='Resumen desnormalizado para grillas de búsqueda/impresión'
+                """))
+                conn.commit()
+                print("   ✓ Tabla accidente_resumen creada exitosamente")
+            else:
+                print("   ⏭️  accidente_resumen ya existe, se reconstruirá su contenido...")
+
+            result = conn.execute(text(
+                "SHOW INDEX FROM persona WHERE Key_name = 'idx_persona_numero_identificacion'"
+            ))
+            if result.fetchone() is None:
+                print("\n📝 Creando índice idx_persona_numero_identificacion...")
+                conn.execute(text(
+                    "ALTER TABLE persona ADD INDEX `idx_persona_numero_identificacion` (`numero_identificacion`)"
+                ))
+                conn.commit()
+                print("   ✓ Índice creado")
+            else:
+                print("   ⏭️  idx_persona_numero_identificacion ya existe")
+
+        # Llenar/reconstruir el resumen (idempotente: REPLACE por accidente)
+        print("\n📝 Llenando accidente_resumen...")
+        with Session(engine) as session:
+            filas = AccidenteResumenRepository(session).reconstruir()
+            session.commit()
+        print(f"   ✓ Filas escritas: {filas}")
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+        print("\n📝 Las búsquedas de accidentes usarán ahora accidente_resumen.")
+        print("   Puede volver a ejecutar este script para reconstruirlo.")
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
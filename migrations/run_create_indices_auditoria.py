@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Índices compuestos para consultar el historial de auditoría
+Fecha: 2026-10-19
+Descripción: El historial (AuditoriaRepository, python -m app.cli historial)
+             filtra por accidente, placa, vehículo o documento y ordena por
+             (fecha_cambio, id). Con índices (columna, fecha_cambio) cada
+             página es un rango del índice ya ordenado (InnoDB agrega el id
+             al final). Los índices de una sola columna que quedan como
+             prefijo de los nuevos se eliminan: no aportan a las consultas y
+             cuestan en cada INSERT.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+# (tabla, índice nuevo, columnas, índice de una columna que reemplaza)
+INDICES = [
+    ("vehiculo_historial", "idx_vh_accidente_fecha", "`accidente_id`, `fecha_cambio`", "idx_accidente"),
+    ("vehiculo_historial", "idx_vh_vehiculo_anterior_fecha", "`vehiculo_id_anterior`, `fecha_cambio`", "idx_vehiculo_anterior"),
+    ("vehiculo_historial", "idx_vh_vehiculo_nuevo_fecha", "`vehiculo_id_nuevo`, `fecha_cambio`", "idx_vehiculo_nuevo"),
+    ("vehiculo_historial", "idx_vh_placa_anterior_fecha", "`placa_anterior`, `fecha_cambio`", "idx_vh_placa_anterior"),
+    ("vehiculo_historial", "idx_vh_placa_nueva_fecha", "`placa_nueva`, `fecha_cambio`", "idx_vh_placa_nueva"),
+    ("propietario_historial", "idx_ph_accidente_fecha", "`accidente_id`, `fecha_cambio`", "idx_accidente"),
+    ("propietario_historial", "idx_ph_documento_anterior_fecha", "`documento_anterior`, `fecha_cambio`", "idx_ph_documento_anterior"),
+    ("propietario_historial", "idx_ph_documento_nuevo_fecha", "`documento_nuevo`, `fecha_cambio`", "idx_ph_documento_nuevo"),
+]
+
+def _existe(conn, tabla: str, indice: str) -> bool:
+    result = conn.execute(
+        text(f"SHOW INDEX FROM `{tabla}` WHERE Key_name = :indice"),
+        {"indice": indice},
+    )
+    return result.fetchone() is not None
+
+def ejecutar_migracion():
+    """Crea los índices compuestos del historial de auditoría."""
+    print("=" * 60)
+    print("MIGRACIÓN: Índices para consultar el historial de auditoría")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            for tabla, indice, columnas, reemplazado in INDICES:
+                if _existe(conn, tabla, indice):
+                    print(f"   ⏭️  {indice} ya existe en {tabla}")
+                else:
+                    print(f"\n📝 Creando {indice} en {tabla} ({columnas})...")
+                    conn.execute(text(f"ALTER TABLE `{tabla}` ADD INDEX `{indice}` ({columnas})"))
+                    conn.commit()
+                    print(f"   ✓ {indice} creado")
+
+                if _existe(conn, tabla, reemplazado):
+                    conn.execute(text(f"ALTER TABLE `{tabla}` DROP INDEX `{reemplazado}`"))
+                    conn.commit()
+                    print(f"   🗑️  {reemplazado} eliminado (cubierto por {indice})")
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
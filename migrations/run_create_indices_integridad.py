@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Índice (prestador_id, fecha_evento) en accidente
+Fecha: 2026-10-19
+Descripción: La auditoría de integridad (python -m app.cli auditar) filtra
+             accidente por prestador y rango de fecha_evento; este índice
+             evita recorrer toda la tabla en cada chequeo.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+INDICES = [
+    ("accidente", "idx_accidente_prestador_fecha", "`prestador_id`, `fecha_evento`"),
+    ("accidente", "idx_accidente_estado_fecha", "`estado`, `fecha_evento`"),
+]
+
+def ejecutar_migracion():
+    """Crea los índices usados por la auditoría de integridad."""
+    print("=" * 60)
+    print("MIGRACIÓN: Índices para auditoría de integridad")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            for tabla, indice, columnas in INDICES:
+                result = conn.execute(
+                    text(f"SHOW INDEX FROM `{tabla}` WHERE Key_name = :indice"),
+                    {"indice": indice},
+                )
+                if result.fetchone() is not None:
+                    print(f"   ⏭️  {indice} ya existe en {tabla}")
+                    continue
+
+                print(f"\n📝 Creando {indice} en {tabla} ({columnas})...")
+                conn.execute(text(f"ALTER TABLE `{tabla}` ADD INDEX `{indice}` ({columnas})"))
+                conn.commit()
+                print(f"   ✓ {indice} creado")
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Crear tablas de archivo para accidentes anulados
+Fecha: 2026-10-19
+Descripción: Crea <tabla>_archivo (CREATE TABLE ... LIKE, sin llaves
+             foráneas) para accidente y sus tablas hijas. El archivado
+             (python -m app.cli archivo archivar) mueve ahí los accidentes
+             con estado = 0 para que las tablas de trabajo solo contengan
+             el conjunto activo.
+
+             Las migraciones que agreguen columnas a estas tablas deben
+             agregarlas también a su tabla de archivo.
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+from app.data.repositories.archivo_repo import TABLAS
+
+def ejecutar_migracion():
+    """Crea las tablas de archivo."""
+    print("=" * 60)
+    print("MIGRACIÓN: Tablas de archivo de accidentes anulados")
+    print("=" * 60)
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            for tabla in TABLAS:
+                archivo = f"{tabla}_archivo"
+                result = conn.execute(text("SHOW TABLES LIKE :archivo"), {"archivo": archivo})
+                if result.fetchone() is not None:
+                    print(f"   ⏭️  {archivo} ya existe")
+                    continue
+
+                print(f"\n📝 Creando {archivo}...")
+                conn.execute(text(f"CREATE TABLE `{archivo}` LIKE `{tabla}`"))
+                conn.execute(text(
+                    f"ALTER TABLE `{archivo}` COMMENT = 'Archivo de {tabla} (accidentes anulados)'"
+                ))
+                print(f"   ✓ {archivo} creada")
+
+            conn.commit()
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+        print("\n📝 Para archivar los accidentes anulados:")
+        print("   python -m app.cli archivo archivar")
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Script de migración: Particionar accidente_detalle por año del evento
+Fecha: 2026-10-19
+Descripción: Agrega anio_evento (año de accidente.fecha_evento) a
+             accidente_detalle y particiona la tabla por RANGE sobre esa
+             columna, un año por partición. Las consultas que incluyen
+             anio_evento (DetalleRepository, auditoría de integridad) solo
+             abren las particiones de los años pedidos.
+
+             - MySQL no admite llaves foráneas en tablas particionadas: se
+               eliminan las de accidente_detalle (se conservan sus índices).
+             - La llave primaria pasa a (id, anio_evento): toda llave única
+               debe incluir la columna de partición.
+             - anio_evento lo mantienen triggers (al insertar un detalle y al
+               cambiar el año de accidente.fecha_evento), así que ningún
+               INSERT existente necesita cambios.
+             - accidente no se particiona: la referencian por llave foránea
+               todas sus tablas hijas; sus consultas por periodo ya usan el
+               índice (prestador_id, fecha_evento).
+
+             Ejecutarla de nuevo (p. ej. cada diciembre) agrega la partición
+             del año siguiente.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from sqlalchemy import text
+from app.config.db import get_engine_app
+
+TABLA = "accidente_detalle"
+
+# Años anteriores a este quedan juntos en p_anterior
+PRIMER_ANIO = 2020
+
+TRIGGERS = {
+    "trg_detalle_anio_insert": """
+        CREATE TRIGGER `trg_detalle_anio_insert` BEFORE INSERT ON `accidente_detalle`
+        FOR EACH ROW
+        SET NEW.anio_evento = COALESCE(
+            (SELECT YEAR(a.fecha_evento) FROM accidente a WHERE a.id = NEW.accidente_id), 0
+        )
+    """,
+    "trg_detalle_anio_update": """
+        CREATE TRIGGER `trg_detalle_anio_update` BEFORE UPDATE ON `accidente_detalle`
+        FOR EACH ROW
+        BEGIN
+            IF NEW.accidente_id <> OLD.accidente_id THEN
+                SET NEW.anio_evento = COALESCE(
+                    (SELECT YEAR(a.fecha_evento) FROM accidente a WHERE a.id = NEW.accidente_id), 0
+                );
+            END IF;
+        END
+    """,
+    "trg_accidente_anio_detalle": """
+        CREATE TRIGGER `trg_accidente_anio_detalle` AFTER UPDATE ON `accidente`
+        FOR EACH ROW
+        BEGIN
+            IF NOT (YEAR(NEW.fecha_evento) <=> YEAR(OLD.fecha_evento)) THEN
+                UPDATE accidente_detalle
+                SET anio_evento = COALESCE(YEAR(NEW.fecha_evento), 0)
+                WHERE accidente_id = NEW.id;
+            END IF;
+        END
+    """,
+}
+
+def _particiones_anuales(desde: int, hasta: int) -> str:
+    """Definición de las particiones p<desde>..p<hasta> (un año cada una)."""
+    return ", ".join(
+        f"PARTITION p{anio} VALUES LESS THAN ({anio + 1})" for anio in range(desde, hasta + 1)
+    )
+
+def _ultimo_anio_particionado(conn) -> int:
+    """Último año con partición propia (las demás son p_anterior y p_futuro)."""
+    result = conn.execute(text("""
+        SELECT MAX(CAST(PARTITION_DESCRIPTION AS UNSIGNED)) - 1
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla
+          AND PARTITION_DESCRIPTION <> 'MAXVALUE'
+    """), {"tabla": TABLA})
+    return int(result.scalar())
+
+def _particionar(conn, anio_final: int):
+    """Agrega anio_evento, quita las llaves foráneas y particiona la tabla."""
+    result = conn.execute(text("""
+        SELECT TABLE_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME = :tabla
+    """), {"tabla": TABLA})
+    referencias = [fila[0] for fila in result]
+    if referencias:
+        raise RuntimeError(
+            f"{TABLA} es referenciada por llave foránea desde: {', '.join(referencias)}"
+        )
+
+    result = conn.execute(text(f"SHOW COLUMNS FROM `{TABLA}` LIKE 'anio_evento'"))
+    if result.fetchone() is None:
+        print("\n📝 Agregando columna anio_evento...")
+        conn.execute(text(f"""
+            ALTER TABLE `{TABLA}`
+            ADD COLUMN `anio_evento` SMALLINT NOT NULL DEFAULT 0
+            COMMENT 'Año de accidente.fecha_evento (llave de partición)'
+        """))
+
+    print("\n📝 Calculando anio_evento de los detalles existentes...")
+    result = conn.execute(text(f"""
+        UPDATE `{TABLA}` d
+        JOIN accidente a ON a.id = d.accidente_id
+        SET d.anio_evento = COALESCE(YEAR(a.fecha_evento), 0)
+    """))
+    print(f"   ✓ {result.rowcount} detalle(s) actualizados")
+
+    result = conn.execute(text("""
+        SELECT CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = :tabla
+    """), {"tabla": TABLA})
+    for (llave,) in result.fetchall():
+        conn.execute(text(f"ALTER TABLE `{TABLA}` DROP FOREIGN KEY `{llave}`"))
+        print(f"   🗑️  Llave foránea {llave} eliminada")
+
+    # Las consultas por accidente necesitan un índice que empiece por accidente_id
+    result = conn.execute(text(
+        f"SHOW INDEX FROM `{TABLA}` WHERE Column_name = 'accidente_id' AND Seq_in_index = 1"
+    ))
+    if result.fetchone() is None:
+        conn.execute(text(f"ALTER TABLE `{TABLA}` ADD INDEX `idx_detalle_accidente` (`accidente_id`)"))
+        print("   ✓ Índice idx_detalle_accidente creado")
+
+    print(f"\n📝 Particionando {TABLA} ({PRIMER_ANIO}..{anio_final})...")
+    conn.execute(text(f"""
+        ALTER TABLE `{TABLA}`
+        DROP PRIMARY KEY,
+        ADD PRIMARY KEY (`id`, `anio_evento`)
+        PARTITION BY RANGE (`anio_evento`) (
+            PARTITION p_anterior VALUES LESS THAN ({PRIMER_ANIO}),
+            {_particiones_anuales(PRIMER_ANIO, anio_final)},
+            PARTITION p_futuro VALUES LESS THAN MAXVALUE
+        )
+    """))
+    print("   ✓ Tabla particionada")
+
+def ejecutar_migracion():
+    """Particiona accidente_detalle por año (o agrega los años que falten)."""
+    print("=" * 60)
+    print("MIGRACIÓN: Particionar accidente_detalle por año del evento")
+    print("=" * 60)
+
+    # Siempre hay partición para el año siguiente (los eventos se radican después)
+    anio_final = date.today().year + 1
+
+    try:
+        engine = get_engine_app()
+
+        with engine.connect() as conn:
+            print("\n✓ Conexión exitosa a la base de datos")
+
+            result = conn.execute(text("""
+                SELECT COUNT(*) FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla
+                  AND PARTITION_NAME IS NOT NULL
+            """), {"tabla": TABLA})
+            particionada = result.scalar() > 0
+
+            if not particionada:
+                _particionar(conn, anio_final)
+            else:
+                ultimo = _ultimo_anio_particionado(conn)
+                if ultimo >= anio_final:
+                    print(f"   ⏭️  {TABLA} ya tiene particiones hasta {ultimo}")
+                else:
+                    print(f"\n📝 Agregando particiones {ultimo + 1}..{anio_final}...")
+                    conn.execute(text(f"""
+                        ALTER TABLE `{TABLA}` REORGANIZE PARTITION p_futuro INTO (
+                            {_particiones_anuales(ultimo + 1, anio_final)},
+                            PARTITION p_futuro VALUES LESS THAN MAXVALUE
+                        )
+                    """))
+                    print("   ✓ Particiones agregadas")
+
+            print("\n📝 Creando triggers de anio_evento...")
+            for nombre, sql in TRIGGERS.items():
+                conn.execute(text(f"DROP TRIGGER IF EXISTS `{nombre}`"))
+                conn.execute(text(sql))
+                print(f"   ✓ {nombre}")
+
+            conn.commit()
+
+            print("\n📊 Particiones:")
+            result = conn.execute(text("""
+                SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+                FROM information_schema.PARTITIONS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla
+                ORDER BY PARTITION_ORDINAL_POSITION
+            """), {"tabla": TABLA})
+            for nombre, limite, filas in result:
+                print(f"   - {nombre}: < {limite} (~{filas} filas)")
+
+        print("\n" + "=" * 60)
+        print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ ERROR durante la migración: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    ejecutar_migracion()
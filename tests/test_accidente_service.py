@@ -0,0 +1,107 @@
+"""
+Pruebas del reintento de consecutivo de AccidenteService.crear_accidente.
+
+La BD se reemplaza por repositorios y sesión falsos: el repositorio simula
+la instantánea de REPEATABLE READ (una lectura normal no ve el consecutivo
+que otra estación confirmó; una lectura con bloqueo sí).
+"""
+from contextlib import nullcontext
+from datetime import date, time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic")
+
+from sqlalchemy.exc import IntegrityError
+
+from app.data.repositories.concurrencia import ER_DUP_ENTRY
+from app.domain.dto import AccidenteDTO
+from app.domain.services.accidente_service import AccidenteService
+
+
+class _SesionFalsa:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def begin_nested(self):
+        return nullcontext()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class _RepositorioConcurrente:
+    """Otra estación ya confirmó el 000000000005; la instantánea solo ve hasta el 4."""
+
+    def __init__(self):
+        self.confirmados = {"000000000005"}
+        self.lecturas_con_bloqueo = 0
+
+    def generar_siguiente_consecutivo(self, prestador_id, bloquear=False):
+        if bloquear:
+            self.lecturas_con_bloqueo += 1
+            return "000000000006"
+        return "000000000005"
+
+    def existe_consecutivo(self, prestador_id, consecutivo, excluir_id=None):
+        return False
+
+    def create(self, accidente):
+        if accidente.numero_consecutivo in self.confirmados:
+            raise IntegrityError("INSERT", {}, Exception(ER_DUP_ENTRY, "Duplicate entry"))
+        accidente.id = 1
+        self.confirmados.add(accidente.numero_consecutivo)
+        return accidente
+
+
+def _servicio(repo) -> AccidenteService:
+    servicio = AccidenteService.__new__(AccidenteService)
+    servicio.session = _SesionFalsa()
+    servicio.accidente_repo = repo
+    servicio.resumen_repo = SimpleNamespace(refrescar=lambda accidente_id: None)
+    servicio.validator = SimpleNamespace(validar_accidente_completo=lambda datos: (True, []))
+    return servicio
+
+
+def _dto(consecutivo: str = "") -> AccidenteDTO:
+    return AccidenteDTO(
+        prestador_id=1,
+        numero_consecutivo=consecutivo,
+        numero_factura="FE1",
+        numero_rad_siras="1",
+        naturaleza_evento_id=1,
+        fecha_evento=date(2026, 1, 1),
+        hora_evento=time(12, 0),
+        municipio_evento_id=1,
+        direccion_evento="CALLE 1",
+        estado_aseguramiento_id=1,
+    )
+
+
+def test_reintento_lee_el_consecutivo_con_bloqueo():
+    repo = _RepositorioConcurrente()
+    servicio = _servicio(repo)
+
+    accidente, errores = servicio.crear_accidente(_dto())
+
+    assert errores == []
+    assert accidente.numero_consecutivo == "000000000006"
+    assert repo.lecturas_con_bloqueo == 1
+    assert servicio.session.commits == 1
+
+
+def test_consecutivo_manual_duplicado_no_se_reintenta():
+    repo = _RepositorioConcurrente()
+    servicio = _servicio(repo)
+
+    accidente, errores = servicio.crear_accidente(_dto("000000000005"))
+
+    assert accidente is None
+    assert "ya existe" in errores[0]
+    assert repo.lecturas_con_bloqueo == 0
@@ -0,0 +1,52 @@
+"""
+Pruebas de ArchivoRepository.max_consecutivo cuando aún no se ejecutó
+migrations/run_create_tablas_archivo.py.
+"""
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.data.repositories.archivo_repo import ArchivoRepository
+
+
+class _Resultado:
+    def __init__(self, valor):
+        self.valor = valor
+
+    def scalar(self):
+        return self.valor
+
+
+class _SesionFalsa:
+    def __init__(self, existe: int, maximo=None):
+        self.existe = existe
+        self.maximo = maximo
+        self.consultas = []
+
+    def execute(self, sql, parametros=None):
+        texto = str(sql)
+        self.consultas.append(texto)
+        return _Resultado(self.existe if "information_schema.TABLES" in texto else self.maximo)
+
+
+@pytest.fixture(autouse=True)
+def _sin_cache(monkeypatch):
+    monkeypatch.setattr(ArchivoRepository, "_archivo_existe", None)
+
+
+def test_sin_tabla_de_archivo_no_consulta_y_se_verifica_una_vez():
+    session = _SesionFalsa(existe=0)
+
+    assert ArchivoRepository(session).max_consecutivo(1) is None
+    assert ArchivoRepository(session).max_consecutivo(2) is None
+
+    assert len(session.consultas) == 1
+
+
+def test_con_tabla_de_archivo_retorna_el_maximo():
+    session = _SesionFalsa(existe=1, maximo=42)
+
+    assert ArchivoRepository(session).max_consecutivo(1) == 42
+    assert ArchivoRepository(session).max_consecutivo(1) == 42
+
+    assert sum("information_schema.TABLES" in c for c in session.consultas) == 1
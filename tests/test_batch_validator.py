@@ -0,0 +1,109 @@
+"""
+Pruebas de la validación por lotes (app.domain.validators.batch_validator).
+"""
+from datetime import date
+
+from app.domain.validators import FuripsValidator, ValidadorLote, a_columnas
+from app.domain.validators.batch_validator import _registros_sinteticos, _validar_registro
+
+
+def _accidente(**cambios) -> dict:
+    registro = {
+        "numero_consecutivo": "000000000001",
+        "numero_factura": "FE1",
+        "numero_rad_siras": "SIRAS1",
+        "zona": "U",
+        "naturaleza_codigo": "01",
+        "descripcion_otro_evento": None,
+        "estado_aseguramiento_codigo": "1",
+        "tipo_vehiculo_codigo": "01",
+        "placa": "ABC123",
+        "condicion_codigo": "1",
+        "fecha_evento": date(2026, 3, 10),
+        "vigencia_inicio": date(2026, 1, 1),
+        "vigencia_fin": date(2026, 12, 31),
+        "total_facturado_gmq": 100_000,
+        "total_reclamado_gmq": 100_000,
+        "total_facturado_transporte": 0,
+        "total_reclamado_transporte": 0,
+    }
+    registro.update(cambios)
+    return registro
+
+
+def _validar(*registros):
+    return ValidadorLote().validar_accidentes(a_columnas(list(registros), list(registros[0])))
+
+
+def test_filas_validas_e_invalidas():
+    matriz = _validar(_accidente(), _accidente(zona="X"), _accidente())
+
+    assert len(matriz) == 3
+    assert matriz.filas_con_error() == [1]
+    assert matriz.es_valida(0) and not matriz.es_valida(1)
+    assert [r.codigo for r in matriz.reglas_fallidas(1)] == ["zona"]
+    assert matriz.conteo_por_regla() == {"zona": 1}
+
+
+def test_mensajes_con_los_valores_de_la_fila():
+    matriz = _validar(
+        _accidente(
+            naturaleza_codigo="99",
+            fecha_evento=date(2027, 2, 1),
+            total_reclamado_gmq=150_000,
+        )
+    )
+
+    assert matriz.mensajes(0) == [
+        "Código de naturaleza '99' no válido",
+        "Evento fuera de vigencia de póliza (2026-01-01 - 2026-12-31)",
+        "El total reclamado GMQ (150000) no puede exceder el facturado (100000)",
+    ]
+
+
+def test_mensajes_iguales_a_los_de_furips_validator():
+    v = FuripsValidator
+    matriz = _validar(_accidente(numero_consecutivo="12AB", tipo_vehiculo_codigo="99", condicion_codigo="7"))
+
+    assert matriz.mensajes(0) == [
+        v.validar_consecutivo("12AB")[1],
+        v.validar_tipo_vehiculo("99")[1],
+        v.validar_condicion_victima("7")[1],
+    ]
+
+
+def test_columnas_ausentes_se_omiten():
+    matriz = ValidadorLote().validar_accidentes({"zona": ["U", "X"], "placa": ["ABC123", "A" * 11]})
+
+    assert matriz.filas_con_error() == [1]
+    assert matriz.mensajes(1) == [
+        "Zona 'X' no válida (debe ser U o R)",
+        "La placa no puede exceder 10 caracteres",
+    ]
+
+
+def test_detalles():
+    columnas = {
+        "tipo_servicio_codigo": ["1", "9", "2"],
+        "cantidad": [2, 1, 3],
+        "valor_unitario": [10_000, 5_000, 1_000],
+        "valor_facturado": [20_000, 5_000, 2_000],
+        "valor_reclamado": [20_000, 6_000, 2_000],
+    }
+    matriz = ValidadorLote().validar_detalles(columnas)
+
+    assert matriz.filas_con_error() == [1, 2]
+    assert matriz.mensajes(1) == [
+        "Código de tipo de servicio '9' no válido",
+        "El valor reclamado (6000) no puede exceder el facturado (5000)",
+    ]
+    assert matriz.mensajes(2) == [
+        "Valor facturado inconsistente: 3 x 1000 = 3000, pero se declaró 2000",
+    ]
+
+
+def test_coincide_con_la_validacion_por_registro():
+    registros = _registros_sinteticos(500)
+    matriz = _validar(*registros)
+
+    assert [i for i, r in enumerate(registros) if not _validar_registro(r)] == matriz.filas_con_error()
@@ -0,0 +1,82 @@
+"""
+Pruebas de la cola de trabajos persistente (app.infra.cola_trabajos).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.infra.cola_trabajos import COMPLETADO, EN_CURSO, PENDIENTE, ColaTrabajos
+
+
+def _duplicar(parametros, items):
+    return [(True, str(item * 2)) for item in items]
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return tmp_path / "trabajos.db"
+
+
+def _cola(ruta, propietario: str) -> ColaTrabajos:
+    cola = ColaTrabajos(ruta, {"duplicar": _duplicar}, hilos=1, tamano_lote=2, vencimiento=60)
+    cola.propietario = propietario
+    return cola
+
+
+def _envejecer(cola: ColaTrabajos, trabajo_id: int, segundos: int):
+    """Simula un propietario que lleva `segundos` sin renovar el plazo."""
+    antes = (datetime.now() - timedelta(seconds=segundos)).isoformat(timespec="seconds")
+    with cola._transaccion() as conexion:
+        conexion.execute("UPDATE trabajo SET actualizado_en = ? WHERE id = ?", (antes, trabajo_id))
+
+
+def test_procesa_por_bloques_hasta_completar(ruta):
+    cola = _cola(ruta, "equipo:1")
+    cola.iniciar()
+    try:
+        trabajo_id = cola.encolar("duplicar", {}, [1, 2, 3, 4, 5])
+        estado, = cola.esperar([trabajo_id], intervalo=0.01)
+    finally:
+        cola.detener()
+    assert estado["estado"] == COMPLETADO
+    assert estado["procesados"] == estado["total"] == 5
+    assert [r for _, _, r in cola.resultados(trabajo_id)] == ["2", "4", "6", "8", "10"]
+
+
+def test_no_recupera_trabajo_de_otro_proceso_vivo(ruta):
+    vivo = _cola(ruta, "equipo:1")
+    trabajo_id = vivo.encolar("duplicar", {}, [1, 2, 3])
+    assert vivo._tomar(trabajo_id)
+
+    otro = _cola(ruta, "equipo:2")
+    assert otro._recuperar_abandonados() == 0
+    assert otro.reanudar(trabajo_id) == []
+    trabajo = otro.trabajo(trabajo_id)
+    assert (trabajo["estado"], trabajo["propietario"]) == (EN_CURSO, "equipo:1")
+
+
+def test_recupera_trabajo_con_plazo_vencido(ruta):
+    caido = _cola(ruta, "equipo:1")
+    trabajo_id = caido.encolar("duplicar", {}, [1, 2, 3])
+    assert caido._tomar(trabajo_id)
+    _envejecer(caido, trabajo_id, 120)
+
+    otro = _cola(ruta, "equipo:2")
+    assert otro._recuperar_abandonados() == 1
+    assert otro.trabajo(trabajo_id)["estado"] == PENDIENTE
+
+    # El proceso anterior, si despierta, ya no puede confirmar su bloque
+    bloque = [{"posicion": 0, "item": 1}]
+    assert not caido._confirmar_bloque(trabajo_id, bloque, [(True, "2")])
+    assert otro.trabajo(trabajo_id)["procesados"] == 0
+
+
+def test_punto_de_control_renueva_el_plazo(ruta):
+    cola = _cola(ruta, "equipo:1")
+    trabajo_id = cola.encolar("duplicar", {}, [1, 2, 3])
+    assert cola._tomar(trabajo_id)
+    _envejecer(cola, trabajo_id, 120)
+
+    assert cola._confirmar_bloque(trabajo_id, [{"posicion": 0, "item": 1}], [(True, "2")])
+    assert _cola(ruta, "equipo:2")._recuperar_abandonados() == 0
+    assert cola.trabajo(trabajo_id)["procesados"] == 1
@@ -0,0 +1,83 @@
+"""
+Pruebas de la conversión ORM/DTO/dict (app.domain.mapeadores).
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pydantic = pytest.importorskip("pydantic")
+
+from app.domain.dto import DetalleDTO, VehiculoDTO
+from app.domain.mapeadores import (
+    ACCIDENTE_COLUMNAS,
+    DETALLE_COLUMNAS,
+    DETALLE_VISTA,
+    Mapeador,
+    _accidentes_sinteticos,
+    _detalles_sinteticos,
+    medir,
+)
+
+
+def test_campos_respetan_exclusiones():
+    assert "accidente_id" not in DETALLE_VISTA.campos
+    assert "id" in DETALLE_VISTA.campos
+    assert "id" not in DETALLE_COLUMNAS.campos and "accidente_id" not in DETALLE_COLUMNAS.campos
+    assert "id" not in ACCIDENTE_COLUMNAS.campos
+
+
+def test_a_dict_lee_objetos_y_dtos():
+    detalle = _detalles_sinteticos(1)[0]
+    fila = DETALLE_VISTA.a_dict(detalle)
+
+    assert list(fila) == list(DETALLE_VISTA.campos)
+    assert fila == {c: getattr(detalle, c) for c in DETALLE_VISTA.campos}
+    # Un DTO tiene los mismos nombres que la entidad
+    dto = DetalleDTO(**fila)
+    assert DETALLE_COLUMNAS.a_dict(dto) == {c: fila[c] for c in DETALLE_COLUMNAS.campos}
+
+
+def test_a_dicts_equivale_a_a_dict():
+    detalles = _detalles_sinteticos(25)
+    assert DETALLE_VISTA.a_dicts(detalles) == [DETALLE_VISTA.a_dict(d) for d in detalles]
+
+
+def test_a_dicts_acepta_un_iterable():
+    detalles = _detalles_sinteticos(3)
+    assert DETALLE_VISTA.a_dicts(iter(detalles)) == [DETALLE_VISTA.a_dict(d) for d in detalles]
+
+
+def test_validar_lista_reporta_la_fila():
+    entradas = DETALLE_VISTA.a_dicts(_detalles_sinteticos(3))
+    assert [d.id for d in DETALLE_VISTA.validar_lista(iter(entradas))] == [0, 1, 2]
+
+    entradas[1]["cantidad"] = -1
+    with pytest.raises(pydantic.ValidationError) as error:
+        DETALLE_VISTA.validar_lista(entradas)
+    assert error.value.errors()[0]["loc"] == (1, "cantidad")
+
+
+def test_mapeador_de_un_solo_campo():
+    excluir = [c for c in VehiculoDTO.model_fields if c != "placa"]
+    mapeador = Mapeador(VehiculoDTO, excluir=excluir)
+
+    assert mapeador.a_dict(SimpleNamespace(placa="ABC123")) == {"placa": "ABC123"}
+
+
+def test_columnas_de_accidente():
+    accidente = _accidentes_sinteticos(1)[0]
+    columnas = ACCIDENTE_COLUMNAS.a_dict(accidente)
+
+    assert "id" not in columnas
+    assert columnas["numero_consecutivo"] == accidente.numero_consecutivo
+
+
+def test_medir():
+    resultado = medir(50)
+
+    assert set(resultado) == {
+        "ORM -> dicts de vista",
+        "validar lista de entrada",
+        "DTO -> columnas de la entidad",
+    }
+    assert all(set(tiempos) == {"antes", "despues"} for tiempos in resultado.values())
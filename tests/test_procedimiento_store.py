@@ -0,0 +1,48 @@
+"""
+Pruebas del almacén compacto de procedimientos (ProcedimientoStore).
+"""
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("dotenv")
+
+from app.domain.services.procedimiento_store import ProcedimientoStore
+
+FILAS = [
+    (1, "890201", "Consulta de primera vez por medicina general", None, 35000),
+    (2, "890202", "CONSULTA DE PRIMERA VEZ POR MEDICINA ESPECIALIZADA", "39145", 60000),
+    (3, "903841", "Glucosa en suero", None, 8000),
+    (4, "S11101", "TRASLADO PRIMARIO EN AMBULANCIA BÁSICA", "S11101", 250000),
+]
+
+
+@pytest.fixture
+def store():
+    return ProcedimientoStore(FILAS)
+
+
+def test_busca_en_codigo_descripcion_y_soat(store):
+    assert [p["id"] for p in store.buscar("consulta", 10)] == [1, 2]
+    assert [p["id"] for p in store.buscar("39145", 10)] == [2]
+    assert [p["id"] for p in store.buscar("9038", 10)] == [3]
+
+
+def test_busqueda_sin_distinguir_tildes(store):
+    assert [p["id"] for p in store.buscar("basica", 10)] == [4]
+    assert [p["id"] for p in store.buscar("BÁSICA", 10)] == [4]
+    # La fila conserva el texto original
+    assert store.buscar("basica", 10)[0]["descripcion"] == "TRASLADO PRIMARIO EN AMBULANCIA BÁSICA"
+
+
+def test_termino_vacio_y_limite(store):
+    assert store.filas_coincidentes("  ") is None
+    assert store.buscar("", 10) == []
+    assert len(store.buscar("0", 2)) == 2
+
+
+def test_fila_por_codigo(store):
+    fila = store.fila_por_codigo("903841")
+    assert store.como_dict(fila)["descripcion"] == "Glucosa en suero"
+    # "89020" es prefijo de dos códigos, no un código
+    assert store.fila_por_codigo("89020") is None
@@ -0,0 +1,82 @@
+"""
+Pruebas de la réplica local de catálogos (app.infra.replica_local).
+"""
+from datetime import datetime
+
+import pytest
+
+from app.infra.replica_local import ReplicaLocal
+
+MUNICIPIOS = [{"id": 5, "nombre": "ÁBREGO"}, {"id": 2, "nombre": "BOGOTÁ"}, {"id": 9, "nombre": "CALI"}]
+
+
+@pytest.fixture
+def replica(tmp_path):
+    replica = ReplicaLocal(tmp_path / "sub" / "replica.db")
+    yield replica
+    replica.cerrar()
+
+
+def test_catalogo_no_sincronizado_retorna_none(replica):
+    assert replica.leer("municipios") is None
+    assert replica.firmas() == {}
+    assert replica.marcas() == {}
+
+
+def test_guardar_conserva_orden_y_firma(replica):
+    assert replica.guardar("municipios", MUNICIPIOS, firma="123")
+
+    assert replica.leer("municipios") == MUNICIPIOS
+    assert replica.firmas() == {"municipios": "123"}
+    # Sin marca de agua: no es un catálogo incremental
+    assert replica.marcas() == {}
+
+
+def test_catalogo_vacio_es_distinto_de_no_sincronizado(replica):
+    replica.guardar("sexos", [])
+
+    assert replica.leer("sexos") == []
+
+
+def test_guardar_reemplaza_el_catalogo_completo(replica):
+    replica.guardar("municipios", MUNICIPIOS, firma="123")
+    replica.guardar("municipios", MUNICIPIOS[:1], firma="456")
+
+    assert replica.leer("municipios") == MUNICIPIOS[:1]
+    assert replica.firmas() == {"municipios": "456"}
+
+
+def test_marca_de_agua(replica):
+    marca = datetime(2026, 3, 1, 10, 30, 0, 123456)
+    replica.guardar("prestadores", [{"id": 1, "razon_social": "IPS"}], marca=marca)
+    assert replica.marcas() == {"prestadores": marca}
+
+    # Una carga sin marca (completa) la quita
+    replica.guardar("prestadores", [{"id": 1, "razon_social": "IPS"}])
+    assert replica.marcas() == {}
+
+
+def test_descartar(replica):
+    replica.guardar("municipios", MUNICIPIOS, marca=datetime(2026, 3, 1))
+    replica.guardar("sexos", [{"id": 1, "codigo": "F"}])
+
+    replica.descartar("municipios")
+    assert replica.leer("municipios") is None
+    assert replica.marcas() == {}
+    assert replica.leer("sexos") == [{"id": 1, "codigo": "F"}]
+
+    replica.descartar()
+    assert replica.leer("sexos") is None
+
+
+def test_persiste_entre_aperturas(tmp_path):
+    ruta = tmp_path / "replica.db"
+    primera = ReplicaLocal(ruta)
+    primera.guardar("municipios", MUNICIPIOS, firma="1")
+    primera.cerrar()
+
+    segunda = ReplicaLocal(ruta)
+    try:
+        assert segunda.leer("municipios") == MUNICIPIOS
+    finally:
+        segunda.cerrar()
@@ -0,0 +1,117 @@
+"""
+Pruebas de la sincronización incremental de la réplica
+(ReplicaService._sincronizar_incremental).
+
+La BD se reemplaza por un repositorio falso que entrega los cambios; la
+réplica es un archivo SQLite temporal.
+"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("dotenv")
+
+from app.data.repositories.sincronizacion_repo import Cambios
+from app.domain.services import replica_service
+from app.domain.services.replica_service import ReplicaService
+from app.infra.replica_local import ReplicaLocal
+
+MARCA_ANTERIOR = datetime(2026, 1, 1, 8, 0)
+MARCA_NUEVA = datetime(2026, 1, 2, 8, 0)
+
+
+class _RepositorioFalso:
+    def __init__(self, cambios: Cambios, completo=None):
+        self.cambios = cambios
+        self.completo = completo or []
+        self.session = object()
+        self.consultas = []
+
+    def cambios_desde(self, tabla, columnas, desde):
+        self.consultas.append(("cambios", tabla, desde))
+        return self.cambios
+
+    def marca_actual(self):
+        self.consultas.append(("marca",))
+        return MARCA_NUEVA
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    replica = ReplicaLocal(tmp_path / "replica.db")
+    monkeypatch.setattr(replica_service, "replica_compartida", lambda: replica)
+    replica.guardar(
+        "municipios",
+        [{"id": 1, "nombre": "BOGOTA"}, {"id": 2, "nombre": "CALI"}],
+        marca=MARCA_ANTERIOR,
+    )
+    yield replica
+    replica.cerrar()
+
+
+def _sincronizar(repo, aplicados):
+    replicado = ("municipio", lambda session: list(repo.completo), aplicados.append)
+    return ReplicaService._sincronizar_incremental(repo, "municipios", replicado, MARCA_ANTERIOR)
+
+
+def test_combina_cambios_por_id_y_reordena(replica):
+    repo = _RepositorioFalso(Cambios(
+        filas=[
+            {"id": 2, "nombre": "ARMENIA", "vigente": True},
+            {"id": 3, "nombre": "MEDELLIN", "vigente": True},
+            {"id": 1, "nombre": "BOGOTA", "vigente": False},
+        ],
+        marca=MARCA_NUEVA,
+        vigentes=2,
+    ))
+    aplicados = []
+
+    assert _sincronizar(repo, aplicados) is True
+
+    esperado = [{"id": 2, "nombre": "ARMENIA"}, {"id": 3, "nombre": "MEDELLIN"}]
+    assert replica.leer("municipios") == esperado
+    assert aplicados == [esperado]
+    assert replica.marcas()["municipios"] == MARCA_NUEVA
+    # Solo se pidieron los cambios: no hubo descarga completa
+    assert repo.consultas == [("cambios", "municipio", MARCA_ANTERIOR)]
+
+
+def test_reordena_los_nombres_con_tilde_como_mysql(replica):
+    repo = _RepositorioFalso(Cambios(
+        filas=[
+            {"id": 3, "nombre": "ÚMBITA", "vigente": True},
+            {"id": 4, "nombre": "ÁBREGO", "vigente": True},
+        ],
+        marca=MARCA_NUEVA,
+        vigentes=4,
+    ))
+
+    assert _sincronizar(repo, []) is True
+
+    assert [f["nombre"] for f in replica.leer("municipios")] == ["ÁBREGO", "BOGOTA", "CALI", "ÚMBITA"]
+
+
+def test_sin_cambios_no_toca_la_replica(replica):
+    repo = _RepositorioFalso(Cambios(filas=[], marca=MARCA_NUEVA, vigentes=2))
+    aplicados = []
+
+    assert _sincronizar(repo, aplicados) is False
+
+    assert aplicados == []
+    assert replica.marcas()["municipios"] == MARCA_ANTERIOR
+
+
+def test_fila_borrada_en_servidor_descarga_completo(replica):
+    # El servidor tiene una fila vigente menos de las que quedan al combinar
+    completo = [{"id": 2, "nombre": "CALI"}]
+    repo = _RepositorioFalso(Cambios(filas=[], marca=MARCA_NUEVA, vigentes=1), completo=completo)
+    aplicados = []
+
+    assert _sincronizar(repo, aplicados) is True
+
+    assert replica.leer("municipios") == completo
+    assert aplicados == [completo]
+    assert replica.marcas()["municipios"] == MARCA_NUEVA
+    assert ("marca",) in repo.consultas
@@ -0,0 +1,48 @@
+"""
+Pruebas del filtro por consecutivo de AccidenteResumenRepository.buscar.
+
+Se usa SQLite en memoria con solo la tabla accidente_resumen.
+"""
+from datetime import date
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.data.models import AccidenteResumen
+from app.data.repositories.resumen_repo import AccidenteResumenRepository
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    AccidenteResumen.__table__.create(engine)
+    with Session(engine) as session:
+        for accidente_id, consecutivo in ((1, "000000000123"), (2, "123"), (3, "1234")):
+            session.add(AccidenteResumen(
+                accidente_id=accidente_id,
+                prestador_id=1,
+                numero_consecutivo=consecutivo,
+                numero_factura=f"F{accidente_id}",
+                fecha_evento=date(2026, 1, accidente_id),
+                estado=1,
+            ))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _ids(session, consecutivo):
+    return [r.accidente_id for r in AccidenteResumenRepository(session).buscar({"consecutivo": consecutivo})]
+
+
+def test_consecutivo_numerico_encuentra_relleno_y_sin_rellenar(session):
+    assert _ids(session, "123") == [2, 1]
+    assert _ids(session, "000000000123") == [1]
+
+
+def test_consecutivo_no_numerico_filtra_por_prefijo(session):
+    assert _ids(session, "12%") == []